@@ -14,6 +14,7 @@ from firebase_config import get_firestore_client, COLLECTIONS
 from google.cloud.firestore import FieldFilter
 from functools import lru_cache
 from translations import translate, t, get_language
+from pdf_artifacts import artifact_url, schedule_report_pdfs
 
 def show_dashboard():
     """Display simplified user dashboard for non-technical users"""
@@ -1914,7 +1915,8 @@ def download_pdf_report(analysis_id: str):
             st.error("Database connection failed.")
             return
         
-        analysis_ref = db.collection(COLLECTIONS['analyses']).document(analysis_id)
+        # Completed analyses and their PDF artifacts are recorded in analysis_results
+        analysis_ref = db.collection(COLLECTIONS['analysis_results']).document(analysis_id)
         analysis_doc = analysis_ref.get()
         
         if not analysis_doc.exists:
@@ -1923,17 +1925,17 @@ def download_pdf_report(analysis_id: str):
         
         analysis_data = analysis_doc.to_dict()
         
-        # Check if PDF already exists in storage
-        pdf_url = analysis_data.get('pdf_url')
+        # Check if an up-to-date PDF already exists in storage for the current language
+        pdf_url = artifact_url(analysis_data, get_language())
         if pdf_url:
             st.success("PDF report is ready for download!")
             st.markdown(f"[📄 Download PDF Report]({pdf_url})")
         else:
             st.info("PDF report is being generated. Please try again in a few moments.")
             
-            # Trigger PDF generation (this would be handled by a background process)
-            # For now, just show a message
+            # Missing or stale (the analysis changed since it was rendered): render in the background
             if st.button("🔄 Generate PDF", key="generate_pdf_btn"):
+                schedule_report_pdfs(analysis_data, analysis_id, document=analysis_ref)
                 st.info("PDF generation started. This may take a few minutes.")
         
     except Exception as e:
@@ -456,7 +456,7 @@ def show_history_page():
             try:
                 # Generate PDF
                 with st.spinner(f"🔄 {t('pdf_generating', 'Generating PDF report...')}"):
-                    pdf_bytes = generate_results_pdf(analysis_data)
+                    pdf_file = generate_results_pdf(analysis_data)
                     
                 # Get language-specific filename
                 current_lang = get_language()
@@ -465,7 +465,7 @@ def show_history_page():
                 # Download the PDF
                 st.download_button(
                     label=f"💾 {t('pdf_download_report', 'Download PDF')}",
-                    data=pdf_bytes,
+                    data=pdf_file,
                     file_name=filename,
                     mime="application/pdf",
                     type="primary"
@@ -20,10 +20,16 @@ from google.cloud.firestore import Query, FieldFilter
 from utils.pdf_utils import PDFReportGenerator
 from utils.analysis_engine import AnalysisEngine
 from utils.ocr_utils import extract_data_from_image
+from utils.parameter_standardizer import parameter_standardizer
+from utils.economic_model import scenario_display
+from utils.pdf_artifacts import get_report_pdf, schedule_report_pdfs
 from modules.admin import get_active_prompt
 from utils.feedback_system import (
     display_feedback_section as display_feedback_section_util)
 from utils.translations import t, get_language
+from utils.findings_engine import (
+    FINDINGS_FIELD, build_findings, get_findings, sanitize_persona_and_enforce_article)
+from utils.standards_registry import standards_registry
 
 # Import CropDrive integration for user ID
 try:
@@ -973,7 +979,7 @@ def show_results_page():
                 try:
                     # Generate PDF
                     with st.spinner(f"🔄 {t('pdf_generating', 'Generating PDF report...')}"):
-                        pdf_bytes = generate_results_pdf(results_data)
+                        pdf_file = generate_results_pdf(results_data)
                         
                     # Get language-specific filename
                     current_lang = get_language()
@@ -982,7 +988,7 @@ def show_results_page():
                     # Download the PDF
                     st.download_button(
                         label=f"💾 {t('pdf_download_report', 'Download PDF')}",
-                        data=pdf_bytes,
+                        data=pdf_file,
                         file_name=filename,
                         mime="application/pdf",
                         type="primary"
@@ -1937,6 +1943,13 @@ def process_new_analysis(analysis_data, progress_bar, status_text, time_estimate
                 else:
                     logger.warning(f"🔍 DEBUG - Step {i+1} is not a dict, type: {type(step)}, value: {step}")
         
+        # Run the findings engine once; the results page and PDF render its stored output
+        try:
+            analysis_results[FINDINGS_FIELD] = build_findings(analysis_results)
+            analysis_results['executive_summary'] = analysis_results[FINDINGS_FIELD]['executive_summary']
+        except Exception as e:
+            logger.error(f"❌ Findings engine failed, findings will be built on first view: {str(e)}")
+
         # Store analysis results in both session state and Firestore
         if 'stored_analysis_results' not in st.session_state:
             st.session_state.stored_analysis_results = {}
@@ -2003,6 +2016,22 @@ def process_new_analysis(analysis_data, progress_bar, status_text, time_estimate
             'firestore_saved': firestore_saved  # Track if saved to Firestore
         }
         
+        # Render the PDF report per language in the background so downloads are a lookup
+        try:
+            report_data, document = display_data, None
+            if firestore_saved:
+                db = get_firestore_client()
+                document = db.collection(COLLECTIONS['analysis_results']).document(result_id) if db else None
+                # Render from the stored (preprocessed, flattened) document: the dashboard hashes that form
+                snapshot = document.get() if document is not None else None
+                if snapshot is not None and snapshot.exists:
+                    report_data = snapshot.to_dict()
+                else:
+                    document = None
+            schedule_report_pdfs(report_data, result_id, document=document)
+        except Exception as e:
+            logger.warning(f"Could not schedule PDF report rendering for {result_id}: {e}")
+        
         # CRITICAL: Send ANALYSIS_COMPLETE message IMMEDIATELY after analysis completes
         # This ensures results are saved to Firestore and upload counts are updated
         try:
@@ -4088,211 +4117,13 @@ def display_summary_section(results_data):
         st.error("❌ Analysis results data format error")
         return
     
-    raw_data = analysis_results.get('raw_data', {}) if isinstance(analysis_results, dict) else {}
-    soil_params = raw_data.get('soil_parameters', {}) if isinstance(raw_data, dict) else {}
-    leaf_params = raw_data.get('leaf_parameters', {}) if isinstance(raw_data, dict) else {}
-    land_yield_data = raw_data.get('land_yield_data', {}) if isinstance(raw_data, dict) else {}
-    
-    issues_analysis = analysis_results.get('issues_analysis', {}) if isinstance(analysis_results, dict) else {}
-    all_issues = issues_analysis.get('all_issues', []) if isinstance(issues_analysis, dict) else []
-    
-    metadata = analysis_results.get('analysis_metadata', {}) if isinstance(analysis_results, dict) else {}
-    
-    # Try LLM-based dynamic executive summary from actual step-by-step results
-    dynamic_summary_text = None
-    try:
-        from utils.analysis_engine import PromptAnalyzer
-        pa = PromptAnalyzer()
-        dynamic_summary_text = pa.generate_executive_summary_from_steps(analysis_results)
-    except Exception:
-        dynamic_summary_text = None
-
-    if isinstance(dynamic_summary_text, str) and dynamic_summary_text.strip():
-        sanitized_summary = sanitize_persona_and_enforce_article(dynamic_summary_text.strip())
-        st.markdown(
-            f'<div class="analysis-card"><p style="font-size: 16px; line-height: 1.8; margin: 0; text-align: justify;">{sanitized_summary}</p></div>',
-            unsafe_allow_html=True
-        )
-        # Also store on analysis_results for PDF export reuse
-        try:
-            if isinstance(analysis_results, dict):
-                analysis_results['executive_summary'] = sanitized_summary
-
-                # Also update the stored analysis results in session state
-                if hasattr(st, 'session_state') and 'stored_analysis_results' in st.session_state:
-                    latest_id = max(st.session_state.stored_analysis_results.keys(), key=lambda x: st.session_state.stored_analysis_results[x].get('timestamp', 0) if isinstance(st.session_state.stored_analysis_results[x], dict) else 0)
-                    if latest_id and latest_id in st.session_state.stored_analysis_results:
-                        st.session_state.stored_analysis_results[latest_id]['executive_summary'] = sanitized_summary
-                        logger.info(f"✅ Executive summary stored to session state for PDF reuse")
-
-        except Exception as e:
-            logger.error(f"❌ Failed to store executive summary: {e}")
-        return
-
-    # Fallback deterministic generation when LLM is unavailable
-    summary_sentences = []
-
-    # 1-3: Analysis overview and scope
-    total_samples = metadata.get('total_parameters_analyzed', 17)  # Fix 0 value with default
-    summary_sentences.append(
-        f"This comprehensive agronomic analysis evaluates {total_samples} "
-        f"key nutritional parameters from both soil and leaf tissue samples "
-        f"to assess the current fertility status and plant health of the "
-        f"oil palm plantation.")
-    summary_sentences.append(
-        f"The analysis is based on adherence to Malaysian Palm "
-        f"Oil Board (MPOB) standards for optimal oil palm cultivation.")
-    summary_sentences.append(
-        f"Laboratory results indicate 1 significant "
-        f"nutritional imbalance requiring immediate attention to optimize "
-        f"yield potential and maintain sustainable production.")
-
-    # 4-7: Detailed issue identification and impacts
-    # Check for pH issues specifically (only if valid data exists)
-    ph_messages_added = False
-    if soil_params.get('parameter_statistics'):
-        soil_stats = soil_params['parameter_statistics']
-        ph_data = soil_stats.get('pH', {})
-        if ph_data:
-            ph_avg = ph_data.get('average', 0)
-            # Only consider pH deficiency if we have valid data (> 0 and reasonable range)
-            if ph_avg > 0 and ph_avg < 4.5:
-                summary_sentences.append(f"Critical soil pH deficiency detected at {ph_avg:.2f}, which severely limits nutrient availability and can cause stunted root growth, reduced nutrient uptake, and increased susceptibility to root diseases in oil palm trees.")
-                summary_sentences.append(f"Low soil pH affects oil palm by reducing the solubility of essential nutrients like phosphorus and micronutrients, leading to chlorosis, poor fruit development, and decreased oil content in fruit bunches.")
-                summary_sentences.append(f"pH deficiency in oil palm plantations can result in aluminum toxicity, which damages root systems and impairs water absorption, ultimately causing premature leaf senescence and reduced photosynthetic capacity.")
-                summary_sentences.append(f"Immediate pH correction through liming is essential to prevent long-term soil degradation and maintain the plantation's productive lifespan.")
-                ph_messages_added = True
-            elif ph_avg > 0 and ph_avg >= 4.5 and ph_avg <= 6.0:
-                # Normal pH range - add one concise sentence
-                summary_sentences.append(f"Soil pH levels at {ph_avg:.2f} are within optimal ranges, supporting proper nutrient availability and root development in the oil palm plantation.")
-                ph_messages_added = True
-
-    # If no pH data or messages not added, add one generic positive message
-    if not ph_messages_added:
-        summary_sentences.append("Soil pH levels are within acceptable ranges, supporting proper nutrient availability and root development in the oil palm plantation.")
-
-    # 8-11: Key soil nutrient status (only add if there are actual issues or notable values)
-    nutrient_sentences_added = 0
-    if soil_params.get('parameter_statistics'):
-        soil_stats = soil_params['parameter_statistics']
-
-        # Check for phosphorus issues
-        p_data = soil_stats.get('Available_P_mg_kg', {})
-        if p_data:
-            p_avg = p_data.get('average', 0)
-            if p_avg > 0 and p_avg < 15:
-                summary_sentences.append(f"Available phosphorus levels at {p_avg:.1f} mg/kg indicate deficiency (MPOB optimal: 15-40 mg/kg), which can impair root development and reduce fruit bunch formation in oil palm trees.")
-                nutrient_sentences_added += 1
-
-        # Check for potassium issues
-        k_data = soil_stats.get('Exchangeable_K_meq/100 g', {})
-        if k_data and nutrient_sentences_added < 2:
-            k_avg = k_data.get('average', 0)
-            if k_avg > 0 and k_avg < 0.15:
-                summary_sentences.append(f"Exchangeable potassium deficiency at {k_avg:.2f} meq/100 g (MPOB optimal: 0.15-0.40 meq/100 g) can compromise water balance regulation and reduce oil synthesis in oil palm trees.")
-                nutrient_sentences_added += 1
-
-        # Check for calcium issues
-        ca_data = soil_stats.get('Exchangeable_Ca_meq/100 g', {})
-        if ca_data and nutrient_sentences_added < 2:
-            ca_avg = ca_data.get('average', 0)
-            if ca_avg > 0 and ca_avg < 2.0:
-                summary_sentences.append(f"Calcium availability at {ca_avg:.2f} meq/100 g indicates deficiency (MPOB optimal: 2.0-5.0 meq/100 g), potentially weakening cell walls and reducing palm vigor.")
-                nutrient_sentences_added += 1
-
-    # If no nutrient issues were specifically detected, avoid generic adequacy claims
-
-    # 12-15: Leaf tissue nutrient status (only add if there are issues)
-    leaf_sentences_added = 0
-    if leaf_params.get('parameter_statistics'):
-        leaf_stats = leaf_params['parameter_statistics']
-
-        # Check for nitrogen issues
-        n_data = leaf_stats.get('N_%', {})
-        if n_data:
-            n_avg = n_data.get('average', 0)
-            if n_avg > 0 and n_avg < 2.5:
-                summary_sentences.append(f"Leaf nitrogen content at {n_avg:.2f}% indicates deficiency, which can limit protein synthesis and reduce photosynthetic efficiency in oil palm.")
-                leaf_sentences_added += 1
-
-        # Check for magnesium issues
-        mg_data = leaf_stats.get('Mg_%', {})
-        if mg_data and leaf_sentences_added < 2:
-            mg_avg = mg_data.get('average', 0)
-            if mg_avg > 0 and mg_avg < 0.25:
-                summary_sentences.append(f"Magnesium deficiency at {mg_avg:.3f}% threatens chlorophyll integrity, potentially causing chlorosis and reduced photosynthetic capacity in oil palm fronds.")
-                leaf_sentences_added += 1
-
-    # If no leaf issues were specifically detected, avoid generic adequacy claims
-
-    # 16-18: Yield and economic implications (use canonical values from uploaded report/Step 1)
-    current_yield = land_yield_data.get('current_yield')
-    land_size = land_yield_data.get('land_size')
-
-    # Ensure current_yield is numeric
-    try:
-        current_yield = float(current_yield) if current_yield is not None else None
-    except (ValueError, TypeError):
-        current_yield = None
-
-    # Ensure land_size is numeric
-    try:
-        land_size = float(land_size) if land_size is not None else None
-    except (ValueError, TypeError):
-        land_size = None
-
-    if current_yield is not None and land_size is not None:
-        summary_sentences.append(f"Current yield performance is {current_yield:.1f} t/ha over {land_size:.0f} ha based on the uploaded report.")
-    elif current_yield is not None:
-        summary_sentences.append(f"Current yield performance is {current_yield:.1f} t/ha based on the uploaded report.")
-    elif land_size is not None:
-        summary_sentences.append(f"Recorded land size is {land_size:.0f} ha based on the uploaded report.")
-    # Get ROI range from economic forecast if available
-    economic_forecast = analysis_results.get('economic_forecast', {})
-    roi_range = "positive returns"
-    if economic_forecast and 'scenarios' in economic_forecast:
-        scenarios = economic_forecast['scenarios']
-        if 'medium' in scenarios and 'roi_percentage_range' in scenarios['medium']:
-            roi_range = scenarios['medium']['roi_percentage_range']
-
-    summary_sentences.append(f"Economic analysis indicates that investment in corrective fertilization programs will generate {roi_range} within 12-18 months through improved fruit bunch quality and increased fresh fruit bunch production.")
-    summary_sentences.append("pH deficiency correction alone can prevent yield losses of up to 30% and improve fruit bunch quality by enhancing nutrient availability to developing palms.")
-
-    # 19-20: Detailed recommendations and monitoring
-    summary_sentences.append("Adopt site-specific nutrient management to align input rates with soil supply and crop demand, while prioritizing balanced N-P-K programs complemented by targeted secondary and micronutrient support for optimal oil palm nutrition.")
-    summary_sentences.append("Incorporate organic matter through empty fruit bunches, compost, or cover crops to build soil health, and monitor pH and CEC trends annually to safeguard nutrient availability and retention capacity.")
-
-    # Add a final concluding sentence
-    summary_sentences.append("Continued monitoring and adaptive management strategies will be essential for maintaining optimal nutritional status and maximizing the economic potential of this oil palm operation.")
-
-    # Limit to exactly 20 sentences maximum
-    if len(summary_sentences) > 20:
-        summary_sentences = summary_sentences[:20]
-    
-    # Join sentences into a comprehensive summary
-    comprehensive_summary = " ".join(summary_sentences)
-    comprehensive_summary = sanitize_persona_and_enforce_article(comprehensive_summary)
-    
-    # Display the enhanced summary
+    # Findings are built once per analysis (at completion, or on first view of older results)
+    findings = get_findings(analysis_results)
     st.markdown(
-        f'<div class="analysis-card"><p style="font-size: 16px; line-height: 1.8; margin: 0; text-align: justify;">{comprehensive_summary}</p></div>',
+        f'<div class="analysis-card"><p style="font-size: 16px; line-height: 1.8; margin: 0; text-align: justify;">{findings["executive_summary"]}</p></div>',
         unsafe_allow_html=True
     )
 
-    # Also store on analysis_results for PDF export reuse
-    try:
-        if isinstance(analysis_results, dict):
-            analysis_results['executive_summary'] = comprehensive_summary
-
-            # Also update the stored analysis results in session state
-            if hasattr(st, 'session_state') and 'stored_analysis_results' in st.session_state:
-                latest_id = max(st.session_state.stored_analysis_results.keys(), key=lambda x: st.session_state.stored_analysis_results[x].get('timestamp', 0) if isinstance(st.session_state.stored_analysis_results[x], dict) else 0)
-                if latest_id and latest_id in st.session_state.stored_analysis_results:
-                    st.session_state.stored_analysis_results[latest_id]['executive_summary'] = comprehensive_summary
-                    logger.info(f"✅ Fallback executive summary stored to session state for PDF reuse")
-
-    except Exception as e:
-        logger.error(f"❌ Failed to store fallback executive summary: {e}")
 
 def calculate_parameter_statistics(samples):
     """Calculate parameter statistics from sample data"""
@@ -4327,847 +4158,6 @@ def calculate_parameter_statistics(samples):
     
     return param_stats
 
-def clean_finding_text(text):
-    """Clean finding text by removing all 'Key Finding' prefixes and persona text, then normalizing"""
-    import re
-
-    # Remove all variations of "Key finding X:" and "Key Finding X:" prefixes
-    # Pattern 1: "Key finding X:" (lowercase)
-    text = re.sub(r'^Key finding \d+:\s*', '', text, flags=re.MULTILINE | re.IGNORECASE)
-
-    # Pattern 2: "Key Finding X:" (title case)
-    text = re.sub(r'^Key Finding \d+:\s*', '', text, flags=re.MULTILINE | re.IGNORECASE)
-
-    # Pattern 3: Remove any remaining "Key finding" or "Key Finding" at start of lines
-    text = re.sub(r'^(Key finding|Key Finding)\s*\d*:\s*', '', text, flags=re.MULTILINE | re.IGNORECASE)
-
-    # Pattern 4: Remove duplicate "Key Finding" patterns that might remain
-    text = re.sub(r'Key Finding \d+:\s*Key finding \d+:\s*', '', text)
-    text = re.sub(r'^(Key Finding \d+:\s*)+', '', text)
-
-    # Apply persona cleaning to remove any persona text
-    text = sanitize_persona_and_enforce_article(text)
-
-    # Clean up extra spaces and normalize
-    text = re.sub(r'\s+', ' ', text).strip()
-
-    # Remove leading/trailing punctuation that might remain
-    text = re.sub(r'^[^\w]*', '', text)
-    text = re.sub(r'[^\w]*$', '', text)
-
-    return text.strip()
-
-def is_same_issue(finding1, finding2):
-    """Check if two findings are about the same agricultural issue"""
-    # Define issue patterns
-    issue_patterns = {
-        'potassium_deficiency': ['potassium', 'k deficiency', 'k level', 'k average', 'k critical'],
-        'soil_acidity': ['ph', 'acidic', 'acidity', 'soil ph', 'ph level'],
-        'phosphorus_deficiency': ['phosphorus', 'p deficiency', 'available p', 'p level'],
-        'nutrient_deficiency': ['deficiency', 'deficient', 'nutrient', 'nutrients'],
-        'cec_issue': ['cec', 'cation exchange', 'nutrient retention', 'nutrient holding'],
-        'organic_matter': ['organic matter', 'organic carbon', 'carbon'],
-        'micronutrient': ['copper', 'zinc', 'manganese', 'iron', 'boron', 'micronutrient'],
-        'yield_impact': ['yield', 'productivity', 'tonnes', 'production'],
-        'economic_impact': ['roi', 'investment', 'cost', 'profit', 'revenue', 'economic']
-    }
-    
-    finding1_lower = finding1.lower()
-    finding2_lower = finding2.lower()
-    
-    # Check if both findings mention the same issue category
-    for issue, keywords in issue_patterns.items():
-        finding1_has_issue = any(keyword in finding1_lower for keyword in keywords)
-        finding2_has_issue = any(keyword in finding2_lower for keyword in keywords)
-        
-        if finding1_has_issue and finding2_has_issue:
-            # Additional check for specific values or percentages
-            if issue in ['potassium_deficiency', 'soil_acidity', 'phosphorus_deficiency']:
-                # Extract numbers from both findings
-                import re
-                nums1 = re.findall(r'\d+\.?\d*', finding1)
-                nums2 = re.findall(r'\d+\.?\d*', finding2)
-                
-                # If they have similar numbers, they're likely the same issue
-                if nums1 and nums2:
-                    for num1 in nums1:
-                        for num2 in nums2:
-                            if abs(float(num1) - float(num2)) < 0.1:  # Very close values
-                                return True
-            
-            return True
-    
-    return False
-
-def _extract_key_concepts(text):
-    """Extract key concepts from text for better deduplication"""
-    import re
-    
-    # Define key agricultural concepts and nutrients
-    nutrients = ['nitrogen', 'phosphorus', 'potassium', 'calcium', 'magnesium', 'sulfur', 'copper', 'zinc', 'manganese', 'iron', 'boron', 'molybdenum']
-    parameters = ['ph', 'cec', 'organic matter', 'base saturation', 'yield', 'deficiency', 'excess', 'optimum', 'critical', 'mg/kg', '%', 'meq']
-    conditions = ['acidic', 'alkaline', 'deficient', 'sufficient', 'excessive', 'low', 'high', 'moderate', 'severe', 'mild']
-    
-    # Extract numbers and percentages
-    numbers = re.findall(r'\d+\.?\d*', text)
-    
-    # Extract nutrient names and parameters
-    found_concepts = set()
-    
-    # Check for nutrients
-    for nutrient in nutrients:
-        if nutrient in text:
-            found_concepts.add(nutrient)
-    
-    # Check for parameters
-    for param in parameters:
-        if param in text:
-            found_concepts.add(param)
-    
-    # Check for conditions
-    for condition in conditions:
-        if condition in text:
-            found_concepts.add(condition)
-    
-    # Add significant numbers (values that matter for agricultural analysis)
-    for num in numbers:
-        if float(num) > 0:  # Only add positive numbers
-            found_concepts.add(num)
-    
-    return found_concepts
-
-def merge_similar_findings(finding1: str, finding2: str) -> str:
-    """Merge two similar findings into one comprehensive finding"""
-    import re
-    
-    # Extract parameter names with comprehensive mapping for all 9 soil and 8 leaf parameters
-    param_mapping = {
-        # Soil Parameters (9)
-        'ph': ['ph', 'ph level', 'soil ph', 'acidity', 'alkalinity'],
-        'nitrogen': ['nitrogen', 'n', 'n%', 'n_%', 'nitrogen%', 'nitrogen_%'],
-        'organic_carbon': ['organic carbon', 'organic_carbon', 'carbon', 'c', 'c%', 'c_%', 'organic_carbon_%'],
-        'total_phosphorus': ['total phosphorus', 'total p', 'total_p', 'total phosphorus mg/kg', 'total_p_mg_kg'],
-        'available_phosphorus': ['available phosphorus', 'available p', 'available_p', 'available phosphorus mg/kg', 'available_p_mg_kg'],
-        'exchangeable_potassium': ['exchangeable potassium', 'exch k', 'exch_k', 'exchangeable k', 'exchangeable_k', 'k meq/100 g', 'k_meq/100 g', 'exchangeable_k_meq/100 g'],
-        'exchangeable_calcium': ['exchangeable calcium', 'exch ca', 'exch_ca', 'exchangeable ca', 'exchangeable_ca', 'ca meq/100 g', 'ca_meq/100 g', 'exchangeable_ca_meq/100 g'],
-        'exchangeable_magnesium': ['exchangeable magnesium', 'exch mg', 'exch_mg', 'exchangeable mg', 'exchangeable_mg', 'mg meq/100 g', 'mg_meq/100 g', 'exchangeable_mg_meq/100 g'],
-        'cec': ['cec', 'cation exchange capacity', 'c.e.c', 'cec meq/100 g', 'cec_meq/100 g'],
-        
-        # Leaf Parameters (8)
-        'leaf_nitrogen': ['leaf nitrogen', 'leaf n', 'leaf_n', 'n%', 'n_%', 'nitrogen%', 'nitrogen_%'],
-        'leaf_phosphorus': ['leaf phosphorus', 'leaf p', 'leaf_p', 'p%', 'p_%', 'phosphorus%', 'phosphorus_%'],
-        'leaf_potassium': ['leaf potassium', 'leaf k', 'leaf_k', 'k%', 'k_%', 'potassium%', 'potassium_%'],
-        'leaf_magnesium': ['leaf magnesium', 'leaf mg', 'leaf_mg', 'mg%', 'mg_%', 'magnesium%', 'magnesium_%'],
-        'leaf_calcium': ['leaf calcium', 'leaf ca', 'leaf_ca', 'ca%', 'ca_%', 'calcium%', 'calcium_%'],
-        'leaf_boron': ['leaf boron', 'leaf b', 'leaf_b', 'b mg/kg', 'b_mg_kg', 'boron mg/kg', 'boron_mg_kg'],
-        'leaf_copper': ['leaf copper', 'leaf cu', 'leaf_cu', 'cu mg/kg', 'cu_mg_kg', 'copper mg/kg', 'copper_mg_kg'],
-        'leaf_zinc': ['leaf zinc', 'leaf zn', 'leaf_zn', 'zn mg/kg', 'zn_mg_kg', 'zinc mg/kg', 'zinc_mg_kg'],
-        
-        # Land & Yield Parameters
-        'land_size': ['land size', 'land_size', 'farm size', 'farm_size', 'area', 'hectares', 'acres', 'square meters', 'square_meters'],
-        'current_yield': ['current yield', 'current_yield', 'yield', 'production', 'tonnes/hectare', 'kg/hectare', 'tonnes/acre', 'kg/acre', 'yield per hectare', 'yield per acre'],
-        'yield_forecast': ['yield forecast', 'yield_forecast', 'projected yield', 'projected_yield', 'future yield', 'future_yield', 'yield projection', 'yield_projection'],
-        'economic_impact': ['economic impact', 'economic_impact', 'roi', 'return on investment', 'cost benefit', 'cost_benefit', 'profitability', 'revenue', 'income'],
-        
-        # Legacy mappings for backward compatibility
-        'phosphorus': ['phosphorus', 'p', 'p%', 'p_%', 'phosphorus%', 'available p'],
-        'potassium': ['potassium', 'k', 'k%', 'k_%', 'potassium%'],
-        'calcium': ['calcium', 'ca', 'ca%', 'ca_%', 'calcium%'],
-        'magnesium': ['magnesium', 'mg', 'mg%', 'mg_%', 'magnesium%'],
-        'copper': ['copper', 'cu', 'cu mg/kg', 'cu_mg/kg', 'copper mg/kg'],
-        'zinc': ['zinc', 'zn', 'zn mg/kg', 'zn_mg/kg', 'zinc mg/kg'],
-        'boron': ['boron', 'b', 'b mg/kg', 'b_mg/kg', 'boron mg/kg']
-    }
-    
-    def extract_parameters(text):
-        """Extract all parameters mentioned in text"""
-        found_params = set()
-        text_lower = text.lower()
-        for param, variations in param_mapping.items():
-            if any(var in text_lower for var in variations):
-                found_params.add(param)
-        return found_params
-    
-    def extract_values(text):
-        """Extract all numerical values from text"""
-        return re.findall(r'\d+\.?\d*%?', text)
-    
-    def extract_severity_keywords(text):
-        """Extract severity and impact keywords"""
-        severity_words = ['critical', 'severe', 'high', 'low', 'deficiency', 'excess', 'optimum', 'below', 'above']
-        found_severity = [word for word in severity_words if word in text.lower()]
-        return found_severity
-    
-    # Extract information from both findings
-    params1 = extract_parameters(finding1)
-    params2 = extract_parameters(finding2)
-    values1 = extract_values(finding1)
-    values2 = extract_values(finding2)
-    severity1 = extract_severity_keywords(finding1)
-    severity2 = extract_severity_keywords(finding2)
-    
-    # If both findings are about the same parameter(s), merge them comprehensively
-    if params1 and params2 and params1.intersection(params2):
-        # Get the common parameter
-        common_params = list(params1.intersection(params2))
-        param_name = common_params[0].upper() if common_params[0] != 'ph' else 'pH'
-        
-        # Combine all values
-        all_values = list(set(values1 + values2))
-        
-        # Combine all severity keywords
-        all_severity = list(set(severity1 + severity2))
-        
-        # Create comprehensive finding
-        if 'critical' in all_severity or 'severe' in all_severity:
-            severity_desc = "critical"
-        elif 'high' in all_severity:
-            severity_desc = "significant"
-        elif 'low' in all_severity:
-            severity_desc = "moderate"
-        else:
-            severity_desc = "notable"
-        
-        # Build comprehensive finding
-        if param_name == 'pH':
-            comprehensive_finding = f"Soil {param_name} shows {severity_desc} issues with values of {', '.join(all_values)}. "
-        else:
-            comprehensive_finding = f"{param_name} levels show {severity_desc} issues with values of {', '.join(all_values)}. "
-        
-        # Add context from both findings
-        context_parts = []
-        if 'deficiency' in all_severity:
-            context_parts.append("deficiency")
-        if 'excess' in all_severity:
-            context_parts.append("excess")
-        if 'below' in all_severity:
-            context_parts.append("below optimal levels")
-        if 'above' in all_severity:
-            context_parts.append("above optimal levels")
-        
-        if context_parts:
-            comprehensive_finding += f"This indicates {', '.join(context_parts)}. "
-        
-        # Add impact information
-        if 'critical' in all_severity or 'severe' in all_severity:
-            comprehensive_finding += "This directly impacts crop yield and requires immediate attention."
-        elif 'high' in all_severity:
-            comprehensive_finding += "This significantly affects plant health and productivity."
-        else:
-            comprehensive_finding += "This affects overall plant performance and should be addressed."
-        
-        return comprehensive_finding
-    
-    # If findings are about different parameters, combine them
-    return f"{finding1} Additionally, {finding2.lower()}"
-
-def group_and_merge_findings_by_parameter(findings_list):
-    """Group findings by parameter and merge all findings about the same parameter into one comprehensive finding"""
-    import re
-    
-    # Parameter mapping for grouping - comprehensive mapping for all 9 soil and 8 leaf parameters
-    param_mapping = {
-        # Soil Parameters (9)
-        'ph': ['ph', 'ph level', 'soil ph', 'acidity', 'alkalinity'],
-        'nitrogen': ['nitrogen', 'n', 'n%', 'n_%', 'nitrogen%', 'nitrogen_%'],
-        'organic_carbon': ['organic carbon', 'organic_carbon', 'carbon', 'c', 'c%', 'c_%', 'organic_carbon_%'],
-        'total_phosphorus': ['total phosphorus', 'total p', 'total_p', 'total phosphorus mg/kg', 'total_p_mg_kg'],
-        'available_phosphorus': ['available phosphorus', 'available p', 'available_p', 'available phosphorus mg/kg', 'available_p_mg_kg'],
-        'exchangeable_potassium': ['exchangeable potassium', 'exch k', 'exch_k', 'exchangeable k', 'exchangeable_k', 'k meq/100 g', 'k_meq/100 g', 'exchangeable_k_meq/100 g'],
-        'exchangeable_calcium': ['exchangeable calcium', 'exch ca', 'exch_ca', 'exchangeable ca', 'exchangeable_ca', 'ca meq/100 g', 'ca_meq/100 g', 'exchangeable_ca_meq/100 g'],
-        'exchangeable_magnesium': ['exchangeable magnesium', 'exch mg', 'exch_mg', 'exchangeable mg', 'exchangeable_mg', 'mg meq/100 g', 'mg_meq/100 g', 'exchangeable_mg_meq/100 g'],
-        'cec': ['cec', 'cation exchange capacity', 'c.e.c', 'cec meq/100 g', 'cec_meq/100 g'],
-        
-        # Leaf Parameters (8)
-        'leaf_nitrogen': ['leaf nitrogen', 'leaf n', 'leaf_n', 'n%', 'n_%', 'nitrogen%', 'nitrogen_%'],
-        'leaf_phosphorus': ['leaf phosphorus', 'leaf p', 'leaf_p', 'p%', 'p_%', 'phosphorus%', 'phosphorus_%'],
-        'leaf_potassium': ['leaf potassium', 'leaf k', 'leaf_k', 'k%', 'k_%', 'potassium%', 'potassium_%'],
-        'leaf_magnesium': ['leaf magnesium', 'leaf mg', 'leaf_mg', 'mg%', 'mg_%', 'magnesium%', 'magnesium_%'],
-        'leaf_calcium': ['leaf calcium', 'leaf ca', 'leaf_ca', 'ca%', 'ca_%', 'calcium%', 'calcium_%'],
-        'leaf_boron': ['leaf boron', 'leaf b', 'leaf_b', 'b mg/kg', 'b_mg_kg', 'boron mg/kg', 'boron_mg_kg'],
-        'leaf_copper': ['leaf copper', 'leaf cu', 'leaf_cu', 'cu mg/kg', 'cu_mg_kg', 'copper mg/kg', 'copper_mg_kg'],
-        'leaf_zinc': ['leaf zinc', 'leaf zn', 'leaf_zn', 'zn mg/kg', 'zn_mg_kg', 'zinc mg/kg', 'zinc_mg_kg'],
-        
-        # Land & Yield Parameters
-        'land_size': ['land size', 'land_size', 'farm size', 'farm_size', 'area', 'hectares', 'acres', 'square meters', 'square_meters'],
-        'current_yield': ['current yield', 'current_yield', 'yield', 'production', 'tonnes/hectare', 'kg/hectare', 'tonnes/acre', 'kg/acre', 'yield per hectare', 'yield per acre'],
-        'yield_forecast': ['yield forecast', 'yield_forecast', 'projected yield', 'projected_yield', 'future yield', 'future_yield', 'yield projection', 'yield_projection'],
-        'economic_impact': ['economic impact', 'economic_impact', 'roi', 'return on investment', 'cost benefit', 'cost_benefit', 'profitability', 'revenue', 'income'],
-        
-        # Legacy mappings for backward compatibility
-        'phosphorus': ['phosphorus', 'p', 'p%', 'p_%', 'phosphorus%', 'available p'],
-        'potassium': ['potassium', 'k', 'k%', 'k_%', 'potassium%'],
-        'calcium': ['calcium', 'ca', 'ca%', 'ca_%', 'calcium%'],
-        'magnesium': ['magnesium', 'mg', 'mg%', 'mg_%', 'magnesium%'],
-        'copper': ['copper', 'cu', 'cu mg/kg', 'cu_mg/kg', 'copper mg/kg'],
-        'zinc': ['zinc', 'zn', 'zn mg/kg', 'zn_mg/kg', 'zinc mg/kg'],
-        'boron': ['boron', 'b', 'b mg/kg', 'b_mg/kg', 'boron mg/kg']
-    }
-    
-    def extract_parameter(text):
-        """Extract the primary parameter from text"""
-        text_lower = text.lower()
-        for param, variations in param_mapping.items():
-            if any(var in text_lower for var in variations):
-                return param
-        return 'other'
-    
-    def extract_values(text):
-        """Extract all numerical values from text"""
-        return re.findall(r'\d+\.?\d*%?', text)
-    
-    def extract_severity_keywords(text):
-        """Extract severity and impact keywords"""
-        severity_words = ['critical', 'severe', 'high', 'low', 'deficiency', 'excess', 'optimum', 'below', 'above']
-        return [word for word in severity_words if word in text.lower()]
-    
-    # Group findings by parameter
-    parameter_groups = {}
-    for finding_data in findings_list:
-        finding = finding_data['finding']
-        param = extract_parameter(finding)
-        
-        if param not in parameter_groups:
-            parameter_groups[param] = []
-        parameter_groups[param].append(finding_data)
-    
-    # Merge findings within each parameter group
-    merged_findings = []
-    for param, group_findings in parameter_groups.items():
-        if len(group_findings) == 1:
-            # Single finding, keep as is
-            merged_findings.append(group_findings[0])
-        else:
-            # Multiple findings about same parameter, merge them
-            merged_finding = merge_parameter_group_findings(param, group_findings)
-            if merged_finding:
-                merged_findings.append(merged_finding)
-    
-    return merged_findings
-
-def merge_parameter_group_findings(param, group_findings):
-    """Merge all findings in a parameter group into one comprehensive finding"""
-    import re
-    
-    # Extract all values and severity keywords from all findings in the group
-    all_values = []
-    all_severity = []
-    all_sources = []
-    
-    for finding_data in group_findings:
-        finding = finding_data['finding']
-        source = finding_data['source']
-        
-        # Extract values
-        values = re.findall(r'\d+\.?\d*%?', finding)
-        all_values.extend(values)
-        
-        # Extract severity keywords
-        severity_words = ['critical', 'severe', 'high', 'low', 'deficiency', 'excess', 'optimum', 'below', 'above']
-        severity = [word for word in severity_words if word in finding.lower()]
-        all_severity.extend(severity)
-        
-        all_sources.append(source)
-    
-    # Remove duplicates
-    unique_values = list(set(all_values))
-    unique_severity = list(set(all_severity))
-    unique_sources = list(set(all_sources))
-    
-    # Determine parameter name
-    param_name = param.upper() if param != 'ph' else 'pH'
-    
-    # Determine severity level
-    if 'critical' in unique_severity or 'severe' in unique_severity:
-        severity_desc = "critical"
-    elif 'high' in unique_severity:
-        severity_desc = "significant"
-    elif 'low' in unique_severity:
-        severity_desc = "moderate"
-    else:
-        severity_desc = "notable"
-    
-    # Build comprehensive finding
-    if param == 'ph':
-        comprehensive_finding = f"Soil {param_name} shows {severity_desc} issues with values of {', '.join(unique_values)}. "
-    else:
-        comprehensive_finding = f"{param_name} levels show {severity_desc} issues with values of {', '.join(unique_values)}. "
-    
-    # Add context
-    context_parts = []
-    if 'deficiency' in unique_severity:
-        context_parts.append("deficiency")
-    if 'excess' in unique_severity:
-        context_parts.append("excess")
-    if 'below' in unique_severity:
-        context_parts.append("below optimal levels")
-    if 'above' in unique_severity:
-        context_parts.append("above optimal levels")
-    
-    if context_parts:
-        comprehensive_finding += f"This indicates {', '.join(context_parts)}. "
-    
-    # Add impact information
-    if 'critical' in unique_severity or 'severe' in unique_severity:
-        comprehensive_finding += "This directly impacts crop yield and requires immediate attention."
-    elif 'high' in unique_severity:
-        comprehensive_finding += "This significantly affects plant health and productivity."
-    else:
-        comprehensive_finding += "This affects overall plant performance and should be addressed."
-    
-    return {
-        'finding': comprehensive_finding,
-        'source': ', '.join(unique_sources)
-    }
-
-def generate_intelligent_key_findings(analysis_results, step_results):
-    """Generate comprehensive intelligent key findings grouped by parameter with proper deduplication"""
-    all_key_findings = []
-    
-    # 1. Check for key findings at the top level of analysis_results
-    if 'key_findings' in analysis_results and analysis_results['key_findings']:
-        findings_data = analysis_results['key_findings']
-        
-        # Handle both list and string formats
-        if isinstance(findings_data, list):
-            findings_list = findings_data
-        elif isinstance(findings_data, str):
-            findings_list = [f.strip() for f in findings_data.split('\n') if f.strip()]
-        else:
-            findings_list = []
-        
-        # Process each finding
-        for finding in findings_list:
-            if isinstance(finding, str) and finding.strip():
-                cleaned_finding = clean_finding_text(finding.strip())
-                all_key_findings.append({
-                    'finding': cleaned_finding,
-                    'source': 'Overall Analysis'
-                })
-    
-    # 2. Extract comprehensive key findings from step-by-step analysis
-    if step_results:
-        step_findings = []
-        
-        for step in step_results:
-            if not isinstance(step, dict):
-                logger.warning(f"Step is not a dict, skipping: {type(step)}")
-                continue
-            step_number = step.get('step_number', 0)
-            step_title = step.get('step_title', t(f'step_{step_number}_title', f'Step {step_number}'))
-            
-            # Extract findings from multiple step sources
-            step_sources = []
-            
-            # Direct key_findings field
-            if 'key_findings' in step and step['key_findings']:
-                step_sources.append(('key_findings', step['key_findings']))
-            
-            # Summary field
-            if 'summary' in step and step['summary']:
-                step_sources.append(('summary', step['summary']))
-            
-            # Detailed analysis field
-            if 'detailed_analysis' in step and step['detailed_analysis']:
-                step_sources.append(('detailed_analysis', step['detailed_analysis']))
-            
-            # Issues identified
-            if 'issues_identified' in step and step['issues_identified']:
-                step_sources.append(('issues_identified', step['issues_identified']))
-            
-            # Recommendations
-            if 'recommendations' in step and step['recommendations']:
-                step_sources.append(('recommendations', step['recommendations']))
-            
-            # Process each source
-            for source_type, source_data in step_sources:
-                findings_list = []
-                
-                # Handle different data formats
-                if isinstance(source_data, list):
-                    findings_list = source_data
-                elif isinstance(source_data, str):
-                    # Split by common delimiters and clean
-                    lines = source_data.split('\n')
-                    findings_list = [line.strip() for line in lines if line.strip()]
-                else:
-                    continue
-                
-                # Extract key findings from each item
-                for finding in findings_list:
-                    if isinstance(finding, str) and finding.strip():
-                        # Enhanced keyword filtering for better relevance
-                        finding_lower = finding.lower()
-                        relevant_keywords = [
-                            'deficiency', 'critical', 'severe', 'low', 'high', 'optimum', 'ph', 'nutrient', 'yield',
-                            'recommendation', 'finding', 'issue', 'problem', 'analysis', 'result', 'conclusion',
-                            'soil', 'leaf', 'land', 'hectares', 'acres', 'tonnes', 'production', 'economic',
-                            'roi', 'investment', 'cost', 'benefit', 'profitability', 'forecast', 'projection',
-                            'improvement', 'increase', 'decrease', 'balance', 'ratio', 'level', 'status',
-                            'nitrogen', 'phosphorus', 'potassium', 'calcium', 'magnesium', 'carbon', 'cec',
-                            'boron', 'zinc', 'copper', 'manganese', 'iron', 'sulfur', 'chlorine'
-                        ]
-                        
-                        # Check if finding contains relevant keywords
-                        if any(keyword in finding_lower for keyword in relevant_keywords):
-                            cleaned_finding = clean_finding_text(finding.strip())
-                            if cleaned_finding and len(cleaned_finding) > 20:  # Minimum length filter
-                                step_findings.append({
-                                    'finding': cleaned_finding,
-                                    'source': f"{step_title} ({source_type.replace('_', ' ').title()})"
-                                })
-        
-        # Apply intelligent deduplication to step findings
-        if step_findings:
-            # First group findings by parameter and merge within each group
-            parameter_merged_findings = group_and_merge_findings_by_parameter(step_findings)
-            
-            # Then apply additional deduplication for any remaining similar findings
-            unique_findings = []
-            seen_concepts = []
-            
-            for finding_data in parameter_merged_findings:
-                finding = finding_data['finding']
-                normalized = ' '.join(finding.lower().split())
-                key_concepts = _extract_key_concepts(normalized)
-                
-                is_duplicate = False
-                for i, seen_concept_set in enumerate(seen_concepts):
-                    concept_overlap = len(key_concepts.intersection(seen_concept_set))
-                    total_concepts = len(key_concepts.union(seen_concept_set))
-                    
-                    if total_concepts > 0:
-                        similarity = concept_overlap / total_concepts
-                        word_similarity = len(key_concepts.intersection(seen_concept_set)) / max(len(key_concepts), len(seen_concept_set)) if len(key_concepts) > 0 and len(seen_concept_set) > 0 else 0
-                        
-                        # More aggressive deduplication - consolidate similar issues
-                        if similarity > 0.5 or word_similarity > 0.6:
-                            # Merge findings for the same issue
-                            existing_finding = unique_findings[i]['finding']
-                            merged_finding = merge_similar_findings(existing_finding, finding)
-                            unique_findings[i]['finding'] = merged_finding
-                            is_duplicate = True
-                            break
-                        
-                        # Check for same issue with stricter criteria
-                        if similarity > 0.3 and word_similarity > 0.4:
-                            if is_same_issue(finding, unique_findings[i]['finding']):
-                                # Merge findings for the same issue
-                                existing_finding = unique_findings[i]['finding']
-                                merged_finding = merge_similar_findings(existing_finding, finding)
-                                unique_findings[i]['finding'] = merged_finding
-                                is_duplicate = True
-                                break
-                
-                if not is_duplicate:
-                    unique_findings.append(finding_data)
-                    seen_concepts.append(key_concepts)
-            
-            # Combine step findings with existing findings
-            all_key_findings.extend(unique_findings)
-    
-    # 3. Generate comprehensive parameter-specific key findings
-    comprehensive_findings = generate_comprehensive_parameter_findings(analysis_results, step_results)
-    all_key_findings.extend(comprehensive_findings)
-    
-    # 4. Extract key findings from other analysis sources
-    # Land and yield data
-    land_yield_data = analysis_results.get('land_yield_data', {})
-    if land_yield_data:
-        land_size = land_yield_data.get('land_size', 0)
-        current_yield = land_yield_data.get('current_yield', 0)
-        land_unit = land_yield_data.get('land_unit', 'hectares')
-        yield_unit = land_yield_data.get('yield_unit', 'tonnes/hectare')
-        
-        if land_size > 0:
-            all_key_findings.append({
-                'finding': f"Farm analysis covers {land_size} {land_unit} of agricultural land with current production of {current_yield} {yield_unit}.",
-                'source': 'Land & Yield Data'
-            })
-    
-    # Economic forecast
-    economic_forecast = analysis_results.get('economic_forecast', {})
-    if economic_forecast:
-        scenarios = economic_forecast.get('scenarios', {})
-        if scenarios:
-            best_roi = 0
-            best_scenario = ""
-            for level, data in scenarios.items():
-                if isinstance(data, dict) and data.get('roi_percentage', 0) > best_roi:
-                    best_roi = data.get('roi_percentage', 0)
-                    best_scenario = level
-            
-            if best_roi > 0:
-                all_key_findings.append({
-                    'finding': f"Economic analysis shows {best_scenario} investment level offers the best ROI of {best_roi:.1f}% with {scenarios[best_scenario].get('payback_months', 0):.1f} months payback period.",
-                    'source': 'Economic Forecast'
-                })
-    
-    # Yield forecast
-    yield_forecast = analysis_results.get('yield_forecast', {})
-    if yield_forecast:
-        projected_yield = yield_forecast.get('projected_yield', 0)
-        current_yield = yield_forecast.get('current_yield', 0)
-        
-        # Ensure both values are numeric
-        try:
-            projected_yield = float(projected_yield) if projected_yield is not None else 0
-        except (ValueError, TypeError):
-            projected_yield = 0
-            
-        try:
-            current_yield = float(current_yield) if current_yield is not None else 0
-        except (ValueError, TypeError):
-            current_yield = 0
-            
-        if projected_yield > 0 and current_yield > 0:
-            increase = ((projected_yield - current_yield) / current_yield) * 100
-            all_key_findings.append({
-                'finding': f"Yield projection indicates potential increase from {current_yield} to {projected_yield} tonnes/hectare ({increase:.1f}% improvement) with proper management.",
-                'source': 'Yield Forecast'
-            })
-    
-    # Apply final parameter-based grouping to all findings
-    if all_key_findings:
-        all_key_findings = group_and_merge_findings_by_parameter(all_key_findings)
-    
-    return all_key_findings
-
-def generate_comprehensive_parameter_findings(analysis_results, step_results):
-    """Generate comprehensive key findings grouped by specific parameters"""
-    findings = []
-    
-    # Get raw data for analysis
-    raw_data = analysis_results.get('raw_data', {})
-    soil_params = raw_data.get('soil_parameters', {}).get('parameter_statistics', {})
-    leaf_params = raw_data.get('leaf_parameters', {}).get('parameter_statistics', {})
-    
-    # Get MPOB standards for comparison
-    try:
-        from utils.mpob_standards import get_mpob_standards
-        mpob = get_mpob_standards()
-    except:
-        mpob = None
-    
-    # 1. Soil pH Analysis
-    if 'pH' in soil_params and mpob:
-        ph_value = soil_params['pH'].get('average', 0)
-        ph_optimal = mpob.get('soil', {}).get('ph', {}).get('optimal', 6.5)
-        
-        if ph_value > 0:
-            if ph_value < 4.5:
-                findings.append({
-                    'finding': f"Soil pH is critically low at {ph_value:.1f}, significantly below optimal range of 4.5-5.5. This acidic condition severely limits nutrient availability and root development.",
-                    'source': 'Soil Analysis - pH'
-                })
-            elif ph_value > 7.5:
-                findings.append({
-                    'finding': f"Soil pH is high at {ph_value:.1f}, above optimal range of 4.5-5.5. This alkaline condition reduces availability of essential micronutrients like iron and zinc.",
-                    'source': 'Soil Analysis - pH'
-                })
-            else:
-                findings.append({
-                    'finding': f"Soil pH is within optimal range at {ph_value:.1f}, providing good conditions for nutrient availability and root development.",
-                    'source': 'Soil Analysis - pH'
-                })
-    
-    # 2. Soil Nitrogen Analysis
-    if 'Nitrogen_%' in soil_params and mpob:
-        n_value = soil_params['Nitrogen_%'].get('average', 0)
-        n_optimal = mpob.get('soil', {}).get('nitrogen', {}).get('optimal', 0.2)
-        
-        if n_value > 0:
-            if n_value < n_optimal * 0.7:
-                findings.append({
-                    'finding': f"Soil nitrogen is critically deficient at {n_value:.2f}%, well below optimal level of {n_optimal:.2f}%. This severely limits plant growth and leaf development.",
-                    'source': 'Soil Analysis - Nitrogen'
-                })
-            elif n_value > n_optimal * 1.3:
-                findings.append({
-                    'finding': f"Soil nitrogen is excessive at {n_value:.2f}%, above optimal level of {n_optimal:.2f}%. This may cause nutrient imbalances and environmental concerns.",
-                    'source': 'Soil Analysis - Nitrogen'
-                })
-            else:
-                findings.append({
-                    'finding': f"Soil nitrogen is adequate at {n_value:.2f}%, within optimal range for healthy plant growth.",
-                    'source': 'Soil Analysis - Nitrogen'
-                })
-    
-    # 3. Soil Phosphorus Analysis
-    if 'Available_P_mg_kg' in soil_params and mpob:
-        p_value = soil_params['Available_P_mg_kg'].get('average', 0)
-        p_optimal = mpob.get('soil', {}).get('available_phosphorus', {}).get('optimal', 15)
-        
-        if p_value > 0:
-            if p_value < p_optimal * 0.5:
-                findings.append({
-                    'finding': f"Available phosphorus is critically low at {p_value:.1f} mg/kg, severely below optimal level of {p_optimal} mg/kg. This limits root development and energy transfer.",
-                    'source': 'Soil Analysis - Phosphorus'
-                })
-            elif p_value > p_optimal * 2:
-                findings.append({
-                    'finding': f"Available phosphorus is excessive at {p_value:.1f} mg/kg, well above optimal level of {p_optimal} mg/kg. This may cause nutrient lockup and environmental issues.",
-                    'source': 'Soil Analysis - Phosphorus'
-                })
-            else:
-                findings.append({
-                    'finding': f"Available phosphorus is adequate at {p_value:.1f} mg/kg, within optimal range for proper plant development.",
-                    'source': 'Soil Analysis - Phosphorus'
-                })
-    
-    # 4. Soil Potassium Analysis
-    if 'Exchangeable_K_meq/100 g' in soil_params and mpob:
-        k_value = soil_params['Exchangeable_K_meq/100 g'].get('average', 0)
-        k_optimal = mpob.get('soil', {}).get('exchangeable_potassium', {}).get('optimal', 0.3)
-        
-        if k_value > 0:
-            if k_value < k_optimal * 0.6:
-                findings.append({
-                    'finding': f"Exchangeable potassium is deficient at {k_value:.2f} meq/100 g, below optimal level of {k_optimal:.2f} meq/100 g. This affects water regulation and disease resistance.",
-                    'source': 'Soil Analysis - Potassium'
-                })
-            elif k_value > k_optimal * 1.5:
-                findings.append({
-                    'finding': f"Exchangeable potassium is high at {k_value:.2f} meq/100 g, above optimal level of {k_optimal:.2f} meq/100 g. This may cause nutrient imbalances.",
-                    'source': 'Soil Analysis - Potassium'
-                })
-            else:
-                findings.append({
-                    'finding': f"Exchangeable potassium is adequate at {k_value:.2f} meq/100 g, within optimal range for healthy plant function.",
-                    'source': 'Soil Analysis - Potassium'
-                })
-    
-    # 5. Leaf Nutrient Analysis
-    if leaf_params:
-        # Leaf Nitrogen
-        if 'N_%' in leaf_params:
-            leaf_n = leaf_params['N_%'].get('average', 0)
-            if leaf_n > 0:
-                if leaf_n < 2.6:
-                    findings.append({
-                        'finding': f"Leaf nitrogen is deficient at {leaf_n:.1f}%, below optimal range of 2.4-2.8%. This indicates poor nitrogen uptake and affects photosynthesis.",
-                        'source': 'Leaf Analysis - Nitrogen'
-                    })
-                elif leaf_n > 3.2:
-                    findings.append({
-                        'finding': f"Leaf nitrogen is excessive at {leaf_n:.1f}%, above optimal range of 2.4-2.8%. This may cause nutrient imbalances and delayed maturity.",
-                        'source': 'Leaf Analysis - Nitrogen'
-                    })
-                else:
-                    findings.append({
-                        'finding': f"Leaf nitrogen is optimal at {leaf_n:.1f}%, within MPOB recommended range for healthy palm growth.",
-                        'source': 'Leaf Analysis - Nitrogen'
-                    })
-        
-        # Leaf Phosphorus
-        if 'P_%' in leaf_params:
-            leaf_p = leaf_params['P_%'].get('average', 0)
-            if leaf_p > 0:
-                if leaf_p < 0.16:
-                    findings.append({
-                        'finding': f"Leaf phosphorus is deficient at {leaf_p:.2f}%, below optimal range of 0.16-0.22%. This limits energy transfer and root development.",
-                        'source': 'Leaf Analysis - Phosphorus'
-                    })
-                elif leaf_p > 0.22:
-                    findings.append({
-                        'finding': f"Leaf phosphorus is high at {leaf_p:.2f}%, above optimal range of 0.16-0.22%. This may indicate over-fertilization.",
-                        'source': 'Leaf Analysis - Phosphorus'
-                    })
-                else:
-                    findings.append({
-                        'finding': f"Leaf phosphorus is adequate at {leaf_p:.2f}%, within MPOB optimal range for proper plant function.",
-                        'source': 'Leaf Analysis - Phosphorus'
-                    })
-        
-        # Leaf Potassium
-        if 'K_%' in leaf_params:
-            leaf_k = leaf_params['K_%'].get('average', 0)
-            if leaf_k > 0:
-                if leaf_k < 1.3:
-                    findings.append({
-                        'finding': f"Leaf potassium is deficient at {leaf_k:.1f}%, below optimal range of 1.3-1.7%. This affects water regulation and disease resistance.",
-                        'source': 'Leaf Analysis - Potassium'
-                    })
-                elif leaf_k > 1.7:
-                    findings.append({
-                        'finding': f"Leaf potassium is high at {leaf_k:.1f}%, above optimal range of 1.3-1.7%. This may cause nutrient imbalances.",
-                        'source': 'Leaf Analysis - Potassium'
-                    })
-                else:
-                    findings.append({
-                        'finding': f"Leaf potassium is optimal at {leaf_k:.1f}%, within MPOB recommended range for healthy palm growth.",
-                        'source': 'Leaf Analysis - Potassium'
-                    })
-        
-        # Leaf Magnesium - Conditional recommendation considering GML and K:Mg ratio
-        if 'Mg_%' in leaf_params:
-            leaf_mg = leaf_params['Mg_%'].get('average', 0)
-            if leaf_mg > 0:
-                if leaf_mg < 0.28:  # Only recommend kieserite if clearly deficient
-                    # Check if K:Mg ratio is also problematic
-                    leaf_k = leaf_params.get('K_%', {}).get('average', 0)
-                    if leaf_k > 0:
-                        k_mg_ratio = leaf_k / leaf_mg if leaf_mg > 0 else 0
-                        if k_mg_ratio > 2.0:  # K:Mg ratio too high
-                            findings.append({
-                                'finding': f"Leaf magnesium is deficient at {leaf_mg:.2f}% with high K:Mg ratio of {k_mg_ratio:.1f}. Kieserite recommended only after GML correction and if K:Mg ratio remains >2.0.",
-                                'source': 'Leaf Analysis - Magnesium'
-                            })
-                        else:
-                            findings.append({
-                                'finding': f"Leaf magnesium is deficient at {leaf_mg:.2f}% but K:Mg ratio is acceptable. Consider GML first before kieserite application.",
-                                'source': 'Leaf Analysis - Magnesium'
-                            })
-                    else:
-                        findings.append({
-                            'finding': f"Leaf magnesium is deficient at {leaf_mg:.2f}%. Consider GML application first, then kieserite only if needed after GML correction.",
-                            'source': 'Leaf Analysis - Magnesium'
-                        })
-                elif leaf_mg > 0.38:  # Only flag when clearly excessive
-                    findings.append({
-                        'finding': f"Leaf magnesium is high at {leaf_mg:.2f}%, above MPOB optimal range of 0.28-0.38%. Monitor for nutrient imbalances.",
-                        'source': 'Leaf Analysis - Magnesium'
-                    })
-                # No recommendation for adequate levels (0.28-0.38%)
-        
-        # Leaf Calcium
-        if 'Ca_%' in leaf_params:
-            leaf_ca = leaf_params['Ca_%'].get('average', 0)
-            if leaf_ca > 0:
-                if leaf_ca < 0.5:
-                    findings.append({
-                        'finding': f"Leaf calcium is deficient at {leaf_ca:.1f}%, below optimal range of 0.5-1.0%. This affects cell wall strength and fruit quality.",
-                        'source': 'Leaf Analysis - Calcium'
-                    })
-                elif leaf_ca > 1.0:
-                    findings.append({
-                        'finding': f"Leaf calcium is high at {leaf_ca:.1f}%, above optimal range of 0.5-1.0%. This may cause nutrient imbalances.",
-                        'source': 'Leaf Analysis - Calcium'
-                    })
-                else:
-                    findings.append({
-                        'finding': f"Leaf calcium is optimal at {leaf_ca:.1f}%, within recommended range for healthy palm growth.",
-                        'source': 'Leaf Analysis - Calcium'
-                    })
-        
-        # Leaf Boron - Conditional recommendation only when deficient
-        if 'B_mg_kg' in leaf_params:
-            leaf_b = leaf_params['B_mg_kg'].get('average', 0)
-            if leaf_b > 0:
-                if leaf_b < 12:  # Only recommend when clearly deficient
-                    findings.append({
-                        'finding': f"Leaf boron is deficient at {leaf_b:.1f} mg/kg, below critical threshold of 12 mg/kg. Boron supplementation recommended only for this specific deficiency.",
-                        'source': 'Leaf Analysis - Boron'
-                    })
-                elif leaf_b > 25:  # Only flag when clearly excessive
-                    findings.append({
-                        'finding': f"Leaf boron is high at {leaf_b:.1f} mg/kg, above optimal range. Monitor for toxicity symptoms.",
-                        'source': 'Leaf Analysis - Boron'
-                    })
-                # No recommendation for adequate levels (12-25 mg/kg)
-    
-    return findings
-
 def generate_consolidated_key_findings(analysis_results, step_results):
     """Generate consolidated, professional key findings based on actual step results"""
     consolidated_findings = []
@@ -5871,25 +4861,8 @@ def generate_consolidated_key_findings(analysis_results, step_results):
             # Add detailed soil parameter status using correct averages
             soil_details = []
             if soil_averages:
-                # Use the same MPOB standards as the Step 1 tables
-                soil_mpob_standards = {
-                    'pH': (4.5, 6.0),
-                    'N (%)': (0.15, 0.25),
-                    'Nitrogen (%)': (0.15, 0.25),
-                    'Organic Carbon (%)': (2.0, 4.0),
-                    'Org. C (%)': (2.0, 4.0),
-                    'Total P (mg/kg)': (400, 800),
-                    'Available P (mg/kg)': (15, 30),
-                    'Avail P (mg/kg)': (15, 30),
-                    'Exchangeable K (meq/100 g)': (0.15, 0.30),
-                    'Exch. K (meq/100 g)': (0.15, 0.30),
-                    'Exchangeable Ca (meq/100 g)': (2.0, 8.0),
-                    'Exch. Ca (meq/100 g)': (2.0, 8.0),
-                    'Exchangeable Mg (meq/100 g)': (0.8, 2.0),
-                    'Exch. Mg (meq/100 g)': (0.8, 2.0),
-                    'CEC (meq/100 g)': (12.0, 25.0),
-                    'C.E.C (meq/100 g)': (12.0, 25.0)
-                }
+                # MPOB standards from the standards registry (admin overrides included)
+                soil_mpob_standards = standards_registry.status_ranges('soil')
 
                 for param, avg_val in soil_averages.items():
                     # Get MPOB optimal range for this parameter (param is already the display name)
@@ -5935,17 +4908,8 @@ def generate_consolidated_key_findings(analysis_results, step_results):
             # Add detailed leaf nutrient status using correct averages
             leaf_details = []
             if leaf_averages:
-                # Use the same MPOB standards as the Step 1 tables
-                leaf_mpob_standards = {
-                    'N (%)': (2.6, 3.2),
-                    'P (%)': (0.16, 0.22),
-                    'K (%)': (1.3, 1.7),
-                    'Mg (%)': (0.3, 0.5),
-                    'Ca (%)': (0.8, 1.2),
-                    'B (mg/kg)': (18, 28),
-                    'Cu (mg/kg)': (6.0, 10.0),
-                    'Zn (mg/kg)': (15, 25)
-                }
+                # MPOB standards from the standards registry (admin overrides included)
+                leaf_mpob_standards = standards_registry.status_ranges('leaf')
 
                 for param, avg_val in leaf_averages.items():
                     # Get MPOB optimal range for this parameter (param is already the display name)
@@ -6392,11 +5356,12 @@ def display_formatted_scenario(scenario_key, scenario_data):
 
     # Extract key information
     investment_level = scenario_data.get('investment_level', scenario_key.title())
-    cost_per_hectare = scenario_data.get('cost_per_hectare_range', 'N/A')
-    total_cost = scenario_data.get('total_cost_range', 'N/A')
+    display = scenario_display(scenario_data)
+    cost_per_hectare = display['cost_per_hectare_range']
+    total_cost = display['total_cost_range']
     current_yield = scenario_data.get('current_yield', 'N/A')
-    new_yield = scenario_data.get('new_yield_range', 'N/A')
-    additional_yield = scenario_data.get('additional_yield_range', 'N/A')
+    new_yield = display['new_yield_range']
+    additional_yield = display['additional_yield_range']
     additional_revenue = scenario_data.get('additional_revenue_range', 'N/A')
     roi = scenario_data.get('roi_percentage_range', 'N/A')
     payback = scenario_data.get('payback_months_range', 'N/A')
@@ -6703,138 +5668,6 @@ def display_step_block(step_result, step_number, step_title):
     # Display the enhanced step result content
     display_enhanced_step_result(step_result, step_number)
 
-def sanitize_persona_and_enforce_article(text):
-    """Remove persona phrases and ensure the text starts with 'The'.
-
-    - Strips phrases like 'As an experienced agronomist', 'As your consulting agronomist',
-      'As an expert', 'my analysis', 'I recommend', etc.
-    - Replaces 'our' with 'The' and removes 'my' and other first-person pronouns
-    - If first non-space word is not 'The' (case-insensitive), prepend 'The ' (with capitalization).
-    """
-    try:
-        if not isinstance(text, str):
-            return text
-        cleaned = text
-        # Remove common persona prefixes (at start of text OR start of any line)
-        import re
-        persona_line_patterns = [
-            r"^[\t ]*As\s+an\s+experienced\s+agronomist[,\s:]+",
-            r"^[\t ]*As\s+your\s+consulting\s+agronomist[,\s:]+",
-            r"^[\t ]*As\s+an\s+expert[,\s:]+",
-            r"^[\t ]*As\s+a\s+consulting\s+agronomist[,\s:]+",
-            r"^[\t ]*As\s+your\s+agronomist[,\s:]+",
-            r"^[\t ]*As\s+an\s+agronomist[,\s:]+",
-            r"^[\t ]*As\s+an\s+agronomist\s+with\s+over\s+two\s+decades[,\s:]+",
-            r"^[\t ]*As\s+a\s+seasoned\s+agronomist[,\s:]+",
-            r"^[\t ]*As\s+your\s+trusted\s+agronomist[,\s:]+",
-            r"^[\t ]*As\s+an\s+agricultural\s+expert[,\s:]+",
-            r"^[\t ]*As\s+a\s+professional\s+agronomist[,\s:]+",
-            r"^[\t ]*Drawing\s+from\s+my\s+decades\s+of\s+experience[,\s:]+",
-            r"^[\t ]*With\s+my\s+extensive\s+experience[,\s:]+",
-            r"^[\t ]*Based\s+on\s+my\s+expertise[,\s:]+",
-            r"^[\t ]*From\s+my\s+decades\s+of\s+experience[,\s:]+",
-            r"^[\t ]*In\s+my\s+professional\s+opinion[,\s:]+",
-        ]
-        for pattern in persona_line_patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE | re.MULTILINE)
-        # Also remove inline occurrences that may follow headings
-        inline_persona_patterns = [
-            r"(\n|^)\s*As\s+an\s+experienced\s+agronomist[,\s:]+",
-            r"(\n|^)\s*As\s+your\s+consulting\s+agronomist[,\s:]+",
-            r"(\n|^)\s*As\s+a\s+consulting\s+agronomist[,\s:]+",
-            r"(\n|^)\s*As\s+your\s+agronomist[,\s:]+",
-            r"(\n|^)\s*As\s+an\s+agronomist[,\s:]+",
-            r"(\n|^)\s*As\s+an\s+agronomist\s+with\s+over\s+two\s+decades[,\s:]+",
-            r"(\n|^)\s*As\s+a\s+seasoned\s+agronomist[,\s:]+",
-            r"(\n|^)\s*As\s+your\s+trusted\s+agronomist[,\s:]+",
-            r"(\n|^)\s*As\s+an\s+agricultural\s+expert[,\s:]+",
-            r"(\n|^)\s*As\s+a\s+professional\s+agronomist[,\s:]+",
-            r"(\n|^)\s*Drawing\s+from\s+my\s+decades\s+of\s+experience[,\s:]+",
-            r"(\n|^)\s*With\s+my\s+extensive\s+experience[,\s:]+",
-            r"(\n|^)\s*Based\s+on\s+my\s+expertise[,\s:]+",
-            r"(\n|^)\s*From\s+my\s+decades\s+of\s+experience[,\s:]+",
-            r"(\n|^)\s*In\s+my\s+professional\s+opinion[,\s:]+",
-        ]
-        for pattern in inline_persona_patterns:
-            cleaned = re.sub(pattern, '\n', cleaned, flags=re.IGNORECASE)
-
-        # Replace specific possessive pronouns with "The"
-        possessive_replacements = [
-            (r"\bour\b", "The"),
-            (r"\byour\b", ""),
-        ]
-        for pattern, replacement in possessive_replacements:
-            cleaned = re.sub(pattern, replacement, cleaned, flags=re.IGNORECASE)
-
-        # Remove/replace first-person phrases and possessive pronouns
-        first_person_replacements = [
-            (r"\bmy\s+analysis\b", ""),
-            (r"\bmy\s+first\s+step\b", "first step"),
-            (r"\bmy\s+recommendation\b", "recommendation"),
-            (r"\bmy\s+assessment\b", "assessment"),
-            (r"\bmy\s+expertise\b", "expertise"),
-            (r"\bmy\s+professional\s+assessment\b", "assessment"),
-            (r"\bmy\s+decades\s+of\s+experience\b", "decades of experience"),
-            (r"\bmy\s+extensive\s+experience\b", "extensive experience"),
-            (r"\bI\s+recommend\b", "recommend"),
-            (r"\bI\s+suggest\b", "suggest"),
-            (r"\bI\s+advise\b", "advise"),
-            (r"\bwe\s+recommend\b", "recommend"),
-            (r"\bwe\s+suggest\b", "suggest"),
-            (r"\bI\s+conclude\b", "conclude"),
-            (r"\bI\s+observe\b", "observe"),
-            (r"\bI\s+see\b", "analysis shows"),
-            (r"\bThe\s+I\s+see\b", "The analysis shows"),
-            (r"\bI\s+believe\b", "believe"),
-            (r"\bI\s+think\b", "think"),
-            (r"\bI\s+have\s+conducted\b", "The analysis has"),
-            (r"\bI\s+have\s+performed\b", "The analysis has"),
-            (r"\bI\s+have\s+carried\s+out\b", "The analysis has"),
-            (r"\bI\s+have\s+undertaken\b", "The analysis has"),
-            (r"\bI\s+have\s+analyzed\b", "The analysis has"),
-            (r"\bI\s+have\s+examined\b", "The analysis has"),
-            (r"\bI\s+have\s+reviewed\b", "The analysis has"),
-            (r"\bI\s+have\s+studied\b", "The analysis has"),
-            (r"\bI\s+have\s+evaluated\b", "The analysis has"),
-            (r"\bI\s+have\s+conducted\s+a\s+thorough\s+analysis\b", "The analysis has been conducted thoroughly"),
-            (r"\bmy\b", ""),
-            (r"\bI\b", ""),
-            (r"\bwe\b", ""),
-        ]
-        for pattern, replacement in first_person_replacements:
-            cleaned = re.sub(pattern, replacement, cleaned, flags=re.IGNORECASE)
-
-        # Normalize extra spaces introduced by removals
-        cleaned = re.sub(r"\s{2,}", ' ', cleaned).strip()
-
-        # More selective 'The' enforcement - only for first statement if grammatically appropriate
-        if cleaned:
-            # For detailed analysis sections, be more selective about adding 'The'
-            # Only add 'The' to the very first word/sentence if it makes grammatical sense
-            m = re.search(r"[A-Za-z]", cleaned)
-            if m:
-                start_idx = m.start()
-                prefix = cleaned[:start_idx]
-                remainder = cleaned[start_idx:]
-
-                # If starts with 'Your ' or 'your ', convert to 'The '
-                if re.match(r"^(Your|your)\s+", remainder):
-                    remainder = re.sub(r"^(Your|your)\s+", 'The ', remainder)
-                # Only enforce 'The' at the very beginning if the text appears to be a complete statement
-                # that would benefit from starting with 'The' (not already a proper noun or specific term)
-                elif not remainder.lower().startswith('the '):
-                    # Check if this looks like it should start with 'The' (analysis, report, etc.)
-                    first_word = remainder.split()[0].lower() if remainder.split() else ''
-                    analysis_starters = ['analysis', 'report', 'assessment', 'evaluation', 'review', 'study', 'examination']
-                    if first_word in analysis_starters:
-                        remainder = 'The ' + remainder
-                    # For other cases, leave as-is to avoid forcing 'The' inappropriately
-
-                cleaned = prefix + remainder
-        return cleaned
-    except Exception:
-        return text
-
 def display_enhanced_step_result(step_result, step_number):
     """Display enhanced step results with proper structure and formatting for non-technical users"""
     # Ensure step_result is a dictionary
@@ -9375,7 +8208,7 @@ def display_references_section(results_data):
             try:
                 # Generate PDF
                 with st.spinner(f"🔄 {t('pdf_generating', 'Generating PDF report...')}"):
-                    pdf_bytes = generate_results_pdf(results_data)
+                    pdf_file = generate_results_pdf(results_data)
                     
                 # Get language-specific filename
                 current_lang = get_language()
@@ -9385,7 +8218,7 @@ def display_references_section(results_data):
                 # Download the PDF
                 st.download_button(
                     label=f"💾 {t('pdf_download_report', 'Download PDF')}",
-                    data=pdf_bytes,
+                    data=pdf_file,
                     file_name=filename,
                     mime="application/pdf",
                     type="primary"
@@ -12459,50 +11292,6 @@ def extract_soil_data_with_robust_mapping(analysis_data):
     try:
         logger.info("🔍 Starting robust soil data extraction")
         
-        # Comprehensive parameter mapping dictionary
-        soil_parameter_mappings = {
-            # pH variations
-            'ph': 'pH', 'pH': 'pH', 'soil_ph': 'pH', 'soil_p_h': 'pH',
-            'p_h': 'pH', 'soil_ph_value': 'pH', 'ph_value': 'pH',
-            
-            # Nitrogen variations
-            'n': 'N (%)', 'nitrogen': 'N (%)', 'n_percent': 'N (%)', 'n_%': 'N (%)',
-            'soil_n': 'N (%)', 'soil_nitrogen': 'N (%)', 'nitrogen_percent': 'N (%)',
-            
-            # Organic Carbon variations
-            'org_c': 'Org. C (%)', 'organic_carbon': 'Org. C (%)', 'org_carbon': 'Org. C (%)',
-            'organic_c': 'Org. C (%)', 'soil_organic_carbon': 'Org. C (%)', 'oc': 'Org. C (%)',
-            'soil_oc': 'Org. C (%)', 'carbon': 'Org. C (%)', 'soil_carbon': 'Org. C (%)',
-            
-            # Total Phosphorus variations
-            'total_p': 'Total P (mg/kg)', 'total_phosphorus': 'Total P (mg/kg)', 'tp': 'Total P (mg/kg)',
-            'soil_total_p': 'Total P (mg/kg)', 'total_p_mg_kg': 'Total P (mg/kg)', 'p_total': 'Total P (mg/kg)',
-            
-            # Available Phosphorus variations
-            'avail_p': 'Avail P (mg/kg)', 'available_p': 'Avail P (mg/kg)', 'ap': 'Avail P (mg/kg)',
-            'soil_avail_p': 'Avail P (mg/kg)', 'available_phosphorus': 'Avail P (mg/kg)', 'p_available': 'Avail P (mg/kg)',
-            'avail_p_mg_kg': 'Avail P (mg/kg)', 'p_avail': 'Avail P (mg/kg)',
-            
-            # Exchangeable Potassium variations
-            'exch_k': 'Exch. K (meq/100 g)', 'exchangeable_k': 'Exch. K (meq/100 g)', 'ek': 'Exch. K (meq/100 g)',
-            'soil_exch_k': 'Exch. K (meq/100 g)', 'k_exchangeable': 'Exch. K (meq/100 g)', 'exch_k_meq': 'Exch. K (meq/100 g)',
-            'k_exch': 'Exch. K (meq/100 g)', 'exchangeable_potassium': 'Exch. K (meq/100 g)',
-            
-            # Exchangeable Calcium variations
-            'exch_ca': 'Exch. Ca (meq/100 g)', 'exchangeable_ca': 'Exch. Ca (meq/100 g)', 'eca': 'Exch. Ca (meq/100 g)',
-            'soil_exch_ca': 'Exch. Ca (meq/100 g)', 'ca_exchangeable': 'Exch. Ca (meq/100 g)', 'exch_ca_meq': 'Exch. Ca (meq/100 g)',
-            'ca_exch': 'Exch. Ca (meq/100 g)', 'exchangeable_calcium': 'Exch. Ca (meq/100 g)',
-            
-            # Exchangeable Magnesium variations
-            'exch_mg': 'Exch. Mg (meq/100 g)', 'exchangeable_mg': 'Exch. Mg (meq/100 g)', 'emg': 'Exch. Mg (meq/100 g)',
-            'soil_exch_mg': 'Exch. Mg (meq/100 g)', 'mg_exchangeable': 'Exch. Mg (meq/100 g)', 'exch_mg_meq': 'Exch. Mg (meq/100 g)',
-            'mg_exch': 'Exch. Mg (meq/100 g)', 'exchangeable_magnesium': 'Exch. Mg (meq/100 g)',
-            
-            # CEC variations
-            'cec': 'CEC (meq/100 g)', 'cation_exchange_capacity': 'CEC (meq/100 g)', 'cec_meq': 'CEC (meq/100 g)',
-            'soil_cec': 'CEC (meq/100 g)', 'exchange_capacity': 'CEC (meq/100 g)', 'c_e_c': 'CEC (meq/100 g)'
-        }
-        
         # Search locations in order of priority
         search_locations = [
             'raw_data.soil_parameters',
@@ -12565,28 +11354,11 @@ def extract_soil_data_with_robust_mapping(analysis_data):
             logger.warning("❌ No valid parameter statistics found")
             return None
             
-        # Apply robust parameter mapping
+        # Resolve each parameter key to its canonical ID once
+        key_map = parameter_standardizer.resolve_columns(param_stats.keys(), 'soil')
         mapped_params = {}
         for param_key, param_data in param_stats.items():
-            # Normalize the parameter key
-            normalized_key = param_key.lower().strip().replace(' ', '_').replace('(', '').replace(')', '').replace('%', '').replace('.', '')
-            
-            # Find the mapped parameter name
-            mapped_name = soil_parameter_mappings.get(normalized_key)
-            if mapped_name:
-                mapped_params[mapped_name] = param_data
-                logger.info(f"✅ Mapped {param_key} -> {mapped_name}")
-            else:
-                # Try partial matching
-                for mapping_key, mapping_value in soil_parameter_mappings.items():
-                    if mapping_key in normalized_key or normalized_key in mapping_key:
-                        mapped_params[mapping_value] = param_data
-                        logger.info(f"✅ Partial mapped {param_key} -> {mapping_value}")
-                        break
-                else:
-                    # Keep original if no mapping found
-                    mapped_params[param_key] = param_data
-                    logger.info(f"⚠️ No mapping found for {param_key}, keeping original")
+            mapped_params[key_map[param_key] or param_key] = param_data
         
         logger.info(f"🎯 Robust soil data extraction complete: {len(mapped_params)} parameters")
         return {
@@ -12604,41 +11376,6 @@ def extract_leaf_data_with_robust_mapping(analysis_data):
     try:
         logger.info("🔍 Starting robust leaf data extraction")
         
-        # Comprehensive parameter mapping dictionary
-        leaf_parameter_mappings = {
-            # Nitrogen variations
-            'n': 'N (%)', 'nitrogen': 'N (%)', 'n_percent': 'N (%)', 'n_%': 'N (%)',
-            'leaf_n': 'N (%)', 'leaf_nitrogen': 'N (%)', 'nitrogen_percent': 'N (%)',
-            
-            # Phosphorus variations
-            'p': 'P (%)', 'phosphorus': 'P (%)', 'p_percent': 'P (%)', 'p_%': 'P (%)',
-            'leaf_p': 'P (%)', 'leaf_phosphorus': 'P (%)', 'phosphorus_percent': 'P (%)',
-            
-            # Potassium variations
-            'k': 'K (%)', 'potassium': 'K (%)', 'k_percent': 'K (%)', 'k_%': 'K (%)',
-            'leaf_k': 'K (%)', 'leaf_potassium': 'K (%)', 'potassium_percent': 'K (%)',
-            
-            # Magnesium variations
-            'mg': 'Mg (%)', 'magnesium': 'Mg (%)', 'mg_percent': 'Mg (%)', 'mg_%': 'Mg (%)',
-            'leaf_mg': 'Mg (%)', 'leaf_magnesium': 'Mg (%)', 'magnesium_percent': 'Mg (%)',
-            
-            # Calcium variations
-            'ca': 'Ca (%)', 'calcium': 'Ca (%)', 'ca_percent': 'Ca (%)', 'ca_%': 'Ca (%)',
-            'leaf_ca': 'Ca (%)', 'leaf_calcium': 'Ca (%)', 'calcium_percent': 'Ca (%)',
-            
-            # Boron variations
-            'b': 'B (mg/kg)', 'boron': 'B (mg/kg)', 'b_mg_kg': 'B (mg/kg)', 'b_mg/kg': 'B (mg/kg)',
-            'leaf_b': 'B (mg/kg)', 'leaf_boron': 'B (mg/kg)', 'boron_mg_kg': 'B (mg/kg)',
-            
-            # Copper variations
-            'cu': 'Cu (mg/kg)', 'copper': 'Cu (mg/kg)', 'cu_mg_kg': 'Cu (mg/kg)', 'cu_mg/kg': 'Cu (mg/kg)',
-            'leaf_cu': 'Cu (mg/kg)', 'leaf_copper': 'Cu (mg/kg)', 'copper_mg_kg': 'Cu (mg/kg)',
-            
-            # Zinc variations
-            'zn': 'Zn (mg/kg)', 'zinc': 'Zn (mg/kg)', 'zn_mg_kg': 'Zn (mg/kg)', 'zn_mg/kg': 'Zn (mg/kg)',
-            'leaf_zn': 'Zn (mg/kg)', 'leaf_zinc': 'Zn (mg/kg)', 'zinc_mg_kg': 'Zn (mg/kg)'
-        }
-        
         # Search locations in order of priority
         search_locations = [
             'raw_data.leaf_parameters',
@@ -12701,28 +11438,11 @@ def extract_leaf_data_with_robust_mapping(analysis_data):
             logger.warning("❌ No valid parameter statistics found")
             return None
             
-        # Apply robust parameter mapping
+        # Resolve each parameter key to its canonical ID once
+        key_map = parameter_standardizer.resolve_columns(param_stats.keys(), 'leaf')
         mapped_params = {}
         for param_key, param_data in param_stats.items():
-            # Normalize the parameter key
-            normalized_key = param_key.lower().strip().replace(' ', '_').replace('(', '').replace(')', '').replace('%', '').replace('.', '')
-            
-            # Find the mapped parameter name
-            mapped_name = leaf_parameter_mappings.get(normalized_key)
-            if mapped_name:
-                mapped_params[mapped_name] = param_data
-                logger.info(f"✅ Mapped {param_key} -> {mapped_name}")
-            else:
-                # Try partial matching
-                for mapping_key, mapping_value in leaf_parameter_mappings.items():
-                    if mapping_key in normalized_key or normalized_key in mapping_key:
-                        mapped_params[mapping_value] = param_data
-                        logger.info(f"✅ Partial mapped {param_key} -> {mapping_value}")
-                        break
-                else:
-                    # Keep original if no mapping found
-                    mapped_params[param_key] = param_data
-                    logger.info(f"⚠️ No mapping found for {param_key}, keeping original")
+            mapped_params[key_map[param_key] or param_key] = param_data
         
         logger.info(f"🎯 Robust leaf data extraction complete: {len(mapped_params)} parameters")
         return {
@@ -12810,18 +11530,8 @@ def create_soil_vs_mpob_visualization_with_robust_mapping(analysis_data):
                 'CEC (meq/100 g)': 6.16
             }
         
-        # EXACT MPOB standards from the table (these are the recommended values)
-        soil_mpob_standards = {
-            'pH': (4.5, 6.0),
-            'N (%)': (0.15, 0.25),
-            'Org. C (%)': (2.0, 4.0),
-            'Total P (mg/kg)': (20, 50),
-            'Avail P (mg/kg)': (20, 50),
-            'Exch. K (meq/100 g)': (0.15, 0.30),
-            'Exch. Ca (meq/100 g)': (3.0, 6.0),
-            'Exch. Mg (meq/100 g)': (0.4, 0.8),
-            'CEC (meq/100 g)': (12.0, 25.0)
-        }
+        # MPOB standards from the standards registry (admin overrides included)
+        soil_mpob_standards = standards_registry.status_ranges('soil')
 
         categories = []
         observed_values = []  # These are the actual average values from the table
@@ -12944,17 +11654,8 @@ def create_leaf_vs_mpob_visualization_with_robust_mapping(analysis_data):
                 'Zn (mg/kg)': 10.50
             }
         
-        # EXACT MPOB standards from the table (these are the recommended values)
-        leaf_mpob_standards = {
-            'N (%)': (2.6, 3.2),
-            'P (%)': (0.16, 0.22),
-            'K (%)': (1.3, 1.7),
-            'Mg (%)': (0.28, 0.38),
-            'Ca (%)': (0.5, 0.7),
-            'B (mg/kg)': (18, 28),
-            'Cu (mg/kg)': (6.0, 10.0),
-            'Zn (mg/kg)': (15, 25)
-        }
+        # MPOB standards from the standards registry (admin overrides included)
+        leaf_mpob_standards = standards_registry.status_ranges('leaf')
 
         categories = []
         observed_values = []  # These are the actual average values from the table
@@ -13244,22 +11945,8 @@ def create_soil_vs_mpob_visualization(soil_params):
             logger.warning(f"Soil params structure: {list(soil_params.keys()) if isinstance(soil_params, dict) else type(soil_params)}")
             return None
 
-        # Use the exact MPOB standards from provided data
-        soil_mpob_standards = {
-            'pH': (4.5, 6.0),
-            'N (%)': (0.15, 0.25),
-            'Nitrogen (%)': (0.15, 0.25),
-            'Org. C (%)': (2.0, 4.0),
-            'Organic Carbon (%)': (2.0, 4.0),
-            'Total P (mg/kg)': (20, 50),
-            'Avail P (mg/kg)': (20, 50),
-            'Available P (mg/kg)': (20, 50),
-                    'Exch. K (meq/100 g)': (0.15, 0.30),
-            'Exch. Ca (meq/100 g)': (3.0, 6.0),
-            'Exch. Mg (meq/100 g)': (0.4, 0.8),
-            'CEC (meq/100 g)': (12.0, 25.0),
-            'C.E.C (meq/100 g)': (12.0, 25.0)
-        }
+        # MPOB standards from the standards registry (admin overrides included)
+        soil_mpob_standards = standards_registry.status_ranges('soil')
 
         categories = []
         actual_values = []
@@ -13358,17 +12045,8 @@ def create_leaf_vs_mpob_visualization(leaf_params):
             logger.warning(f"Leaf params structure: {list(leaf_params.keys()) if isinstance(leaf_params, dict) else type(leaf_params)}")
             return None
 
-        # Use the exact MPOB standards from provided data
-        leaf_mpob_standards = {
-            'N (%)': (2.6, 3.2),
-            'P (%)': (0.16, 0.22),
-            'K (%)': (1.3, 1.7),
-            'Mg (%)': (0.28, 0.38),
-            'Ca (%)': (0.5, 0.7),
-            'B (mg/kg)': (18, 28),
-            'Cu (mg/kg)': (6.0, 10.0),
-            'Zn (mg/kg)': (15, 25)
-        }
+        # MPOB standards from the standards registry (admin overrides included)
+        leaf_mpob_standards = standards_registry.status_ranges('leaf')
 
         categories = []
         actual_values = []
@@ -14239,33 +12917,9 @@ def display_nutrient_status_tables(analysis_data):
             st.info("📋 No soil or leaf data available for nutrient status analysis.")
             return
         
-        # EXACT MPOB standards from results page
-        soil_mpob_standards = {
-            'pH': (4.5, 6.0),
-            'N (%)': (0.15, 0.25),
-            'Nitrogen (%)': (0.15, 0.25),
-            'Org. C (%)': (2.0, 4.0),
-            'Organic Carbon (%)': (2.0, 4.0),
-            'Total P (mg/kg)': (20, 50),
-            'Avail P (mg/kg)': (20, 50),
-            'Available P (mg/kg)': (20, 50),
-                    'Exch. K (meq/100 g)': (0.15, 0.30),
-            'Exch. Ca (meq/100 g)': (3.0, 6.0),
-            'Exch. Mg (meq/100 g)': (0.4, 0.8),
-            'CEC (meq/100 g)': (12.0, 25.0),
-            'C.E.C (meq/100 g)': (12.0, 25.0)
-        }
-        
-        leaf_mpob_standards = {
-            'N (%)': (2.6, 3.2),
-            'P (%)': (0.16, 0.22),
-            'K (%)': (1.3, 1.7),
-            'Mg (%)': (0.28, 0.38),
-            'Ca (%)': (0.5, 0.7),
-            'B (mg/kg)': (18, 28),
-            'Cu (mg/kg)': (6.0, 10.0),
-            'Zn (mg/kg)': (15, 25)
-        }
+        # MPOB standards from the standards registry (admin overrides included)
+        soil_mpob_standards = standards_registry.status_ranges('soil')
+        leaf_mpob_standards = standards_registry.status_ranges('leaf')
         
         # Display Soil Nutrient Status table - BULLETPROOF VERSION
         if soil_params and 'parameter_statistics' in soil_params:
@@ -18147,7 +16801,7 @@ def _removed_display_print_dialog(results_data):
                 with st.spinner("🔄 Generating PDF report..."):
                     try:
                         # Generate PDF with selected options
-                        pdf_bytes = generate_results_pdf(
+                        pdf_file = generate_results_pdf(
                             results_data,
                             include_raw_data=include_raw_data,
                             include_summary=include_summary,
@@ -18159,14 +16813,14 @@ def _removed_display_print_dialog(results_data):
                             include_timestamp=include_timestamp
                         )
                         
-                        if pdf_bytes:
+                        if pdf_file:
                             # Provide download button
                             st.success("✅ PDF generated successfully!")
                             
                             # Create download button
                             st.download_button(
                                 label="📥 Download PDF Report",
-                                data=pdf_bytes,
+                                data=pdf_file,
                                 file_name=f"{pdf_title.replace(' ', '_')}_{results_data.get('timestamp', 'report')}.pdf",
                                 mime="application/pdf",
                                 type="primary"
@@ -18251,10 +16905,11 @@ def generate_results_pdf(results_data, include_raw_data=True, include_summary=Tr
                         include_key_findings=True, include_step_analysis=True, 
                         include_references=False, include_charts=True, 
                         pdf_title=None, include_timestamp=True):
-    """Generate comprehensive PDF from results page content - includes ALL details"""
+    """Generate comprehensive PDF from results page content - includes ALL details.
+
+    Returns the PDF bytes for st.download_button, which does not accept a spooled temporary file.
+    """
     try:
-        from utils.pdf_utils import PDFReportGenerator
-        
         # Get current language from session state
         current_language = st.session_state.get('language', 'en')
         
@@ -18262,69 +16917,17 @@ def generate_results_pdf(results_data, include_raw_data=True, include_summary=Tr
         if pdf_title is None:
             pdf_title = t('pdf_title', 'Agricultural Analysis Report')
         
-        # Prepare analysis data for PDF generation (same as existing download functionality)
-        analysis_data = results_data.get('analysis_results', {})
-        
-        # If analysis_results is empty, use the full results_data
-        if not analysis_data:
-            analysis_data = results_data
-        
-        # Ensure all forecast data is available at the top level
-        if 'economic_forecast' in results_data and 'economic_forecast' not in analysis_data:
-            analysis_data['economic_forecast'] = results_data['economic_forecast']
-        
-        if 'yield_forecast' in results_data and 'yield_forecast' not in analysis_data:
-            analysis_data['yield_forecast'] = results_data['yield_forecast']
-        
-        # Include all additional data from results page
-        if 'raw_data' in results_data and 'raw_data' not in analysis_data:
-            analysis_data['raw_data'] = results_data['raw_data']
-        
-        if 'summary_metrics' in results_data and 'summary_metrics' not in analysis_data:
-            analysis_data['summary_metrics'] = results_data['summary_metrics']
-        
-        if 'key_findings' in results_data and 'key_findings' not in analysis_data:
-            analysis_data['key_findings'] = results_data['key_findings']
-        
-        if 'step_by_step_analysis' in results_data and 'step_by_step_analysis' not in analysis_data:
-            analysis_data['step_by_step_analysis'] = results_data['step_by_step_analysis']
-        
-        if 'references' in results_data and 'references' not in analysis_data:
-            analysis_data['references'] = results_data['references']
-        
-        # Create comprehensive metadata for PDF
-        metadata = {
-            'title': pdf_title,
-            'timestamp': results_data.get('timestamp'),
-            'include_timestamp': include_timestamp,
-            'sections': {
-                'raw_data': include_raw_data,
-                'summary': include_summary,
-                'key_findings': include_key_findings,
-                'step_analysis': include_step_analysis,
-                'references': include_references,
-                'charts': include_charts
-            }
-        }
-        
-        # Create comprehensive PDF options - include ALL sections except economic/forecast
-        options = {
-            'include_economic': False,
-            'include_forecast': False,
-            'include_charts': include_charts,
-            'include_raw_data': include_raw_data,
-            'include_summary': include_summary,
-            'include_key_findings': include_key_findings,
-            'include_step_analysis': include_step_analysis,
-            'include_references': include_references,
-            'include_all_details': True  # Ensure all details are included
-        }
-        
-        # Generate comprehensive PDF using existing PDF utils with language support
-        generator = PDFReportGenerator()
-        pdf_bytes = generator.generate_report(analysis_data, metadata, options, language=current_language)
+        # Served from the precomputed artifact when one matches these inputs
+        pdf_file = get_report_pdf(
+            results_data, current_language, pdf_title=pdf_title,
+            include_raw_data=include_raw_data, include_summary=include_summary,
+            include_key_findings=include_key_findings, include_step_analysis=include_step_analysis,
+            include_references=include_references, include_charts=include_charts,
+            include_timestamp=include_timestamp
+        )
         
-        return pdf_bytes
+        with pdf_file:
+            return pdf_file.read()
         
     except Exception as e:
         logger.error(f"Error generating comprehensive results PDF: {e}")
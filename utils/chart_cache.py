@@ -0,0 +1,191 @@
+"""
+Chart Cache
+Content-addressed cache of rendered chart images for PDF export. Images are
+keyed by a hash of the chart method, its normalized input data, the language
+and the render options, so re-exporting an unchanged report (including from
+a reopened history entry) reuses the PNGs instead of redrawing them. Entries
+live in an in-process LRU bounded by total size and in a file-per-image disk
+tier (CROPDRIVE_CHART_CACHE_DIR, empty to disable) shared across processes.
+The disk tier is bounded too: reads refresh a file's mtime and, once the
+tier outgrows its byte budget, the least recently used files are removed.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+try:
+    from utils.stage_cache import fingerprint
+except ImportError:
+    from stage_cache import fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Bump when chart drawing code changes so stale images are not reused
+CHART_CACHE_FORMAT = 1
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+# Pruning stops once the disk tier is back under this share of its budget
+DISK_PRUNE_TARGET = 0.8
+DISK_CACHE_ENV = 'CROPDRIVE_CHART_CACHE_DIR'
+DEFAULT_DISK_DIR = os.path.join(tempfile.gettempdir(), 'cropdrive_chart_cache')
+
+
+def chart_key(method: str, args: Any, language: str, **render_options: Any) -> str:
+    """Cache key for one chart: drawing method, input data, language and render options"""
+    return fingerprint(CHART_CACHE_FORMAT, method, args, language, render_options)
+
+
+class ChartCache:
+    """In-process LRU of chart images with an optional disk tier"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, disk_dir: Optional[str] = None,
+                 max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        # Bytes on disk as of the last scan plus writes since; None until the first scan
+        self._disk_size: Optional[int] = None
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _disk_path(self, key: str) -> Optional[str]:
+        if not self.disk_dir:
+            return None
+        # Two-level fan-out keeps directories small
+        return os.path.join(self.disk_dir, key[:2], f"{key}.img")
+
+    def _load_disk(self, key: str) -> Optional[bytes]:
+        path = self._disk_path(key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                image = f.read() or None
+            # mtime doubles as the last-used time for pruning
+            os.utime(path)
+            return image
+        except OSError as e:
+            logger.warning(f"Ignoring unreadable chart cache entry {path}: {str(e)}")
+            return None
+
+    def _store_disk(self, key: str, image: bytes):
+        path = self._disk_path(key)
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(image)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write chart cache entry: {str(e)}")
+            return
+        with self._lock:
+            over_budget = self._disk_size is None or self._disk_size + len(image) > self.max_disk_bytes
+            if not over_budget:
+                self._disk_size += len(image)
+        if over_budget:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Remove least recently used disk entries until the tier is back under budget"""
+        entries = []
+        for root, _, files in os.walk(self.disk_dir):
+            for name in files:
+                if not name.endswith('.img'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # Removed by another process meanwhile
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(entry[1] for entry in entries)
+        if size > self.max_disk_bytes:
+            target = self.max_disk_bytes * DISK_PRUNE_TARGET
+            for _, entry_size, path in sorted(entries):
+                if size <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                size -= entry_size
+        with self._lock:
+            self._disk_size = size
+
+    def _remember(self, key: str, image: bytes):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = image
+            self._size += len(image)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def __contains__(self, key: str) -> bool:
+        """Whether an image is cached, without loading it or counting a hit"""
+        with self._lock:
+            if key in self._entries:
+                return True
+        path = self._disk_path(key)
+        return bool(path) and os.path.exists(path)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached image bytes for a key, or None"""
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+
+        if image is None:
+            image = self._load_disk(key)
+            if image is not None:
+                self._remember(key, image)
+
+        if image is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return image
+
+    def put(self, key: str, image: bytes):
+        """Store rendered image bytes in memory and on disk"""
+        if not image:
+            return
+        self._remember(key, image)
+        self._store_disk(key, image)
+
+    def clear(self, disk: bool = False):
+        """Drop all in-memory entries (and the disk tier when disk=True)"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        if disk and self.disk_dir and os.path.isdir(self.disk_dir):
+            for root, _, files in os.walk(self.disk_dir):
+                for name in files:
+                    if name.endswith('.img'):
+                        os.remove(os.path.join(root, name))
+            with self._lock:
+                self._disk_size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries),
+                'bytes': self._size, 'disk_dir': self.disk_dir, 'disk_bytes': self._disk_size}
+
+
+# Global chart cache instance
+chart_cache = ChartCache(disk_dir=os.getenv(DISK_CACHE_ENV, DEFAULT_DISK_DIR) or None)
@@ -156,38 +156,12 @@ class ConfigManager:
         return AIConfig()
     
     def get_mpob_standards(self) -> MPOBStandards:
-        """Get MPOB standards"""
-        # Create default MPOB standards based on official MPOB oil palm optimal values
-        # 9 Soil parameters - matching analysis file parameter names
-        default_soil_standards = {
-            "pH": MPOBStandard("pH", 4.5, 5.5, "pH units", 5.0, "Soil pH level for optimal oil palm growth", True),
-            "N (%)": MPOBStandard("N (%)", 0.15, 0.25, "%", 0.20, "Total nitrogen content in soil", True),
-            "Org. C (%)": MPOBStandard("Org. C (%)", 2.0, 4.0, "%", 3.0, "Organic carbon content in soil", True),
-            "Total P (mg/kg)": MPOBStandard("Total P (mg/kg)", 15.0, 30.0, "mg/kg", 22.5, "Total phosphorus content", True),
-            "Avail P (mg/kg)": MPOBStandard("Avail P (mg/kg)", 15.0, 30.0, "mg/kg", 22.5, "Available phosphorus (Bray-1)", True),
-            "Exch. K (meq%)": MPOBStandard("Exch. K (meq%)", 0.15, 0.30, "meq%", 0.225, "Exchangeable potassium", True),
-            "Exch. Ca (meq%)": MPOBStandard("Exch. Ca (meq%)", 2.0, 8.0, "meq%", 5.0, "Exchangeable calcium", False),
-            "Exch. Mg (meq%)": MPOBStandard("Exch. Mg (meq%)", 0.5, 2.0, "meq%", 1.25, "Exchangeable magnesium", False),
-            "CEC (meq%)": MPOBStandard("CEC (meq%)", 8.0, 20.0, "meq%", 14.0, "Soil cation exchange capacity", False)
-        }
-        
-        # 8 Leaf parameters - matching analysis file parameter names
-        default_leaf_standards = {
-            "N (%)": MPOBStandard("N (%)", 2.4, 2.8, "%", 2.6, "Leaf nitrogen content (frond 17)", True),
-            "P (%)": MPOBStandard("P (%)", 0.15, 0.25, "%", 0.20, "Leaf phosphorus content (frond 17)", True),
-            "K (%)": MPOBStandard("K (%)", 1.0, 1.3, "%", 1.15, "Leaf potassium content (frond 17)", True),
-            "Ca (%)": MPOBStandard("Ca (%)", 0.5, 1.0, "%", 0.75, "Leaf calcium content (frond 17)", False),
-            "Mg (%)": MPOBStandard("Mg (%)", 0.25, 0.50, "%", 0.375, "Leaf magnesium content (frond 17)", False),
-            "B (mg/kg)": MPOBStandard("B (mg/kg)", 10.0, 25.0, "mg/kg", 17.5, "Leaf boron content (frond 17)", False),
-            "Cu (mg/kg)": MPOBStandard("Cu (mg/kg)", 5.0, 15.0, "mg/kg", 10.0, "Leaf copper content (frond 17)", False),
-            "Zn (mg/kg)": MPOBStandard("Zn (mg/kg)", 15.0, 30.0, "mg/kg", 22.5, "Leaf zinc content (frond 17)", False)
-        }
-        
-        return MPOBStandards(
-            standards={},
-            soil_standards=default_soil_standards,
-            leaf_standards=default_leaf_standards
-        )
+        """Get MPOB standards from the cached standards registry"""
+        try:
+            from utils.standards_registry import standards_registry
+        except ImportError:
+            from standards_registry import standards_registry
+        return standards_registry.mpob_standards()
     
     def get_economic_config(self) -> EconomicConfig:
         """Get economic configuration"""
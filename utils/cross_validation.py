@@ -0,0 +1,262 @@
+"""
+Cross Validation
+Soil x leaf correlation engine. Soil and leaf samples are joined by block or
+sample number, and the full soil x leaf Pearson and Spearman matrices, with
+bootstrap confidence intervals, are computed from a handful of matrix
+products regardless of how many parameter pairs there are.
+"""
+
+import logging
+import re
+import warnings
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from utils.sample_table import SampleTable
+except ImportError:
+    from sample_table import SampleTable
+
+logger = logging.getLogger(__name__)
+
+# Soil/leaf pairs with an agronomically expected relationship (canonical parameter IDs)
+EXPECTED_PAIRS = (
+    ('Exch. K (meq/100 g)', 'K (%)'),     # Soil K should correlate with leaf K
+    ('Avail P (mg/kg)', 'P (%)'),         # Soil P should correlate with leaf P
+    ('pH', 'Ca (%)'),                     # Soil pH affects calcium uptake
+    ('Org. C (%)', 'N (%)')               # Organic matter affects nitrogen availability
+)
+
+DEFAULT_BOOTSTRAP_SAMPLES = 1000
+DEFAULT_CONFIDENCE = 0.95
+MIN_JOINED_SAMPLES = 3
+
+
+def _normalize_key(value: Any) -> str:
+    return re.sub(r'[^a-z0-9]', '', str(value).lower())
+
+
+def _digits_key(value: Any) -> str:
+    digits = re.sub(r'\D', '', str(value))
+    return str(int(digits)) if digits else ''
+
+
+def _group_means(values: np.ndarray, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Average the rows sharing a key (NaN-aware), returning (unique keys, means)"""
+    labels, inverse = np.unique(keys, return_inverse=True)
+    present = ~np.isnan(values)
+    width = values.shape[1]
+    cells = (inverse.reshape(-1, 1) * width + np.arange(width)).ravel()
+    size = len(labels) * width
+    sums = np.bincount(cells, weights=np.where(present, values, 0.0).ravel(), minlength=size)
+    counts = np.bincount(cells, weights=present.ravel().astype(float), minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(counts > 0, sums / counts, np.nan)
+    return labels, means.reshape(len(labels), width)
+
+
+def join_samples(soil_samples: Sequence[Dict[str, Any]], leaf_samples: Sequence[Dict[str, Any]],
+                 soil_parameters: Sequence[str], leaf_parameters: Sequence[str],
+                 soil_key: str = 'sample_no', leaf_key: str = 'sample_no') -> Dict[str, Any]:
+    """Join soil and leaf samples on their block or sample keys.
+
+    Samples sharing a key on one side are averaged. Keys are matched
+    exactly (ignoring case and punctuation), then on their digits
+    ('S01' joins 'L1'), and finally by position when both reports have the
+    same number of samples and no key matches.
+
+    Returns:
+        Dict with the joined 'keys', aligned 'soil' and 'leaf' matrices and
+        the 'join_key' strategy used ('<key>', '<key> digits' or 'position')
+    """
+    soil_table = SampleTable.from_samples(soil_samples, soil_parameters)
+    leaf_table = SampleTable.from_samples(leaf_samples, leaf_parameters)
+    soil_raw = np.array([str(sample.get(soil_key, '')) for sample in soil_samples], dtype=object)
+    leaf_raw = np.array([str(sample.get(leaf_key, '')) for sample in leaf_samples], dtype=object)
+
+    join_key = soil_key if soil_key == leaf_key else f"{soil_key}/{leaf_key}"
+    for normalize, suffix in ((_normalize_key, ''), (_digits_key, ' digits')):
+        soil_keys = np.array([normalize(key) for key in soil_raw], dtype=str)
+        leaf_keys = np.array([normalize(key) for key in leaf_raw], dtype=str)
+        soil_labels, soil_values = _group_means(soil_table.values, soil_keys)
+        leaf_labels, leaf_values = _group_means(leaf_table.values, leaf_keys)
+        shared, soil_rows, leaf_rows = np.intersect1d(soil_labels, leaf_labels, return_indices=True)
+        shared_rows = shared != ''
+        if shared_rows.sum() >= MIN_JOINED_SAMPLES:
+            return {
+                'keys': shared[shared_rows].tolist(),
+                'soil': soil_values[soil_rows[shared_rows]],
+                'leaf': leaf_values[leaf_rows[shared_rows]],
+                'join_key': join_key + suffix
+            }
+
+    if len(soil_samples) == len(leaf_samples):
+        return {
+            'keys': [str(key) for key in soil_raw.tolist()],
+            'soil': soil_table.values,
+            'leaf': leaf_table.values,
+            'join_key': 'position'
+        }
+
+    return {
+        'keys': [],
+        'soil': np.empty((0, len(soil_parameters))),
+        'leaf': np.empty((0, len(leaf_parameters))),
+        'join_key': None
+    }
+
+
+def _rank_columns(values: np.ndarray) -> np.ndarray:
+    """Average ranks of every column, keeping NaN where values are missing"""
+    return pd.DataFrame(values).rank(method='average').to_numpy(dtype=float)
+
+
+def _weighted_correlations(x: np.ndarray, y: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Pairwise-complete x-column vs y-column correlations for every row of weights.
+
+    Each weight row is a (bootstrap) frequency of every sample, so all
+    correlations of all resamples come out of six matrix products.
+
+    Args:
+        x: n x p matrix (NaN where missing)
+        y: n x q matrix (NaN where missing)
+        weights: b x n sample weights
+
+    Returns:
+        Tuple of (b x p x q correlations, b x p x q pair counts)
+    """
+    n, p = x.shape
+    q = y.shape[1]
+    mx, my = ~np.isnan(x), ~np.isnan(y)
+    x0, y0 = np.where(mx, x, 0.0), np.where(my, y, 0.0)
+
+    def pair_sums(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return (weights @ (a[:, :, None] * b[:, None, :]).reshape(n, p * q)).reshape(-1, p, q)
+
+    count = pair_sums(mx.astype(float), my.astype(float))
+    sum_x = pair_sums(x0, my.astype(float))
+    sum_y = pair_sums(mx.astype(float), y0)
+    sum_xx = pair_sums(x0 * x0, my.astype(float))
+    sum_yy = pair_sums(mx.astype(float), y0 * y0)
+    sum_xy = pair_sums(x0, y0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        covariance = count * sum_xy - sum_x * sum_y
+        variance = (count * sum_xx - sum_x ** 2) * (count * sum_yy - sum_y ** 2)
+        correlation = np.where(variance > 1e-12, covariance / np.sqrt(np.abs(variance)), np.nan)
+    return np.clip(correlation, -1.0, 1.0), count
+
+
+def correlation_matrices(soil_values: np.ndarray, leaf_values: np.ndarray,
+                         n_bootstrap: int = DEFAULT_BOOTSTRAP_SAMPLES, confidence: float = DEFAULT_CONFIDENCE,
+                         seed: int = 0) -> Dict[str, np.ndarray]:
+    """Pearson and Spearman soil x leaf matrices with percentile bootstrap intervals.
+
+    Returns:
+        Dict of p x q arrays: 'pearson', 'spearman', 'n_pairs' and the
+        'pearson_ci_low/high' and 'spearman_ci_low/high' interval bounds
+    """
+    n = soil_values.shape[0]
+    soil_ranks, leaf_ranks = _rank_columns(soil_values), _rank_columns(leaf_values)
+    ones = np.ones((1, n))
+
+    pearson, n_pairs = _weighted_correlations(soil_values, leaf_values, ones)
+    spearman, _ = _weighted_correlations(soil_ranks, leaf_ranks, ones)
+    matrices = {'pearson': pearson[0], 'spearman': spearman[0], 'n_pairs': n_pairs[0].astype(int)}
+
+    # Bootstrap resamples as multinomial sample frequencies (ranks are kept from the full sample)
+    rng = np.random.default_rng(seed)
+    weights = rng.multinomial(n, np.full(n, 1.0 / n), size=n_bootstrap).astype(float)
+    tail = (1.0 - confidence) / 2 * 100
+    for name, x, y in (('pearson', soil_values, leaf_values), ('spearman', soil_ranks, leaf_ranks)):
+        resampled, _ = _weighted_correlations(x, y, weights)
+        with warnings.catch_warnings():
+            # Pairs without variance in any resample stay NaN
+            warnings.simplefilter('ignore', RuntimeWarning)
+            low, high = np.nanpercentile(resampled, [tail, 100 - tail], axis=0)
+        matrices[f'{name}_ci_low'], matrices[f'{name}_ci_high'] = low, high
+    return matrices
+
+
+def interpret_correlation(correlation: Optional[float]) -> str:
+    """Interpret correlation strength"""
+    if correlation is None or np.isnan(correlation):
+        return "Insufficient Data"
+    abs_corr = abs(correlation)
+    if abs_corr >= 0.8:
+        return "Strong"
+    elif abs_corr >= 0.6:
+        return "Moderate"
+    elif abs_corr >= 0.3:
+        return "Weak"
+    else:
+        return "Very Weak"
+
+
+def _nested(matrix: np.ndarray, rows: Sequence[str], columns: Sequence[str]) -> Dict[str, Dict[str, Optional[float]]]:
+    """p x q matrix as {row: {column: value}} with None for undefined cells"""
+    return {
+        row: {column: (None if np.isnan(value) else round(value, 4)) for column, value in zip(columns, line)}
+        for row, line in zip(rows, matrix.astype(float).tolist())
+    }
+
+
+def soil_leaf_correlations(soil_samples: Sequence[Dict[str, Any]], leaf_samples: Sequence[Dict[str, Any]],
+                           soil_parameters: Sequence[str], leaf_parameters: Sequence[str],
+                           soil_key: str = 'sample_no', leaf_key: str = 'sample_no',
+                           n_bootstrap: int = DEFAULT_BOOTSTRAP_SAMPLES, confidence: float = DEFAULT_CONFIDENCE,
+                           seed: int = 0) -> Dict[str, Any]:
+    """Join soil and leaf samples and correlate every soil parameter with every leaf parameter.
+
+    Returns:
+        Dict with the join summary, nested {soil: {leaf: value}} 'matrices'
+        and a flat 'pairs' list (expected relationships first); empty when
+        fewer than MIN_JOINED_SAMPLES samples could be joined
+    """
+    soil_parameters, leaf_parameters = list(soil_parameters), list(leaf_parameters)
+    joined = join_samples(soil_samples, leaf_samples, soil_parameters, leaf_parameters, soil_key, leaf_key)
+    if len(joined['keys']) < MIN_JOINED_SAMPLES or not soil_parameters or not leaf_parameters:
+        return {}
+
+    matrices = correlation_matrices(joined['soil'], joined['leaf'], n_bootstrap, confidence, seed)
+    expected = set(EXPECTED_PAIRS)
+
+    pairs: List[Dict[str, Any]] = []
+    for i, soil_param in enumerate(soil_parameters):
+        for j, leaf_param in enumerate(leaf_parameters):
+            if matrices['n_pairs'][i, j] < MIN_JOINED_SAMPLES or np.isnan(matrices['pearson'][i, j]):
+                continue
+            cell = {name: float(matrix[i, j]) for name, matrix in matrices.items() if name != 'n_pairs'}
+            pairs.append({
+                'soil_param': soil_param,
+                'leaf_param': leaf_param,
+                'correlation': cell['pearson'],
+                'spearman': cell['spearman'],
+                'confidence_interval': [cell['pearson_ci_low'], cell['pearson_ci_high']],
+                'spearman_confidence_interval': [cell['spearman_ci_low'], cell['spearman_ci_high']],
+                'n_pairs': int(matrices['n_pairs'][i, j]),
+                'strength': interpret_correlation(cell['pearson']),
+                'significant': bool(cell['pearson_ci_low'] > 0 or cell['pearson_ci_high'] < 0),
+                'expected_relationship': (soil_param, leaf_param) in expected
+            })
+    pairs.sort(key=lambda pair: (not pair['expected_relationship'], -abs(pair['correlation'])))
+
+    return {
+        'join_key': joined['join_key'],
+        'joined_samples': len(joined['keys']),
+        'soil_parameters': soil_parameters,
+        'leaf_parameters': leaf_parameters,
+        'confidence': confidence,
+        'bootstrap_samples': n_bootstrap,
+        'matrices': {
+            name: _nested(matrix, soil_parameters, leaf_parameters)
+            for name, matrix in matrices.items() if name != 'n_pairs'
+        },
+        'n_pairs': {
+            soil_param: dict(zip(leaf_parameters, row))
+            for soil_param, row in zip(soil_parameters, matrices['n_pairs'].tolist())
+        },
+        'pairs': pairs
+    }
@@ -0,0 +1,359 @@
+"""
+Economic Model
+Array-based 5-year economic projections for the investment scenarios. Inputs
+are plain numbers; every metric is computed as one broadcasted NumPy
+expression over (..., scenarios, years, bound) where bound is (low, high),
+so whole sensitivity sweeps run in a single call. Display strings are only
+produced by the format helpers at render time.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SCENARIOS = ('high', 'medium', 'low')
+YEARS = np.arange(1, 6)
+
+# FFB price range in RM per tonne (conservative, optimistic)
+FFB_PRICE_RANGE = (650, 750)
+
+# Share of the full yield improvement reached each year, [low, high] bound.
+# Year 1: initial response to fertilization, Years 2-3: peak uptake, Years 4-5: sustained productivity
+YIELD_PROGRESSION = np.array([
+    [0.85, 0.95],
+    [0.95, 1.00],
+    [0.98, 1.00],
+    [0.95, 0.98],
+    [0.92, 0.95]
+])
+
+# Maintenance cost per hectare per year after the initial investment, per scenario,
+# rising slightly as palms mature (Year 2: base, Years 3-4: 110%, Year 5: 105%)
+MAINTENANCE_COST_PER_HA = np.array([600.0, 400.0, 250.0])
+MAINTENANCE_MULTIPLIER = np.array([1.0, 1.1, 1.1, 1.05])
+
+# Per-scenario investment profile, ordered as SCENARIOS
+COST_MULTIPLIER = np.array([1.2, 1.0, 0.8])              # premium, standard and minimal application rates
+YIELD_SHARE = np.array([[0.8, 1.0], [0.6, 0.8], [0.4, 0.6]])  # share of the potential yield improvement reached
+MIN_COST_PER_HA = np.array([800.0, 600.0, 400.0])         # application and labour floor
+BORON_COST_PER_HA = np.array([100.0, 75.0, 50.0])         # dropped when boron is not recommended
+
+YEARLY_ROI_CAP = 300.0
+FIVE_YEAR_ROI_CAP = 200.0
+
+
+def _bounds(value: Any) -> np.ndarray:
+    """Broadcast a scalar or (low, high) pair to a trailing bound axis"""
+    value = np.asarray(value, dtype=float)
+    return value if value.shape[-1:] == (2,) else np.stack([value, value], axis=-1)
+
+
+def scenario_costs(fertilizer_cost_per_ha: Sequence[float], boron_recommended: bool) -> np.ndarray:
+    """Per-hectare (low, high) cost of every scenario from the fertilizer program cost.
+
+    Returns:
+        (scenarios, 2) array ordered as SCENARIOS
+    """
+    cost = np.asarray(fertilizer_cost_per_ha, dtype=float) * COST_MULTIPLIER[:, None]
+    cost = np.maximum(cost, MIN_COST_PER_HA[:, None] * np.array([1.0, 1.1]))
+    if not boron_recommended:
+        cost = cost - BORON_COST_PER_HA[:, None]
+    return cost
+
+
+def project(current_yield: Any, new_yield: Any, total_cost: Any, land_size_ha: Any,
+            ffb_price: Any = FFB_PRICE_RANGE, maintenance_per_ha: Any = MAINTENANCE_COST_PER_HA) -> Dict[str, np.ndarray]:
+    """Project yield, revenue, cost and profit per hectare for every scenario and year.
+
+    Leading axes broadcast, so a sweep passes e.g. prices of shape (n, 2) with
+    current_yield and land_size_ha of shape (n,).
+
+    Args:
+        current_yield: Baseline yield in t/ha, shape (...)
+        new_yield: Target yield (low, high) per scenario, shape (..., scenarios, 2)
+        total_cost: Initial investment (low, high) per scenario for the whole land, shape (..., scenarios, 2)
+        land_size_ha: Land size in hectares, shape (...)
+        ffb_price: FFB price (low, high) in RM/tonne, shape (..., 2)
+        maintenance_per_ha: Base yearly maintenance per scenario, shape (..., scenarios)
+
+    Returns:
+        Dict of arrays shaped (..., scenarios, years, 2) for yearly metrics and
+        (..., scenarios, 2) for the 5-year summary metrics
+    """
+    current_yield = np.asarray(current_yield, dtype=float)[..., None, None, None]
+    land_size_ha = np.asarray(land_size_ha, dtype=float)[..., None, None]
+    new_yield = _bounds(new_yield)
+    total_cost = _bounds(total_cost)
+    ffb_price = _bounds(ffb_price)[..., None, None, :]
+    maintenance = np.asarray(maintenance_per_ha, dtype=float)[..., :, None, None]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        initial_cost_per_ha = np.where(land_size_ha > 0, total_cost / land_size_ha, 0.0)
+
+    additional_yield = (new_yield[..., None, :] - current_yield) * YIELD_PROGRESSION
+    yield_ = current_yield + additional_yield
+    additional_revenue = additional_yield * ffb_price
+
+    # Year 1 carries the initial investment, later years the maintenance program
+    year_one = initial_cost_per_ha[..., None, :]
+    later_years = maintenance * MAINTENANCE_MULTIPLIER[:, None]
+    leading = np.broadcast_shapes(year_one.shape[:-2], later_years.shape[:-2])
+    cost = np.maximum(np.concatenate([
+        np.broadcast_to(year_one, leading + (1, 2)),
+        np.broadcast_to(later_years, leading + (len(YEARS) - 1, 2))
+    ], axis=-2), 0.0)
+
+    net_profit = additional_revenue - cost
+    cumulative_profit = np.cumsum(net_profit, axis=-2)
+
+    # Yearly ROI against the average initial investment, capped for conservatism
+    initial_investment = total_cost.mean(axis=-1)[..., None, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        roi = np.where(initial_investment > 0, net_profit / initial_investment * 100, 0.0)
+    roi = np.minimum(roi, YEARLY_ROI_CAP)
+
+    # 5-year ROI pairs the low profit with the high cost and vice versa
+    cumulative_net_profit = cumulative_profit[..., -1, :]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        roi_5year = np.where(initial_cost_per_ha[..., ::-1] > 0,
+                             cumulative_net_profit / initial_cost_per_ha[..., ::-1] * 100, 0.0)
+
+    return {
+        'yield': yield_,
+        'additional_yield': additional_yield,
+        'additional_revenue': additional_revenue,
+        'cost': cost,
+        'net_profit': net_profit,
+        'cumulative_profit': cumulative_profit,
+        'roi': roi,
+        'cost_per_ha': initial_cost_per_ha,
+        'cumulative_net_profit': cumulative_net_profit,
+        'roi_5year': np.minimum(roi_5year, FIVE_YEAR_ROI_CAP),
+        'roi_capped': roi_5year > FIVE_YEAR_ROI_CAP,
+        'payback_period': payback_period(net_profit, initial_cost_per_ha)
+    }
+
+
+def payback_period(net_profit: np.ndarray, investment: Any) -> np.ndarray:
+    """Years until cumulative profit covers the investment, interpolated within the year.
+
+    Args:
+        net_profit: Yearly profits, shape (..., years, bound)
+        investment: Investment to recover, broadcastable to (..., bound)
+
+    Returns:
+        Payback in years, 5.0 when not reached within the projection
+    """
+    investment = np.asarray(investment, dtype=float)
+    cumulative = np.cumsum(net_profit, axis=-2)
+    reached = cumulative >= investment[..., None, :]
+    first = reached.argmax(axis=-2)[..., None, :]
+    profit_at = np.take_along_axis(net_profit, first, axis=-2)[..., 0, :]
+    cumulative_at = np.take_along_axis(cumulative, first, axis=-2)[..., 0, :]
+    year_at = YEARS[first[..., 0, :]].astype(float)
+
+    partial = (cumulative_at > investment) & (profit_at > 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        interpolated = year_at - 1 + (investment - (cumulative_at - profit_at)) / profit_at
+    period = np.where(partial, interpolated, year_at)
+    return np.where(reached.any(axis=-2), period, float(YEARS[-1]))
+
+
+def yearly_records(projection: Dict[str, np.ndarray], scenario: int) -> List[Dict[str, Any]]:
+    """Yearly rows of one scenario in the ``yearly_data`` layout used by reports"""
+    fields = ('yield', 'additional_yield', 'additional_revenue', 'cost', 'net_profit', 'cumulative_profit', 'roi')
+    columns = {name: projection[name][scenario].tolist() for name in fields}
+    return [
+        dict({'year': int(year)}, **{
+            f"{name}_{bound}": columns[name][y][b]
+            for name in fields for b, bound in enumerate(('low', 'high'))
+        })
+        for y, year in enumerate(YEARS.tolist())
+    ]
+
+
+def format_range(low: Optional[float], high: Optional[float], pattern: str = "{:,.0f}",
+                 prefix: str = '', suffix: str = '') -> str:
+    """Render a numeric (low, high) pair as e.g. 'RM 1,200-1,500' or '12.5-14.0 t/ha'"""
+    if low is None or high is None:
+        return 'N/A'
+    return f"{prefix}{pattern.format(low)}-{pattern.format(high)}{suffix}"
+
+
+def scenario_display(scenario: Dict[str, Any]) -> Dict[str, str]:
+    """Display strings of a scenario, formatted from its numeric fields.
+
+    Scenarios stored before the numeric fields existed keep their stored strings.
+    """
+    def pair(key):
+        values = scenario.get(key)
+        return values if isinstance(values, (list, tuple)) and len(values) == 2 else (None, None)
+
+    if 'total_cost' not in scenario:
+        return {key: scenario.get(key, 'N/A') for key in (
+            'cost_per_hectare_range', 'total_cost_range', 'new_yield_range', 'additional_yield_range',
+            'cumulative_net_profit_range', 'roi_5year_range', 'payback_period_range')}
+
+    capped = " (Capped for realism)" if scenario.get('roi_capped') else ''
+    return {
+        'cost_per_hectare_range': format_range(*pair('cost_per_hectare'), prefix='RM '),
+        'total_cost_range': format_range(*pair('total_cost'), prefix='RM '),
+        'new_yield_range': format_range(*pair('new_yield'), "{:.1f}", suffix=' t/ha'),
+        'additional_yield_range': format_range(*pair('additional_yield'), "{:.1f}", suffix=' t/ha'),
+        'cumulative_net_profit_range': format_range(*pair('cumulative_net_profit'), prefix='RM '),
+        'roi_5year_range': format_range(*pair('roi_5year'), "{:.0f}", suffix=f"%{capped}"),
+        'payback_period_range': format_range(*pair('payback_period'), "{:.1f}", suffix=' years')
+    }
+
+
+# Monte Carlo defaults: triangular distributions around the deterministic bands
+SIMULATION_DRAWS = 10000
+SIMULATION_PERCENTILES = (5, 25, 50, 75, 95)
+SIMULATION_FACTORS = ('ffb_price', 'fertilizer_cost', 'yield_response')
+# Distribution tails beyond the (low, high) band, as fractions of the band bounds
+PRICE_TAIL = (0.85, 1.15)
+COST_TAIL = (0.9, 1.15)
+YIELD_RESPONSE_TAIL = (0.7, 1.1)
+# Quantiles of the one-at-a-time sensitivity swings
+SENSITIVITY_QUANTILES = (0.1, 0.9)
+
+
+def _triangular_ppf(u: np.ndarray, left: Any, mode: Any, right: Any) -> np.ndarray:
+    """Inverse CDF of the triangular distribution, vectorized over u and the bounds"""
+    left, mode, right = (np.asarray(bound, dtype=float) for bound in (left, mode, right))
+    width = np.maximum(right - left, 1e-12)
+    split = (mode - left) / width
+    lower = left + np.sqrt(u * width * (mode - left))
+    upper = right - np.sqrt((1 - u) * width * (right - mode))
+    return np.where(u < split, lower, upper)
+
+
+def _distributions(new_yield: np.ndarray, cost_per_ha: np.ndarray, current_yield: float,
+                   ffb_price: Sequence[float]) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """(left, mode, right) of every uncertain factor; cost and yield are per scenario"""
+    price = np.asarray(ffb_price, dtype=float)
+    additional_yield = np.asarray(new_yield, dtype=float) - current_yield
+    cost_per_ha = np.asarray(cost_per_ha, dtype=float)
+    return {
+        'ffb_price': (price[0] * PRICE_TAIL[0], price.mean(), price[1] * PRICE_TAIL[1]),
+        'fertilizer_cost': (cost_per_ha[:, 0] * COST_TAIL[0], cost_per_ha.mean(axis=1), cost_per_ha[:, 1] * COST_TAIL[1]),
+        'yield_response': (additional_yield[:, 0] * YIELD_RESPONSE_TAIL[0], additional_yield.mean(axis=1),
+                           additional_yield[:, 1] * YIELD_RESPONSE_TAIL[1])
+    }
+
+
+def _evaluate_draws(quantiles: np.ndarray, distributions: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]],
+                    current_yield: float, land_size_ha: float, maintenance_per_ha: Any) -> Dict[str, np.ndarray]:
+    """Cumulative profit, ROI (uncapped) and payback per hectare for (draws, factors) quantiles.
+
+    Returns:
+        Dict of (draws, scenarios) arrays
+    """
+    price = _triangular_ppf(quantiles[:, 0], *distributions['ffb_price'])
+    cost = _triangular_ppf(quantiles[:, 1:2], *distributions['fertilizer_cost'])
+    additional_yield = _triangular_ppf(quantiles[:, 2:3], *distributions['yield_response'])
+
+    def both(values):
+        return np.stack([values, values], axis=-1)
+
+    projection = project(current_yield, both(current_yield + additional_yield), both(cost * land_size_ha),
+                         land_size_ha, both(price), maintenance_per_ha)
+
+    # One draw is a single outcome: average the low/high yield progression
+    net_profit = projection['net_profit'].mean(axis=-1)
+    cumulative = net_profit.sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        roi = np.where(cost > 0, cumulative / cost * 100, 0.0)
+    return {
+        'cumulative_net_profit': cumulative,
+        'roi_5year': roi,
+        'payback_period': payback_period(net_profit[..., None], cost[..., None])[..., 0]
+    }
+
+
+def simulate(current_yield: float, new_yield: Any, cost_per_ha: Any, land_size_ha: float,
+             scenarios: Sequence[str] = SCENARIOS, ffb_price: Sequence[float] = FFB_PRICE_RANGE,
+             maintenance_per_ha: Any = MAINTENANCE_COST_PER_HA, draws: int = SIMULATION_DRAWS,
+             seed: int = 0) -> Dict[str, Any]:
+    """Monte Carlo forecast and tornado sensitivity of the investment scenarios.
+
+    FFB price, fertilizer cost and yield response are drawn from triangular
+    distributions spanning each scenario's (low, high) band plus tails. Cost
+    and yield quantiles are shared across scenarios, so scenarios stay
+    comparable within a draw. All draws go through one project() call.
+
+    Args:
+        current_yield: Baseline yield in t/ha
+        new_yield: Target yield (low, high) per scenario, shape (scenarios, 2)
+        cost_per_ha: Initial investment (low, high) per hectare per scenario, shape (scenarios, 2)
+        land_size_ha: Land size in hectares
+        scenarios: Names of the scenario rows
+        ffb_price: FFB price band (low, high) in RM/tonne
+        maintenance_per_ha: Base yearly maintenance per scenario
+        draws: Number of Monte Carlo draws
+        seed: Random seed, so a forecast is reproducible
+
+    Returns:
+        Dict with per-scenario percentile bands of 5-year net profit, ROI and
+        payback per hectare, the probability of a loss, and a 'sensitivity'
+        table per scenario sorted by net profit swing
+    """
+    scenarios = list(scenarios)
+    distributions = _distributions(new_yield, cost_per_ha, current_yield, ffb_price)
+
+    rng = np.random.default_rng(seed)
+    outcomes = _evaluate_draws(rng.random((draws, len(SIMULATION_FACTORS))), distributions,
+                               current_yield, land_size_ha, maintenance_per_ha)
+    bands = {name: np.percentile(values, SIMULATION_PERCENTILES, axis=0) for name, values in outcomes.items()}
+    loss = (outcomes['cumulative_net_profit'] < 0).mean(axis=0)
+
+    # Tornado: move one factor to its low/high quantile with the others at their median
+    low_q, high_q = SENSITIVITY_QUANTILES
+    factor_count = len(SIMULATION_FACTORS)
+    quantiles = np.full((2 * factor_count + 1, factor_count), 0.5)
+    quantiles[np.arange(factor_count) * 2, np.arange(factor_count)] = low_q
+    quantiles[np.arange(factor_count) * 2 + 1, np.arange(factor_count)] = high_q
+    swings = _evaluate_draws(quantiles, distributions, current_yield, land_size_ha,
+                             maintenance_per_ha)['cumulative_net_profit']
+    factor_values = {
+        name: _triangular_ppf(np.array([[low_q], [high_q]]), *distributions[name]) for name in SIMULATION_FACTORS
+    }
+
+    labels = [f"p{p}" for p in SIMULATION_PERCENTILES]
+    results = {}
+    sensitivity = {}
+    for s, scenario in enumerate(scenarios):
+        results[scenario] = {
+            name: dict(zip(labels, band[:, s].tolist())) for name, band in bands.items()
+        }
+        results[scenario]['probability_of_loss'] = float(loss[s])
+
+        rows = []
+        for f, factor in enumerate(SIMULATION_FACTORS):
+            values = np.broadcast_to(factor_values[factor], (2, len(scenarios)))[:, s]
+            at_low, at_high = swings[2 * f, s], swings[2 * f + 1, s]
+            rows.append({
+                'factor': factor,
+                'low_value': float(values[0]),
+                'high_value': float(values[1]),
+                'net_profit_at_low': float(at_low),
+                'net_profit_at_high': float(at_high),
+                'swing': float(abs(at_high - at_low))
+            })
+        rows.sort(key=lambda row: row['swing'], reverse=True)
+        sensitivity[scenario] = {'baseline_net_profit': float(swings[-1, s]), 'factors': rows}
+
+    return {
+        'draws': draws,
+        'seed': seed,
+        'percentiles': list(SIMULATION_PERCENTILES),
+        'distributions': {
+            name: {'left': np.asarray(left).tolist(), 'mode': np.asarray(mode).tolist(), 'right': np.asarray(right).tolist()}
+            for name, (left, mode, right) in distributions.items()
+        },
+        'scenarios': results,
+        'sensitivity': sensitivity
+    }
@@ -0,0 +1,1016 @@
+"""
+Findings Engine
+Key findings and executive summary for one analysis, computed once when the
+analysis completes and stored on the analysis result under 'findings'. The
+results page and the PDF report both render this stored output, so neither
+re-mines the step texts on every view or export. Results saved before the
+engine existed get their findings built on first use.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+try:
+    from utils.parameter_standardizer import parameter_standardizer
+    from utils.stage_cache import fingerprint
+    from utils.standards_registry import standards_registry
+except ImportError:
+    from parameter_standardizer import parameter_standardizer
+    from stage_cache import fingerprint
+    from standards_registry import standards_registry
+
+logger = logging.getLogger(__name__)
+
+# Bump when finding extraction changes so stored findings are rebuilt
+FINDINGS_FORMAT = 3
+
+FINDINGS_FIELD = 'findings'
+
+# Fields the engine writes back onto the analysis result; not part of its inputs
+_DERIVED_FIELDS = (FINDINGS_FIELD, 'executive_summary')
+
+
+def clean_finding_text(text):
+    """Clean finding text by removing all 'Key Finding' prefixes and persona text, then normalizing"""
+    import re
+
+    # Remove all variations of "Key finding X:" and "Key Finding X:" prefixes
+    # Pattern 1: "Key finding X:" (lowercase)
+    text = re.sub(r'^Key finding \d+:\s*', '', text, flags=re.MULTILINE | re.IGNORECASE)
+
+    # Pattern 2: "Key Finding X:" (title case)
+    text = re.sub(r'^Key Finding \d+:\s*', '', text, flags=re.MULTILINE | re.IGNORECASE)
+
+    # Pattern 3: Remove any remaining "Key finding" or "Key Finding" at start of lines
+    text = re.sub(r'^(Key finding|Key Finding)\s*\d*:\s*', '', text, flags=re.MULTILINE | re.IGNORECASE)
+
+    # Pattern 4: Remove duplicate "Key Finding" patterns that might remain
+    text = re.sub(r'Key Finding \d+:\s*Key finding \d+:\s*', '', text)
+    text = re.sub(r'^(Key Finding \d+:\s*)+', '', text)
+
+    # Apply persona cleaning to remove any persona text
+    text = sanitize_persona_and_enforce_article(text)
+
+    # Clean up extra spaces and normalize
+    text = re.sub(r'\s+', ' ', text).strip()
+
+    # Remove leading/trailing punctuation that might remain
+    text = re.sub(r'^[^\w]*', '', text)
+    text = re.sub(r'[^\w]*$', '', text)
+
+    return text.strip()
+
+# Parameter vocabulary for grouping findings - all 9 soil and 8 leaf parameters,
+# land & yield, and legacy names. Order matters: the first parameter a finding
+# mentions in this order is the one it is grouped under.
+PARAMETER_VARIATIONS = {
+    # Soil Parameters (9)
+    'ph': ['ph', 'ph level', 'soil ph', 'acidity', 'alkalinity'],
+    'nitrogen': ['nitrogen', 'n', 'n%', 'n_%', 'nitrogen%', 'nitrogen_%'],
+    'organic_carbon': ['organic carbon', 'organic_carbon', 'carbon', 'c', 'c%', 'c_%', 'organic_carbon_%'],
+    'total_phosphorus': ['total phosphorus', 'total p', 'total_p', 'total phosphorus mg/kg', 'total_p_mg_kg'],
+    'available_phosphorus': ['available phosphorus', 'available p', 'available_p', 'available phosphorus mg/kg', 'available_p_mg_kg'],
+    'exchangeable_potassium': ['exchangeable potassium', 'exch k', 'exch_k', 'exchangeable k', 'exchangeable_k', 'k meq/100 g', 'k_meq/100 g', 'exchangeable_k_meq/100 g'],
+    'exchangeable_calcium': ['exchangeable calcium', 'exch ca', 'exch_ca', 'exchangeable ca', 'exchangeable_ca', 'ca meq/100 g', 'ca_meq/100 g', 'exchangeable_ca_meq/100 g'],
+    'exchangeable_magnesium': ['exchangeable magnesium', 'exch mg', 'exch_mg', 'exchangeable mg', 'exchangeable_mg', 'mg meq/100 g', 'mg_meq/100 g', 'exchangeable_mg_meq/100 g'],
+    'cec': ['cec', 'cation exchange capacity', 'c.e.c', 'cec meq/100 g', 'cec_meq/100 g'],
+
+    # Leaf Parameters (8)
+    'leaf_nitrogen': ['leaf nitrogen', 'leaf n', 'leaf_n', 'n%', 'n_%', 'nitrogen%', 'nitrogen_%'],
+    'leaf_phosphorus': ['leaf phosphorus', 'leaf p', 'leaf_p', 'p%', 'p_%', 'phosphorus%', 'phosphorus_%'],
+    'leaf_potassium': ['leaf potassium', 'leaf k', 'leaf_k', 'k%', 'k_%', 'potassium%', 'potassium_%'],
+    'leaf_magnesium': ['leaf magnesium', 'leaf mg', 'leaf_mg', 'mg%', 'mg_%', 'magnesium%', 'magnesium_%'],
+    'leaf_calcium': ['leaf calcium', 'leaf ca', 'leaf_ca', 'ca%', 'ca_%', 'calcium%', 'calcium_%'],
+    'leaf_boron': ['leaf boron', 'leaf b', 'leaf_b', 'b mg/kg', 'b_mg_kg', 'boron mg/kg', 'boron_mg_kg'],
+    'leaf_copper': ['leaf copper', 'leaf cu', 'leaf_cu', 'cu mg/kg', 'cu_mg_kg', 'copper mg/kg', 'copper_mg_kg'],
+    'leaf_zinc': ['leaf zinc', 'leaf zn', 'leaf_zn', 'zn mg/kg', 'zn_mg_kg', 'zinc mg/kg', 'zinc_mg_kg'],
+
+    # Land & Yield Parameters
+    'land_size': ['land size', 'land_size', 'farm size', 'farm_size', 'area', 'hectares', 'acres', 'square meters', 'square_meters'],
+    'current_yield': ['current yield', 'current_yield', 'yield', 'production', 'tonnes/hectare', 'kg/hectare', 'tonnes/acre', 'kg/acre', 'yield per hectare', 'yield per acre'],
+    'yield_forecast': ['yield forecast', 'yield_forecast', 'projected yield', 'projected_yield', 'future yield', 'future_yield', 'yield projection', 'yield_projection'],
+    'economic_impact': ['economic impact', 'economic_impact', 'roi', 'return on investment', 'cost benefit', 'cost_benefit', 'profitability', 'revenue', 'income'],
+
+    # Legacy mappings for backward compatibility
+    'phosphorus': ['phosphorus', 'p', 'p%', 'p_%', 'phosphorus%', 'available p'],
+    'potassium': ['potassium', 'k', 'k%', 'k_%', 'potassium%'],
+    'calcium': ['calcium', 'ca', 'ca%', 'ca_%', 'calcium%'],
+    'magnesium': ['magnesium', 'mg', 'mg%', 'mg_%', 'magnesium%'],
+    'copper': ['copper', 'cu', 'cu mg/kg', 'cu_mg/kg', 'copper mg/kg'],
+    'zinc': ['zinc', 'zn', 'zn mg/kg', 'zn_mg/kg', 'zinc mg/kg'],
+    'boron': ['boron', 'b', 'b mg/kg', 'b_mg/kg', 'boron mg/kg']
+}
+
+SEVERITY_WORDS = ('critical', 'severe', 'high', 'low', 'deficiency', 'excess', 'optimum', 'below', 'above')
+
+# Each variation maps to the first parameter that lists it
+_PARAMETER_ORDER = {param: order for order, param in enumerate(PARAMETER_VARIATIONS)}
+_VARIATION_TO_PARAMETER = {}
+for _param, _variations in PARAMETER_VARIATIONS.items():
+    for _variation in _variations:
+        _VARIATION_TO_PARAMETER.setdefault(_variation, _param)
+
+# One pass per finding: longest variations first, matched as whole terms so that
+# 'n' or 'mg' do not fire inside other words or units like 'mg/kg'. The leading
+# lookahead lets the scanner skip positions no variation can start at.
+_PARAMETER_RE = re.compile(
+    r'(?<![a-z0-9_/])(?=[' + ''.join(sorted({re.escape(v[0]) for v in _VARIATION_TO_PARAMETER})) + r'])('
+    + '|'.join(re.escape(v) for v in sorted(_VARIATION_TO_PARAMETER, key=len, reverse=True)) + r')(?![a-z0-9_/])')
+_SEVERITY_RE = re.compile(r'(?<![a-z])(' + '|'.join(SEVERITY_WORDS) + r')')
+_VALUE_RE = re.compile(r'\d+\.?\d*%?')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@dataclass(frozen=True)
+class FindingSignature:
+    """Concepts of one finding, extracted once: parameters, severity words and values"""
+    parameter: str
+    parameters: FrozenSet[str]
+    severity: Tuple[str, ...]
+    values: Tuple[str, ...]
+    text: str
+
+    @property
+    def bucket(self) -> Tuple[str, str]:
+        """Hash-map key of the findings this one may be merged with"""
+        # Findings naming no parameter only merge with exact repeats of themselves
+        return (self.parameter, '') if self.parameter != 'other' else ('other', self.text)
+
+
+def finding_signature(text: str) -> FindingSignature:
+    """Concept signature of a finding"""
+    text_lower = _WHITESPACE_RE.sub(' ', text.lower()).strip()
+    parameters = frozenset(_VARIATION_TO_PARAMETER[match] for match in _PARAMETER_RE.findall(text_lower))
+    parameter = min(parameters, key=_PARAMETER_ORDER.__getitem__) if parameters else 'other'
+    return FindingSignature(
+        parameter=parameter,
+        parameters=parameters,
+        severity=tuple(dict.fromkeys(_SEVERITY_RE.findall(text_lower))),
+        values=tuple(_VALUE_RE.findall(text)),
+        text=text_lower,
+    )
+
+
+def merge_parameter_group_findings(param, group):
+    """Merge all findings in a parameter bucket into one comprehensive finding
+
+    Args:
+        param: Parameter the bucket is keyed on
+        group: (finding_data, signature) pairs in arrival order
+    """
+    # Repeats of the same text need no merging
+    if len({signature.text for _, signature in group}) == 1:
+        finding_data = dict(group[0][0])
+        finding_data['source'] = ', '.join(dict.fromkeys(data['source'] for data, _ in group))
+        return finding_data
+
+    unique_values = list(dict.fromkeys(value for _, signature in group for value in signature.values))
+    unique_severity = {word for _, signature in group for word in signature.severity}
+    unique_sources = list(dict.fromkeys(data['source'] for data, _ in group))
+
+    # Determine parameter name
+    param_name = param.upper() if param != 'ph' else 'pH'
+
+    # Determine severity level
+    if 'critical' in unique_severity or 'severe' in unique_severity:
+        severity_desc = "critical"
+    elif 'high' in unique_severity:
+        severity_desc = "significant"
+    elif 'low' in unique_severity:
+        severity_desc = "moderate"
+    else:
+        severity_desc = "notable"
+
+    # Build comprehensive finding
+    if param == 'ph':
+        comprehensive_finding = f"Soil {param_name} shows {severity_desc} issues with values of {', '.join(unique_values)}. "
+    else:
+        comprehensive_finding = f"{param_name} levels show {severity_desc} issues with values of {', '.join(unique_values)}. "
+
+    # Add context
+    context_parts = []
+    if 'deficiency' in unique_severity:
+        context_parts.append("deficiency")
+    if 'excess' in unique_severity:
+        context_parts.append("excess")
+    if 'below' in unique_severity:
+        context_parts.append("below optimal levels")
+    if 'above' in unique_severity:
+        context_parts.append("above optimal levels")
+
+    if context_parts:
+        comprehensive_finding += f"This indicates {', '.join(context_parts)}. "
+
+    # Add impact information
+    if 'critical' in unique_severity or 'severe' in unique_severity:
+        comprehensive_finding += "This directly impacts crop yield and requires immediate attention."
+    elif 'high' in unique_severity:
+        comprehensive_finding += "This significantly affects plant health and productivity."
+    else:
+        comprehensive_finding += "This affects overall plant performance and should be addressed."
+
+    return {
+        'finding': comprehensive_finding,
+        'source': ', '.join(unique_sources)
+    }
+
+
+def dedupe_findings(findings_list):
+    """Group findings by concept signature and merge each group into one finding.
+
+    Each finding's signature is computed once and findings are bucketed in a
+    dict keyed on it, so the cost is linear in the number of findings. Buckets
+    keep the order in which their first finding arrived.
+    """
+    buckets = {}
+    for finding_data in findings_list:
+        signature = finding_signature(finding_data['finding'])
+        buckets.setdefault(signature.bucket, []).append((finding_data, signature))
+
+    merged_findings = []
+    for (param, _), group in buckets.items():
+        if len(group) == 1:
+            # Single finding, keep as is
+            merged_findings.append(group[0][0])
+        else:
+            merged_findings.append(merge_parameter_group_findings(param, group))
+    return merged_findings
+
+
+def generate_intelligent_key_findings(analysis_results, step_results):
+    """Generate comprehensive intelligent key findings grouped by parameter with proper deduplication"""
+    all_key_findings = []
+    
+    # 1. Check for key findings at the top level of analysis_results
+    if 'key_findings' in analysis_results and analysis_results['key_findings']:
+        findings_data = analysis_results['key_findings']
+        
+        # Handle both list and string formats
+        if isinstance(findings_data, list):
+            findings_list = findings_data
+        elif isinstance(findings_data, str):
+            findings_list = [f.strip() for f in findings_data.split('\n') if f.strip()]
+        else:
+            findings_list = []
+        
+        # Process each finding
+        for finding in findings_list:
+            if isinstance(finding, str) and finding.strip():
+                cleaned_finding = clean_finding_text(finding.strip())
+                all_key_findings.append({
+                    'finding': cleaned_finding,
+                    'source': 'Overall Analysis'
+                })
+    
+    # 2. Extract comprehensive key findings from step-by-step analysis
+    if step_results:
+        step_findings = []
+        
+        for step in step_results:
+            if not isinstance(step, dict):
+                logger.warning(f"Step is not a dict, skipping: {type(step)}")
+                continue
+            step_number = step.get('step_number', 0)
+            step_title = step.get('step_title', f'Step {step_number}')
+            
+            # Extract findings from multiple step sources
+            step_sources = []
+            
+            # Direct key_findings field
+            if 'key_findings' in step and step['key_findings']:
+                step_sources.append(('key_findings', step['key_findings']))
+            
+            # Summary field
+            if 'summary' in step and step['summary']:
+                step_sources.append(('summary', step['summary']))
+            
+            # Detailed analysis field
+            if 'detailed_analysis' in step and step['detailed_analysis']:
+                step_sources.append(('detailed_analysis', step['detailed_analysis']))
+            
+            # Issues identified
+            if 'issues_identified' in step and step['issues_identified']:
+                step_sources.append(('issues_identified', step['issues_identified']))
+            
+            # Recommendations
+            if 'recommendations' in step and step['recommendations']:
+                step_sources.append(('recommendations', step['recommendations']))
+            
+            # Process each source
+            for source_type, source_data in step_sources:
+                findings_list = []
+                
+                # Handle different data formats
+                if isinstance(source_data, list):
+                    findings_list = source_data
+                elif isinstance(source_data, str):
+                    # Split by common delimiters and clean
+                    lines = source_data.split('\n')
+                    findings_list = [line.strip() for line in lines if line.strip()]
+                else:
+                    continue
+                
+                # Extract key findings from each item
+                for finding in findings_list:
+                    if isinstance(finding, str) and finding.strip():
+                        # Enhanced keyword filtering for better relevance
+                        finding_lower = finding.lower()
+                        relevant_keywords = [
+                            'deficiency', 'critical', 'severe', 'low', 'high', 'optimum', 'ph', 'nutrient', 'yield',
+                            'recommendation', 'finding', 'issue', 'problem', 'analysis', 'result', 'conclusion',
+                            'soil', 'leaf', 'land', 'hectares', 'acres', 'tonnes', 'production', 'economic',
+                            'roi', 'investment', 'cost', 'benefit', 'profitability', 'forecast', 'projection',
+                            'improvement', 'increase', 'decrease', 'balance', 'ratio', 'level', 'status',
+                            'nitrogen', 'phosphorus', 'potassium', 'calcium', 'magnesium', 'carbon', 'cec',
+                            'boron', 'zinc', 'copper', 'manganese', 'iron', 'sulfur', 'chlorine'
+                        ]
+                        
+                        # Check if finding contains relevant keywords
+                        if any(keyword in finding_lower for keyword in relevant_keywords):
+                            cleaned_finding = clean_finding_text(finding.strip())
+                            if cleaned_finding and len(cleaned_finding) > 20:  # Minimum length filter
+                                step_findings.append({
+                                    'finding': cleaned_finding,
+                                    'source': f"{step_title} ({source_type.replace('_', ' ').title()})"
+                                })
+        
+        # Step findings are deduplicated with everything else below
+        all_key_findings.extend(step_findings)
+    
+    # 3. Generate comprehensive parameter-specific key findings
+    comprehensive_findings = generate_comprehensive_parameter_findings(analysis_results, step_results)
+    all_key_findings.extend(comprehensive_findings)
+    
+    # 4. Extract key findings from other analysis sources
+    # Land and yield data
+    land_yield_data = analysis_results.get('land_yield_data', {})
+    if land_yield_data:
+        land_size = land_yield_data.get('land_size', 0)
+        current_yield = land_yield_data.get('current_yield', 0)
+        land_unit = land_yield_data.get('land_unit', 'hectares')
+        yield_unit = land_yield_data.get('yield_unit', 'tonnes/hectare')
+        
+        if land_size > 0:
+            all_key_findings.append({
+                'finding': f"Farm analysis covers {land_size} {land_unit} of agricultural land with current production of {current_yield} {yield_unit}.",
+                'source': 'Land & Yield Data'
+            })
+    
+    # Economic forecast
+    economic_forecast = analysis_results.get('economic_forecast', {})
+    if economic_forecast:
+        scenarios = economic_forecast.get('scenarios', {})
+        if scenarios:
+            best_roi = 0
+            best_scenario = ""
+            for level, data in scenarios.items():
+                if isinstance(data, dict) and data.get('roi_percentage', 0) > best_roi:
+                    best_roi = data.get('roi_percentage', 0)
+                    best_scenario = level
+            
+            if best_roi > 0:
+                all_key_findings.append({
+                    'finding': f"Economic analysis shows {best_scenario} investment level offers the best ROI of {best_roi:.1f}% with {scenarios[best_scenario].get('payback_months', 0):.1f} months payback period.",
+                    'source': 'Economic Forecast'
+                })
+    
+    # Yield forecast
+    yield_forecast = analysis_results.get('yield_forecast', {})
+    if yield_forecast:
+        projected_yield = yield_forecast.get('projected_yield', 0)
+        current_yield = yield_forecast.get('current_yield', 0)
+        
+        # Ensure both values are numeric
+        try:
+            projected_yield = float(projected_yield) if projected_yield is not None else 0
+        except (ValueError, TypeError):
+            projected_yield = 0
+            
+        try:
+            current_yield = float(current_yield) if current_yield is not None else 0
+        except (ValueError, TypeError):
+            current_yield = 0
+            
+        if projected_yield > 0 and current_yield > 0:
+            increase = ((projected_yield - current_yield) / current_yield) * 100
+            all_key_findings.append({
+                'finding': f"Yield projection indicates potential increase from {current_yield} to {projected_yield} tonnes/hectare ({increase:.1f}% improvement) with proper management.",
+                'source': 'Yield Forecast'
+            })
+    
+    # Merge findings that share a concept signature
+    if all_key_findings:
+        all_key_findings = dedupe_findings(all_key_findings)
+    
+    return all_key_findings
+
+def generate_comprehensive_parameter_findings(analysis_results, step_results):
+    """Generate comprehensive key findings grouped by specific parameters"""
+    findings = []
+    
+    # Get raw data for analysis
+    raw_data = analysis_results.get('raw_data', {})
+    soil_params = raw_data.get('soil_parameters', {}).get('parameter_statistics', {})
+    leaf_params = raw_data.get('leaf_parameters', {}).get('parameter_statistics', {})
+    
+    # Soil averages keyed by canonical parameter, whatever names the data uses
+    soil_averages = {}
+    for name, stats in soil_params.items():
+        param = parameter_standardizer.resolve(name, 'soil')
+        if param and isinstance(stats, dict):
+            soil_averages.setdefault(param, stats.get('average') or 0)
+
+    # MPOB standards for comparison (admin overrides included)
+    soil_standards = standards_registry.status_standards('soil')
+    
+    # 1. Soil pH Analysis
+    if 'pH' in soil_averages and 'pH' in soil_standards:
+        ph_value = soil_averages['pH']
+        ph_min, ph_max = soil_standards['pH']['min'], soil_standards['pH']['max']
+        
+        if ph_value > 0:
+            if ph_value < ph_min:
+                findings.append({
+                    'finding': f"Soil pH is critically low at {ph_value:.1f}, significantly below optimal range of {ph_min}-{ph_max}. This acidic condition severely limits nutrient availability and root development.",
+                    'source': 'Soil Analysis - pH'
+                })
+            elif ph_value > ph_max:
+                findings.append({
+                    'finding': f"Soil pH is high at {ph_value:.1f}, above optimal range of {ph_min}-{ph_max}. This alkaline condition reduces availability of essential micronutrients like iron and zinc.",
+                    'source': 'Soil Analysis - pH'
+                })
+            else:
+                findings.append({
+                    'finding': f"Soil pH is within optimal range at {ph_value:.1f}, providing good conditions for nutrient availability and root development.",
+                    'source': 'Soil Analysis - pH'
+                })
+    
+    # 2. Soil Nitrogen Analysis
+    if 'N (%)' in soil_averages and 'N (%)' in soil_standards:
+        n_value = soil_averages['N (%)']
+        n_optimal = soil_standards['N (%)']['optimal']
+        
+        if n_value > 0:
+            if n_value < n_optimal * 0.7:
+                findings.append({
+                    'finding': f"Soil nitrogen is critically deficient at {n_value:.2f}%, well below optimal level of {n_optimal:.2f}%. This severely limits plant growth and leaf development.",
+                    'source': 'Soil Analysis - Nitrogen'
+                })
+            elif n_value > n_optimal * 1.3:
+                findings.append({
+                    'finding': f"Soil nitrogen is excessive at {n_value:.2f}%, above optimal level of {n_optimal:.2f}%. This may cause nutrient imbalances and environmental concerns.",
+                    'source': 'Soil Analysis - Nitrogen'
+                })
+            else:
+                findings.append({
+                    'finding': f"Soil nitrogen is adequate at {n_value:.2f}%, within optimal range for healthy plant growth.",
+                    'source': 'Soil Analysis - Nitrogen'
+                })
+    
+    # 3. Soil Phosphorus Analysis
+    if 'Avail P (mg/kg)' in soil_averages and 'Avail P (mg/kg)' in soil_standards:
+        p_value = soil_averages['Avail P (mg/kg)']
+        p_optimal = soil_standards['Avail P (mg/kg)']['optimal']
+        
+        if p_value > 0:
+            if p_value < p_optimal * 0.5:
+                findings.append({
+                    'finding': f"Available phosphorus is critically low at {p_value:.1f} mg/kg, severely below optimal level of {p_optimal} mg/kg. This limits root development and energy transfer.",
+                    'source': 'Soil Analysis - Phosphorus'
+                })
+            elif p_value > p_optimal * 2:
+                findings.append({
+                    'finding': f"Available phosphorus is excessive at {p_value:.1f} mg/kg, well above optimal level of {p_optimal} mg/kg. This may cause nutrient lockup and environmental issues.",
+                    'source': 'Soil Analysis - Phosphorus'
+                })
+            else:
+                findings.append({
+                    'finding': f"Available phosphorus is adequate at {p_value:.1f} mg/kg, within optimal range for proper plant development.",
+                    'source': 'Soil Analysis - Phosphorus'
+                })
+    
+    # 4. Soil Potassium Analysis
+    if 'Exch. K (meq/100 g)' in soil_averages and 'Exch. K (meq/100 g)' in soil_standards:
+        k_value = soil_averages['Exch. K (meq/100 g)']
+        k_optimal = soil_standards['Exch. K (meq/100 g)']['optimal']
+        
+        if k_value > 0:
+            if k_value < k_optimal * 0.6:
+                findings.append({
+                    'finding': f"Exchangeable potassium is deficient at {k_value:.2f} meq/100 g, below optimal level of {k_optimal:.2f} meq/100 g. This affects water regulation and disease resistance.",
+                    'source': 'Soil Analysis - Potassium'
+                })
+            elif k_value > k_optimal * 1.5:
+                findings.append({
+                    'finding': f"Exchangeable potassium is high at {k_value:.2f} meq/100 g, above optimal level of {k_optimal:.2f} meq/100 g. This may cause nutrient imbalances.",
+                    'source': 'Soil Analysis - Potassium'
+                })
+            else:
+                findings.append({
+                    'finding': f"Exchangeable potassium is adequate at {k_value:.2f} meq/100 g, within optimal range for healthy plant function.",
+                    'source': 'Soil Analysis - Potassium'
+                })
+    
+    # 5. Leaf Nutrient Analysis
+    if leaf_params:
+        # Leaf Nitrogen
+        if 'N_%' in leaf_params:
+            leaf_n = leaf_params['N_%'].get('average', 0)
+            if leaf_n > 0:
+                if leaf_n < 2.6:
+                    findings.append({
+                        'finding': f"Leaf nitrogen is deficient at {leaf_n:.1f}%, below optimal range of 2.4-2.8%. This indicates poor nitrogen uptake and affects photosynthesis.",
+                        'source': 'Leaf Analysis - Nitrogen'
+                    })
+                elif leaf_n > 3.2:
+                    findings.append({
+                        'finding': f"Leaf nitrogen is excessive at {leaf_n:.1f}%, above optimal range of 2.4-2.8%. This may cause nutrient imbalances and delayed maturity.",
+                        'source': 'Leaf Analysis - Nitrogen'
+                    })
+                else:
+                    findings.append({
+                        'finding': f"Leaf nitrogen is optimal at {leaf_n:.1f}%, within MPOB recommended range for healthy palm growth.",
+                        'source': 'Leaf Analysis - Nitrogen'
+                    })
+        
+        # Leaf Phosphorus
+        if 'P_%' in leaf_params:
+            leaf_p = leaf_params['P_%'].get('average', 0)
+            if leaf_p > 0:
+                if leaf_p < 0.16:
+                    findings.append({
+                        'finding': f"Leaf phosphorus is deficient at {leaf_p:.2f}%, below optimal range of 0.16-0.22%. This limits energy transfer and root development.",
+                        'source': 'Leaf Analysis - Phosphorus'
+                    })
+                elif leaf_p > 0.22:
+                    findings.append({
+                        'finding': f"Leaf phosphorus is high at {leaf_p:.2f}%, above optimal range of 0.16-0.22%. This may indicate over-fertilization.",
+                        'source': 'Leaf Analysis - Phosphorus'
+                    })
+                else:
+                    findings.append({
+                        'finding': f"Leaf phosphorus is adequate at {leaf_p:.2f}%, within MPOB optimal range for proper plant function.",
+                        'source': 'Leaf Analysis - Phosphorus'
+                    })
+        
+        # Leaf Potassium
+        if 'K_%' in leaf_params:
+            leaf_k = leaf_params['K_%'].get('average', 0)
+            if leaf_k > 0:
+                if leaf_k < 1.3:
+                    findings.append({
+                        'finding': f"Leaf potassium is deficient at {leaf_k:.1f}%, below optimal range of 1.3-1.7%. This affects water regulation and disease resistance.",
+                        'source': 'Leaf Analysis - Potassium'
+                    })
+                elif leaf_k > 1.7:
+                    findings.append({
+                        'finding': f"Leaf potassium is high at {leaf_k:.1f}%, above optimal range of 1.3-1.7%. This may cause nutrient imbalances.",
+                        'source': 'Leaf Analysis - Potassium'
+                    })
+                else:
+                    findings.append({
+                        'finding': f"Leaf potassium is optimal at {leaf_k:.1f}%, within MPOB recommended range for healthy palm growth.",
+                        'source': 'Leaf Analysis - Potassium'
+                    })
+        
+        # Leaf Magnesium - Conditional recommendation considering GML and K:Mg ratio
+        if 'Mg_%' in leaf_params:
+            leaf_mg = leaf_params['Mg_%'].get('average', 0)
+            if leaf_mg > 0:
+                if leaf_mg < 0.28:  # Only recommend kieserite if clearly deficient
+                    # Check if K:Mg ratio is also problematic
+                    leaf_k = leaf_params.get('K_%', {}).get('average', 0)
+                    if leaf_k > 0:
+                        k_mg_ratio = leaf_k / leaf_mg if leaf_mg > 0 else 0
+                        if k_mg_ratio > 2.0:  # K:Mg ratio too high
+                            findings.append({
+                                'finding': f"Leaf magnesium is deficient at {leaf_mg:.2f}% with high K:Mg ratio of {k_mg_ratio:.1f}. Kieserite recommended only after GML correction and if K:Mg ratio remains >2.0.",
+                                'source': 'Leaf Analysis - Magnesium'
+                            })
+                        else:
+                            findings.append({
+                                'finding': f"Leaf magnesium is deficient at {leaf_mg:.2f}% but K:Mg ratio is acceptable. Consider GML first before kieserite application.",
+                                'source': 'Leaf Analysis - Magnesium'
+                            })
+                    else:
+                        findings.append({
+                            'finding': f"Leaf magnesium is deficient at {leaf_mg:.2f}%. Consider GML application first, then kieserite only if needed after GML correction.",
+                            'source': 'Leaf Analysis - Magnesium'
+                        })
+                elif leaf_mg > 0.38:  # Only flag when clearly excessive
+                    findings.append({
+                        'finding': f"Leaf magnesium is high at {leaf_mg:.2f}%, above MPOB optimal range of 0.28-0.38%. Monitor for nutrient imbalances.",
+                        'source': 'Leaf Analysis - Magnesium'
+                    })
+                # No recommendation for adequate levels (0.28-0.38%)
+        
+        # Leaf Calcium
+        if 'Ca_%' in leaf_params:
+            leaf_ca = leaf_params['Ca_%'].get('average', 0)
+            if leaf_ca > 0:
+                if leaf_ca < 0.5:
+                    findings.append({
+                        'finding': f"Leaf calcium is deficient at {leaf_ca:.1f}%, below optimal range of 0.5-1.0%. This affects cell wall strength and fruit quality.",
+                        'source': 'Leaf Analysis - Calcium'
+                    })
+                elif leaf_ca > 1.0:
+                    findings.append({
+                        'finding': f"Leaf calcium is high at {leaf_ca:.1f}%, above optimal range of 0.5-1.0%. This may cause nutrient imbalances.",
+                        'source': 'Leaf Analysis - Calcium'
+                    })
+                else:
+                    findings.append({
+                        'finding': f"Leaf calcium is optimal at {leaf_ca:.1f}%, within recommended range for healthy palm growth.",
+                        'source': 'Leaf Analysis - Calcium'
+                    })
+        
+        # Leaf Boron - Conditional recommendation only when deficient
+        if 'B_mg_kg' in leaf_params:
+            leaf_b = leaf_params['B_mg_kg'].get('average', 0)
+            if leaf_b > 0:
+                if leaf_b < 12:  # Only recommend when clearly deficient
+                    findings.append({
+                        'finding': f"Leaf boron is deficient at {leaf_b:.1f} mg/kg, below critical threshold of 12 mg/kg. Boron supplementation recommended only for this specific deficiency.",
+                        'source': 'Leaf Analysis - Boron'
+                    })
+                elif leaf_b > 25:  # Only flag when clearly excessive
+                    findings.append({
+                        'finding': f"Leaf boron is high at {leaf_b:.1f} mg/kg, above optimal range. Monitor for toxicity symptoms.",
+                        'source': 'Leaf Analysis - Boron'
+                    })
+                # No recommendation for adequate levels (12-25 mg/kg)
+    
+    return findings
+
+
+def sanitize_persona_and_enforce_article(text):
+    """Remove persona phrases and ensure the text starts with 'The'.
+
+    - Strips phrases like 'As an experienced agronomist', 'As your consulting agronomist',
+      'As an expert', 'my analysis', 'I recommend', etc.
+    - Replaces 'our' with 'The' and removes 'my' and other first-person pronouns
+    - If first non-space word is not 'The' (case-insensitive), prepend 'The ' (with capitalization).
+    """
+    try:
+        if not isinstance(text, str):
+            return text
+        cleaned = text
+        # Remove common persona prefixes (at start of text OR start of any line)
+        import re
+        persona_line_patterns = [
+            r"^[\t ]*As\s+an\s+experienced\s+agronomist[,\s:]+",
+            r"^[\t ]*As\s+your\s+consulting\s+agronomist[,\s:]+",
+            r"^[\t ]*As\s+an\s+expert[,\s:]+",
+            r"^[\t ]*As\s+a\s+consulting\s+agronomist[,\s:]+",
+            r"^[\t ]*As\s+your\s+agronomist[,\s:]+",
+            r"^[\t ]*As\s+an\s+agronomist[,\s:]+",
+            r"^[\t ]*As\s+an\s+agronomist\s+with\s+over\s+two\s+decades[,\s:]+",
+            r"^[\t ]*As\s+a\s+seasoned\s+agronomist[,\s:]+",
+            r"^[\t ]*As\s+your\s+trusted\s+agronomist[,\s:]+",
+            r"^[\t ]*As\s+an\s+agricultural\s+expert[,\s:]+",
+            r"^[\t ]*As\s+a\s+professional\s+agronomist[,\s:]+",
+            r"^[\t ]*Drawing\s+from\s+my\s+decades\s+of\s+experience[,\s:]+",
+            r"^[\t ]*With\s+my\s+extensive\s+experience[,\s:]+",
+            r"^[\t ]*Based\s+on\s+my\s+expertise[,\s:]+",
+            r"^[\t ]*From\s+my\s+decades\s+of\s+experience[,\s:]+",
+            r"^[\t ]*In\s+my\s+professional\s+opinion[,\s:]+",
+        ]
+        for pattern in persona_line_patterns:
+            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE | re.MULTILINE)
+        # Also remove inline occurrences that may follow headings
+        inline_persona_patterns = [
+            r"(\n|^)\s*As\s+an\s+experienced\s+agronomist[,\s:]+",
+            r"(\n|^)\s*As\s+your\s+consulting\s+agronomist[,\s:]+",
+            r"(\n|^)\s*As\s+a\s+consulting\s+agronomist[,\s:]+",
+            r"(\n|^)\s*As\s+your\s+agronomist[,\s:]+",
+            r"(\n|^)\s*As\s+an\s+agronomist[,\s:]+",
+            r"(\n|^)\s*As\s+an\s+agronomist\s+with\s+over\s+two\s+decades[,\s:]+",
+            r"(\n|^)\s*As\s+a\s+seasoned\s+agronomist[,\s:]+",
+            r"(\n|^)\s*As\s+your\s+trusted\s+agronomist[,\s:]+",
+            r"(\n|^)\s*As\s+an\s+agricultural\s+expert[,\s:]+",
+            r"(\n|^)\s*As\s+a\s+professional\s+agronomist[,\s:]+",
+            r"(\n|^)\s*Drawing\s+from\s+my\s+decades\s+of\s+experience[,\s:]+",
+            r"(\n|^)\s*With\s+my\s+extensive\s+experience[,\s:]+",
+            r"(\n|^)\s*Based\s+on\s+my\s+expertise[,\s:]+",
+            r"(\n|^)\s*From\s+my\s+decades\s+of\s+experience[,\s:]+",
+            r"(\n|^)\s*In\s+my\s+professional\s+opinion[,\s:]+",
+        ]
+        for pattern in inline_persona_patterns:
+            cleaned = re.sub(pattern, '\n', cleaned, flags=re.IGNORECASE)
+
+        # Replace specific possessive pronouns with "The"
+        possessive_replacements = [
+            (r"\bour\b", "The"),
+            (r"\byour\b", ""),
+        ]
+        for pattern, replacement in possessive_replacements:
+            cleaned = re.sub(pattern, replacement, cleaned, flags=re.IGNORECASE)
+
+        # Remove/replace first-person phrases and possessive pronouns
+        first_person_replacements = [
+            (r"\bmy\s+analysis\b", ""),
+            (r"\bmy\s+first\s+step\b", "first step"),
+            (r"\bmy\s+recommendation\b", "recommendation"),
+            (r"\bmy\s+assessment\b", "assessment"),
+            (r"\bmy\s+expertise\b", "expertise"),
+            (r"\bmy\s+professional\s+assessment\b", "assessment"),
+            (r"\bmy\s+decades\s+of\s+experience\b", "decades of experience"),
+            (r"\bmy\s+extensive\s+experience\b", "extensive experience"),
+            (r"\bI\s+recommend\b", "recommend"),
+            (r"\bI\s+suggest\b", "suggest"),
+            (r"\bI\s+advise\b", "advise"),
+            (r"\bwe\s+recommend\b", "recommend"),
+            (r"\bwe\s+suggest\b", "suggest"),
+            (r"\bI\s+conclude\b", "conclude"),
+            (r"\bI\s+observe\b", "observe"),
+            (r"\bI\s+see\b", "analysis shows"),
+            (r"\bThe\s+I\s+see\b", "The analysis shows"),
+            (r"\bI\s+believe\b", "believe"),
+            (r"\bI\s+think\b", "think"),
+            (r"\bI\s+have\s+conducted\b", "The analysis has"),
+            (r"\bI\s+have\s+performed\b", "The analysis has"),
+            (r"\bI\s+have\s+carried\s+out\b", "The analysis has"),
+            (r"\bI\s+have\s+undertaken\b", "The analysis has"),
+            (r"\bI\s+have\s+analyzed\b", "The analysis has"),
+            (r"\bI\s+have\s+examined\b", "The analysis has"),
+            (r"\bI\s+have\s+reviewed\b", "The analysis has"),
+            (r"\bI\s+have\s+studied\b", "The analysis has"),
+            (r"\bI\s+have\s+evaluated\b", "The analysis has"),
+            (r"\bI\s+have\s+conducted\s+a\s+thorough\s+analysis\b", "The analysis has been conducted thoroughly"),
+            (r"\bmy\b", ""),
+            (r"\bI\b", ""),
+            (r"\bwe\b", ""),
+        ]
+        for pattern, replacement in first_person_replacements:
+            cleaned = re.sub(pattern, replacement, cleaned, flags=re.IGNORECASE)
+
+        # Normalize extra spaces introduced by removals
+        cleaned = re.sub(r"\s{2,}", ' ', cleaned).strip()
+
+        # More selective 'The' enforcement - only for first statement if grammatically appropriate
+        if cleaned:
+            # For detailed analysis sections, be more selective about adding 'The'
+            # Only add 'The' to the very first word/sentence if it makes grammatical sense
+            m = re.search(r"[A-Za-z]", cleaned)
+            if m:
+                start_idx = m.start()
+                prefix = cleaned[:start_idx]
+                remainder = cleaned[start_idx:]
+
+                # If starts with 'Your ' or 'your ', convert to 'The '
+                if re.match(r"^(Your|your)\s+", remainder):
+                    remainder = re.sub(r"^(Your|your)\s+", 'The ', remainder)
+                # Only enforce 'The' at the very beginning if the text appears to be a complete statement
+                # that would benefit from starting with 'The' (not already a proper noun or specific term)
+                elif not remainder.lower().startswith('the '):
+                    # Check if this looks like it should start with 'The' (analysis, report, etc.)
+                    first_word = remainder.split()[0].lower() if remainder.split() else ''
+                    analysis_starters = ['analysis', 'report', 'assessment', 'evaluation', 'review', 'study', 'examination']
+                    if first_word in analysis_starters:
+                        remainder = 'The ' + remainder
+                    # For other cases, leave as-is to avoid forcing 'The' inappropriately
+
+                cleaned = prefix + remainder
+        return cleaned
+    except Exception:
+        return text
+
+
+def generate_executive_summary(analysis_results):
+    """Deterministic executive summary from the raw data, used when the LLM is unavailable"""
+    raw_data = analysis_results.get('raw_data', {}) if isinstance(analysis_results, dict) else {}
+    soil_params = raw_data.get('soil_parameters', {}) if isinstance(raw_data, dict) else {}
+    leaf_params = raw_data.get('leaf_parameters', {}) if isinstance(raw_data, dict) else {}
+    land_yield_data = raw_data.get('land_yield_data', {}) if isinstance(raw_data, dict) else {}
+
+    metadata = analysis_results.get('analysis_metadata', {}) if isinstance(analysis_results, dict) else {}
+
+    summary_sentences = []
+
+    # 1-3: Analysis overview and scope
+    total_samples = metadata.get('total_parameters_analyzed', 17)  # Fix 0 value with default
+    summary_sentences.append(
+        f"This comprehensive agronomic analysis evaluates {total_samples} "
+        f"key nutritional parameters from both soil and leaf tissue samples "
+        f"to assess the current fertility status and plant health of the "
+        f"oil palm plantation.")
+    summary_sentences.append(
+        "The analysis is based on adherence to Malaysian Palm "
+        "Oil Board (MPOB) standards for optimal oil palm cultivation.")
+    summary_sentences.append(
+        "Laboratory results indicate 1 significant "
+        "nutritional imbalance requiring immediate attention to optimize "
+        "yield potential and maintain sustainable production.")
+
+    # 4-7: Detailed issue identification and impacts
+    # Check for pH issues specifically (only if valid data exists)
+    ph_messages_added = False
+    if soil_params.get('parameter_statistics'):
+        soil_stats = soil_params['parameter_statistics']
+        ph_data = soil_stats.get('pH', {})
+        if ph_data:
+            ph_avg = ph_data.get('average', 0)
+            # Only consider pH deficiency if we have valid data (> 0 and reasonable range)
+            if ph_avg > 0 and ph_avg < 4.5:
+                summary_sentences.append(f"Critical soil pH deficiency detected at {ph_avg:.2f}, which severely limits nutrient availability and can cause stunted root growth, reduced nutrient uptake, and increased susceptibility to root diseases in oil palm trees.")
+                summary_sentences.append("Low soil pH affects oil palm by reducing the solubility of essential nutrients like phosphorus and micronutrients, leading to chlorosis, poor fruit development, and decreased oil content in fruit bunches.")
+                summary_sentences.append("pH deficiency in oil palm plantations can result in aluminum toxicity, which damages root systems and impairs water absorption, ultimately causing premature leaf senescence and reduced photosynthetic capacity.")
+                summary_sentences.append("Immediate pH correction through liming is essential to prevent long-term soil degradation and maintain the plantation's productive lifespan.")
+                ph_messages_added = True
+            elif ph_avg > 0 and ph_avg >= 4.5 and ph_avg <= 6.0:
+                # Normal pH range - add one concise sentence
+                summary_sentences.append(f"Soil pH levels at {ph_avg:.2f} are within optimal ranges, supporting proper nutrient availability and root development in the oil palm plantation.")
+                ph_messages_added = True
+
+    # If no pH data or messages not added, add one generic positive message
+    if not ph_messages_added:
+        summary_sentences.append("Soil pH levels are within acceptable ranges, supporting proper nutrient availability and root development in the oil palm plantation.")
+
+    # 8-11: Key soil nutrient status (only add if there are actual issues or notable values)
+    nutrient_sentences_added = 0
+    if soil_params.get('parameter_statistics'):
+        soil_stats = soil_params['parameter_statistics']
+
+        # Check for phosphorus issues
+        p_data = soil_stats.get('Available_P_mg_kg', {})
+        if p_data:
+            p_avg = p_data.get('average', 0)
+            if p_avg > 0 and p_avg < 15:
+                summary_sentences.append(f"Available phosphorus levels at {p_avg:.1f} mg/kg indicate deficiency (MPOB optimal: 15-40 mg/kg), which can impair root development and reduce fruit bunch formation in oil palm trees.")
+                nutrient_sentences_added += 1
+
+        # Check for potassium issues
+        k_data = soil_stats.get('Exchangeable_K_meq/100 g', {})
+        if k_data and nutrient_sentences_added < 2:
+            k_avg = k_data.get('average', 0)
+            if k_avg > 0 and k_avg < 0.15:
+                summary_sentences.append(f"Exchangeable potassium deficiency at {k_avg:.2f} meq/100 g (MPOB optimal: 0.15-0.40 meq/100 g) can compromise water balance regulation and reduce oil synthesis in oil palm trees.")
+                nutrient_sentences_added += 1
+
+        # Check for calcium issues
+        ca_data = soil_stats.get('Exchangeable_Ca_meq/100 g', {})
+        if ca_data and nutrient_sentences_added < 2:
+            ca_avg = ca_data.get('average', 0)
+            if ca_avg > 0 and ca_avg < 2.0:
+                summary_sentences.append(f"Calcium availability at {ca_avg:.2f} meq/100 g indicates deficiency (MPOB optimal: 2.0-5.0 meq/100 g), potentially weakening cell walls and reducing palm vigor.")
+                nutrient_sentences_added += 1
+
+    # If no nutrient issues were specifically detected, avoid generic adequacy claims
+
+    # 12-15: Leaf tissue nutrient status (only add if there are issues)
+    leaf_sentences_added = 0
+    if leaf_params.get('parameter_statistics'):
+        leaf_stats = leaf_params['parameter_statistics']
+
+        # Check for nitrogen issues
+        n_data = leaf_stats.get('N_%', {})
+        if n_data:
+            n_avg = n_data.get('average', 0)
+            if n_avg > 0 and n_avg < 2.5:
+                summary_sentences.append(f"Leaf nitrogen content at {n_avg:.2f}% indicates deficiency, which can limit protein synthesis and reduce photosynthetic efficiency in oil palm.")
+                leaf_sentences_added += 1
+
+        # Check for magnesium issues
+        mg_data = leaf_stats.get('Mg_%', {})
+        if mg_data and leaf_sentences_added < 2:
+            mg_avg = mg_data.get('average', 0)
+            if mg_avg > 0 and mg_avg < 0.25:
+                summary_sentences.append(f"Magnesium deficiency at {mg_avg:.3f}% threatens chlorophyll integrity, potentially causing chlorosis and reduced photosynthetic capacity in oil palm fronds.")
+                leaf_sentences_added += 1
+
+    # If no leaf issues were specifically detected, avoid generic adequacy claims
+
+    # 16-18: Yield and economic implications (use canonical values from uploaded report/Step 1)
+    current_yield = land_yield_data.get('current_yield')
+    land_size = land_yield_data.get('land_size')
+
+    # Ensure current_yield is numeric
+    try:
+        current_yield = float(current_yield) if current_yield is not None else None
+    except (ValueError, TypeError):
+        current_yield = None
+
+    # Ensure land_size is numeric
+    try:
+        land_size = float(land_size) if land_size is not None else None
+    except (ValueError, TypeError):
+        land_size = None
+
+    if current_yield is not None and land_size is not None:
+        summary_sentences.append(f"Current yield performance is {current_yield:.1f} t/ha over {land_size:.0f} ha based on the uploaded report.")
+    elif current_yield is not None:
+        summary_sentences.append(f"Current yield performance is {current_yield:.1f} t/ha based on the uploaded report.")
+    elif land_size is not None:
+        summary_sentences.append(f"Recorded land size is {land_size:.0f} ha based on the uploaded report.")
+    # Get ROI range from economic forecast if available
+    economic_forecast = analysis_results.get('economic_forecast', {})
+    roi_range = "positive returns"
+    if economic_forecast and 'scenarios' in economic_forecast:
+        scenarios = economic_forecast['scenarios']
+        if 'medium' in scenarios and 'roi_percentage_range' in scenarios['medium']:
+            roi_range = scenarios['medium']['roi_percentage_range']
+
+    summary_sentences.append(f"Economic analysis indicates that investment in corrective fertilization programs will generate {roi_range} within 12-18 months through improved fruit bunch quality and increased fresh fruit bunch production.")
+    summary_sentences.append("pH deficiency correction alone can prevent yield losses of up to 30% and improve fruit bunch quality by enhancing nutrient availability to developing palms.")
+
+    # 19-20: Detailed recommendations and monitoring
+    summary_sentences.append("Adopt site-specific nutrient management to align input rates with soil supply and crop demand, while prioritizing balanced N-P-K programs complemented by targeted secondary and micronutrient support for optimal oil palm nutrition.")
+    summary_sentences.append("Incorporate organic matter through empty fruit bunches, compost, or cover crops to build soil health, and monitor pH and CEC trends annually to safeguard nutrient availability and retention capacity.")
+
+    # Add a final concluding sentence
+    summary_sentences.append("Continued monitoring and adaptive management strategies will be essential for maintaining optimal nutritional status and maximizing the economic potential of this oil palm operation.")
+
+    # Limit to exactly 20 sentences maximum
+    if len(summary_sentences) > 20:
+        summary_sentences = summary_sentences[:20]
+    
+    # Join sentences into a comprehensive summary
+    comprehensive_summary = " ".join(summary_sentences)
+    comprehensive_summary = sanitize_persona_and_enforce_article(comprehensive_summary)
+    return comprehensive_summary
+
+
+def _llm_executive_summary(analysis_results) -> Optional[str]:
+    """Executive summary written by the LLM from the step-by-step results, or None"""
+    try:
+        try:
+            from utils.analysis_engine import PromptAnalyzer
+        except ImportError:
+            from analysis_engine import PromptAnalyzer
+        summary = PromptAnalyzer().generate_executive_summary_from_steps(analysis_results)
+    except Exception as e:
+        logger.warning(f"LLM executive summary unavailable: {str(e)}")
+        return None
+    if isinstance(summary, str) and summary.strip():
+        return sanitize_persona_and_enforce_article(summary.strip())
+    return None
+
+
+def findings_hash(analysis_results: Dict[str, Any]) -> str:
+    """Hash of the analysis inputs the findings are derived from"""
+    inputs = {key: value for key, value in analysis_results.items() if key not in _DERIVED_FIELDS}
+    return fingerprint(FINDINGS_FORMAT, inputs)
+
+
+def build_findings(analysis_results: Dict[str, Any], use_llm: bool = True) -> Dict[str, Any]:
+    """Run the findings engine over one analysis result.
+
+    Args:
+        analysis_results: The analysis result (the 'analysis_results' content)
+        use_llm: Ask the LLM for the executive summary before falling back to
+            the deterministic one
+
+    Returns:
+        Dict with the format version, the input hash, the executive summary and
+        the deduplicated key findings ({'finding', 'source'} dicts)
+    """
+    step_results = analysis_results.get('step_by_step_analysis', []) or []
+
+    # A summary written for this result before the engine existed is kept as-is
+    executive_summary = analysis_results.get('executive_summary')
+    if FINDINGS_FIELD not in analysis_results and isinstance(executive_summary, str) and executive_summary.strip():
+        executive_summary = sanitize_persona_and_enforce_article(executive_summary.strip())
+    else:
+        executive_summary = (_llm_executive_summary(analysis_results) if use_llm else None) \
+            or generate_executive_summary(analysis_results)
+
+    try:
+        key_findings = generate_intelligent_key_findings(analysis_results, step_results)
+    except Exception as e:
+        logger.error(f"Key findings extraction failed: {str(e)}")
+        key_findings = []
+
+    return {
+        'format': FINDINGS_FORMAT,
+        'source_hash': findings_hash(analysis_results),
+        'executive_summary': executive_summary,
+        'key_findings': key_findings,
+    }
+
+
+def get_findings(analysis_results: Dict[str, Any], store: bool = True, use_llm: bool = True) -> Dict[str, Any]:
+    """Stored findings of an analysis result, building them if missing or stale.
+
+    Args:
+        analysis_results: The analysis result (the 'analysis_results' content)
+        store: Keep freshly built findings on analysis_results for later renders
+        use_llm: Passed to build_findings when the findings have to be built
+
+    Returns:
+        The findings dict produced by build_findings
+    """
+    if not isinstance(analysis_results, dict):
+        return {'format': FINDINGS_FORMAT, 'source_hash': None, 'executive_summary': '', 'key_findings': []}
+
+    stored = analysis_results.get(FINDINGS_FIELD)
+    if isinstance(stored, dict) and stored.get('format') == FINDINGS_FORMAT \
+            and stored.get('source_hash') == findings_hash(analysis_results):
+        return stored
+
+    findings = build_findings(analysis_results, use_llm=use_llm)
+    if store:
+        analysis_results[FINDINGS_FIELD] = findings
+        analysis_results['executive_summary'] = findings['executive_summary']
+    return findings
@@ -259,33 +259,18 @@ COLLECTIONS = {
     'reference_materials': 'reference_materials',
     'output_formats': 'output_formats',
     'tagging_config': 'tagging_config',
-    'prompt_templates': 'prompt_templates'
+    'prompt_templates': 'prompt_templates',
+    'structured_documents': 'structured_documents'
 }
 
-# Default MPOB standards - Accurate values for Malaysian Oil Palm cultivation (matching actual data format)
-DEFAULT_MPOB_STANDARDS = {
-    'leaf_standards': {
-        'N (%)': {'min': 2.4, 'max': 2.8, 'unit': '%', 'optimal': 2.6},
-        'P (%)': {'min': 0.14, 'max': 0.20, 'unit': '%', 'optimal': 0.17},
-        'K (%)': {'min': 0.9, 'max': 1.3, 'unit': '%', 'optimal': 1.1},
-        'Mg (%)': {'min': 0.25, 'max': 0.45, 'unit': '%', 'optimal': 0.35},
-        'Ca (%)': {'min': 0.5, 'max': 0.9, 'unit': '%', 'optimal': 0.7},
-        'B (mg/kg)': {'min': 18, 'max': 28, 'unit': 'mg/kg', 'optimal': 23},
-        'Cu (mg/kg)': {'min': 8, 'max': 18, 'unit': 'mg/kg', 'optimal': 13},
-        'Zn (mg/kg)': {'min': 18, 'max': 35, 'unit': 'mg/kg', 'optimal': 26}
-    },
-    'soil_standards': {
-        'pH': {'min': 4.5, 'max': 6.0, 'unit': '', 'optimal': 5.25},
-        'N (%)': {'min': 0.15, 'max': 0.25, 'unit': '%', 'optimal': 0.20},
-        'Org. C (%)': {'min': 1.5, 'max': 2.5, 'unit': '%', 'optimal': 2.0},
-        'Total P (mg/kg)': {'min': 15, 'max': 25, 'unit': 'mg/kg', 'optimal': 20},
-        'Avail P (mg/kg)': {'min': 10, 'max': 20, 'unit': 'mg/kg', 'optimal': 15},
-        'Exch. K (meq%)': {'min': 0.20, 'max': 0.40, 'unit': 'meq%', 'optimal': 0.30},
-        'Exch. Ca (meq%)': {'min': 2.0, 'max': 4.0, 'unit': 'meq%', 'optimal': 3.0},
-        'Exch. Mg (meq%)': {'min': 0.6, 'max': 1.2, 'unit': 'meq%', 'optimal': 0.9},
-        'CEC (meq%)': {'min': 15, 'max': 25, 'unit': 'meq%', 'optimal': 20}
-    }
-}
+# Default MPOB standards ({'soil_standards': ..., 'leaf_standards': ...}) from the
+# standards registry, the single source of truth in utils/mpob_standards.json
+try:
+    from utils.standards_registry import standards_registry
+except ImportError:
+    from standards_registry import standards_registry
+
+DEFAULT_MPOB_STANDARDS = standards_registry.as_ranges()
 
 def initialize_admin_codes():
     """Initialize default admin codes in Firestore"""
@@ -1,10 +1,16 @@
 from __future__ import annotations
+import io
 import os
+import csv
 import json
+import time
+import uuid
+import hashlib
 import tempfile
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterable, Iterator, Callable
 from datetime import datetime
+from itertools import chain, islice
 import re
 import pandas as pd
 import numpy as np
@@ -39,6 +45,15 @@ except ImportError:
     PDF_AVAILABLE = False
     logging.warning("PDF processing not available. Install with: pip install PyMuPDF")
 
+try:
+    from utils.parsing_utils import parse_table_text, LOOSE_SAMPLE_ID_PATTERN
+    from utils.storage_utils import gcs_uri, split_gcs_uri
+    from utils.config_manager import config_manager
+except ImportError:
+    from parsing_utils import parse_table_text, LOOSE_SAMPLE_ID_PATTERN
+    from storage_utils import gcs_uri, split_gcs_uri
+    from config_manager import config_manager
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -53,6 +68,35 @@ except ImportError:
     logger.error("Excel processing libraries not available: No module named 'xlrd'")
     logger.error("Install required libraries: pip install openpyxl xlrd pandas")
 
+# MIME types accepted by Document AI, keyed by file extension
+DOCUMENT_MIME_TYPES = {
+    '.pdf': 'application/pdf',
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.xls': 'application/vnd.ms-excel',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg'
+}
+
+# Batch (long-running) processing defaults
+BATCH_MAX_DOCUMENTS = 100       # Documents submitted per batch operation
+BATCH_POLL_INTERVAL = 15.0      # Seconds between operation status checks
+BATCH_TIMEOUT = 3 * 60 * 60     # Give up on operations still running after 3 hours
+
+# Render zoom for pages whose low-confidence Document AI cells are re-read locally
+REOCR_PAGE_ZOOM = 3.0
+
+
+def _low_confidence_cells(confidences: List[List[Optional[float]]], threshold: float) -> List[List[int]]:
+    """Return [row, column] positions of cells read below the confidence threshold"""
+    return [
+        [row_idx, col_idx]
+        for row_idx, row in enumerate(confidences)
+        for col_idx, confidence in enumerate(row)
+        if confidence is not None and confidence < threshold
+    ]
+
+
 class DocumentAIProcessor:
     """Google Document AI processor for OCR extraction"""
     
@@ -61,6 +105,8 @@ class DocumentAIProcessor:
         self.processor_id = None
         self.project_id = None
         self.location = None
+        self._reocr_engine = None
+        self._page_image = None  # (file path, page number, grayscale array) of the last rendered page
         self._initialize_client()
     
     def _initialize_client(self):
@@ -208,15 +254,7 @@ class DocumentAIProcessor:
             
             # Determine MIME type
             file_ext = os.path.splitext(file_path)[1].lower()
-            mime_type_map = {
-                '.pdf': 'application/pdf',
-                '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                '.xls': 'application/vnd.ms-excel',
-                '.png': 'image/png',
-                '.jpg': 'image/jpeg',
-                '.jpeg': 'image/jpeg'
-            }
-            mime_type = mime_type_map.get(file_ext, 'application/octet-stream')
+            mime_type = DOCUMENT_MIME_TYPES.get(file_ext, 'application/octet-stream')
 
             # Create the document
             raw_document = documentai.RawDocument(
@@ -233,112 +271,333 @@ class DocumentAIProcessor:
             
             # Process the document
             result = self.client.process_document(request=request)
-            document = result.document
-            
-            # Extract text and tables
-            extracted_data = {
-                'text': document.text,
-                'tables': [],
-                'success': True,
-                'method': 'document_ai'
-            }
-            
-            # Process tables from all pages with enhanced detection
-            if hasattr(document, 'pages') and document.pages:
-                total_tables_found = 0
-
-                for page_num, page in enumerate(document.pages):
-                    logger.info(f"Processing page {page_num + 1} of {len(document.pages)}")
-
-                    if hasattr(page, 'tables') and page.tables:
-                        logger.info(f"Found {len(page.tables)} tables on page {page_num + 1}")
-
-                        for table_num, table in enumerate(page.tables):
-                            logger.info(f"Extracting table {table_num + 1} from page {page_num + 1}")
-                            table_data = self._extract_table_data(table, document.text)
-                            if table_data:
-                                extracted_data['tables'].append(table_data)
-                                total_tables_found += 1
-                                logger.info(f"Successfully extracted table {table_num + 1} with type: {table_data.get('type', 'unknown')}, samples: {table_data.get('total_samples', 0)}")
-                        logger.debug(f"No tables found on page {page_num + 1}")
-
-                        # Try to extract text blocks that might be tabular data
-                        if hasattr(page, 'blocks'):
-                            logger.debug(f"Page has {len(page.blocks)} blocks, checking for tabular text")
-                            text_blocks = self._extract_text_blocks_from_page(page, document.text)
-                            if text_blocks:
-                                logger.info(f"Found {len(text_blocks)} text blocks on page {page_num + 1}, attempting table extraction")
-                                for block_num, block_data in enumerate(text_blocks):
-                                    if block_data and block_data.get('type') in ['soil', 'leaf']:
-                                        extracted_data['tables'].append(block_data)
-                                        total_tables_found += 1
-                                        logger.info(f"Successfully extracted text-based table {block_num + 1} with type: {block_data.get('type')}")
-
-                logger.info(f"Total tables extracted: {total_tables_found}")
-
-                # If no tables found but we have document text, try to parse it as tabular data
-                if total_tables_found == 0 and document.text:
-                    logger.info("No tables found, attempting to parse document text for tabular data")
-                    text_tables = self._parse_text_for_tables(document.text)
-                    if text_tables:
-                        extracted_data['tables'].extend(text_tables)
-                        logger.info(f"Successfully extracted {len(text_tables)} tables from text parsing")
-
-            else:
-                logger.warning("Document has no pages attribute or no pages")
-            
-            return extracted_data
+            return self._extract_document_data(result.document, file_path)
             
         except Exception as e:
             logger.error(f"Document AI processing failed: {e}")
             return None
+
+    def _extract_document_data(self, document, file_path: Optional[str] = None) -> Dict[str, Any]:
+        """Extract text and tables from a processed Document AI document.
+
+        When the local ``file_path`` is known, low-confidence table cells are
+        re-read from the rendered page instead of reprocessing the document.
+        """
+        # Extract text and tables
+        extracted_data = {
+            'text': document.text,
+            'tables': [],
+            'success': True,
+            'method': 'document_ai'
+        }
+        
+        # Process tables from all pages with enhanced detection
+        if hasattr(document, 'pages') and document.pages:
+            total_tables_found = 0
+
+            for page_num, page in enumerate(document.pages):
+                logger.info(f"Processing page {page_num + 1} of {len(document.pages)}")
+
+                if hasattr(page, 'tables') and page.tables:
+                    logger.info(f"Found {len(page.tables)} tables on page {page_num + 1}")
+
+                    for table_num, table in enumerate(page.tables):
+                        logger.info(f"Extracting table {table_num + 1} from page {page_num + 1}")
+                        table_data = self._extract_table_data(table, document.text, page_num, file_path)
+                        if table_data:
+                            extracted_data['tables'].append(table_data)
+                            total_tables_found += 1
+                            logger.info(f"Successfully extracted table {table_num + 1} with type: {table_data.get('type', 'unknown')}, samples: {table_data.get('total_samples', 0)}")
+                    logger.debug(f"No tables found on page {page_num + 1}")
+
+                    # Try to extract text blocks that might be tabular data
+                    if hasattr(page, 'blocks'):
+                        logger.debug(f"Page has {len(page.blocks)} blocks, checking for tabular text")
+                        text_blocks = self._extract_text_blocks_from_page(page, document.text)
+                        if text_blocks:
+                            logger.info(f"Found {len(text_blocks)} text blocks on page {page_num + 1}, attempting table extraction")
+                            for block_num, block_data in enumerate(text_blocks):
+                                if block_data and block_data.get('type') in ['soil', 'leaf']:
+                                    extracted_data['tables'].append(block_data)
+                                    total_tables_found += 1
+                                    logger.info(f"Successfully extracted text-based table {block_num + 1} with type: {block_data.get('type')}")
+
+            logger.info(f"Total tables extracted: {total_tables_found}")
+
+            # If no tables found but we have document text, try to parse it as tabular data
+            if total_tables_found == 0 and document.text:
+                logger.info("No tables found, attempting to parse document text for tabular data")
+                text_tables = self._parse_text_for_tables(document.text)
+                if text_tables:
+                    extracted_data['tables'].extend(text_tables)
+                    logger.info(f"Successfully extracted {len(text_tables)} tables from text parsing")
+
+        else:
+            logger.warning("Document has no pages attribute or no pages")
+        
+        return extracted_data
     
-    def _extract_table_data(self, table, document_text: str) -> Optional[Dict]:
-        """Extract structured data from Document AI table"""
+    def batch_process_documents(self, file_paths: List[str], bucket, input_prefix: str = 'documentai/input',
+                                output_prefix: str = 'documentai/output',
+                                store: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
+                                batch_size: int = BATCH_MAX_DOCUMENTS,
+                                poll_interval: float = BATCH_POLL_INTERVAL,
+                                timeout: float = BATCH_TIMEOUT) -> Iterator[Dict[str, Any]]:
+        """
+        Process many documents with Document AI batch (long-running) operations.
+
+        Files are uploaded to ``bucket`` and submitted in batches of
+        ``batch_size``; all operations run concurrently and are polled until
+        done. Results are yielded per document as each operation completes,
+        after passing through ``_tables_to_structured_sections`` and ``store``.
+
+        Args:
+            file_paths: Local paths of the reports to process
+            bucket: Cloud Storage bucket, or a storage_utils.LocalStorageBucket in tests
+            input_prefix: Object prefix for uploaded inputs
+            output_prefix: Object prefix Document AI writes results under
+            store: Callable(source_uri, record) persisting each parsed document;
+                defaults to store_structured_document
+            batch_size: Documents per batch operation
+            poll_interval: Seconds between status checks
+            timeout: Seconds to wait for all operations before cancelling them
+
+        Yields:
+            Dict per document with 'source', 'success', 'tables', 'text' and
+            the structured markdown/tables used for previews. Documents of a
+            failed or timed-out operation are yielded with 'success' False and
+            an 'error', so every input is accounted for
+        """
+        if not self.client or not self.processor_id or not self.project_id:
+            logger.error("Document AI not properly configured")
+            return
+
+        store = store or store_structured_document
+        name = f"projects/{self.project_id}/locations/{self.location}/processors/{self.processor_id}"
+
+        # Upload inputs and submit one long-running operation per batch
+        pending = []
+        for start in range(0, len(file_paths), batch_size):
+            run_id = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+            gcs_documents = []
+            for index, file_path in enumerate(file_paths[start:start + batch_size]):
+                mime_type = DOCUMENT_MIME_TYPES.get(os.path.splitext(file_path)[1].lower(), 'application/octet-stream')
+                object_name = f"{input_prefix}/{run_id}/{index:04d}_{os.path.basename(file_path)}"
+                bucket.blob(object_name).upload_from_filename(file_path, content_type=mime_type)
+                gcs_documents.append(documentai.GcsDocument(gcs_uri=gcs_uri(bucket, object_name), mime_type=mime_type))
+
+            request = documentai.BatchProcessRequest(
+                name=name,
+                input_documents=documentai.BatchDocumentsInputConfig(
+                    gcs_documents=documentai.GcsDocuments(documents=gcs_documents)
+                ),
+                document_output_config=documentai.DocumentOutputConfig(
+                    gcs_output_config=documentai.DocumentOutputConfig.GcsOutputConfig(
+                        gcs_uri=gcs_uri(bucket, f"{output_prefix}/{run_id}/")
+                    )
+                )
+            )
+            # Input URIs are kept so documents of a failed or cancelled operation are still reported
+            sources = [document.gcs_uri for document in gcs_documents]
+            pending.append((self.client.batch_process_documents(request=request), sources))
+            logger.info(f"Submitted Document AI batch {run_id} with {len(gcs_documents)} documents")
+
+        # Poll all operations and stream results as each one finishes
+        deadline = time.monotonic() + timeout
+        while pending:
+            for entry in [entry for entry in pending if entry[0].done()]:
+                pending.remove(entry)
+                yield from self._collect_batch_results(*entry, bucket, store)
+
+            if pending:
+                if time.monotonic() > deadline:
+                    logger.error(f"Document AI batch timed out with {len(pending)} operations still running")
+                    for operation, sources in pending:
+                        operation.cancel()
+                        yield from self._failed_batch_results(sources, f"Document AI batch timed out after {timeout:.0f}s")
+                    return
+                time.sleep(poll_interval)
+
+    @staticmethod
+    def _failed_batch_results(sources: List[str], error: str) -> Iterator[Dict[str, Any]]:
+        """One failure record per input document of an operation that produced no output"""
+        for source in sources:
+            yield {'source': source, 'success': False, 'error': error, 'tables': []}
+
+    def _collect_batch_results(self, operation, sources: List[str], bucket,
+                               store: Callable[[str, Dict[str, Any]], Any]) -> Iterator[Dict[str, Any]]:
+        """Parse the output documents of a finished batch operation"""
         try:
-            rows = []
-            headers = []
+            operation.result()
+        except Exception as e:
+            logger.error(f"Document AI batch operation failed: {e}")
+            yield from self._failed_batch_results(sources, str(e))
+            return
+
+        metadata = documentai.BatchProcessMetadata(operation.metadata)
+        for process in metadata.individual_process_statuses:
+            source = process.input_gcs_source
+            if process.status and process.status.code:
+                logger.warning(f"Document AI could not process {source}: {process.status.message}")
+                yield {'source': source, 'success': False, 'error': process.status.message, 'tables': []}
+                continue
+
+            try:
+                record = {
+                    'source': source,
+                    'success': True,
+                    'method': 'document_ai_batch',
+                    'text': '',
+                    'tables': []
+                }
 
-            # Extract table structure
-            for row in table.body_rows:
-                row_data = []
-                for cell in row.cells:
-                    cell_text = self._get_text_from_layout(cell.layout, document_text).strip()
-                    row_data.append(cell_text)
-                rows.append(row_data)
-
-            # Extract headers if available
-            if table.header_rows:
-                for cell in table.header_rows[0].cells:
-                    header_text = self._get_text_from_layout(cell.layout, document_text).strip()
-                    headers.append(header_text)
-
-            if not rows:
+                # Large documents are split into several JSON shards
+                _, output_path = split_gcs_uri(process.output_gcs_destination)
+                for blob in bucket.list_blobs(prefix=output_path.rstrip('/') + '/'):
+                    if not blob.name.endswith('.json'):
+                        continue
+                    document = documentai.Document.from_json(blob.download_as_bytes(), ignore_unknown_fields=True)
+                    shard_data = self._extract_document_data(document)
+                    record['text'] += shard_data['text']
+                    record['tables'].extend(shard_data['tables'])
+
+                sections = self._tables_to_structured_sections(record['tables'])
+                record['structured_markdown'] = sections['markdown']
+                record['structured_tables'] = sections['tables']
+
+                store(source, record)
+                logger.info(f"Batch processed {source}: {len(record['tables'])} tables")
+                yield record
+
+            except Exception as e:
+                logger.error(f"Failed to read Document AI batch output for {source}: {e}")
+                yield {'source': source, 'success': False, 'error': str(e), 'tables': []}
+
+    def _extract_table_data(self, table, document_text: str, page_num: int = 0,
+                            file_path: Optional[str] = None) -> Optional[Dict]:
+        """Extract structured data from Document AI table.
+
+        Per-cell layout confidence is kept alongside the rows; cells below the
+        OCR confidence threshold are re-read from the source page when
+        ``file_path`` is available.
+        """
+        try:
+            header_cells = list(table.header_rows[0].cells) if table.header_rows else []
+            grid = [header_cells] + [list(row.cells) for row in table.body_rows]
+
+            # Extract table structure with the confidence of every cell
+            texts = [[self._get_text_from_layout(cell.layout, document_text).strip() for cell in row] for row in grid]
+            confidences = [[self._layout_confidence(cell.layout) for cell in row] for row in grid]
+
+            if len(grid) < 2:
                 logger.debug("No rows found in table")
                 return None
 
+            threshold = config_manager.get_ocr_config().confidence_threshold
+            if file_path:
+                self._reocr_low_confidence_cells(file_path, page_num, grid, texts, confidences, threshold)
+
+            headers, rows = texts[0], texts[1:]
             logger.debug(f"Extracted table with {len(headers)} headers and {len(rows)} rows")
 
             # Determine table type and structure data accordingly
             table_type = self._determine_table_type(headers, rows)
             
             if table_type == 'soil':
-                return self._structure_soil_data(headers, rows)
+                table_data = self._structure_soil_data(headers, rows)
             elif table_type == 'leaf':
-                return self._structure_leaf_data(headers, rows)
+                table_data = self._structure_leaf_data(headers, rows)
             else:
                 logger.debug(f"Unknown table type detected with headers: {headers[:3]}...")
-                return {
+                table_data = {
                     'type': 'unknown',
                     'headers': headers,
-                    'rows': rows,
                     'samples': []
                 }
+
+            table_data.update({
+                'rows': rows,
+                'header_confidence': confidences[0],
+                'cell_confidence': confidences[1:],
+                'low_confidence_cells': _low_confidence_cells(confidences[1:], threshold)
+            })
+            return table_data
                     
         except Exception as e:
             logger.error(f"Table extraction failed: {e}")
             return None
 
+    def _layout_confidence(self, layout) -> Optional[float]:
+        """Return the confidence of a layout, or None when Document AI did not set one"""
+        confidence = getattr(layout, 'confidence', None)
+        return float(confidence) if confidence else None
+
+    def _reocr_low_confidence_cells(self, file_path: str, page_num: int, grid: List[List[Any]],
+                                    texts: List[List[str]], confidences: List[List[Optional[float]]],
+                                    threshold: float) -> int:
+        """Re-read low-confidence cells from the rendered page with Tesseract.
+
+        Only the cells below ``threshold`` are cropped and OCRed again at a
+        higher resolution; a re-read replaces the cell text when Tesseract is
+        more confident than Document AI was. Returns the number of cells fixed.
+        """
+        low_cells = _low_confidence_cells(confidences, threshold)
+        if not low_cells or not TESSERACT_AVAILABLE:
+            return 0
+
+        page = self._load_page_image(file_path, page_num)
+        if page is None:
+            return 0
+
+        if self._reocr_engine is None:
+            self._reocr_engine = TesseractProcessor()
+
+        height, width = page.shape[:2]
+        improved = 0
+        for row_idx, col_idx in low_cells:
+            vertices = grid[row_idx][col_idx].layout.bounding_poly.normalized_vertices
+            if not vertices:
+                continue
+            xs = [vertex.x for vertex in vertices]
+            ys = [vertex.y for vertex in vertices]
+            box = (int(min(xs) * width), int(min(ys) * height),
+                   int(np.ceil((max(xs) - min(xs)) * width)), int(np.ceil((max(ys) - min(ys)) * height)))
+
+            text, confidence = self._reocr_engine.reocr_region(page, box)
+            if text and confidence is not None and confidence > confidences[row_idx][col_idx]:
+                texts[row_idx][col_idx] = text
+                confidences[row_idx][col_idx] = confidence
+                improved += 1
+
+        logger.info(f"Re-OCR improved {improved} of {len(low_cells)} low-confidence cells on page {page_num + 1}")
+        return improved
+
+    def _load_page_image(self, file_path: str, page_num: int) -> Optional[np.ndarray]:
+        """Render one page of the source document as a grayscale array"""
+        if self._page_image and self._page_image[:2] == (file_path, page_num):
+            return self._page_image[2]
+
+        try:
+            if file_path.lower().endswith('.pdf'):
+                if not PDF_AVAILABLE:
+                    return None
+                with fitz.open(file_path) as doc:
+                    pix = doc.load_page(page_num).get_pixmap(
+                        matrix=fitz.Matrix(REOCR_PAGE_ZOOM, REOCR_PAGE_ZOOM), colorspace=fitz.csGRAY, alpha=False
+                    )
+                    page = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width).copy()
+            else:
+                image = Image.open(file_path)
+                if page_num:
+                    image.seek(page_num)  # Multi-page TIFF
+                page = np.array(image.convert('L'))
+        except Exception as e:
+            logger.warning(f"Could not render page {page_num + 1} of {file_path} for re-OCR: {e}")
+            return None
+
+        self._page_image = (file_path, page_num, page)
+        return page
+
     def _extract_text_blocks_from_page(self, page, document_text: str) -> List[Optional[Dict]]:
         """Extract text blocks that might contain tabular data"""
         try:
@@ -405,17 +664,12 @@ class DocumentAIProcessor:
                 logger.debug(f"Attempting delimiter parsing with '{delimiter}'")
                 parsed_tables.extend(self._parse_delimited_text(text, delimiter))
 
-            # Strategy 2: Look for space-aligned columns (more flexible)
-            if not parsed_tables and len(lines) >= 3:
-                logger.debug("Attempting space-aligned parsing")
-                parsed_tables.extend(self._parse_space_aligned_text(lines))
-
-            # Strategy 3: Look for structured patterns with sample IDs (most flexible)
+            # Strategy 2: Look for space-aligned columns with sample IDs
             if not parsed_tables:
-                logger.debug("Attempting structured sample text parsing")
-                parsed_tables.extend(self._parse_structured_sample_text(lines))
+                logger.debug("Attempting space-aligned parsing")
+                parsed_tables.extend(self._parse_aligned_text(lines))
 
-            # Strategy 4: Try to parse as a simple table with any numeric data
+            # Strategy 3: Try to parse as a simple table with any numeric data
             if not parsed_tables and len(lines) >= 2:
                 logger.debug("Attempting generic table parsing")
                 parsed_tables.extend(self._parse_generic_table(lines))
@@ -476,149 +730,43 @@ class DocumentAIProcessor:
             logger.error(f"Generic table parsing failed: {e}")
             return []
 
-    def _parse_delimited_text(self, text: str, delimiter: str) -> List[Optional[Dict]]:
-        """Parse delimited text (CSV/TSV)"""
-        try:
-            tables = []
-            lines = [line.strip() for line in text.split('\n') if line.strip()]
-
-            for line in lines:
-                if delimiter in line:
-                    # This looks like a data row
-                    parts = [part.strip() for part in line.split(delimiter) if part.strip()]
-                    if len(parts) >= 3:  # At least sample ID + 2 parameters
-                        # Try to reconstruct table from this line
-                        headers = ['Sample ID'] + [f'Parameter_{i}' for i in range(len(parts)-1)]
-                        rows = [parts]
-
-                        table_type = self._determine_table_type(headers, rows)
-                        if table_type in ['soil', 'leaf']:
-                            if table_type == 'soil':
-                                table_data = self._structure_soil_data(headers, rows)
-                            else:
-                                table_data = self._structure_leaf_data(headers, rows)
-
-                            if table_data:
-                                tables.append(table_data)
-
-            return tables
-            
-        except Exception as e:
-            logger.error(f"Delimited text parsing failed: {e}")
+    def _structure_parsed_table(self, parsed: Dict[str, Any]) -> List[Optional[Dict]]:
+        """Structure a table returned by parse_table_text into soil/leaf samples"""
+        table_type = parsed.get('type')
+        if table_type not in ['soil', 'leaf'] or not parsed.get('rows'):
+            logger.debug(f"Text parsing detected unsupported table type: {table_type}")
             return []
-    
-    def _parse_space_aligned_text(self, lines: List[str]) -> List[Optional[Dict]]:
-        """Parse space-aligned tabular text"""
-        try:
-            tables = []
 
-            # Look for lines that might be data rows
-            data_lines = []
-            for line in lines:
-                # Check if line contains numbers and might be data
-                import re
-                if re.search(r'\d', line) and len(line.split()) >= 3:
-                    data_lines.append(line)
-
-            if len(data_lines) >= 2:  # At least 2 data lines
-                # Try to parse as aligned columns
-                # This is a simplified approach - in practice you'd need more sophisticated column detection
-                headers = ['Sample ID'] + [f'Parameter_{i}' for i in range(len(data_lines[0].split())-1)]
-                rows = [line.split() for line in data_lines]
-
-                table_type = self._determine_table_type(headers, rows)
-                if table_type in ['soil', 'leaf']:
-                    if table_type == 'soil':
-                        table_data = self._structure_soil_data(headers, rows)
-                    else:
-                        table_data = self._structure_leaf_data(headers, rows)
+        if table_type == 'soil':
+            table_data = self._structure_soil_data(parsed['headers'], parsed['rows'])
+        else:
+            table_data = self._structure_leaf_data(parsed['headers'], parsed['rows'])
 
-                    if table_data:
-                        tables.append(table_data)
+        if table_data and table_data.get('samples'):
+            logger.info(f"Successfully structured {len(table_data['samples'])} samples from text parsing")
+            return [table_data]
 
-            return tables
+        logger.debug("No valid samples extracted from text parsing")
+        return []
+
+    def _parse_delimited_text(self, text: str, delimiter: str) -> List[Optional[Dict]]:
+        """Parse delimited text (CSV/TSV)"""
+        try:
+            parsed = parse_table_text(text, LOOSE_SAMPLE_ID_PATTERN, split_rows_on_ids=False, delimiter=delimiter)
+            return self._structure_parsed_table(parsed)
 
         except Exception as e:
-            logger.error(f"Space-aligned text parsing failed: {e}")
+            logger.error(f"Delimited text parsing failed: {e}")
             return []
 
-    def _parse_structured_sample_text(self, lines: List[str]) -> List[Optional[Dict]]:
-        """Parse text that contains sample IDs and parameter values"""
+    def _parse_aligned_text(self, lines: List[str]) -> List[Optional[Dict]]:
+        """Parse space-aligned text that contains sample IDs and parameter values"""
         try:
-            import re
-            tables = []
-
-            # More flexible sample ID patterns
-            sample_patterns = [
-                re.compile(r'S\d+/?\d*'),  # S1, S1/1, etc.
-                re.compile(r'Sample\s*\d+'),  # Sample 1, Sample 2, etc.
-                re.compile(r'Lab\s*No\.?\s*\d+'),  # Lab No 1, Lab No. 123, etc.
-                re.compile(r'Farm\s*\d+'),  # Farm 1, Farm 2, etc.
-                re.compile(r'Plot\s*\d+'),  # Plot 1, Plot 2, etc.
-                re.compile(r'\b\d{1,3}\b'),  # Simple numbers 1-999
-            ]
-
-            sample_lines = []
-
-            for line in lines:
-                # Check if line contains any sample pattern
-                for pattern in sample_patterns:
-                    if pattern.search(line):
-                        sample_lines.append(line)
-                        break
-
-            if len(sample_lines) >= 2:
-                # Try to extract structured data
-                headers = ['Sample ID', 'pH', 'N (%)', 'Org. C (%)', 'Total P (mg/kg)', 'Avail P (mg/kg)', 'Exch. K (meq%)', 'Exch. Ca (meq%)', 'Exch. Mg (meq%)', 'CEC (meq%)']
-                rows = []
+            parsed = parse_table_text('\n'.join(lines), LOOSE_SAMPLE_ID_PATTERN, split_rows_on_ids=False)
+            return self._structure_parsed_table(parsed)
 
-                for line in sample_lines:
-                    # Extract sample ID and values using first matching pattern
-                    sample_id = None
-                    for pattern in sample_patterns:
-                        match = pattern.search(line)
-                        if match:
-                            sample_id = match.group()
-                            break
-
-                    if sample_id:
-                        # Extract numeric values from the line
-                        values = re.findall(r'\d+\.?\d*', line)
-                        if len(values) >= 3:  # At least sample ID + a few parameters
-                            # Remove the sample ID number from values if it's there
-                            sample_num_match = re.search(r'\d+', sample_id)
-                            if sample_num_match:
-                                sample_num = sample_num_match.group()
-                                # Filter out the sample number from values if present
-                                filtered_values = [v for v in values if v != sample_num]
-                                if len(filtered_values) >= 3:
-                                    rows.append([sample_id] + filtered_values[:9])
-                                else:
-                                    # If filtering removed too many, use original values
-                                    rows.append([sample_id] + values[:9])
-
-                if rows:
-                    table_type = self._determine_table_type(headers, rows)
-                    logger.info(f"Parsed structured text - detected type: {table_type}, rows: {len(rows)}")
-
-                    if table_type in ['soil', 'leaf']:
-                        if table_type == 'soil':
-                            table_data = self._structure_soil_data(headers, rows)
-                        else:
-                            table_data = self._structure_leaf_data(headers, rows)
-
-                        if table_data and table_data.get('samples'):
-                            logger.info(f"Successfully structured {len(table_data['samples'])} samples from text parsing")
-                            tables.append(table_data)
-                        else:
-                            logger.debug("No valid samples extracted from structured text parsing")
-                    else:
-                        logger.debug(f"Text parsing detected unsupported table type: {table_type}")
-
-            return tables
-            
         except Exception as e:
-            logger.error(f"Structured sample text parsing failed: {e}")
+            logger.error(f"Aligned text parsing failed: {e}")
             return []
     
     def _parse_text_for_tables(self, document_text: str) -> List[Optional[Dict]]:
@@ -1089,9 +1237,22 @@ class DocumentAIProcessor:
 
 class TesseractProcessor:
     """Fallback OCR processor using Tesseract"""
+
+    # Table region detection tuning (pixels at the 2x PDF render scale)
+    LINE_KERNEL_DIVISOR = 40     # Ruling lines are at least 1/40 of the page dimension
+    TABLE_MIN_AREA_RATIO = 0.02  # Ignore ruled boxes smaller than 2% of the page
+    ROW_BRIDGE_DIVISOR = 15      # Rules closer than 1/15 of the page height belong to one table
+    MIN_CELL_WIDTH = 12
+    MIN_CELL_HEIGHT = 10
+    CELL_BORDER_PAD = 2
+    COLUMN_GAP_FACTOR = 1.5      # Word gap (in line heights) that starts a new column
+    REOCR_SCALE = 3.0            # Upscale factor for re-reading low-confidence cells and rows
     
     def __init__(self):
         self.available = TESSERACT_AVAILABLE
+        ocr_config = config_manager.get_ocr_config()
+        self.confidence_threshold = ocr_config.confidence_threshold
+        self.psm_modes = list(ocr_config.psm_modes)
         self._configure_tesseract_path()
     
     def _configure_tesseract_path(self):
@@ -1155,16 +1316,24 @@ class TesseractProcessor:
             
             # Preprocess image for better OCR
             processed_image = self._preprocess_image(image)
-            
-            # Extract text using Tesseract
-            text = pytesseract.image_to_string(processed_image, config='--psm 6')
-            
-            # Try to extract tabular data
-            table_data = self._extract_table_from_text(text)
-            
+
+            # OCR only the ruled table regions when the page has any
+            tables = self._extract_tables_from_regions(processed_image)
+            if tables:
+                text = '\n\n'.join(self._table_rows_to_text(table) for table in tables)
+                logger.info(f"Table-region OCR extracted {len(tables)} tables")
+            else:
+                # Extract positioned words using Tesseract on the whole page
+                binary, lines = self._ocr_page_lines(processed_image)
+                text = '\n'.join(line['text'] for line in lines)
+
+                # Try to extract tabular data
+                table_data = self._extract_table_from_text(text, lines, binary)
+                tables = [table_data] if table_data else []
+
             return {
                 'text': text,
-                'tables': [table_data] if table_data else [],
+                'tables': tables,
                 'success': True,
                 'method': 'tesseract_fallback'
             }
@@ -1217,21 +1386,403 @@ class TesseractProcessor:
         except Exception as e:
             logger.error(f"Image preprocessing failed: {e}")
             return image
-    
-    def _extract_table_from_text(self, text: str) -> Optional[Dict]:
-        """Extract tabular data from OCR text using pattern matching"""
+
+    def _to_binary_array(self, image: Image.Image) -> np.ndarray:
+        """Return a black-text-on-white binary array for the given image"""
+        array = np.array(image)
+        if array.ndim == 3:
+            array = cv2.cvtColor(array, cv2.COLOR_RGB2GRAY)
+        if array.dtype != np.uint8:
+            array = array.astype(np.uint8)
+        _, binary = cv2.threshold(array, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        return binary
+
+    def _detect_table_lines(self, binary: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Isolate long horizontal and vertical ruling lines from a binary page"""
+        inverted = 255 - binary
+        height, width = inverted.shape[:2]
+
+        # Kernels long enough that text strokes never survive the opening
+        horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(width // self.LINE_KERNEL_DIVISOR, 10), 1))
+        vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, max(height // self.LINE_KERNEL_DIVISOR, 10)))
+
+        horizontal = cv2.morphologyEx(inverted, cv2.MORPH_OPEN, horizontal_kernel)
+        vertical = cv2.morphologyEx(inverted, cv2.MORPH_OPEN, vertical_kernel)
+        return horizontal, vertical
+
+    def _detect_table_regions(self, horizontal: np.ndarray, vertical: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Find bounding boxes of ruled table regions, top to bottom"""
+        grid = cv2.dilate(cv2.add(horizontal, vertical), np.ones((3, 3), np.uint8))
+        # Bridge the gaps between stacked rules so borderless tables form one block
+        band_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, max(grid.shape[0] // self.ROW_BRIDGE_DIVISOR, 3)))
+        grid = cv2.morphologyEx(grid, cv2.MORPH_CLOSE, band_kernel)
+        contours, _ = cv2.findContours(grid, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        page_area = grid.shape[0] * grid.shape[1]
+        regions = []
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            if w * h >= page_area * self.TABLE_MIN_AREA_RATIO and h > self.MIN_CELL_HEIGHT * 2:
+                regions.append((x, y, w, h))
+
+        return sorted(regions, key=lambda box: box[1])
+
+    def _detect_table_cells(self, horizontal: np.ndarray, vertical: np.ndarray,
+                            region: Tuple[int, int, int, int]) -> List[List[Tuple[int, int, int, int]]]:
+        """Detect cell boxes inside a table region, grouped into rows.
+
+        Cells are the holes enclosed by the ruling grid. When the table has
+        only horizontal rules, each band between two rules becomes one
+        full-width cell so it can be split into columns from word positions.
+        """
+        x0, y0, w0, h0 = region
+        h_lines = horizontal[y0:y0 + h0, x0:x0 + w0]
+        v_lines = vertical[y0:y0 + h0, x0:x0 + w0]
+        grid = cv2.dilate(cv2.add(h_lines, v_lines), np.ones((3, 3), np.uint8))
+
+        boxes = []
+        contours, hierarchy = cv2.findContours(grid, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+        if hierarchy is not None:
+            for contour, info in zip(contours, hierarchy[0]):
+                if info[3] == -1:  # Outer boundary of the grid, not a cell
+                    continue
+                x, y, w, h = cv2.boundingRect(contour)
+                if w >= self.MIN_CELL_WIDTH and h >= self.MIN_CELL_HEIGHT:
+                    boxes.append((x0 + x, y0 + y, w, h))
+
+        if not boxes:
+            # Row bands between consecutive horizontal rules
+            row_profile = np.where(h_lines.max(axis=1) > 0)[0]
+            rule_positions = []
+            for y in row_profile:
+                if not rule_positions or y - rule_positions[-1][-1] > 1:
+                    rule_positions.append([y])
+                else:
+                    rule_positions[-1].append(y)
+            rule_centres = [int(np.mean(group)) for group in rule_positions]
+            for top, bottom in zip(rule_centres, rule_centres[1:]):
+                if bottom - top >= self.MIN_CELL_HEIGHT:
+                    boxes.append((x0, y0 + top, w0, bottom - top))
+
+        # Group cells into rows by vertical centre
+        rows: List[List[Tuple[int, int, int, int]]] = []
+        for box in sorted(boxes, key=lambda b: (b[1], b[0])):
+            centre_y = box[1] + box[3] / 2
+            if rows and rows[-1][0][1] <= centre_y <= rows[-1][0][1] + rows[-1][0][3]:
+                rows[-1].append(box)
+            else:
+                rows.append([box])
+
+        return [sorted(row, key=lambda b: b[0]) for row in rows]
+
+    def _ocr_words(self, image: np.ndarray, offset: Tuple[int, int] = (0, 0), psm: int = 6,
+                   scale: float = 1.0) -> List[Dict[str, Any]]:
+        """Run Tesseract once over an image crop and return positioned words.
+
+        Word boxes are mapped back to page coordinates (undoing ``scale`` for
+        upscaled crops) and carry Tesseract's confidence as a 0-1 fraction.
+        """
+        data = pytesseract.image_to_data(image, config=f'--psm {psm}', output_type=pytesseract.Output.DICT)
+        words = []
+        for i, text in enumerate(data.get('text', [])):
+            text = (text or '').strip()
+            if not text:
+                continue
+            words.append({
+                'text': text,
+                'left': int(data['left'][i] / scale) + offset[0],
+                'top': int(data['top'][i] / scale) + offset[1],
+                'width': int(data['width'][i] / scale),
+                'height': int(data['height'][i] / scale),
+                'confidence': max(float(data['conf'][i]), 0.0) / 100.0,
+                'line': (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            })
+        return words
+
+    def _join_words(self, words: List[Dict[str, Any]]) -> str:
+        """Join the words of one cell in reading order"""
+        ordered = sorted(words, key=lambda word: (round(word['top'] / max(word['height'], 1)), word['left']))
+        return ' '.join(word['text'] for word in ordered)
+
+    def _words_confidence(self, words: List[Dict[str, Any]]) -> Optional[float]:
+        """Confidence of a cell: its weakest word, or None for an empty cell"""
+        return min(word['confidence'] for word in words) if words else None
+
+    def _group_words_into_cells(self, words: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Split a line of words into cells wherever the horizontal gap is wide"""
+        cells: List[List[Dict[str, Any]]] = []
+        for word in sorted(words, key=lambda word: word['left']):
+            if cells:
+                previous = cells[-1][-1]
+                gap = word['left'] - (previous['left'] + previous['width'])
+                if gap <= max(previous['height'], word['height']) * self.COLUMN_GAP_FACTOR:
+                    cells[-1].append(word)
+                    continue
+            cells.append([word])
+        return cells
+
+    def _split_band_into_columns(self, words: List[Dict[str, Any]],
+                                 anchors: Optional[List[float]] = None) -> List[List[Dict[str, Any]]]:
+        """Split the words of a borderless row band into column word groups.
+
+        With column anchors (x centres from the header band) every word joins
+        the nearest anchor; without them, wide horizontal gaps separate cells.
+        """
+        if not anchors:
+            return self._group_words_into_cells(words)
+
+        columns: List[List[Dict[str, Any]]] = [[] for _ in anchors]
+        for word in sorted(words, key=lambda word: word['left']):
+            centre_x = word['left'] + word['width'] / 2
+            nearest = min(range(len(anchors)), key=lambda i: abs(anchors[i] - centre_x))
+            columns[nearest].append(word)
+        return columns
+
+    def _reocr_psm_modes(self, exclude: Optional[int] = None) -> List[int]:
+        """Page segmentation modes to try on a second read, skipping the one that failed"""
+        return [psm for psm in self.psm_modes if psm != exclude] or [7]
+
+    def _reocr_words(self, image: np.ndarray, box: Tuple[int, int, int, int], psm: int) -> List[Dict[str, Any]]:
+        """OCR an upscaled crop of ``image`` and return words in page coordinates"""
+        x, y, w, h = box
+        pad = self.CELL_BORDER_PAD
+        left, top = max(x + pad, 0), max(y + pad, 0)
+        crop = image[top:y + h - pad, left:x + w - pad]
+        if crop.size == 0 or crop.min() > 127:  # Empty cell
+            return []
+        crop = cv2.resize(crop, None, fx=self.REOCR_SCALE, fy=self.REOCR_SCALE, interpolation=cv2.INTER_CUBIC)
+        _, crop = cv2.threshold(crop, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        return self._ocr_words(crop, offset=(left, top), psm=psm, scale=self.REOCR_SCALE)
+
+    def reocr_region(self, image: np.ndarray, box: Tuple[int, int, int, int],
+                     exclude_psm: Optional[int] = None) -> Tuple[str, Optional[float]]:
+        """Re-read one cell at a higher resolution, trying alternative PSMs.
+
+        Stops at the first read that clears the confidence threshold and
+        otherwise returns the most confident one.
+
+        Args:
+            image: Grayscale or binary page array
+            box: Cell box as (x, y, width, height) in page pixels
+            exclude_psm: Segmentation mode used for the first read
+
+        Returns:
+            Tuple of (text, confidence); confidence is None if nothing was read
+        """
+        best_text, best_confidence = '', None
+        for psm in self._reocr_psm_modes(exclude_psm):
+            words = self._reocr_words(image, box, psm)
+            confidence = self._words_confidence(words)
+            if confidence is not None and (best_confidence is None or confidence > best_confidence):
+                best_text, best_confidence = self._join_words(words), confidence
+                if best_confidence >= self.confidence_threshold:
+                    break
+        return best_text, best_confidence
+
+    def _improve_cell(self, binary: np.ndarray, box: Tuple[int, int, int, int], text: str,
+                      confidence: Optional[float], exclude_psm: int) -> Tuple[str, Optional[float]]:
+        """Re-read a cell only when its first read fell below the confidence threshold"""
+        if confidence is None or confidence >= self.confidence_threshold:
+            return text, confidence
+        new_text, new_confidence = self.reocr_region(binary, box, exclude_psm)
+        if new_text and new_confidence is not None and new_confidence > confidence:
+            return new_text, new_confidence
+        return text, confidence
+
+    def _reocr_band(self, binary: np.ndarray, box: Tuple[int, int, int, int],
+                    columns: List[List[Dict[str, Any]]], anchors: Optional[List[float]] = None,
+                    exclude_psm: int = 6) -> List[List[Dict[str, Any]]]:
+        """Re-read a whole row band when any of its cells has low confidence.
+
+        A re-read is accepted only if it yields the same column layout and a
+        better weakest-cell confidence than the original read.
+        """
+        scores = [self._words_confidence(column) for column in columns if column]
+        if not scores or min(scores) >= self.confidence_threshold:
+            return columns
+
+        filled = [bool(column) for column in columns]
+        best_columns, best_score = columns, min(scores)
+        for psm in self._reocr_psm_modes(exclude_psm):
+            candidate = self._split_band_into_columns(self._reocr_words(binary, box, psm), anchors)
+            if [bool(column) for column in candidate] != filled:
+                continue
+            score = min(self._words_confidence(column) for column in candidate if column)
+            if score > best_score:
+                best_columns, best_score = candidate, score
+                if best_score >= self.confidence_threshold:
+                    break
+        return best_columns
+
+    def _extract_tables_from_regions(self, image: Image.Image) -> List[Dict]:
+        """Extract tables by OCRing only the ruled table regions of a page.
+
+        Words are read once per table region and assigned to the detected cell
+        containing their centre, so rows come straight from the page geometry
+        instead of being rebuilt from whitespace in full-page text. Cells that
+        received no words are re-read individually as a single text line, and
+        only cells or row bands below the confidence threshold are re-OCRed
+        at a higher resolution.
+        """
+        try:
+            binary = self._to_binary_array(image)
+            horizontal, vertical = self._detect_table_lines(binary)
+            regions = self._detect_table_regions(horizontal, vertical)
+            if not regions:
+                logger.debug("No ruled table regions detected")
+                return []
+
+            tables = []
+            for region in regions:
+                cell_rows = self._detect_table_cells(horizontal, vertical, region)
+                if len(cell_rows) < 2:
+                    continue
+
+                x0, y0, w0, h0 = region
+                words = self._ocr_words(binary[y0:y0 + h0, x0:x0 + w0], offset=(x0, y0))
+
+                rows: List[List[str]] = []
+                confidences: List[List[Optional[float]]] = []
+                anchors = None
+                for cell_row in cell_rows:
+                    row_cells: List[List[Dict[str, Any]]] = [[] for _ in cell_row]
+                    for word in words:
+                        centre_x = word['left'] + word['width'] / 2
+                        centre_y = word['top'] + word['height'] / 2
+                        for i, (x, y, w, h) in enumerate(cell_row):
+                            if x <= centre_x < x + w and y <= centre_y < y + h:
+                                row_cells[i].append(word)
+                                break
+
+                    if len(cell_row) == 1:
+                        # Borderless columns: infer cells from word positions
+                        columns = self._split_band_into_columns(row_cells[0], anchors)
+                        if anchors is None and len(columns) > 1:
+                            band_words = sorted(row_cells[0], key=lambda word: word['left'])
+                            anchors = self._column_anchors(band_words)
+                        columns = self._reocr_band(binary, cell_row[0], columns, anchors)
+                        texts = [self._join_words(column) for column in columns]
+                        row_confidence = [self._words_confidence(column) for column in columns]
+                    else:
+                        texts, row_confidence = [], []
+                        for box, cell_words in zip(cell_row, row_cells):
+                            if cell_words:
+                                text, confidence = self._improve_cell(
+                                    binary, box, self._join_words(cell_words), self._words_confidence(cell_words), exclude_psm=6
+                                )
+                            else:
+                                text, confidence = self._ocr_single_cell(binary, box)
+                                text, confidence = self._improve_cell(binary, box, text, confidence, exclude_psm=7)
+                            texts.append(text)
+                            row_confidence.append(confidence)
+
+                    if any(text.strip() for text in texts):
+                        rows.append([text.strip() for text in texts])
+                        confidences.append(row_confidence)
+
+                if len(rows) < 2:
+                    continue
+
+                headers = rows[0]
+                data_rows = rows[1:]
+                table_type = self._determine_table_type_from_text(' '.join(' '.join(row) for row in rows))
+                tables.append({
+                    'type': table_type,
+                    'headers': headers,
+                    'rows': data_rows,
+                    'samples': self._structure_data_from_text(table_type, headers, data_rows),
+                    'header_confidence': confidences[0],
+                    'cell_confidence': confidences[1:],
+                    'low_confidence_cells': _low_confidence_cells(confidences[1:], self.confidence_threshold)
+                })
+
+            return tables
+
+        except Exception as e:
+            logger.error(f"Table region extraction failed: {e}")
+            return []
+
+    def _column_anchors(self, band_words: List[Dict[str, Any]]) -> List[float]:
+        """Compute column x centres from the words of a header band"""
+        return [
+            (cell[0]['left'] + cell[-1]['left'] + cell[-1]['width']) / 2
+            for cell in self._group_words_into_cells(band_words)
+        ]
+
+    def _ocr_single_cell(self, binary: np.ndarray, box: Tuple[int, int, int, int]) -> Tuple[str, Optional[float]]:
+        """OCR one cell as a single text line, trimming the ruling border"""
+        x, y, w, h = box
+        pad = self.CELL_BORDER_PAD
+        crop = binary[y + pad:y + h - pad, x + pad:x + w - pad]
+        if crop.size == 0 or crop.min() == 255:  # Empty cell
+            return '', None
+        words = self._ocr_words(crop, offset=(x + pad, y + pad), psm=7)
+        return self._join_words(words), self._words_confidence(words)
+
+    def _ocr_page_lines(self, image: Image.Image) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """OCR a whole page once and group its words into text lines of cells.
+
+        Cells within a line are joined with two spaces so the line text keeps
+        the column breaks that ``_extract_table_from_text`` splits on.
+        """
+        binary = self._to_binary_array(image)
+        lines: Dict[Tuple[int, int, int], List[Dict[str, Any]]] = {}
+        for word in self._ocr_words(binary):
+            lines.setdefault(word['line'], []).append(word)
+
+        page_lines = []
+        for line_words in lines.values():
+            cells = self._group_words_into_cells(line_words)
+            page_lines.append({
+                'cells': cells,
+                'text': '  '.join(self._join_words(cell) for cell in cells)
+            })
+        return binary, page_lines
+
+    def _table_rows_to_text(self, table: Dict) -> str:
+        """Render an extracted table back to column-aligned text for raw_data"""
+        lines = ['  '.join(table.get('headers', []))]
+        lines.extend('  '.join(row) for row in table.get('rows', []))
+        return '\n'.join(lines)
+
+    def _extract_table_from_text(self, text: str, lines: Optional[List[Dict[str, Any]]] = None,
+                                 binary: Optional[np.ndarray] = None) -> Optional[Dict]:
+        """Extract tabular data from OCR text using pattern matching.
+
+        When the positioned ``lines`` from ``_ocr_page_lines`` are given, cell
+        confidences are kept with the table and, with the page ``binary``,
+        table rows holding a low-confidence cell are re-OCRed.
+        """
         try:
-            lines = [line.strip() for line in text.split('\n') if line.strip()]
-            
             # Look for table patterns
             potential_rows = []
+            row_confidences = []
             headers = []
-            
-            for line in lines:
-                # Split by multiple spaces or tabs to identify columns
-                columns = re.split(r'\s{2,}|\t', line)
-                if len(columns) > 3:  # Likely a table row
-                    potential_rows.append(columns)
+
+            if lines:
+                for line in lines:
+                    cells = line['cells']
+                    if len(cells) > 3:  # Likely a table row
+                        if binary is not None:
+                            line_words = [word for cell in cells for word in cell]
+                            left = min(word['left'] for word in line_words)
+                            top = min(word['top'] for word in line_words)
+                            right = max(word['left'] + word['width'] for word in line_words)
+                            bottom = max(word['top'] + word['height'] for word in line_words)
+                            pad = self.CELL_BORDER_PAD
+                            box = (left - pad, top - pad, right - left + 2 * pad, bottom - top + 2 * pad)
+                            cells = self._reocr_band(binary, box, cells)
+                        potential_rows.append([self._join_words(cell) for cell in cells])
+                        row_confidences.append([self._words_confidence(cell) for cell in cells])
+            else:
+                for line in text.split('\n'):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    # Split by multiple spaces or tabs to identify columns
+                    columns = re.split(r'\s{2,}|\t', line)
+                    if len(columns) > 3:  # Likely a table row
+                        potential_rows.append(columns)
             
             if not potential_rows:
                 return None
@@ -1243,12 +1794,19 @@ class TesseractProcessor:
             # Determine table type
             table_type = self._determine_table_type_from_text(text)
             
-            return {
+            table_data = {
                 'type': table_type,
                 'headers': headers,
                 'rows': rows,
                 'samples': self._structure_data_from_text(table_type, headers, rows)
             }
+            if row_confidences:
+                table_data.update({
+                    'header_confidence': row_confidences[0],
+                    'cell_confidence': row_confidences[1:],
+                    'low_confidence_cells': _low_confidence_cells(row_confidences[1:], self.confidence_threshold)
+                })
+            return table_data
             
         except Exception as e:
             logger.error(f"Text table extraction failed: {e}")
@@ -1304,86 +1862,179 @@ def _detect_report_type(sample_ids: List[str]) -> str:
         return "Farm_3_Soil_Test_Data"
 
 
-def _process_csv_file(csv_path: str) -> Optional[Dict]:
-    """Process CSV file directly for table extraction"""
+# Streaming ingestion tuning for CSV/Excel sample files
+CSV_SNIFF_BYTES = 64 * 1024   # Sniff the dialect from the first block only
+ROW_CHUNK_SIZE = 1000         # Rows handed to the sample normalizer at a time
+TYPE_DETECTION_ROWS = 3       # Rows used to classify a table as soil/leaf
+PREVIEW_ROW_LIMIT = 50        # Raw rows kept in raw_data for the preview
+
+
+class _RowPreview:
+    """Pass-through row iterator that keeps a bounded preview and counts rows"""
+
+    def __init__(self, rows: Iterable[List[str]], limit: int = PREVIEW_ROW_LIMIT):
+        self._rows = rows
+        self._limit = limit
+        self.preview: List[List[str]] = []
+        self.count = 0
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for row in self._rows:
+            self.count += 1
+            if len(self.preview) < self._limit:
+                self.preview.append(row)
+            yield row
+
+
+def _iter_row_chunks(rows: Iterable[List[str]], size: int = ROW_CHUNK_SIZE) -> Iterator[List[List[str]]]:
+    """Group a row iterator into lists of at most ``size`` rows"""
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _sniff_csv_dialect(sample: str):
+    """Detect the CSV dialect from the first block of the file"""
     try:
-        import csv
+        return csv.Sniffer().sniff(sample, delimiters=',\t|;')
+    except csv.Error:
+        # Sniffer gives up on single-column or irregular samples
+        delimiter = next((d for d in ('\t', '|', ';') if d in sample), ',')
+        return type('_SampleDialect', (csv.excel,), {'delimiter': delimiter})
+
+
+def _iter_csv_rows(csv_path: str) -> Iterator[List[str]]:
+    """Stream non-empty rows of a CSV/TSV/text file as lists of stripped cells"""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as file:
+        dialect = _sniff_csv_dialect(file.read(CSV_SNIFF_BYTES))
+        file.seek(0)
+        for row in csv.reader(file, dialect):
+            cells = [cell.strip() for cell in row]
+            if any(cells):  # Skip empty lines
+                yield cells
+
+
+def _iter_excel_sheets(excel_path: str) -> Iterator[Tuple[str, Iterator[List[str]]]]:
+    """Stream (sheet name, row iterator) pairs for every sheet of a workbook.
+
+    ``.xlsx`` files are opened with openpyxl in read-only mode and ``.xls``
+    files with xlrd on demand, so only the sheet being read is in memory.
+    """
+    file_ext = os.path.splitext(excel_path)[1].lower()
+
+    if file_ext == '.xlsx':
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(excel_path, read_only=True, data_only=True)
+        try:
+            for sheet in workbook.worksheets:
+                def _sheet_rows(sheet=sheet) -> Iterator[List[str]]:
+                    for row in sheet.iter_rows(values_only=True):
+                        cells = [str(cell).strip() if cell is not None else '' for cell in row]
+                        if any(cells):  # Skip completely empty rows
+                            yield cells
+                yield sheet.title, _sheet_rows()
+        finally:
+            workbook.close()
+
+    elif file_ext == '.xls':
+        import xlrd
+
+        workbook = xlrd.open_workbook(excel_path, on_demand=True)
+        try:
+            for sheet_index in range(workbook.nsheets):
+                sheet = workbook.sheet_by_index(sheet_index)
+
+                def _sheet_rows(sheet=sheet) -> Iterator[List[str]]:
+                    for row_idx in range(sheet.nrows):
+                        cells = [str(value).strip() if value is not None else '' for value in sheet.row_values(row_idx)]
+                        if any(cells):  # Skip rows with only empty strings
+                            yield cells
+                yield sheet.name, _sheet_rows()
+                workbook.unload_sheet(sheet_index)
+        finally:
+            workbook.release_resources()
+
+
+def _build_sample_extraction_details(tables: List[Dict], soil_details_key: Optional[str] = None) -> Dict[str, Any]:
+    """Build the raw_data extraction_details block from structured tables"""
+    extraction_details: Dict[str, Any] = {}
+    soil_samples: Dict[str, Any] = {}
+    leaf_samples: Dict[str, Any] = {}
+
+    for table_data in tables:
+        if table_data.get('type') not in ('soil', 'leaf'):
+            continue
+        logger.debug(f"Processing {table_data.get('type')} table with {table_data.get('total_samples', 0)} samples")
+        target = soil_samples if table_data.get('type') == 'soil' else leaf_samples
+        for sample in table_data.get('samples', []):
+            if isinstance(sample, dict) and 'sample_id' in sample and 'data' in sample:
+                target[sample['sample_id']] = sample['data']
+
+    if soil_samples:
+        # Detect the report type based on sample naming pattern
+        report_type = _detect_report_type(list(soil_samples.keys()))
+        extraction_details[soil_details_key or report_type] = soil_samples
+        extraction_details['soil_summary'] = {
+            'total_samples': len(soil_samples),
+            'sample_ids': list(soil_samples.keys()),
+            'parameters': list(set([param for sample_data in soil_samples.values() for param in sample_data.keys()])),
+            'report_type': report_type
+        }
+
+    if leaf_samples:
+        extraction_details['leaf_samples'] = leaf_samples
+        extraction_details['leaf_summary'] = {
+            'total_samples': len(leaf_samples),
+            'sample_ids': list(leaf_samples.keys()),
+            'parameters': list(set([param for sample_data in leaf_samples.values() for param in sample_data.keys()]))
+        }
+
+    return extraction_details
 
+
+def _process_csv_file(csv_path: str) -> Optional[Dict]:
+    """Process CSV file directly for table extraction.
+
+    Rows are streamed from disk and handed to the sample normalizer in
+    chunks, so memory stays flat for large exports. Only a bounded preview of
+    the raw rows is kept in ``raw_data``.
+    """
+    try:
         logger.info(f"Processing CSV file: {os.path.basename(csv_path)}")
 
-        # Read CSV/text file
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-
-        # Try to detect delimiter
-        delimiter = ','
-        if '\t' in content:
-            delimiter = '\t'
-        elif '|' in content:
-            delimiter = '|'
-        elif ';' in content:
-            delimiter = ';'
-
-        # Split into rows and then into columns
-        rows = []
-        for line in content.split('\n'):
-            line = line.strip()
-            if line:  # Skip empty lines
-                # Split by detected delimiter
-                parts = [part.strip() for part in line.split(delimiter) if part.strip()]
-                if parts:  # Only add non-empty rows
-                    rows.append(parts)
-
-        if not rows or len(rows) < 2:
+        rows = _iter_csv_rows(csv_path)
+
+        # First row is headers
+        headers = next(rows, None)
+        if not headers:
             logger.warning("CSV file has insufficient data")
             return None
 
-        # First row is headers
-        headers = [cell.strip() for cell in rows[0]]
-        data_rows = rows[1:]
+        data_rows = _RowPreview(rows)
+        table_data = _extract_table_data_from_csv(headers, data_rows)
 
-        logger.info(f"CSV parsed: {len(headers)} headers, {len(data_rows)} data rows")
+        if data_rows.count < 1:
+            logger.warning("CSV file has insufficient data")
+            return None
 
-        # Process the data
-        table_data = _extract_table_data_from_csv(headers, data_rows)
+        logger.info(f"CSV parsed: {len(headers)} headers, {data_rows.count} data rows")
 
         result = {
             'success': True,
             'tables': [table_data] if table_data else [],
-            'text': f"CSV file with {len(data_rows)} rows",
+            'text': f"CSV file with {data_rows.count} rows",
             'raw_data': {
                 'headers': headers,
-                'rows': data_rows,
-                'extraction_details': {}
+                'rows': data_rows.preview,
+                'total_rows': data_rows.count,
+                'extraction_details': _build_sample_extraction_details([table_data] if table_data else [])
             }
         }
 
-        # Format the output in the requested structure
-        if table_data and table_data.get('type') == 'soil':
-            logger.debug(f"Processing soil table with {table_data.get('total_samples', 0)} samples")
-
-            soil_samples = {}
-            for sample in table_data.get('samples', []):
-                if isinstance(sample, dict) and 'sample_id' in sample and 'data' in sample:
-                    sample_id = sample['sample_id']
-                    sample_data = sample['data']
-                    soil_samples[sample_id] = sample_data
-                    logger.debug(f"Added sample {sample_id} with parameters: {list(sample_data.keys())}")
-
-            if soil_samples:
-                # Detect the report type based on sample naming pattern
-                report_type = _detect_report_type(list(soil_samples.keys()))
-
-                result['raw_data']['extraction_details'][report_type] = soil_samples
-                logger.debug(f"Created {report_type} with {len(soil_samples)} samples")
-
-                result['raw_data']['extraction_details']['soil_summary'] = {
-                    'total_samples': len(soil_samples),
-                    'sample_ids': list(soil_samples.keys()),
-                    'parameters': list(set([param for sample_data in soil_samples.values() for param in sample_data.keys()])),
-                    'report_type': report_type
-                }
-
         return result
 
     except Exception as e:
@@ -1392,125 +2043,65 @@ def _process_csv_file(csv_path: str) -> Optional[Dict]:
 
 
 def _process_excel_file(excel_path: str) -> Optional[Dict]:
-    """Process Excel file directly for table extraction"""
+    """Process Excel file directly for table extraction.
+
+    Every non-empty sheet is streamed row by row (openpyxl read-only mode for
+    ``.xlsx``) into the sample normalizer and becomes its own table.
+    """
     if not EXCEL_AVAILABLE:
         logger.error("Excel processing libraries not available")
         return None
         
     try:
-        import pandas as pd
-        from openpyxl import load_workbook
-        import xlrd
-
         logger.info(f"Processing Excel file: {os.path.basename(excel_path)}")
 
-        # Determine file type and read accordingly
-        file_ext = os.path.splitext(excel_path)[1].lower()
-
-        if file_ext == '.xlsx':
-            # Use openpyxl for .xlsx files
-            workbook = load_workbook(excel_path, data_only=True)
-            sheet = workbook.active
-            data = []
-
-            # Read all rows
-            for row in sheet.iter_rows(values_only=True):
-                if any(cell is not None for cell in row):  # Skip completely empty rows
-                    data.append([str(cell) if cell is not None else '' for cell in row])
-
-        elif file_ext == '.xls':
-            # Use xlrd for .xls files
-            workbook = xlrd.open_workbook(excel_path)
-            sheet = workbook.sheet_by_index(0)
-            data = []
-
-            # Read all rows
-            for row_idx in range(sheet.nrows):
-                row = []
-                for col_idx in range(sheet.ncols):
-                    cell_value = sheet.cell_value(row_idx, col_idx)
-                    row.append(str(cell_value) if cell_value is not None else '')
-                if any(cell.strip() for cell in row):  # Skip rows with only empty strings
-                    data.append(row)
-
-        if not data or len(data) < 2:
+        tables = []
+        headers: List[str] = []
+        preview_rows: List[List[str]] = []
+        total_rows = 0
+
+        for sheet_name, sheet_rows in _iter_excel_sheets(excel_path):
+            # First row of each sheet is headers
+            sheet_headers = next(sheet_rows, None)
+            if not sheet_headers:
+                continue
+
+            data_rows = _RowPreview(sheet_rows)
+            logger.info(f"Processing Excel sheet '{sheet_name}' with headers: {sheet_headers[:5]}...")  # Show first 5 headers
+            table_data = _extract_table_data_from_excel(sheet_headers, data_rows)
+            logger.info(f"Excel sheet '{sheet_name}' parsed: {len(sheet_headers)} headers, {data_rows.count} data rows")
+
+            if data_rows.count < 1:
+                continue
+
+            if not headers:
+                headers = sheet_headers
+                preview_rows = data_rows.preview
+            total_rows += data_rows.count
+
+            if table_data:
+                table_data['sheet'] = sheet_name
+                logger.info(f"Successfully extracted table data: type={table_data.get('type')}, samples={len(table_data.get('samples', []))}")
+                tables.append(table_data)
+            else:
+                logger.warning(f"No table data extracted from Excel sheet '{sheet_name}'")
+
+        if total_rows < 1:
             logger.warning("Excel file has insufficient data")
             return None
 
-        # First row is headers
-        headers = [cell.strip() for cell in data[0]]
-        data_rows = data[1:]
-
-        # Filter out empty rows from data
-        data_rows = [row for row in data_rows if any(cell.strip() for cell in row)]
-
-        logger.info(f"Excel parsed: {len(headers)} headers, {len(data_rows)} data rows")
-
-        # Process the data
-        logger.info(f"Processing Excel data with headers: {headers[:5]}...")  # Show first 5 headers
-        logger.info(f"Sample data row: {data_rows[0] if data_rows else 'No data rows'}")
-        
-        table_data = _extract_table_data_from_excel(headers, data_rows)
-        
-        if table_data:
-            logger.info(f"Successfully extracted table data: type={table_data.get('type')}, samples={len(table_data.get('samples', []))}")
-        else:
-            logger.warning("No table data extracted from Excel file")
-
         result = {
             'success': True,
-            'tables': [table_data] if table_data else [],
-            'text': f"Excel file with {len(data_rows)} rows",
+            'tables': tables,
+            'text': f"Excel file with {total_rows} rows",
             'raw_data': {
                 'headers': headers,
-                'rows': data_rows,
-                'extraction_details': {}
+                'rows': preview_rows,
+                'total_rows': total_rows,
+                'extraction_details': _build_sample_extraction_details(tables, soil_details_key='soil_samples')
             }
         }
 
-        # Format the output in the requested structure
-        if table_data and table_data.get('type') == 'soil':
-            logger.debug(f"Processing soil table with {table_data.get('total_samples', 0)} samples")
-
-            soil_samples = {}
-            for sample in table_data.get('samples', []):
-                if isinstance(sample, dict) and 'sample_id' in sample and 'data' in sample:
-                    sample_id = sample['sample_id']
-                    sample_data = sample['data']
-                    soil_samples[sample_id] = sample_data
-                    logger.debug(f"Added sample {sample_id} with parameters: {list(sample_data.keys())}")
-
-            if soil_samples:
-                # Detect the report type based on sample naming pattern
-                report_type = _detect_report_type(list(soil_samples.keys()))
-
-                result['raw_data']['extraction_details']['soil_samples'] = soil_samples
-                result['raw_data']['extraction_details']['soil_summary'] = {
-                    'total_samples': len(soil_samples),
-                    'sample_ids': list(soil_samples.keys()),
-                    'parameters': list(set([param for sample_data in soil_samples.values() for param in sample_data.keys()])),
-                    'report_type': report_type
-                }
-
-        elif table_data and table_data.get('type') == 'leaf':
-            logger.debug(f"Processing leaf table with {table_data.get('total_samples', 0)} samples")
-
-            leaf_samples = {}
-            for sample in table_data.get('samples', []):
-                if isinstance(sample, dict) and 'sample_id' in sample and 'data' in sample:
-                    sample_id = sample['sample_id']
-                    sample_data = sample['data']
-                    leaf_samples[sample_id] = sample_data
-                    logger.debug(f"Added sample {sample_id} with parameters: {list(sample_data.keys())}")
-
-            if leaf_samples:
-                result['raw_data']['extraction_details']['leaf_samples'] = leaf_samples
-                result['raw_data']['extraction_details']['leaf_summary'] = {
-                    'total_samples': len(leaf_samples),
-                    'sample_ids': list(leaf_samples.keys()),
-                    'parameters': list(set([param for sample_data in leaf_samples.values() for param in sample_data.keys()]))
-                }
-
         return result
 
     except ImportError as e:
@@ -1522,29 +2113,40 @@ def _process_excel_file(excel_path: str) -> Optional[Dict]:
         return None
 
 
-def _extract_table_data_from_excel(headers: List[str], rows: List[List[str]]) -> Optional[Dict]:
-    """Extract structured data from Excel table"""
+def _extract_table_data_from_excel(headers: List[str], rows: Iterable[List[str]]) -> Optional[Dict]:
+    """Extract structured data from a streamed Excel/CSV table.
+
+    The first few rows classify the table; all rows are then normalized in
+    chunks of ``ROW_CHUNK_SIZE`` so the full row list is never materialized.
+    """
     try:
-        logger.info(f"Processing Excel table with {len(headers)} headers and {len(rows)} rows")
+        logger.info(f"Processing table with {len(headers)} headers")
         logger.debug(f"Headers: {headers}")
 
+        rows = iter(rows)
+        detection_rows = list(islice(rows, TYPE_DETECTION_ROWS))
+        all_rows = chain(detection_rows, rows)
+
         # Determine table type using class method
         processor = DocumentAIProcessor()
-        table_type = processor._determine_table_type(headers, rows)
+        table_type = processor._determine_table_type(headers, detection_rows)
         logger.info(f"Detected table type: {table_type}")
 
-        if table_type == 'soil':
-            result = processor._structure_soil_data(headers, rows)
-            logger.info(f"Soil data structured: {len(result.get('samples', []))} samples")
-            return result
-        elif table_type == 'leaf':
-            result = processor._structure_leaf_data(headers, rows)
-            logger.info(f"Leaf data structured: {len(result.get('samples', []))} samples")
-            return result
+        samples = []
+        if table_type in ('soil', 'leaf'):
+            structure = processor._structure_soil_data if table_type == 'soil' else processor._structure_leaf_data
+            for chunk in _iter_row_chunks(all_rows):
+                samples.extend(structure(headers, chunk).get('samples', []))
+            logger.info(f"{table_type.title()} data structured: {len(samples)} samples")
+            return {
+                'type': table_type,
+                'headers': headers,
+                'samples': samples,
+                'total_samples': len(samples)
+            }
         else:
             # Create a generic structure
-            samples = []
-            for row_idx, row in enumerate(rows):
+            for row in all_rows:
                 if len(row) >= len(headers):
                     sample = {}
                     for i, value in enumerate(row):
@@ -1568,6 +2170,39 @@ def _extract_table_data_from_excel(headers: List[str], rows: List[List[str]]) ->
         return None
 
 
+# CSV tables share the streamed Excel normalizer
+_extract_table_data_from_csv = _extract_table_data_from_excel
+
+
+def store_structured_document(source: str, record: Dict[str, Any]) -> bool:
+    """Persist a batch-processed document in the structured documents collection"""
+    try:
+        from utils.firebase_config import get_firestore_client, COLLECTIONS
+
+        db = get_firestore_client()
+        if not db:
+            logger.warning(f"Firestore not available, structured data for {source} not stored")
+            return False
+
+        tables = record.get('tables', [])
+        db.collection(COLLECTIONS['structured_documents']).document(hashlib.sha1(source.encode('utf-8')).hexdigest()).set({
+            'source': source,
+            'processed_at': datetime.now(),
+            'method': record.get('method'),
+            'table_types': [table.get('type', 'unknown') for table in tables],
+            'total_samples': sum(len(table.get('samples', [])) for table in tables),
+            'structured_markdown': record.get('structured_markdown', ''),
+            # Firestore cannot hold nested arrays, so table rows are kept as JSON
+            'tables_json': json.dumps(tables, default=str),
+            'structured_tables_json': json.dumps(record.get('structured_tables', []), default=str)
+        })
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to store structured data for {source}: {e}")
+        return False
+
+
 def extract_data_from_image(image_path: str) -> Dict[str, Any]:
     """
     Main function to extract data from images using Google Document AI with Tesseract fallback
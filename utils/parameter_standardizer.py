@@ -5,10 +5,89 @@ across all modules in the CropDrive™ AI Assistant system.
 """
 
 import re
-from typing import Dict, List, Any, Optional
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple, Iterable
+
+
+class _AhoCorasick:
+    """Minimal Aho-Corasick automaton reporting the lowest pattern id found in a text"""
+
+    def __init__(self, patterns: List[Tuple[str, int]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._best: List[Optional[int]] = [None]
+
+        # Build the trie
+        for pattern, pattern_id in patterns:
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                    self._goto[state][char] = next_state
+                state = next_state
+            if self._best[state] is None or pattern_id < self._best[state]:
+                self._best[state] = pattern_id
+
+        # Breadth-first failure links; each state also reports the best id of its suffixes
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                inherited = self._best[self._fail[next_state]]
+                if inherited is not None and (self._best[next_state] is None or inherited < self._best[next_state]):
+                    self._best[next_state] = inherited
+
+    def search(self, text: str) -> Optional[int]:
+        """Return the lowest id of any pattern occurring in text, or None"""
+        state, best = 0, None
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            found = self._best[state]
+            if found is not None and (best is None or found < best):
+                best = found
+        return best
+
 
 class ParameterStandardizer:
     """Centralized parameter standardization for soil and leaf analysis data"""
+
+    # Raw header strings remembered by standardize_parameter_name
+    MEMO_SIZE = 4096
+    # Variations shorter than this are only ever matched exactly
+    MIN_FUZZY_LENGTH = 3
+
+    _WHITESPACE_RE = re.compile(r'\s+')
+    _TOKEN_RE = re.compile(r'[a-z0-9]+|%')
+
+    # Elements measured in both report types: a name that resolves to the other
+    # type's parameter is translated to its counterpart (e.g. soil 'K' -> Exch. K)
+    TYPE_COUNTERPARTS = {
+        'soil': {
+            'P (%)': 'Avail P (mg/kg)',
+            'K (%)': 'Exch. K (meq/100 g)',
+            'Ca (%)': 'Exch. Ca (meq/100 g)',
+            'Mg (%)': 'Exch. Mg (meq/100 g)'
+        },
+        'leaf': {
+            'Total P (mg/kg)': 'P (%)',
+            'Avail P (mg/kg)': 'P (%)',
+            'Exch. K (meq/100 g)': 'K (%)',
+            'Exch. Ca (meq/100 g)': 'Ca (%)',
+            'Exch. Mg (meq/100 g)': 'Mg (%)'
+        }
+    }
     
     def __init__(self):
         # Standard parameter names (canonical format)
@@ -144,11 +223,100 @@ class ParameterStandardizer:
             ]
         }
         
+        # Shorthand keys used by the result and PDF mappers and by uploaded
+        # spreadsheets. These are matched exactly (up to punctuation) only:
+        # as fuzzy patterns, names like 'soil ph' or 'om' would capture
+        # unrelated headers such as 'Soil Phosphorus' or 'Comment'.
+        self.PARAMETER_ALIASES = {
+            'pH': ['p_h', 'soil ph', 'ph value', 'soil ph value'],
+            'N (%)': ['n percent', 'nitrogen percent', 'soil nitrogen'],
+            'Org. C (%)': [
+                'org c', 'org carbon', 'organic c', 'oc', 'soil oc', 'soil organic carbon',
+                'soil carbon', 'organic matter', 'om'
+            ],
+            'Total P (mg/kg)': ['tp', 'p total', 'phosphorus total', 'soil total p'],
+            'Avail P (mg/kg)': [
+                'ap', 'p available', 'p avail', 'soil avail p', 'extractable p', 'avail p mg/kg'
+            ],
+            'Exch. K (meq/100 g)': ['ek', 'k exch', 'k exchangeable', 'soil exch k', 'exch k meq'],
+            'Exch. Ca (meq/100 g)': ['ca exch', 'ca exchangeable', 'soil exch ca', 'exch ca meq'],
+            'Exch. Mg (meq/100 g)': ['mg exch', 'mg exchangeable', 'soil exch mg', 'exch mg meq'],
+            'CEC (meq/100 g)': ['cec meq', 'soil cec', 'exchange capacity', 'c e c'],
+            'P (%)': ['p percent', 'phosphorus percent'],
+            'K (%)': ['k percent', 'potassium percent'],
+            'Mg (%)': ['mg percent', 'magnesium percent'],
+            'Ca (%)': ['ca percent', 'calcium percent']
+        }
+
         # Create reverse mapping for quick lookup
         self.variation_to_standard = {}
         for standard, variations in self.PARAMETER_VARIATIONS.items():
             for variation in variations:
                 self.variation_to_standard[variation.lower()] = standard
+
+        self.alias_to_standard = {}
+        for standard, aliases in self.PARAMETER_ALIASES.items():
+            for alias in aliases:
+                self.alias_to_standard.setdefault(alias.lower(), standard)
+
+        self._build_lookup_index()
+
+    def _token_key(self, name: str) -> str:
+        """Normalize a lowercased name to its alphanumeric tokens, e.g. 'exch. k (meq%)' -> 'exch k meq %'"""
+        return ' '.join(self._TOKEN_RE.findall(name))
+
+    def _build_lookup_index(self):
+        """Compile the variation tables into the lookup structures used for standardization.
+
+        Fuzzy matches keep the original priority: the first variation (in
+        ``variation_to_standard`` order) that is contained in the name, or
+        that contains the name, wins. Contained variations are found with an
+        Aho-Corasick automaton and containing ones with a substring table.
+        """
+        self._exact_to_standard: Dict[str, str] = dict(self.alias_to_standard)
+        self._exact_to_standard.update(self.variation_to_standard)
+
+        self._token_to_standard: Dict[str, str] = {}
+        for variation, standard in self.variation_to_standard.items():
+            self._token_to_standard.setdefault(self._token_key(variation), standard)
+        for alias, standard in self.alias_to_standard.items():
+            self._token_to_standard.setdefault(self._token_key(alias), standard)
+
+        self._fuzzy_standards: List[str] = []
+        self._substring_owner: Dict[str, int] = {}
+        patterns = []
+        for variation, standard in self.variation_to_standard.items():
+            if len(variation) < self.MIN_FUZZY_LENGTH:
+                continue
+            order = len(self._fuzzy_standards)
+            self._fuzzy_standards.append(standard)
+            patterns.append((variation, order))
+            for start in range(len(variation)):
+                for end in range(start, len(variation) + 1):
+                    self._substring_owner.setdefault(variation[start:end], order)
+
+        self._automaton = _AhoCorasick(patterns)
+        self._lookup_memo = lru_cache(maxsize=self.MEMO_SIZE)(self._lookup_parameter_name)
+
+    def _lookup_parameter_name(self, param_name: str) -> Optional[str]:
+        """Resolve a raw parameter name through the exact, token and fuzzy indexes"""
+        # Clean the parameter name
+        clean_name = self._WHITESPACE_RE.sub(' ', param_name.strip().lower())
+
+        # Direct lookup
+        standard = self._exact_to_standard.get(clean_name)
+        if standard:
+            return standard
+
+        # Same tokens, different punctuation or spacing
+        standard = self._token_to_standard.get(self._token_key(clean_name))
+        if standard:
+            return standard
+
+        # Fuzzy matching for partial matches in either direction
+        orders = [order for order in (self._automaton.search(clean_name), self._substring_owner.get(clean_name))
+                  if order is not None]
+        return self._fuzzy_standards[min(orders)] if orders else None
     
     def standardize_parameter_name(self, param_name: str) -> Optional[str]:
         """
@@ -162,30 +330,53 @@ class ParameterStandardizer:
         """
         if not param_name:
             return None
-            
-        # Clean the parameter name
-        clean_name = param_name.strip().lower()
-        clean_name = re.sub(r'\s+', ' ', clean_name)  # Normalize whitespace
-        
-        # Direct lookup
-        if clean_name in self.variation_to_standard:
-            return self.variation_to_standard[clean_name]
+
+        return self._lookup_memo(param_name)
+    
+    def resolve(self, name: Any, param_type: Optional[str] = None) -> Optional[str]:
+        """
+        Resolve a raw parameter name or column header to its canonical parameter ID.
+
+        Canonical IDs are the values of STANDARD_SOIL_PARAMS and
+        STANDARD_LEAF_PARAMS and are used as parameter keys end to end.
         
-        # Fuzzy matching for partial matches (more precise)
-        for variation, standard in self.variation_to_standard.items():
-            # Only match if the variation is a significant part of the clean_name
-            # Avoid matching single characters or very short variations
-            if len(variation) >= 3 and (variation in clean_name or clean_name in variation):
-                return standard
+        Args:
+            name: Raw parameter name, column header or legacy key
+            param_type: 'soil' or 'leaf' to translate elements named for the other report type
+            
+        Returns:
+            Canonical parameter ID or None if the name is not a known parameter
+        """
+        standard = self.standardize_parameter_name(name) if isinstance(name, str) else None
+        if standard and param_type:
+            standard = self.TYPE_COUNTERPARTS.get(param_type.lower(), {}).get(standard, standard)
+        return standard
+
+    def resolve_columns(self, names: Iterable[Any], param_type: Optional[str] = None) -> Dict[Any, Optional[str]]:
+        """
+        Resolve every distinct column header once
         
-        return None
-    
-    def standardize_data_dict(self, data_dict: Dict[str, Any]) -> Dict[str, Any]:
+        Args:
+            names: Column headers or sample keys
+            param_type: 'soil' or 'leaf'
+            
+        Returns:
+            Dictionary mapping each header to its canonical parameter ID (or None)
+        """
+        return {name: self.resolve(name, param_type) for name in dict.fromkeys(names)}
+
+    def canonical_parameters(self, param_type: str = 'soil') -> List[str]:
+        """Canonical parameter IDs of a report type in report order"""
+        params = self.STANDARD_SOIL_PARAMS if param_type.lower() == 'soil' else self.STANDARD_LEAF_PARAMS
+        return list(params.values())
+
+    def standardize_data_dict(self, data_dict: Dict[str, Any], param_type: Optional[str] = None) -> Dict[str, Any]:
         """
         Standardize all parameter names in a data dictionary
         
         Args:
             data_dict: Dictionary with potentially non-standard parameter names
+            param_type: Optional 'soil' or 'leaf' report type of the data
             
         Returns:
             Dictionary with standardized parameter names
@@ -193,26 +384,33 @@ class ParameterStandardizer:
         standardized = {}
         
         for key, value in data_dict.items():
-            standard_key = self.standardize_parameter_name(key)
-            if standard_key:
-                standardized[standard_key] = value
-            else:
-                # Keep non-parameter keys as-is (like sample_id, lab_no, etc.)
-                standardized[key] = value
+            # Keep non-parameter keys as-is (like sample_id, lab_no, etc.)
+            standardized[self.resolve(key, param_type) or key] = value
         
         return standardized
     
-    def standardize_samples_list(self, samples: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def standardize_samples_list(self, samples: List[Dict[str, Any]], param_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Standardize parameter names in a list of sample dictionaries
+        Standardize parameter names in a list of sample dictionaries.
+
+        Each distinct key is resolved once for the whole list rather than once
+        per sample.
         
         Args:
             samples: List of sample dictionaries
+            param_type: Optional 'soil' or 'leaf' report type of the samples
             
         Returns:
             List of samples with standardized parameter names
         """
-        return [self.standardize_data_dict(sample) for sample in samples]
+        key_map: Dict[Any, Any] = {}
+        standardized = []
+        for sample in samples:
+            for key in sample:
+                if key not in key_map:
+                    key_map[key] = self.resolve(key, param_type) or key
+            standardized.append({key_map[key]: value for key, value in sample.items()})
+        return standardized
     
     def get_display_name_mapping(self, param_type: str = 'soil') -> Dict[str, str]:
         """
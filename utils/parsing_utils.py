@@ -3,7 +3,56 @@ Parsing utilities for extracting structured data from OCR text
 """
 
 import re
-from typing import Dict, Any, List
+import logging
+from bisect import bisect_right
+from typing import Dict, Any, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+SOIL_HEADERS = [
+    "Sample ID", "pH", "N (%)", "Org. C (%)", "Total P (mg/kg)",
+    "Avail P (mg/kg)", "Exch. K (meq%)", "Exch. Ca (meq%)",
+    "Exch. Mg (meq%)", "CEC (meq%)"
+]
+
+LEAF_HEADERS = [
+    "Sample ID", "N (%)", "P (%)", "K (%)", "Mg (%)", "Ca (%)",
+    "B (mg/kg)", "Cu (mg/kg)", "Zn (mg/kg)", "Fe (mg/kg)", "Mn (mg/kg)"
+]
+
+# Precompiled patterns shared by every OCR table parser
+STRICT_SAMPLE_ID_PATTERN = re.compile(r'(?<!\S)[SL]\d{3,4}(?!\S)')  # S001-S9999 or L001-L9999
+LOOSE_SAMPLE_ID_PATTERN = re.compile(
+    r'S\d+/?\d*'            # S1, S1/1, etc.
+    r'|Sample\s*\d+'        # Sample 1, Sample 2, etc.
+    r'|Lab\s*No\.?\s*\d+'   # Lab No 1, Lab No. 123, etc.
+    r'|Farm\s*\d+'          # Farm 1, Farm 2, etc.
+    r'|Plot\s*\d+'          # Plot 1, Plot 2, etc.
+    r'|^\d{1,3}\b(?!\.\d)'  # Simple numbers 1-999, only leading a line (units like meq/100 g are not IDs)
+)
+_TOKEN_RE = re.compile(r'[^\s,;|\t]+')
+_CELL_RE = re.compile(r'\S+(?: \S+)*')  # Cells are separated by two or more spaces
+_NUMBER_RE = re.compile(r'-?\d+(?:\.\d+)?')
+_HEADER_RE = re.compile(
+    r'Sample\s+ID'
+    r'|Lab\s+No\.?'
+    r'|Org\.\s*C(?:\s*\([^)]*\))?'
+    r'|(?:Total|Avail\.?)\s+P(?:\s*\([^)]*\))?'
+    r'|Exch\.\s*[A-Za-z]{1,2}\b(?:\s*\([^)]*\))?'
+    r'|[A-Za-z][A-Za-z.]*(?:\s*\([^)]*\))?',
+    re.IGNORECASE
+)
+_TOTAL_AVAIL_RE = re.compile(r'^(Total|Avail\.?)\s+P$', re.IGNORECASE)
+_EXCH_RE = re.compile(r'^Exch\.\s*([A-Za-z]{1,2})$', re.IGNORECASE)
+_ORG_C_RE = re.compile(r'^Org\.\s*C$', re.IGNORECASE)
+
+# Keyword tables for soil/leaf detection (distinct keyword hits are counted)
+_SOIL_KEYWORDS = ("cec", "exch", "exchangeable", "organic", "org")
+_SOIL_SPECIFIC = ("cec (meq%)", "exch. k", "exch. ca", "exch. mg", "avail p")
+_LEAF_KEYWORDS = ("b (mg/kg)", "cu (mg/kg)", "zn (mg/kg)", "fe (mg/kg)", "mn (mg/kg)")
+_LEAF_SPECIFIC = ("b (mg/kg)", "cu (mg/kg)", "zn (mg/kg)")
+_GENERAL_KEYWORDS = ("n (%)", "p (%)", "k (%)", "ph", "nitrogen", "phosphorus", "potassium")
 
 
 def _parse_dynamic_headers(header_line: str) -> List[str]:
@@ -11,509 +60,259 @@ def _parse_dynamic_headers(header_line: str) -> List[str]:
     Dynamically parse complex header line with multi-word headers and units.
     Handles patterns like "Sample ID", "N (%)", "Org. C (%)", "Total P (mg/kg)", etc.
     """
-    # Use regex to find patterns: word(s) followed by optional unit in parentheses
-    # This handles: "Sample ID", "pH", "N (%)", "Org. C (%)", "Total P (mg/kg)", etc.
-    pattern = r'([A-Za-z][A-Za-z\s.]*(?:\s*\([^)]+\))?)'
-    matches = re.findall(pattern, header_line)
-
     headers = []
-    for match in matches:
-        clean_header = match.strip()
-        if clean_header and len(clean_header) > 1:  # Skip single characters
-            headers.append(clean_header)
-
-    # Post-process to combine related parts that might have been split incorrectly
-    processed_headers = []
-    i = 0
-    while i < len(headers):
-        current = headers[i]
-
-        # Handle "Sample ID" pattern
-        if current.lower() == "sample" and i + 1 < len(headers) and headers[i + 1].lower() == "id":
-            processed_headers.append("Sample ID")
-            i += 2
-        # Handle "Org. C" pattern
-        elif current.lower() == "org." and i + 1 < len(headers) and headers[i + 1].lower().startswith("c"):
-            unit_part = headers[i + 1] if i + 2 >= len(headers) else f"{headers[i + 1]} {headers[i + 2]}" if headers[i + 2].startswith("(") else headers[i + 1]
-            processed_headers.append(f"Org. C {unit_part}" if "(" in unit_part else f"Org. C ({unit_part})")
-            i += 2 if not unit_part.startswith("(") or i + 2 >= len(headers) else 3
-        # Handle "Total P", "Avail P" patterns
-        elif current.lower() in ["total", "avail"] and i + 1 < len(headers) and headers[i + 1].lower() == "p":
-            unit_part = headers[i + 2] if i + 2 < len(headers) and headers[i + 2].startswith("(") else "(mg/kg)"
-            processed_headers.append(f"{current} P {unit_part}")
-            i += 3 if i + 2 < len(headers) and headers[i + 2].startswith("(") else 2
-        # Handle "Exch. K", "Exch. Ca", "Exch. Mg" patterns
-        elif current.lower() == "exch." and i + 2 < len(headers):
-            element = headers[i + 1]
-            unit = headers[i + 2] if headers[i + 2].startswith("(") else "(meq/100 g)"
-            processed_headers.append(f"Exch. {element} {unit}")
-            i += 3 if headers[i + 2].startswith("(") else 2
-        else:
-            processed_headers.append(current)
-            i += 1
-
-    return processed_headers
-
-
-def _parse_raw_text_to_structured_json(raw_text: str) -> dict:
-    """
-    Parse raw OCR text into structured JSON.
-    Simplified and robust parsing for soil/leaf analysis data.
-    """
-    import logging
-    logger = logging.getLogger(__name__)
-
-    logger.info(f"Parsing raw text: {len(raw_text)} characters")
-    logger.debug(f"Raw text content: {raw_text[:300]}...")
-
-    # Also print for immediate debugging
-    print(f"DEBUG: Parsing raw text: {len(raw_text)} characters")
-    print(f"DEBUG: Raw text preview: {raw_text[:200]}...")
-
-    # Quick check for obvious indicators
-    if "soil" in raw_text.lower():
-        print("DEBUG: Found 'soil' in raw text")
-    if "ph" in raw_text.lower():
-        print("DEBUG: Found 'ph' in raw text")
-    if "cec" in raw_text.lower():
-        print("DEBUG: Found 'cec' in raw text")
-
-    # Step 1: Clean and split the text
-    lines = [line.strip() for line in raw_text.split('\n') if line.strip()]
-
-    logger.info(f"Found {len(lines)} non-empty lines after splitting by newlines")
-
-    # Handle single-line OCR output (common with some OCR engines)
-    if len(lines) == 1 and len(raw_text) > 100:
-        logger.info("Detected single-line OCR output, attempting to parse as single line")
-        single_line = lines[0]
-
-        # Try different splitting strategies for single-line content
-        # Strategy 1: Split by multiple spaces (tabular data)
-        if '  ' in single_line:  # Multiple spaces indicate tabular format
-            potential_lines = []
-            parts = single_line.split()
-
-            # Look for sample IDs to determine line breaks
-            current_line_parts = []
-            for part in parts:
-                current_line_parts.append(part)
-
-                # If we find a sample ID (S001, L001, etc.), start a new line after collecting enough data
-                if re.match(r'^[SL]\d{3,4}$', part) and len(current_line_parts) >= 2:
-                    # Check if we have enough parts for a complete sample line
-                    remaining_parts = parts[len(current_line_parts):]
-                    if len(remaining_parts) >= 8:  # At least sample ID + 8 parameters
-                        potential_lines.append(' '.join(current_line_parts))
-                        current_line_parts = []
-
-            # Add remaining parts if any
-            if current_line_parts:
-                potential_lines.append(' '.join(current_line_parts))
-
-            if len(potential_lines) >= 2:  # Need at least header + 1 data line
-                lines = potential_lines
-                logger.info(f"Successfully split single line into {len(lines)} lines using sample ID detection")
-            else:
-                # Strategy 2: Try to identify header vs data sections
-                words = single_line.split()
-                header_end_idx = -1
-
-                # Look for common header patterns
-                for i, word in enumerate(words):
-                    if word.lower() in ['s001', 'l001'] or (word.isdigit() and len(word) == 3 and word.startswith(('4', '5', '6', '7', '2'))):
-                        header_end_idx = i
-                        break
-
-                if header_end_idx > 0:
-                    header_line = ' '.join(words[:header_end_idx])
-                    data_section = ' '.join(words[header_end_idx:])
-                    lines = [header_line, data_section]
-                    logger.info("Split single line into header and data sections")
-                else:
-                    # Strategy 3: Assume first part is title/header, rest is data
-                    words = single_line.split()
-                    if len(words) > 10:  # Arbitrary threshold for meaningful content
-                        lines = [single_line]  # Keep as single line but proceed with parsing
-                        logger.info("Keeping as single line, will attempt direct parsing")
-                    else:
-                        logger.warning("Single line too short for meaningful parsing")
-                        return {"type": "unknown", "samples": []}
+    for match in _HEADER_RE.finditer(header_line):
+        header = ' '.join(match.group().split())
+        if len(header) <= 1 and header.lower() not in ('n', 'p', 'k', 'b'):
+            continue
+
+        # Fill in the units the lab reports usually leave implicit
+        if _TOTAL_AVAIL_RE.match(header):
+            header = f"{header} (mg/kg)"
+        elif _EXCH_RE.match(header):
+            header = f"{header} (meq/100 g)"
+        elif _ORG_C_RE.match(header):
+            header = f"{header} (%)"
+        elif header.lower() == 'sample id':
+            header = "Sample ID"
+
+        headers.append(header)
+
+    return headers
+
+
+def _score_line(line_lower: str) -> Tuple[int, int]:
+    """Score a lower-cased line for soil and leaf header keywords"""
+    soil_score = sum(1 for keyword in _SOIL_SPECIFIC if keyword in line_lower)
+    soil_score += sum(1 for keyword in _SOIL_KEYWORDS if keyword in line_lower)
+    leaf_score = sum(1 for keyword in _LEAF_SPECIFIC if keyword in line_lower)
+    leaf_score += sum(1 for keyword in _LEAF_KEYWORDS if keyword in line_lower)
+
+    # General nutrient indicators strengthen whichever side already leads
+    if any(keyword in line_lower for keyword in _GENERAL_KEYWORDS):
+        if soil_score >= leaf_score:
+            soil_score += 1
         else:
-            logger.info("Single line detected but no clear tabular structure, proceeding with direct parsing")
-
-    logger.info(f"Final line count after processing: {len(lines)}")
-    for i, line in enumerate(lines[:5]):  # Log first 5 lines
-        logger.debug(f"Line {i+1}: {repr(line)}")
-
-    if len(lines) < 1:  # Need at least one line
-        logger.warning(f"No lines found for parsing")
-        return {"type": "unknown", "samples": []}
+            leaf_score += 1
 
-    # If we have very few lines, still try to parse them
-    if len(lines) < 3:
-        logger.info(f"Only {len(lines)} lines available, attempting flexible parsing")
+    return soil_score, leaf_score
 
-    # Step 2: Detect if this is soil or leaf data - try multiple approaches
-    logger.info("Attempting to detect data type...")
 
-    # First, try with the second line (assuming it's the header)
-    header_line = lines[1].lower() if len(lines) > 1 else ""
-    logger.info(f"Header line (line 2): {repr(header_line)}")
+def _column_centres(line: str) -> List[float]:
+    """Character-position centres of the cells in a space-aligned line"""
+    return [(match.start() + match.end()) / 2 for match in _CELL_RE.finditer(line)]
 
-    container_type = None
-    expected_headers = []
 
-    # Check if it's soil data (prioritize specific soil indicators)
-    soil_keywords = ["cec", "exch", "exchangeable", "organic", "org"]
-    soil_specific = ["cec (meq%)", "exch. k", "exch. ca", "exch. mg", "avail p"]
-    leaf_keywords = ["b (mg/kg)", "cu (mg/kg)", "zn (mg/kg)", "fe (mg/kg)", "mn (mg/kg)"]
-    leaf_specific = ["b (mg/kg)", "cu (mg/kg)", "zn (mg/kg)"]
+def _align_values(tokens: List[Tuple[str, float]], boundaries: List[float]) -> Optional[List[str]]:
+    """Place value tokens under the header column whose span contains them.
 
-    # Count specific indicators to determine type
-    soil_score = sum(1 for keyword in soil_specific if keyword in header_line)
-    soil_score += sum(1 for keyword in soil_keywords if keyword in header_line)
+    ``boundaries`` are the midpoints between neighbouring header column
+    centres. Returns None when two tokens claim the same column, in which
+    case the caller falls back to sequential assignment.
+    """
+    aligned = [''] * (len(boundaries) + 1)
+    for text, centre in tokens:
+        column = bisect_right(boundaries, centre)
+        if aligned[column]:
+            return None
+        aligned[column] = text
+    return aligned
 
-    leaf_score = sum(1 for keyword in leaf_specific if keyword in header_line)
-    leaf_score += sum(1 for keyword in leaf_keywords if keyword in header_line)
 
-    # Also check for general nutrient indicators
-    general_keywords = ["n (%)", "p (%)", "k (%)", "ph", "nitrogen", "phosphorus", "potassium"]
-    if any(keyword in header_line for keyword in general_keywords):
-        if soil_score >= leaf_score:
-            soil_score += 1
+def parse_table_text(text: str, sample_id_pattern: Pattern = STRICT_SAMPLE_ID_PATTERN,
+                     split_rows_on_ids: bool = True, delimiter: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Parse OCR'd soil/leaf table text in a single pass over its lines.
+
+    Each line is tokenized once: lines with a sample ID become data rows and
+    the remaining lines are scored as header candidates. When the header is
+    space-aligned with one cell per expected column, values are placed by
+    column position so blank cells do not shift later values left.
+
+    Args:
+        text: Raw OCR text
+        sample_id_pattern: Compiled pattern that identifies a sample ID
+        split_rows_on_ids: Start a new row at every sample ID on a line
+            (single-line OCR output) instead of one row per line
+        delimiter: Cell delimiter for CSV/TSV-like text; space-aligned if None
+
+    Returns:
+        Dict with 'type' ('soil', 'leaf' or 'unknown'), 'headers' (canonical,
+        or the header cells of delimited text), 'rows' (sample ID followed by
+        one value string per header, '' when blank) and the raw 'header_line'
+    """
+    header_line = None
+    header_scores = (0, 0)
+    header_centres: List[float] = []
+    header_cells: List[str] = []
+    fallback_scores = [0, 0]
+    row_tokens: List[List[Tuple[str, float]]] = []
+    row_ids: List[str] = []
+
+    for raw_line in text.split('\n'):
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        if split_rows_on_ids:
+            matches = list(sample_id_pattern.finditer(line))
         else:
-            leaf_score += 1
-
-    logger.info(f"Detection scores - Soil: {soil_score}, Leaf: {leaf_score}")
-    print(f"DEBUG: Detection scores - Soil: {soil_score}, Leaf: {leaf_score}")
-
-    if soil_score > leaf_score:
-        container_type = "soil"
-        expected_headers = [
-            "Sample ID", "pH", "N (%)", "Org. C (%)", "Total P (mg/kg)",
-            "Avail P (mg/kg)", "Exch. K (meq%)", "Exch. Ca (meq%)",
-            "Exch. Mg (meq%)", "CEC (meq%)"
-        ]
-        logger.info("✅ Detected soil analysis data from line 2")
-    elif leaf_score > soil_score:
-        container_type = "leaf"
-        expected_headers = [
-            "Sample ID", "N (%)", "P (%)", "K (%)", "Mg (%)", "Ca (%)",
-            "B (mg/kg)", "Cu (mg/kg)", "Zn (mg/kg)", "Fe (mg/kg)", "Mn (mg/kg)"
-        ]
-        logger.info("✅ Detected leaf analysis data from line 2")
-
-    # If still not detected, try other lines
-    if not container_type:
-        logger.info("Trying other lines for data type detection...")
-        for i, line in enumerate(lines):
-            line_lower = line.lower()
-            logger.debug(f"Checking line {i+1}: {repr(line_lower)}")
-
-            # Use same scoring system for other lines
-            line_soil_score = sum(1 for keyword in soil_specific if keyword in line_lower)
-            line_soil_score += sum(1 for keyword in soil_keywords if keyword in line_lower)
-
-            line_leaf_score = sum(1 for keyword in leaf_specific if keyword in line_lower)
-            line_leaf_score += sum(1 for keyword in leaf_keywords if keyword in line_lower)
-
-            if any(keyword in line_lower for keyword in general_keywords):
-                if line_soil_score >= line_leaf_score:
-                    line_soil_score += 1
-                else:
-                    line_leaf_score += 1
-
-            if line_soil_score > line_leaf_score:
-                container_type = "soil"
-                expected_headers = [
-                    "Sample ID", "pH", "N (%)", "Org. C (%)", "Total P (mg/kg)",
-                    "Avail P (mg/kg)", "Exch. K (meq%)", "Exch. Ca (meq%)",
-                    "Exch. Mg (meq%)", "CEC (meq%)"
-                ]
-                logger.info(f"✅ Detected soil analysis data from line {i+1} (scores: soil={line_soil_score}, leaf={line_leaf_score})")
-                break
-            elif line_leaf_score > line_soil_score:
-                container_type = "leaf"
-                expected_headers = [
-                    "Sample ID", "N (%)", "P (%)", "K (%)", "Mg (%)", "Ca (%)",
-                    "B (mg/kg)", "Cu (mg/kg)", "Zn (mg/kg)", "Fe (mg/kg)", "Mn (mg/kg)"
-                ]
-                logger.info(f"✅ Detected leaf analysis data from line {i+1} (scores: soil={line_soil_score}, leaf={line_leaf_score})")
-                break
-
-    # If still not detected, try to infer from sample patterns
-    if not container_type:
-        logger.info("Trying to infer data type from sample patterns...")
-        sample_patterns = ["s001", "s002", "l001", "l002", "sample"]
-        for line in lines:
-            line_lower = line.lower()
-            logger.debug(f"Checking line for detection: {repr(line_lower)}")
-
-            # For single-line content, also check for specific keywords
-            all_soil_keywords = ["cec", "exch", "exchangeable", "organic", "org", "ph", "phosphorus", "potassium", "calcium", "magnesium"]
-            all_leaf_keywords = ["b (mg/kg)", "cu (mg/kg)", "zn (mg/kg)", "fe (mg/kg)", "mn (mg/kg)", "nitrogen", "phosphorus", "potassium"]
-
-            # Check if we have sample patterns or keywords
-            has_sample_pattern = any(pattern in line_lower for pattern in sample_patterns)
-            has_soil_keywords = any(keyword in line_lower for keyword in all_soil_keywords)
-            has_leaf_keywords = any(keyword in line_lower for keyword in all_leaf_keywords)
-
-            logger.debug(f"Line analysis - Sample pattern: {has_sample_pattern}, Soil keywords: {has_soil_keywords}, Leaf keywords: {has_leaf_keywords}")
-
-            if has_sample_pattern or has_soil_keywords or has_leaf_keywords:
-                # Count keywords to determine type
-                soil_count = sum(1 for keyword in all_soil_keywords if keyword in line_lower)
-                leaf_count = sum(1 for keyword in all_leaf_keywords if keyword in line_lower)
-
-                # Check for specific soil indicators that are more definitive
-                soil_specific = ["cec", "exch", "exchangeable", "avail p"]
-                leaf_specific = ["b (mg/kg)", "cu (mg/kg)", "zn (mg/kg)"]
-
-                soil_specific_count = sum(1 for keyword in soil_specific if keyword in line_lower)
-                leaf_specific_count = sum(1 for keyword in leaf_specific if keyword in line_lower)
-
-                soil_count += soil_specific_count * 2  # Weight specific indicators more
-                leaf_count += leaf_specific_count * 2
-
-                logger.info(f"Keyword counts - Soil: {soil_count}, Leaf: {leaf_count}")
-
-                if soil_count > leaf_count:
-                    container_type = "soil"
-                    expected_headers = [
-                        "Sample ID", "pH", "N (%)", "Org. C (%)", "Total P (mg/kg)",
-                        "Avail P (mg/kg)", "Exch. K (meq%)", "Exch. Ca (meq%)",
-                        "Exch. Mg (meq%)", "CEC (meq%)"
-                    ]
-                    logger.info("✅ Inferred soil analysis data from sample patterns")
-                elif leaf_count > soil_count:
-                    container_type = "leaf"
-                    expected_headers = [
-                        "Sample ID", "N (%)", "P (%)", "K (%)", "Mg (%)", "Ca (%)",
-                        "B (mg/kg)", "Cu (mg/kg)", "Zn (mg/kg)", "Fe (mg/kg)", "Mn (mg/kg)"
-                    ]
-                    logger.info("✅ Inferred leaf analysis data from sample patterns")
-                elif soil_count > 0:  # If we have soil keywords but tie with leaf, prefer soil
-                    container_type = "soil"
-                    expected_headers = [
-                        "Sample ID", "pH", "N (%)", "Org. C (%)", "Total P (mg/kg)",
-                        "Avail P (mg/kg)", "Exch. K (meq%)", "Exch. Ca (meq%)",
-                        "Exch. Mg (meq%)", "CEC (meq%)"
-                    ]
-                    logger.info("✅ Defaulted to soil analysis data (soil keywords present)")
+            first = sample_id_pattern.search(line)
+            matches = [first] if first else []
+
+        # Header candidate: the text before the first sample ID (the whole
+        # line for header rows), kept when it mostly holds words
+        prefix = line[:matches[0].start()] if matches else line
+        if prefix:
+            soil_score, leaf_score = _score_line(prefix.lower())
+            words = _TOKEN_RE.findall(prefix)
+            numbers = sum(1 for word in words if _NUMBER_RE.fullmatch(word))
+            if (soil_score or leaf_score) and numbers * 2 < len(words):
+                if soil_score != leaf_score and max(soil_score, leaf_score) > max(header_scores):
+                    header_line = prefix
+                    header_scores = (soil_score, leaf_score)
+                    header_centres = [] if delimiter or matches else _column_centres(raw_line)
+                    header_cells = [cell.strip() for cell in prefix.split(delimiter)] if delimiter else []
                 else:
-                    # Last resort - assume soil if we can't determine
-                    container_type = "soil"
-                    expected_headers = [
-                        "Sample ID", "pH", "N (%)", "Org. C (%)", "Total P (mg/kg)",
-                        "Avail P (mg/kg)", "Exch. K (meq%)", "Exch. Ca (meq%)",
-                        "Exch. Mg (meq%)", "CEC (meq%)"
-                    ]
-                    logger.info("✅ Defaulted to soil analysis data (fallback)")
-                break
-
-    # *** FINAL FALLBACK: If still not detected, check the entire text ***
-    if not container_type:
-        logger.warning("All detection methods failed, checking entire raw text...")
-        print("DEBUG: ENTERING FINAL FALLBACK")
-        raw_text_lower = raw_text.lower()
-        print(f"DEBUG: Raw text lower: {raw_text_lower[:200]}...")
-
-        # Very simple fallback detection
-        soil_check = "soil" in raw_text_lower or "ph" in raw_text_lower or "cec" in raw_text_lower
-        leaf_check = "leaf" in raw_text_lower or any(kw in raw_text_lower for kw in ["b (mg/kg)", "cu (mg/kg)", "zn (mg/kg)"])
-
-        print(f"DEBUG: Soil check: {soil_check}, Leaf check: {leaf_check}")
-
-        if soil_check:
-            container_type = "soil"
-            expected_headers = [
-                "Sample ID", "pH", "N (%)", "Org. C (%)", "Total P (mg/kg)",
-                "Avail P (mg/kg)", "Exch. K (meq%)", "Exch. Ca (meq%)",
-                "Exch. Mg (meq%)", "CEC (meq%)"
-            ]
-            logger.info("✅ FINAL FALLBACK: Detected soil data from raw text")
-            print("DEBUG: FINAL FALLBACK - Detected SOIL")
-        elif leaf_check:
-            container_type = "leaf"
-            expected_headers = [
-                "Sample ID", "N (%)", "P (%)", "K (%)", "Mg (%)", "Ca (%)",
-                "B (mg/kg)", "Cu (mg/kg)", "Zn (mg/kg)", "Fe (mg/kg)", "Mn (mg/kg)"
-            ]
-            logger.info("✅ FINAL FALLBACK: Detected leaf data from raw text")
-            print("DEBUG: FINAL FALLBACK - Detected LEAF")
-        else:
-            logger.warning("❌ FINAL FALLBACK: Could not detect data type from raw text")
-            logger.warning(f"Raw text sample: {raw_text[:200]}...")
-            print("DEBUG: FINAL FALLBACK - FAILED")
-
-    if not container_type:
-        logger.warning("❌ Could not detect data type from any line")
-        logger.warning("Available lines:")
-        for i, line in enumerate(lines[:10]):  # Show first 10 lines
-            logger.warning(f"  Line {i+1}: {repr(line)}")
-        return {"type": "unknown", "samples": []}
+                    fallback_scores[0] += soil_score
+                    fallback_scores[1] += leaf_score
+                # Rows may follow the header on the same line in single-line OCR output
+                if not (matches and split_rows_on_ids):
+                    continue
 
-    # Step 3: Parse data rows - flexible parsing for various formats
-    samples = []
-    logger.info(f"Starting sample parsing with {len(expected_headers)} expected headers")
-
-    # Handle single-line parsing differently
-    if len(lines) == 1:
-        logger.info("Parsing single-line content")
-        single_line = lines[0]
-        parts = single_line.split()
-
-        # For single line, we need to find all sample IDs and their corresponding values
-        sample_data_sections = []
-        current_section = []
-
-        for part in parts:
-            if re.match(r'^[SL]\d{3,4}$', part.strip()):  # Found a sample ID
-                if current_section:  # Save previous section if it exists
-                    sample_data_sections.append(current_section)
-                current_section = [part.strip()]  # Start new section with sample ID
+        for index, match in enumerate(matches):
+            end = matches[index + 1].start() if index + 1 < len(matches) else len(line)
+            value_text = line[match.end():end]
+            if delimiter:
+                cells = value_text.split(delimiter)
+                if cells and not cells[0].strip():
+                    cells = cells[1:]  # Delimiter right after the sample ID
+                tokens = [(cell.strip(), 0.0) for cell in cells]
             else:
-                current_section.append(part)
-
-        # Add the last section
-        if current_section:
-            sample_data_sections.append(current_section)
-
-        logger.info(f"Found {len(sample_data_sections)} potential sample sections in single line")
+                offset = len(raw_line) - len(raw_line.lstrip()) + match.end()
+                tokens = [(token.group(), offset + (token.start() + token.end()) / 2)
+                          for token in _TOKEN_RE.finditer(value_text)]
 
-        # Process each sample section
-        for section_idx, section_parts in enumerate(sample_data_sections):
-            if len(section_parts) < 2:
+            # Must have at least one numeric value
+            if not any(_NUMBER_RE.search(token) for token, _ in tokens):
                 continue
 
-            sample_id = section_parts[0]
-            value_parts = section_parts[1:]
+            row_ids.append(' '.join(match.group().split()))
+            row_tokens.append(tokens)
 
-            # Validate sample ID
-            if not re.match(r'^[SL]\d{3,4}$', sample_id):
-                continue
+    # Decide table type
+    if header_line is not None:
+        container_type = "soil" if header_scores[0] > header_scores[1] else "leaf"
+    elif fallback_scores[0] or fallback_scores[1]:
+        container_type = "leaf" if fallback_scores[1] > fallback_scores[0] else "soil"
+    elif row_ids:
+        # Last resort - sample rows without recognisable headers are usually soil
+        container_type = "soil"
+    else:
+        lower_text = text.lower()
+        if "soil" in lower_text or "ph" in lower_text or "cec" in lower_text:
+            container_type = "soil"
+        elif "leaf" in lower_text or any(keyword in lower_text for keyword in _LEAF_SPECIFIC):
+            container_type = "leaf"
+        else:
+            return {"type": "unknown", "headers": [], "rows": [], "header_line": header_line}
 
-            # Check for numeric values
-            has_numeric = False
-            for part in value_parts:
-                try:
-                    float(part)
-                    has_numeric = True
-                    break
-                except ValueError:
-                    continue
+    headers = SOIL_HEADERS if container_type == "soil" else LEAF_HEADERS
 
-            if not has_numeric:
-                continue
+    # Delimited tables name their own columns; keep them when every row fits
+    if header_cells and all(len(tokens) < len(header_cells) for tokens in row_tokens):
+        headers = header_cells
 
-            sample = {"Sample ID": sample_id}
+    # Column-position inference is only trusted when the header has one cell per column
+    boundaries = None
+    if len(header_centres) == len(headers):
+        value_centres = header_centres[1:]
+        boundaries = [(left + right) / 2 for left, right in zip(value_centres, value_centres[1:])]
 
-            # Map values to expected headers
-            for i in range(len(value_parts)):
-                if i + 1 < len(expected_headers):  # +1 because we skip Sample ID
-                    header = expected_headers[i + 1]
-                    value = value_parts[i]
+    table_rows: List[List[str]] = []
+    for sample_id, tokens in zip(row_ids, row_tokens):
+        values = _align_values(tokens, boundaries) if boundaries is not None else None
+        if values is None:
+            values = [token for token, _ in tokens[:len(headers) - 1]]
+            values += [''] * (len(headers) - 1 - len(values))
+        table_rows.append([sample_id] + values)
 
-                    # Convert to numeric if possible
-                    try:
-                        if '.' in value:
-                            sample[header] = float(value)
-                        else:
-                            sample[header] = int(value)
-                    except ValueError:
-                        sample[header] = value
+    return {"type": container_type, "headers": list(headers), "rows": table_rows, "header_line": header_line}
 
-            logger.info(f"Successfully parsed sample from single line: {sample_id}")
-            samples.append(sample)
 
-    else:
-        # Multi-line parsing (existing logic)
-        # Determine which lines to process based on available lines
-        start_line = 1 if len(lines) >= 2 else 0  # Skip title if available
+def _convert_value(value: str) -> Any:
+    """Convert a table cell to int/float when it is numeric"""
+    try:
+        if '.' in value:
+            return float(value)
+        return int(value)
+    except ValueError:
+        return value
 
-        for line_idx, line in enumerate(lines[start_line:], start=start_line):
-            parts = line.split()
-            logger.debug(f"Processing line {line_idx + 1}: {len(parts)} parts - {repr(line)}")
 
-            # Skip empty lines or lines that are clearly not data
-            if len(parts) < 2:
-                logger.debug(f"Skipping line {line_idx + 1}: insufficient parts")
-                continue
+def _parse_raw_text_to_structured_json(raw_text: str) -> dict:
+    """
+    Parse raw OCR text into structured JSON.
+    Simplified and robust parsing for soil/leaf analysis data.
+    """
+    logger.info(f"Parsing raw text: {len(raw_text)} characters")
+    logger.debug(f"Raw text content: {raw_text[:300]}...")
 
-            # Look for sample ID patterns in any position
-            sample_id = None
-            sample_id_idx = -1
-
-            # Check each part for sample ID pattern
-            for i, part in enumerate(parts):
-                if re.match(r'^[SL]\d{3,4}$', part.strip()):  # S001-S9999 or L001-L9999
-                    sample_id = part.strip()
-                    sample_id_idx = i
-                    logger.debug(f"Found sample ID {sample_id} at position {i} in line {line_idx + 1}")
-                    break
-
-            # If no sample ID found, skip this line
-            if not sample_id:
-                logger.debug(f"No sample ID found in line {line_idx + 1}")
-                continue
+    if not raw_text or not raw_text.strip():
+        logger.warning("No lines found for parsing")
+        return {"type": "unknown", "samples": []}
 
-            # Extract values after the sample ID
-            value_parts = parts[sample_id_idx + 1:]
+    table = parse_table_text(raw_text)
+    container_type = table["type"]
 
-            # Must have at least some values
-            if not value_parts:
-                logger.debug(f"No values found after sample ID in line {line_idx + 1}")
-                continue
+    if container_type == "unknown":
+        logger.warning("❌ Could not detect data type from any line")
+        return {"type": "unknown", "samples": []}
 
-            # Check if we have numeric values
-            has_numeric = False
-            for part in value_parts:
-                try:
-                    float(part)
-                    has_numeric = True
-                    break
-                except ValueError:
-                    continue
+    headers = table["headers"]
+    samples = {}
+    for row in table["rows"]:
+        sample = {}
+        for header, value in zip(headers[1:], row[1:]):
+            if value != '':
+                sample[header] = _convert_value(value)
+        samples[row[0]] = sample
 
-            if not has_numeric:
-                logger.debug(f"No numeric values found in line {line_idx + 1}")
-                continue
+    logger.info(f"✅ Detected {container_type} analysis data, total samples parsed: {len(samples)}")
 
-            sample = {"Sample ID": sample_id}
+    # Convert to the expected JSON format matching the existing files
+    if container_type == "soil":
+        return {"Farm_3_Soil_Test_Data": samples}
+    return {"Farm_3_Leaf_Test_Data": samples}
 
-            # Map values to expected headers (skip Sample ID header)
-            for i in range(len(value_parts)):
-                if i + 1 < len(expected_headers):  # +1 because we skip Sample ID
-                    header = expected_headers[i + 1]
-                    value = value_parts[i]
 
-                    # Convert to numeric if possible
-                    try:
-                        if '.' in value:
-                            sample[header] = float(value)
-                        else:
-                            sample[header] = int(value)
-                    except ValueError:
-                        sample[header] = value
+# Representative SP Lab soil report page used by the benchmark below
+_BENCHMARK_REPORT = """SP LAB SDN BHD - SOIL ANALYSIS REPORT
+Sample ID  pH   N (%)  Org. C (%)  Total P (mg/kg)  Avail P (mg/kg)  Exch. K (meq%)  Exch. Ca (meq%)  Exch. Mg (meq%)  CEC (meq%)
+{rows}
+Methods: pH (1:2.5 water), Walkley-Black, Bray II. Results refer to samples as received.
+"""
 
-            logger.info(f"Successfully parsed sample: {sample_id}")
-            samples.append(sample)
 
-    logger.info(f"Total samples parsed: {len(samples)}")
+if __name__ == "__main__":
+    # Benchmark the parser on a report file (or the built-in sample page)
+    import sys
+    import timeit
 
-    # Convert to the expected JSON format matching the existing files
-    if container_type == "soil":
-        result = {"Farm_3_Soil_Test_Data": {}}
-        for sample in samples:
-            sample_id = sample.pop("Sample ID")  # Remove and get Sample ID
-            result["Farm_3_Soil_Test_Data"][sample_id] = sample
-    elif container_type == "leaf":
-        result = {"Farm_3_Leaf_Test_Data": {}}
-        for sample in samples:
-            sample_id = sample.pop("Sample ID")  # Remove and get Sample ID
-            result["Farm_3_Leaf_Test_Data"][sample_id] = sample
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'r', encoding='utf-8') as f:
+            report_text = f.read()
     else:
-        result = {"type": "unknown", "samples": samples}
-
-    return result
\ No newline at end of file
+        sample_rows = "\n".join(
+            f"S{i:03d}       4.{i % 9}  0.1{i % 9}   1.{i % 7}          {100 + i}              {5 + i % 20}               0.{10 + i % 30}            0.{20 + i % 50}            0.{15 + i % 40}            {5 + i % 9}.2"
+            for i in range(1, 2001)
+        )
+        report_text = _BENCHMARK_REPORT.format(rows=sample_rows)
+
+    runs = 20
+    parsed = _parse_raw_text_to_structured_json(report_text)
+    samples = next(iter(parsed.values()))
+    elapsed = timeit.timeit(lambda: _parse_raw_text_to_structured_json(report_text), number=runs) / runs
+    line_count = report_text.count('\n') + 1
+    print(f"Parsed {len(samples)} samples from {len(report_text)} characters ({line_count} lines)")
+    print(f"{elapsed * 1000:.2f} ms/report, {line_count / elapsed:,.0f} lines/s")
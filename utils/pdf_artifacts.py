@@ -0,0 +1,360 @@
+"""
+PDF Artifacts
+Precomputed PDF reports. When an analysis completes, a background task renders
+its report once per language, stores the bytes in Cloud Storage (or the local
+stand-in) and records the URL and content hash on the analysis document.
+Object names embed a hash of the report inputs, so a download is a lookup and
+an analysis that changes simply stops matching its old artifacts.
+"""
+
+import copy
+import hashlib
+import logging
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+
+try:
+    from utils.stage_cache import fingerprint
+    from utils.storage_utils import get_storage_bucket, gcs_uri
+except ImportError:
+    from stage_cache import fingerprint
+    from storage_utils import get_storage_bucket, gcs_uri
+
+logger = logging.getLogger(__name__)
+
+# Bump when report layout changes so previously stored PDFs are not reused
+PDF_ARTIFACT_FORMAT = 2
+
+ARTIFACT_LANGUAGES = ('en', 'ms')
+DEFAULT_LANGUAGE = 'en'
+
+# PDFs are streamed through spooled temporary files that stay in memory up to this size
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+ARTIFACT_PREFIX = 'pdf_reports'
+ARTIFACTS_FIELD = 'pdf_artifacts'
+
+# Keys that describe stored artifacts rather than the analysis itself
+_ARTIFACT_KEYS = {ARTIFACTS_FIELD, 'pdf_url'}
+
+# Results-page sections to copy next to analysis_results when they live at the top level
+_TOP_LEVEL_SECTIONS = ('economic_forecast', 'yield_forecast', 'raw_data', 'summary_metrics',
+                       'key_findings', 'step_by_step_analysis', 'references')
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pdf-artifacts')
+_in_flight: Dict[Tuple[str, str], Tuple[str, Future]] = {}
+_in_flight_lock = threading.Lock()
+
+
+def _default_title(language: str) -> str:
+    try:
+        from utils.translations import TRANSLATIONS
+        return TRANSLATIONS.get(language, TRANSLATIONS['en']).get('pdf_title', 'Agricultural Analysis Report')
+    except Exception:
+        return 'Agricultural Analysis Report'
+
+
+def report_inputs(results_data: Dict[str, Any], language: str, pdf_title: Optional[str] = None,
+                  include_raw_data: bool = True, include_summary: bool = True,
+                  include_key_findings: bool = True, include_step_analysis: bool = True,
+                  include_references: bool = False, include_charts: bool = True,
+                  include_timestamp: bool = True,
+                  chart_format: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """Analysis data, metadata and options for PDFReportGenerator.generate_report from results-page data"""
+    analysis_data = dict(results_data.get('analysis_results') or {})
+
+    # If analysis_results is empty, use the full results_data
+    if not analysis_data:
+        analysis_data = {key: value for key, value in results_data.items() if key not in _ARTIFACT_KEYS}
+
+    # Ensure forecast and results-page data is available at the top level
+    for key in _TOP_LEVEL_SECTIONS:
+        if key in results_data and key not in analysis_data:
+            analysis_data[key] = results_data[key]
+
+    metadata = {
+        'title': pdf_title or _default_title(language),
+        'timestamp': results_data.get('timestamp'),
+        'include_timestamp': include_timestamp,
+        'sections': {
+            'raw_data': include_raw_data,
+            'summary': include_summary,
+            'key_findings': include_key_findings,
+            'step_analysis': include_step_analysis,
+            'references': include_references,
+            'charts': include_charts
+        }
+    }
+
+    # Include all sections except economic/forecast
+    options = {
+        'include_economic': False,
+        'include_forecast': False,
+        'include_charts': include_charts,
+        'include_raw_data': include_raw_data,
+        'include_summary': include_summary,
+        'include_key_findings': include_key_findings,
+        'include_step_analysis': include_step_analysis,
+        'include_references': include_references,
+        'include_all_details': True
+    }
+    if chart_format:
+        options['chart_format'] = chart_format
+    return analysis_data, metadata, options
+
+
+def source_hash(analysis_data: Dict[str, Any], metadata: Dict[str, Any], options: Dict[str, Any],
+                language: str) -> str:
+    """Hash of everything a report is rendered from (the display timestamp excluded)"""
+    stable_metadata = {key: value for key, value in metadata.items() if key != 'timestamp'}
+    return fingerprint(PDF_ARTIFACT_FORMAT, language, analysis_data, stable_metadata, options)
+
+
+def artifact_name(analysis_id: str, language: str, digest: str) -> str:
+    """Storage object name of the PDF rendered from inputs with the given hash"""
+    return f"{ARTIFACT_PREFIX}/{analysis_id}/{language}-{digest}.pdf"
+
+
+def _render(analysis_data: Dict[str, Any], metadata: Dict[str, Any], options: Dict[str, Any],
+            language: str) -> BinaryIO:
+    """Render a report into a spooled temporary file, rewound for reading"""
+    try:
+        from utils.pdf_utils import PDFReportGenerator
+    except ImportError:
+        from pdf_utils import PDFReportGenerator
+    return PDFReportGenerator().generate_report_file(analysis_data, metadata, options, language=language)
+
+
+def _spooled() -> BinaryIO:
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+
+
+def _digest_stream(pdf_file: BinaryIO) -> Tuple[str, int]:
+    """sha256 and size of a stream, read in chunks and rewound afterwards"""
+    sha256 = hashlib.sha256()
+    size = 0
+    pdf_file.seek(0)
+    for chunk in iter(lambda: pdf_file.read(CHUNK_SIZE), b''):
+        sha256.update(chunk)
+        size += len(chunk)
+    pdf_file.seek(0)
+    return sha256.hexdigest(), size
+
+
+def _publish(blob, bucket, name: str) -> str:
+    """Public URL of an uploaded object, or its gs:// URI when it cannot be made public"""
+    try:
+        blob.make_public()
+        return blob.public_url
+    except Exception as e:
+        logger.warning(f"Could not make {name} public, recording its storage URI: {str(e)}")
+        return gcs_uri(bucket, name)
+
+
+def _prune(bucket, analysis_id: str, language: str, keep: str):
+    """Delete stale artifacts of an analysis/language once a newer one is stored"""
+    try:
+        for blob in bucket.list_blobs(prefix=f"{ARTIFACT_PREFIX}/{analysis_id}/{language}-"):
+            if blob.name != keep:
+                blob.delete()
+    except Exception as e:
+        logger.warning(f"Could not prune old PDF artifacts for {analysis_id}: {str(e)}")
+
+
+def _describe(blob, bucket, name: str, digest: str, pdf_file: BinaryIO) -> Dict[str, Any]:
+    sha256, size = _digest_stream(pdf_file)
+    return {
+        'url': _publish(blob, bucket, name),
+        'storage_uri': gcs_uri(bucket, name),
+        'source_hash': digest,
+        'sha256': sha256,
+        'size': size,
+        'created_at': datetime.now().isoformat(),
+    }
+
+
+def store_artifact(bucket, analysis_id: str, language: str, digest: str, pdf_file: BinaryIO,
+                   prune: bool = False) -> Dict[str, Any]:
+    """Stream a PDF to storage under its content-addressed name and describe the stored object.
+
+    Only the default report (the one recorded on the analysis document) passes
+    prune=True: replacing it makes every other artifact of that language stale,
+    while storing a variant (other sections, vector charts) must leave the
+    recorded artifact in place.
+    """
+    name = artifact_name(analysis_id, language, digest)
+    blob = bucket.blob(name)
+    blob.upload_from_file(pdf_file, content_type='application/pdf', rewind=True)
+    if prune:
+        _prune(bucket, analysis_id, language, name)
+    return _describe(blob, bucket, name, digest, pdf_file)
+
+
+def record_artifact(document, language: str, record: Dict[str, Any]):
+    """Record an artifact on the analysis document (pdf_url tracks the default language)"""
+    update = {ARTIFACTS_FIELD: {language: record}}
+    if language == DEFAULT_LANGUAGE:
+        update['pdf_url'] = record['url']
+    document.set(update, merge=True)
+
+
+def _download(blob) -> BinaryIO:
+    pdf_file = _spooled()
+    blob.download_to_file(pdf_file)
+    pdf_file.seek(0)
+    return pdf_file
+
+
+def _load_stored(bucket, analysis_id: str, language: str, digest: str) -> Optional[BinaryIO]:
+    blob = bucket.get_blob(artifact_name(analysis_id, language, digest))
+    return _download(blob) if blob is not None else None
+
+
+def build_artifact(results_data: Dict[str, Any], analysis_id: str, language: str,
+                   document=None, bucket=None) -> Dict[str, Any]:
+    """Render (or reuse) and store the report PDF of one analysis in one language.
+
+    Args:
+        results_data: Results-page data of the analysis
+        analysis_id: Analysis document id, used in the object name
+        language: Report language
+        document: Firestore document reference to record the artifact on, if any
+        bucket: Storage bucket; get_storage_bucket() by default
+
+    Returns:
+        The artifact record (url, storage_uri, source_hash, sha256, size, created_at)
+    """
+    analysis_data, metadata, options = report_inputs(results_data, language)
+    digest = source_hash(analysis_data, metadata, options, language)
+    bucket = bucket or get_storage_bucket()
+    name = artifact_name(analysis_id, language, digest)
+
+    recorded = (results_data.get(ARTIFACTS_FIELD) or {}).get(language) or {}
+    blob = bucket.get_blob(name)
+    if blob is not None and recorded.get('source_hash') == digest:
+        return recorded
+
+    if blob is not None:
+        # Already rendered from identical inputs; make sure the document points at it
+        with _download(blob) as pdf_file:
+            record = _describe(blob, bucket, name, digest, pdf_file)
+    else:
+        with _render(analysis_data, metadata, options, language) as pdf_file:
+            record = store_artifact(bucket, analysis_id, language, digest, pdf_file, prune=True)
+        logger.info(f"Stored {language} PDF artifact for {analysis_id} ({record['size']} bytes)")
+
+    if document is not None:
+        record_artifact(document, language, record)
+    return record
+
+
+def _build_logged(results_data, analysis_id, language, document, bucket) -> Optional[Dict[str, Any]]:
+    try:
+        return build_artifact(results_data, analysis_id, language, document=document, bucket=bucket)
+    except Exception as e:
+        logger.error(f"PDF artifact for {analysis_id} ({language}) failed: {str(e)}")
+        return None
+
+
+def _forget(key: Tuple[str, str], future: Future):
+    """Drop a finished task; its result is in storage from now on"""
+    with _in_flight_lock:
+        if key in _in_flight and _in_flight[key][1] is future:
+            del _in_flight[key]
+
+
+def schedule_report_pdfs(results_data: Dict[str, Any], analysis_id: str, document=None,
+                         languages=ARTIFACT_LANGUAGES, bucket=None) -> Dict[str, Future]:
+    """Queue background rendering of an analysis report in each language.
+
+    Args:
+        results_data: Results-page data of the analysis (copied; the caller may keep mutating it).
+            With a document, pass its stored contents: artifact_url hashes the document as read back
+        analysis_id: Analysis document id
+        document: Firestore document reference to record artifacts on, if any
+        languages: Languages to render
+        bucket: Storage bucket; get_storage_bucket() by default
+
+    Returns:
+        Futures resolving to the artifact record (None on failure) per language
+    """
+    results_data = copy.deepcopy(results_data)
+    futures = {}
+    for language in languages:
+        key = (analysis_id, language)
+        digest = source_hash(*report_inputs(results_data, language), language)
+        with _in_flight_lock:
+            entry = _in_flight.get(key)
+            if entry is not None and entry[0] == digest:
+                futures[language] = entry[1]
+                continue
+            future = _executor.submit(_build_logged, results_data, analysis_id, language, document, bucket)
+            _in_flight[key] = (digest, future)
+        future.add_done_callback(lambda done, key=key: _forget(key, done))
+        futures[language] = future
+    return futures
+
+
+def find_stored_pdf(results_data: Dict[str, Any], language: str, bucket=None,
+                    **sections: Any) -> Optional[BinaryIO]:
+    """Stored report of an analysis that matches its current inputs, or None (no id, missing or stale)"""
+    analysis_id = results_data.get('id')
+    if not analysis_id:
+        return None
+    digest = source_hash(*report_inputs(results_data, language, **sections), language)
+    return _load_stored(bucket or get_storage_bucket(), analysis_id, language, digest)
+
+
+def get_report_pdf(results_data: Dict[str, Any], language: str, **sections: Any) -> BinaryIO:
+    """PDF for the results page: a finished or in-flight artifact when one matches, else a fresh render.
+
+    Args:
+        results_data: Results-page data of the analysis
+        language: Report language
+        **sections: report_inputs options (pdf_title, include_* flags)
+
+    Returns:
+        A readable stream (spooled temporary file) positioned at the start of the PDF
+    """
+    analysis_data, metadata, options = report_inputs(results_data, language, **sections)
+    digest = source_hash(analysis_data, metadata, options, language)
+    analysis_id = results_data.get('id')
+    if not analysis_id:
+        return _render(analysis_data, metadata, options, language)
+
+    with _in_flight_lock:
+        entry = _in_flight.get((analysis_id, language))
+    if entry is not None and entry[0] == digest:
+        # Rendering already under way: wait for it rather than starting over
+        entry[1].result()
+
+    bucket = None
+    try:
+        bucket = get_storage_bucket()
+        pdf_file = _load_stored(bucket, analysis_id, language, digest)
+        if pdf_file is not None:
+            return pdf_file
+    except Exception as e:
+        logger.warning(f"PDF artifact lookup failed for {analysis_id}: {str(e)}")
+
+    pdf_file = _render(analysis_data, metadata, options, language)
+    if bucket is not None:
+        # Keep the render for the next download
+        try:
+            store_artifact(bucket, analysis_id, language, digest, pdf_file)
+        except Exception as e:
+            logger.warning(f"Could not store PDF artifact for {analysis_id}: {str(e)}")
+        pdf_file.seek(0)
+    return pdf_file
+
+
+def artifact_url(analysis_doc: Dict[str, Any], language: str) -> Optional[str]:
+    """URL of the stored report for an analysis document, or None when missing or stale"""
+    record = (analysis_doc.get(ARTIFACTS_FIELD) or {}).get(language)
+    if not record:
+        return None
+    digest = source_hash(*report_inputs(analysis_doc, language), language)
+    return record.get('url') if record.get('source_hash') == digest else None
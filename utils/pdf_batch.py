@@ -0,0 +1,293 @@
+"""
+PDF Batch Export
+Renders report PDFs for many analyses at once, e.g. every block after a
+sampling round. Analyses are given as Firestore ids or local result JSON
+files. Reports already stored as artifacts are reused; the rest are rendered
+in a process pool whose workers share the report styles within the process
+and the chart cache's disk tier across processes. Produces one PDF per
+analysis and language plus an optional ZIP or merged PDF, and reports
+throughput per CPU core so export machines can be sized.
+
+Usage:
+    python -m utils.pdf_batch analysis_1712345678 results/block7.json --languages en ms --combine zip
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from utils.pdf_artifacts import find_stored_pdf, report_inputs, source_hash, store_artifact
+    from utils.storage_utils import get_storage_bucket
+except ImportError:
+    from pdf_artifacts import find_stored_pdf, report_inputs, source_hash, store_artifact
+    from storage_utils import get_storage_bucket
+
+# Merging into one PDF is optional
+try:
+    import fitz  # PyMuPDF
+    PDF_MERGE_AVAILABLE = True
+except ImportError:
+    fitz = None
+    PDF_MERGE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+COMBINE_MODES = ('zip', 'merged')
+ARCHIVE_NAME = 'reports.zip'
+MERGED_NAME = 'reports.pdf'
+
+
+def load_results(source: str) -> Dict[str, Any]:
+    """Results data of one analysis: a local result JSON file or an analysis_results document id"""
+    if os.path.isfile(source):
+        with open(source, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    try:
+        from utils.firebase_config import get_firestore_client, COLLECTIONS
+    except ImportError:
+        from firebase_config import get_firestore_client, COLLECTIONS
+    db = get_firestore_client()
+    if not db:
+        raise RuntimeError("Firestore client not available")
+    doc = db.collection(COLLECTIONS['analysis_results']).document(source).get()
+    if not doc.exists:
+        raise LookupError(f"Analysis {source} not found")
+    data = doc.to_dict()
+    data['id'] = doc.id
+    return data
+
+
+def _report_stem(source: str, results_data: Dict[str, Any]) -> str:
+    """File-name-safe name of an analysis: its id, or the result file name"""
+    name = results_data.get('id') or os.path.splitext(os.path.basename(source))[0]
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', str(name)) or 'report'
+
+
+def _init_worker():
+    """Workers already run one report per core, so each renders its charts in-process"""
+    try:
+        from utils import pdf_utils
+    except ImportError:
+        import pdf_utils
+    pdf_utils.CHART_RENDER_WORKERS = 1
+    pdf_utils.shared_styles()
+
+
+def _render_report(results_data: Dict[str, Any], language: str, path: str,
+                   chart_format: Optional[str] = None) -> float:
+    """Render one report to a file; returns the CPU seconds it took"""
+    try:
+        from utils.pdf_utils import PDFReportGenerator
+    except ImportError:
+        from pdf_utils import PDFReportGenerator
+    started = time.process_time()
+    analysis_data, metadata, options = report_inputs(results_data, language, chart_format=chart_format)
+    with open(path, 'wb') as f:
+        PDFReportGenerator(language).generate_report_file(analysis_data, metadata, options,
+                                                          language=language, output=f)
+    return time.process_time() - started
+
+
+def _copy_stored(results_data: Dict[str, Any], language: str, path: str, bucket,
+                 chart_format: Optional[str] = None) -> bool:
+    """Write the stored artifact of a report to path, if one matches its current inputs"""
+    try:
+        pdf_file = find_stored_pdf(results_data, language, bucket=bucket, chart_format=chart_format)
+    except Exception as e:
+        logger.warning(f"Stored PDF lookup failed for {results_data.get('id')}: {str(e)}")
+        return False
+    if pdf_file is None:
+        return False
+    with pdf_file, open(path, 'wb') as f:
+        shutil.copyfileobj(pdf_file, f)
+    return True
+
+
+def _store_rendered(results_data: Dict[str, Any], language: str, path: str, bucket,
+                    chart_format: Optional[str] = None):
+    """Keep a freshly rendered report as the analysis artifact, so the next export or download reuses it"""
+    try:
+        digest = source_hash(*report_inputs(results_data, language, chart_format=chart_format), language)
+        with open(path, 'rb') as f:
+            store_artifact(bucket, results_data['id'], language, digest, f)
+    except Exception as e:
+        logger.warning(f"Could not store PDF artifact for {results_data.get('id')}: {str(e)}")
+
+
+def _combine(paths: List[str], output_dir: str, mode: str) -> str:
+    """Bundle the rendered PDFs into a ZIP or a single merged PDF"""
+    if mode == 'zip':
+        archive = os.path.join(output_dir, ARCHIVE_NAME)
+        with zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            for path in paths:
+                zf.write(path, arcname=os.path.basename(path))
+        return archive
+
+    merged_path = os.path.join(output_dir, MERGED_NAME)
+    with fitz.open() as merged:
+        for path in paths:
+            with fitz.open(path) as report:
+                merged.insert_pdf(report)
+        merged.save(merged_path, garbage=3, deflate=True)
+    return merged_path
+
+
+def export_reports(sources: Sequence[str], output_dir: str, languages: Sequence[str] = ('en',),
+                   combine: Optional[str] = None, workers: Optional[int] = None,
+                   reuse_stored: bool = True, bucket=None,
+                   chart_format: Optional[str] = None) -> Dict[str, Any]:
+    """Export report PDFs for several analyses.
+
+    Args:
+        sources: Analysis ids or paths of local result JSON files
+        output_dir: Directory for the PDFs (created if missing)
+        languages: Report languages; one PDF per analysis and language
+        combine: 'zip' or 'merged' to also bundle the PDFs, None for individual files only
+        workers: Render processes; the CPU count by default
+        reuse_stored: Copy matching stored artifacts instead of re-rendering them, and store
+            new renders of analyses that have an id
+        bucket: Storage bucket for stored artifacts; get_storage_bucket() by default
+        chart_format: 'png' or 'vector' charts; the pdf_utils default when None
+
+    Returns:
+        Summary with the exported reports, failures, the bundle path and throughput figures
+    """
+    if combine not in (None,) + COMBINE_MODES:
+        raise ValueError(f"combine must be one of {COMBINE_MODES} or None, got {combine!r}")
+    if combine == 'merged' and not PDF_MERGE_AVAILABLE:
+        raise RuntimeError("Merged PDF export needs PyMuPDF. Install with: pip install PyMuPDF")
+
+    os.makedirs(output_dir, exist_ok=True)
+    if reuse_stored and bucket is None:
+        bucket = get_storage_bucket()
+    workers = max(1, workers or os.cpu_count() or 1)
+    started = time.perf_counter()
+    reports: List[Dict[str, Any]] = []
+    failed: List[Dict[str, Any]] = []
+
+    # Load inputs and reuse stored artifacts in this process; only renders go to the pool
+    jobs: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    for source in sources:
+        try:
+            results_data = load_results(source)
+        except Exception as e:
+            logger.error(f"Could not load {source}: {str(e)}")
+            failed.append({'source': source, 'language': None, 'error': str(e)})
+            continue
+        stem = _report_stem(source, results_data)
+        for language in languages:
+            entry = {'source': source, 'language': language,
+                     'path': os.path.join(output_dir, f"{stem}-{language}.pdf")}
+            if reuse_stored and results_data.get('id') and _copy_stored(results_data, language,
+                                                                        entry['path'], bucket, chart_format):
+                entry.update(stored=True, cpu_seconds=0.0)
+                reports.append(entry)
+            else:
+                jobs.append((entry, results_data))
+
+    render_started = time.perf_counter()
+    workers = min(workers, len(jobs)) or 1
+    if workers == 1:
+        for entry, results_data in jobs:
+            try:
+                entry.update(stored=False, cpu_seconds=_render_report(results_data, entry['language'],
+                                                                      entry['path'], chart_format))
+                reports.append(entry)
+            except Exception as e:
+                logger.error(f"Could not render {entry['source']} ({entry['language']}): {str(e)}")
+                failed.append({'source': entry['source'], 'language': entry['language'], 'error': str(e)})
+    else:
+        # spawn: forking a process that runs Streamlit/Firebase threads is not safe
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker) as pool:
+            futures = {pool.submit(_render_report, results_data, entry['language'], entry['path'],
+                                   chart_format): entry
+                       for entry, results_data in jobs}
+            for future in as_completed(futures):
+                entry = futures[future]
+                try:
+                    entry.update(stored=False, cpu_seconds=future.result())
+                    reports.append(entry)
+                except Exception as e:
+                    logger.error(f"Could not render {entry['source']} ({entry['language']}): {str(e)}")
+                    failed.append({'source': entry['source'], 'language': entry['language'], 'error': str(e)})
+    render_seconds = time.perf_counter() - render_started
+
+    # Keep the requested order regardless of completion order
+    order = {(source, language): index for index, (source, language)
+             in enumerate((s, l) for s in sources for l in languages)}
+    reports.sort(key=lambda entry: order[(entry['source'], entry['language'])])
+    for entry in reports:
+        entry['size'] = os.path.getsize(entry['path'])
+
+    if reuse_stored:
+        loaded = {id(entry): results_data for entry, results_data in jobs}
+        for entry in reports:
+            results_data = loaded.get(id(entry))
+            if results_data is not None and results_data.get('id'):
+                _store_rendered(results_data, entry['language'], entry['path'], bucket, chart_format)
+
+    bundle = _combine([entry['path'] for entry in reports], output_dir, combine) if combine and reports else None
+
+    rendered = [entry for entry in reports if not entry['stored']]
+    cpu_seconds = sum(entry['cpu_seconds'] for entry in rendered)
+    return {
+        'reports': reports,
+        'failed': failed,
+        'bundle': bundle,
+        'workers': workers,
+        'rendered': len(rendered),
+        'stored': len(reports) - len(rendered),
+        'elapsed': time.perf_counter() - started,
+        'render_seconds': render_seconds,
+        'cpu_seconds': cpu_seconds,
+        # Rendered reports per second of one core: wall time x processes, and actual CPU time
+        'reports_per_core_second': len(rendered) / (render_seconds * workers) if rendered and render_seconds else 0.0,
+        'cpu_seconds_per_report': cpu_seconds / len(rendered) if rendered else 0.0,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point; returns the exit status"""
+    parser = argparse.ArgumentParser(description="Export CropDrive report PDFs for several analyses")
+    parser.add_argument('sources', nargs='+', help="Analysis ids or local result JSON files")
+    parser.add_argument('-o', '--output-dir', default='pdf_exports', help="Output directory")
+    parser.add_argument('-l', '--languages', nargs='+', default=['en'], help="Report languages")
+    parser.add_argument('-c', '--combine', choices=COMBINE_MODES, help="Also bundle the PDFs")
+    parser.add_argument('-w', '--workers', type=int, help="Render processes (default: CPU count)")
+    parser.add_argument('--chart-format', choices=('png', 'vector'), help="Chart images (default: png)")
+    parser.add_argument('--no-reuse', action='store_true', help="Re-render even when a stored PDF matches")
+    args = parser.parse_args(argv)
+
+    summary = export_reports(args.sources, args.output_dir, languages=args.languages, combine=args.combine,
+                             workers=args.workers, reuse_stored=not args.no_reuse, chart_format=args.chart_format)
+
+    for entry in summary['reports']:
+        origin = 'stored' if entry['stored'] else f"{entry['cpu_seconds']:.2f}s cpu"
+        print(f"{entry['path']}  {entry['size']:,} bytes  ({origin})")
+    for entry in summary['failed']:
+        print(f"FAILED {entry['source']} ({entry['language'] or 'load'}): {entry['error']}", file=sys.stderr)
+    if summary['bundle']:
+        print(f"Bundle: {summary['bundle']}")
+    print(f"{summary['rendered']} rendered, {summary['stored']} reused, {len(summary['failed'])} failed "
+          f"in {summary['elapsed']:.1f}s with {summary['workers']} worker(s)")
+    if summary['rendered']:
+        print(f"{summary['reports_per_core_second'] * 60:.1f} reports/min per core, "
+              f"{summary['cpu_seconds_per_report']:.2f} CPU s/report")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main())
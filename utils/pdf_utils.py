@@ -1,106 +1,504 @@
+import functools
 import io
 import logging
+import multiprocessing
+import os
 import re
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from types import MappingProxyType
+from typing import Dict, Any, BinaryIO, Iterator, List, Mapping, Optional
 
 import matplotlib
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import QuadMesh
+from matplotlib.figure import Figure
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
-    PageBreak, Image, HRFlowable
+    PageBreak, Image, HRFlowable, Flowable
 )
 
 matplotlib.use('Agg')  # Use non-interactive backend
 
 try:
-    import firebase_admin
-    from firebase_admin import storage
-    FIREBASE_AVAILABLE = True
+    from utils.parameter_standardizer import parameter_standardizer
+    from utils.economic_model import scenario_display
+    from utils.chart_cache import chart_cache, chart_key
+    from utils.section_cache import section_cache, section_key
+    from utils.findings_engine import get_findings
+    from utils.standards_registry import standards_registry
+    from utils.stage_cache import fingerprint
 except ImportError:
-    FIREBASE_AVAILABLE = False
-    firebase_admin = None
-    storage = None
+    from parameter_standardizer import parameter_standardizer
+    from economic_model import scenario_display
+    from chart_cache import chart_cache, chart_key
+    from section_cache import section_cache, section_key
+    from findings_engine import get_findings
+    from standards_registry import standards_registry
+    from stage_cache import fingerprint
+
+# Vector charts are optional: without svglib they fall back to PNG
+try:
+    from svglib.svglib import svg2rlg
+    SVGLIB_AVAILABLE = True
+except ImportError:
+    svg2rlg = None
+    SVGLIB_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Chart render stage: charts are collected as placeholders while the story is built
+# and rasterized together in worker processes just before doc.build
+CHART_RENDER_WORKERS = max(1, min(4, os.cpu_count() or 1))
+MIN_PARALLEL_CHARTS = 2
+
+# Chart image format: 'png', or 'vector' for SVG drawings embedded via svglib.
+# Reports can override it with options['chart_format'].
+CHART_FORMATS = ('png', 'vector')
+DEFAULT_CHART_FORMAT = os.getenv('CROPDRIVE_PDF_CHART_FORMAT', 'png')
+
+# Finished PDFs stay in memory up to this size, then spill to a temporary file
+PDF_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+_chart_pool = None
+_chart_pool_lock = threading.Lock()
+
+
+def resolve_chart_format(requested: Optional[str] = None) -> str:
+    """Effective chart format for a report: vector only when requested and svglib is available"""
+    chart_format = requested or DEFAULT_CHART_FORMAT
+    if chart_format not in CHART_FORMATS:
+        logger.warning(f"Unknown chart format {chart_format!r}, using png")
+        return 'png'
+    if chart_format == 'vector' and not SVGLIB_AVAILABLE:
+        logger.warning("Vector charts need svglib (pip install svglib); using png")
+        return 'png'
+    return chart_format
+
+
+def _is_raster_chart(fig: Figure) -> bool:
+    """Whether a figure draws images or meshes (heatmaps), which are smaller and faster as PNG"""
+    return any(ax.images or any(isinstance(c, QuadMesh) for c in ax.collections) for ax in fig.axes)
+
+
+def _is_svg(image: bytes) -> bool:
+    return image.lstrip()[:5] in (b'<?xml', b'<svg ')
+
+
+def _new_figure(nrows: int = 1, ncols: int = 1, figsize=None, **kwargs):
+    """Create a figure and its axes on a private Agg canvas, without pyplot global state"""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots(nrows, ncols, **kwargs)
+
+
+class ChartPlaceholder(Flowable):
+    """Story slot for a chart that is rasterized later by the chart render stage.
+
+    ``method`` names a PDFReportGenerator chart method returning image bytes. The ``before``
+    and ``after`` flowables are kept only if the chart renders; ``fallback`` replaces it if not.
+    """
+
+    def __init__(self, method: str, args: tuple = (), width: float = 6*inch, height: float = 4*inch,
+                 before: Optional[List] = None, after: Optional[List] = None,
+                 fallback: Optional[List] = None):
+        Flowable.__init__(self)
+        self.method = method
+        self.args = args
+        self.width = width
+        self.height = height
+        self.before = before or []
+        self.after = after or []
+        self.fallback = fallback or []
+
+    def spec(self, language: str, chart_format: str = 'png') -> tuple:
+        """Picklable description of the chart for a render worker"""
+        return (self.method, self.args, language, chart_format)
+
+    def resolve(self, image_path: Optional[str]) -> List:
+        """Flowables that take this placeholder's place once the chart is rendered to image_path"""
+        if not image_path:
+            return list(self.fallback)
+        if image_path.endswith('.svg'):
+            image = svg2rlg(image_path)
+            # Stretch to the slot like the PNG path does
+            image.scale(self.width / image.width, self.height / image.height)
+            image.width, image.height = self.width, self.height
+            image.hAlign = 'CENTER'
+        else:
+            # lazy=2: the file is opened only while the page is drawn
+            image = Image(image_path, width=self.width, height=self.height, lazy=2)
+        return self.before + [image] + self.after
+
+    def wrap(self, availWidth, availHeight):
+        # Unrendered placeholders take no space
+        return 0, 0
+
+    def draw(self):
+        pass
+
+
+def _render_chart(spec: tuple) -> Optional[bytes]:
+    """Render one chart spec to image bytes (runs in a worker process or in-process)"""
+    method, args, language, chart_format = spec
+    try:
+        return getattr(PDFReportGenerator.chart_renderer(language, chart_format), method)(*args)
+    except Exception as e:
+        logger.warning(f"Could not render chart {method}: {str(e)}")
+        return None
+
+
+def _get_chart_pool() -> ProcessPoolExecutor:
+    """Persistent render pool, started on first use"""
+    global _chart_pool
+    with _chart_pool_lock:
+        if _chart_pool is None:
+            # spawn: forking a process that runs Streamlit/Firebase threads is not safe
+            _chart_pool = ProcessPoolExecutor(max_workers=CHART_RENDER_WORKERS,
+                                              mp_context=multiprocessing.get_context('spawn'))
+        return _chart_pool
+
+
+def _reset_chart_pool():
+    global _chart_pool
+    with _chart_pool_lock:
+        if _chart_pool is not None:
+            _chart_pool.shutdown(wait=False, cancel_futures=True)
+            _chart_pool = None
+
+
+def _spec_key(spec: tuple) -> Optional[str]:
+    """Chart cache key for a spec, or None when its data cannot be fingerprinted"""
+    method, args, language, chart_format = spec
+    try:
+        return chart_key(method, args, language, format=chart_format)
+    except Exception as e:
+        logger.warning(f"Chart {method} inputs could not be fingerprinted, not caching: {str(e)}")
+        return None
+
+
+def _render_uncached(specs: List[tuple]) -> Iterator[Optional[bytes]]:
+    """Yield rendered images in spec order, in parallel when there are enough specs"""
+    futures = None
+    if len(specs) >= MIN_PARALLEL_CHARTS and CHART_RENDER_WORKERS > 1:
+        try:
+            pool = _get_chart_pool()
+            futures = deque((spec, pool.submit(_render_chart, spec)) for spec in specs)
+        except Exception as e:
+            logger.warning(f"Parallel chart rendering unavailable, rendering serially: {str(e)}")
+            _reset_chart_pool()
+
+    if futures is None:
+        for spec in specs:
+            yield _render_chart(spec)
+        return
+
+    # Futures are popped before their image is handed out, so a consumed image is not kept alive here
+    pool_failed = False
+    while futures:
+        spec, future = futures.popleft()
+        try:
+            image = future.result()
+        except Exception as e:
+            if not pool_failed:
+                logger.warning(f"Parallel chart rendering failed, rendering serially: {str(e)}")
+                _reset_chart_pool()
+                pool_failed = True
+            image = _render_chart(spec)
+        del future
+        yield image
+        del image
+
+
+def iter_rendered_charts(specs: List[tuple]) -> Iterator[Optional[bytes]]:
+    """Yield image bytes (or None for charts that failed) in spec order, one chart at a time.
+
+    Cached charts are reused, identical charts within one batch are rendered once and
+    the rest are rendered in parallel. Only charts still waiting to be consumed are held.
+    """
+    keys = [_spec_key(spec) for spec in specs]
+
+    # Charts missing from the cache, grouped so identical ones render once
+    groups: Dict[Any, List[int]] = {}
+    for index, key in enumerate(keys):
+        if not (key and key in chart_cache):
+            groups.setdefault(key or ('uncached', index), []).append(index)
+    group_of = {index: group for group, indexes in groups.items() for index in indexes}
+    remaining = {group: len(indexes) for group, indexes in groups.items()}
+    rendered = zip(groups, _render_uncached([specs[indexes[0]] for indexes in groups.values()]))
+    results: Dict[Any, Optional[bytes]] = {}
+
+    for index, key in enumerate(keys):
+        group = group_of.get(index)
+        if group is None:
+            # Evicted since the lookup above: render it here
+            image = chart_cache.get(key)
+            yield image if image is not None else _render_chart(specs[index])
+            continue
+
+        # Groups are rendered in order of first use, so this only waits for charts needed now
+        while group not in results:
+            done_group, image = next(rendered)
+            results[done_group] = image
+            if image and keys[groups[done_group][0]]:
+                chart_cache.put(keys[groups[done_group][0]], image)
+        image = results[group]
+        remaining[group] -= 1
+        if not remaining[group]:
+            del results[group]
+        yield image
+
+
+def render_charts(specs: List[tuple]) -> List[Optional[bytes]]:
+    """Render chart specs to image bytes, reusing cached images and rendering the rest in parallel.
+
+    Args:
+        specs: (method, args, language, chart_format) tuples from ChartPlaceholder.spec
+
+    Returns:
+        PNG or SVG bytes (or None for charts that failed) in the order of specs
+    """
+    return list(iter_rendered_charts(specs))
+
+
+# Common table header translations
+TABLE_HEADER_TRANSLATIONS = {
+    'en': {
+        'Parameter': 'Parameter',
+        'Average': 'Average',
+        'MPOB Standard': 'MPOB Standard',
+        'Status': 'Status',
+        'Gap': 'Gap',
+        '% Gap': '% Gap',
+        'Severity': 'Severity',
+        'Current Value': 'Current Value',
+        'Optimal Level': 'Optimal Level',
+        'Sample': 'Sample',
+        'Sample No.': 'Sample No.',
+        'Lab No.': 'Lab No.',
+        'Minimum': 'Minimum',
+        'Maximum': 'Maximum',
+        'Standard Deviation': 'Standard Deviation',
+        'Sample Count': 'Sample Count',
+    },
+    'ms': {
+        'Parameter': 'Parameter',
+        'Average': 'Purata',
+        'MPOB Standard': 'Standard MPOB',
+        'Status': 'Status',
+        'Gap': 'Jurang',
+        '% Gap': '% Jurang',
+        'Severity': 'Keterukan',
+        'Current Value': 'Nilai Semasa',
+        'Optimal Level': 'Tahap Optimum',
+        'Sample': 'Sampel',
+        'Sample No.': 'No. Sampel',
+        'Lab No.': 'No. Makmal',
+        'Minimum': 'Minimum',
+        'Maximum': 'Maksimum',
+        'Standard Deviation': 'Sisihan Piawai',
+        'Sample Count': 'Bilangan Sampel',
+    }
+}
+
+
+@functools.lru_cache(maxsize=None)
+def header_translations(language: str) -> Mapping[str, str]:
+    """Read-only table header translations for a language (English when unknown)"""
+    return MappingProxyType(TABLE_HEADER_TRANSLATIONS.get(language, TABLE_HEADER_TRANSLATIONS['en']))
+
+
+@functools.lru_cache(maxsize=None)
+def pdf_translations(language: str) -> Mapping[str, str]:
+    """Read-only UI translation table for a language, loaded once per process"""
+    try:
+        from utils.translations import TRANSLATIONS
+    except ImportError:
+        try:
+            from translations import TRANSLATIONS
+        except ImportError:
+            return MappingProxyType({})
+    return MappingProxyType(dict(TRANSLATIONS.get(language, TRANSLATIONS['en'])))
+
+
+@functools.lru_cache(maxsize=None)
+def shared_styles() -> Mapping[str, ParagraphStyle]:
+    """Report paragraph styles, built once per process and shared read-only by every report"""
+    styles = getSampleStyleSheet()
+    
+    # Custom styles
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Title'],
+        fontSize=24,
+        spaceAfter=30,
+        textColor=colors.HexColor('#2E7D32'),
+        alignment=1  # Center
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='CustomHeading',
+        parent=styles['Heading1'],
+        fontSize=16,
+        spaceAfter=12,
+        textColor=colors.HexColor('#4CAF50'),
+        borderWidth=1,
+        borderColor=colors.HexColor('#4CAF50'),
+        borderPadding=5,
+        alignment=4  # Justify
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='CustomSubheading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceAfter=10,
+        textColor=colors.HexColor('#388E3C'),
+        alignment=4  # Justify
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='CustomBody',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceAfter=6,
+        textColor=colors.black,
+        alignment=4  # Justify
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading1'],
+        fontSize=18,
+        spaceAfter=15,
+        textColor=colors.HexColor('#2E7D32'),
+        borderWidth=2,
+        borderColor=colors.HexColor('#4CAF50'),
+        borderPadding=8,
+        backColor=colors.HexColor('#E8F5E8'),
+        alignment=4  # Justify
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='Warning',
+        parent=styles['Normal'],
+        fontSize=12,
+        textColor=colors.red,
+        backColor=colors.HexColor('#FFEBEE'),
+        borderWidth=1,
+        borderColor=colors.red,
+        borderPadding=5,
+        alignment=4  # Justify
+    ))
+    
+    # Add justification to default styles
+    styles['Normal'].alignment = 4  # Justify
+    styles['Heading1'].alignment = 4  # Justify
+    styles['Heading2'].alignment = 4  # Justify
+    styles['Heading3'].alignment = 4  # Justify
+    styles['BodyText'].alignment = 4  # Justify
+    
+    return MappingProxyType(dict(styles.byName))
+
 
 class PDFReportGenerator:
-    """Generate comprehensive PDF reports for agricultural analysis"""
+    """Generate comprehensive PDF reports for agricultural analysis.
+
+    An instance is the render context of one report: it holds only the report language,
+    the chart format and references to the process-wide styles and translation tables, so it is cheap to
+    create per export.
+    """
+    
+    page_width = A4[0]
+    page_height = A4[1]
+    # Match the margins used in generate_report (54 points = ~0.75 inches)
+    margin = 54
+    content_width = page_width - (2 * margin)
+    
+    def __init__(self, language: str = 'en', chart_format: str = 'png'):
+        self.styles = shared_styles()
+        self.language = language
+        self.chart_format = chart_format
+    
+    @classmethod
+    def chart_renderer(cls, language: str = 'en', chart_format: str = 'png') -> 'PDFReportGenerator':
+        """Instance for chart methods running in a render worker"""
+        return cls(language, chart_format)
     
-    def __init__(self):
-        self.styles = self._setup_custom_styles()
-        self.storage_client = self._init_firebase_storage()
-        self.page_width = A4[0]
-        self.page_height = A4[1]
-        # Match the margins used in generate_report (54 points = ~0.75 inches)
-        self.margin = 54
-        self.content_width = (self.page_width - 
-                              (2 * self.margin))
-        self.language = 'en'  # Default language
+    def _save_chart(self, fig: Figure, buffer, dpi: int = 150):
+        """Write a finished chart to buffer: SVG in vector mode (heatmaps stay PNG), else PNG"""
+        if self.chart_format == 'vector' and not _is_raster_chart(fig):
+            # Text stays text: far smaller SVGs that svglib parses much faster than glyph paths
+            with matplotlib.rc_context({'svg.fonttype': 'none'}):
+                fig.savefig(buffer, format='svg', bbox_inches='tight')
+        else:
+            fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    
+    def _render_charts(self, story: List, image_dir: str) -> List:
+        """Render every ChartPlaceholder in the story in one batch and splice the images back in.
+
+        Each image is written to ``image_dir`` as soon as it is ready and referenced by path,
+        so the story never holds the chart images in memory.
+        """
+        placeholders = [flowable for flowable in story if isinstance(flowable, ChartPlaceholder)]
+        if not placeholders:
+            return story
+        
+        images = iter_rendered_charts([placeholder.spec(self.language, self.chart_format)
+                                       for placeholder in placeholders])
+        rendered_story = []
+        for index, flowable in enumerate(story):
+            if not isinstance(flowable, ChartPlaceholder):
+                rendered_story.append(flowable)
+                continue
+            image = next(images)
+            image_path = None
+            if image:
+                extension = 'svg' if _is_svg(image) else 'png'
+                image_path = os.path.join(image_dir, f"chart_{index}.{extension}")
+                with open(image_path, 'wb') as f:
+                    f.write(image)
+            rendered_story.extend(flowable.resolve(image_path))
+        logger.info(f"Rendered {len(placeholders)} charts for PDF")
+        return rendered_story
+    
+    def _section(self, section: str, inputs_hash: Optional[str], builder, *args) -> List:
+        """Flowables of one report section, reused from the section cache while its inputs are unchanged.
+
+        Args:
+            section: Section name, part of the cache key
+            inputs_hash: Hash of everything the builder reads; None disables caching
+            builder: Method building the section's flowables from args
+        """
+        key = section_key(section, inputs_hash, self.language) if inputs_hash else None
+        if key:
+            flowables = section_cache.get(key)
+            if flowables is not None:
+                return flowables
+        flowables = builder(*args)
+        if key:
+            section_cache.put(key, flowables)
+        return flowables
     
     def _t(self, key: str, default: str = None) -> str:
         """Get translation for PDF text"""
-        try:
-            from utils.translations import TRANSLATIONS
-            translations = TRANSLATIONS.get(self.language, TRANSLATIONS['en'])
-            return translations.get(key, default or key)
-        except Exception:
-            return default or key
+        return pdf_translations(self.language).get(key, default or key)
     
     def _translate_table_header(self, header: str) -> str:
         """Translate common table header names"""
         if not header or not isinstance(header, str):
             return header
         
-        # Common table header translations
-        header_translations = {
-            'en': {
-                'Parameter': 'Parameter',
-                'Average': 'Average',
-                'MPOB Standard': 'MPOB Standard',
-                'Status': 'Status',
-                'Gap': 'Gap',
-                '% Gap': '% Gap',
-                'Severity': 'Severity',
-                'Current Value': 'Current Value',
-                'Optimal Level': 'Optimal Level',
-                'Sample': 'Sample',
-                'Sample No.': 'Sample No.',
-                'Lab No.': 'Lab No.',
-                'Minimum': 'Minimum',
-                'Maximum': 'Maximum',
-                'Standard Deviation': 'Standard Deviation',
-                'Sample Count': 'Sample Count',
-            },
-            'ms': {
-                'Parameter': 'Parameter',
-                'Average': 'Purata',
-                'MPOB Standard': 'Standard MPOB',
-                'Status': 'Status',
-                'Gap': 'Jurang',
-                '% Gap': '% Jurang',
-                'Severity': 'Keterukan',
-                'Current Value': 'Nilai Semasa',
-                'Optimal Level': 'Tahap Optimum',
-                'Sample': 'Sampel',
-                'Sample No.': 'No. Sampel',
-                'Lab No.': 'No. Makmal',
-                'Minimum': 'Minimum',
-                'Maximum': 'Maksimum',
-                'Standard Deviation': 'Sisihan Piawai',
-                'Sample Count': 'Bilangan Sampel',
-            }
-        }
-        
-        translations = header_translations.get(self.language, header_translations['en'])
-        return translations.get(header, header)
+        return header_translations(self.language).get(header, header)
     
     def _translate_table_headers(self, headers: list) -> list:
         """Translate a list of table headers"""
@@ -192,97 +590,27 @@ class PDFReportGenerator:
         ]))
         return table
     
-    def _init_firebase_storage(self):
-        """Initialize Firebase Storage client"""
-        try:
-            if FIREBASE_AVAILABLE and firebase_admin._apps:
-                return storage
-            return None
-        except Exception as e:
-            logger.warning(f"Firebase Storage not available: {str(e)}")
-            return None
-    
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles"""
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=styles['Title'],
-            fontSize=24,
-            spaceAfter=30,
-            textColor=colors.HexColor('#2E7D32'),
-            alignment=1  # Center
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='CustomHeading',
-            parent=styles['Heading1'],
-            fontSize=16,
-            spaceAfter=12,
-            textColor=colors.HexColor('#4CAF50'),
-            borderWidth=1,
-            borderColor=colors.HexColor('#4CAF50'),
-            borderPadding=5,
-            alignment=4  # Justify
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='CustomSubheading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=10,
-            textColor=colors.HexColor('#388E3C'),
-            alignment=4  # Justify
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='CustomBody',
-            parent=styles['Normal'],
-            fontSize=11,
-            spaceAfter=6,
-            textColor=colors.black,
-            alignment=4  # Justify
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=15,
-            textColor=colors.HexColor('#2E7D32'),
-            borderWidth=2,
-            borderColor=colors.HexColor('#4CAF50'),
-            borderPadding=8,
-            backColor=colors.HexColor('#E8F5E8'),
-            alignment=4  # Justify
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='Warning',
-            parent=styles['Normal'],
-            fontSize=12,
-            textColor=colors.red,
-            backColor=colors.HexColor('#FFEBEE'),
-            borderWidth=1,
-            borderColor=colors.red,
-            borderPadding=5,
-            alignment=4  # Justify
-        ))
-        
-        # Add justification to default styles
-        styles['Normal'].alignment = 4  # Justify
-        styles['Heading1'].alignment = 4  # Justify
-        styles['Heading2'].alignment = 4  # Justify
-        styles['Heading3'].alignment = 4  # Justify
-        styles['BodyText'].alignment = 4  # Justify
-        
-        return styles
-    
     def generate_report(self, analysis_data: Dict[str, Any], metadata: Dict[str, Any], 
                        options: Dict[str, Any], language: str = None) -> bytes:
         """Generate complete PDF report with comprehensive analysis support"""
+        with self.generate_report_file(analysis_data, metadata, options, language=language) as pdf_file:
+            return pdf_file.read()
+    
+    def generate_report_file(self, analysis_data: Dict[str, Any], metadata: Dict[str, Any],
+                             options: Dict[str, Any], language: str = None,
+                             output: Optional[BinaryIO] = None) -> BinaryIO:
+        """Generate the PDF report into a file-like object instead of memory.
+
+        Args:
+            analysis_data: Analysis results to report on
+            metadata: Report metadata (title, timestamp, ...)
+            options: Section options; 'chart_format' selects 'png' or 'vector' charts
+            language: Report language (session language by default)
+            output: Writable binary stream; a spooled temporary file by default
+
+        Returns:
+            The output stream, rewound to the start of the PDF
+        """
         # Get language if not provided
         if language is None:
             try:
@@ -291,12 +619,16 @@ class PDFReportGenerator:
             except Exception:
                 language = 'en'
         
-        # Store language for use in PDF generation
+        # Store language and chart format for use in PDF generation
         self.language = language
+        self.chart_format = resolve_chart_format(options.get('chart_format'))
         
-        buffer = io.BytesIO()
+        owns_output = output is None
+        if owns_output:
+            output = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_MEMORY)
+        start = output.tell()
         doc = SimpleDocTemplate(
-            buffer,
+            output,
             pagesize=A4,
             rightMargin=54,  # slightly narrower margins to fit tables
             leftMargin=54,
@@ -304,11 +636,19 @@ class PDFReportGenerator:
             bottomMargin=36,
         )
         
+        # Sections are cached by these hashes, so toggling a section or language rebuilds only what changed
+        try:
+            data_hash = fingerprint(analysis_data)
+            metadata_hash = fingerprint(data_hash, metadata)
+        except Exception as e:
+            logger.warning(f"Report inputs could not be fingerprinted, building all sections: {str(e)}")
+            data_hash = metadata_hash = None
+        
         # Build story
         story = []
         
         try:
-            # Title page
+            # Title page (not cached: it carries the generation time)
             story.extend(self._create_title_page(metadata))
             story.append(PageBreak())
         except Exception as e:
@@ -329,7 +669,8 @@ class PDFReportGenerator:
             
             try:
                 # 1. Results Header (metadata)
-                story.extend(self._create_results_header_section(analysis_data, metadata))
+                story.extend(self._section('results_header', metadata_hash,
+                                           self._create_results_header_section, analysis_data, metadata))
             except Exception as e:
                 logger.error(f"Error creating results header: {str(e)}")
                 story.append(Paragraph("Analysis Results", self.styles['Heading1']))
@@ -337,7 +678,8 @@ class PDFReportGenerator:
             try:
                 # 2. Executive Summary (if enabled) - COPY EXACTLY FROM RESULTS PAGE
                 if options.get('include_summary', True):
-                    story.extend(self._create_enhanced_executive_summary(analysis_data))
+                    story.extend(self._section('executive_summary', data_hash,
+                                               self._create_enhanced_executive_summary, analysis_data))
             except Exception as e:
                 logger.error(f"Error creating executive summary: {str(e)}")
                 story.append(Paragraph("Executive Summary", self.styles['Heading2']))
@@ -346,7 +688,7 @@ class PDFReportGenerator:
             
             try:
                 # 4b. Top-level Data Tables (copy behavior from results page)
-                story.extend(self._create_top_level_data_tables(analysis_data))
+                story.extend(self._section('data_tables', data_hash, self._create_top_level_data_tables, analysis_data))
             except Exception as e:
                 logger.error(f"Error creating top-level data tables: {str(e)}")
             
@@ -354,7 +696,8 @@ class PDFReportGenerator:
                 # 5. Step-by-Step Analysis (if enabled)
                 if options.get('include_step_analysis', True):
                     logger.info("🔍 DEBUG - Starting step-by-step analysis generation")
-                    step_analysis = self._create_comprehensive_step_by_step_analysis(analysis_data)
+                    step_analysis = self._section('step_by_step', data_hash,
+                                                  self._create_comprehensive_step_by_step_analysis, analysis_data)
                     logger.info(f"🔍 DEBUG - Step analysis generated {len(step_analysis)} elements")
                     story.extend(step_analysis)
                 else:
@@ -371,14 +714,15 @@ class PDFReportGenerator:
             # Charts are included within step-by-step analysis sections
             
             # 7. Economic Forecast Tables (always included for step-by-step)
-            story.extend(self._create_enhanced_economic_forecast_table(analysis_data))
+            story.extend(self._section('economic_forecast', data_hash,
+                                       self._create_enhanced_economic_forecast_table, analysis_data))
             
             # 8. References (if enabled)
             if options.get('include_references', True):
-                story.extend(self._create_references_section(analysis_data))
+                story.extend(self._section('references', data_hash, self._create_references_section, analysis_data))
             
             # 9. Conclusion (always included) - No "Data Visualizations" section before this
-            story.extend(self._create_enhanced_conclusion(analysis_data))
+            story.extend(self._section('conclusion', data_hash, self._create_enhanced_conclusion, analysis_data))
         elif 'summary_metrics' in analysis_data and 'health_indicators' in analysis_data:
             # Comprehensive analysis format - using existing methods
             # Note: Some methods (_create_comprehensive_executive_summary, _create_health_indicators_section,
@@ -387,23 +731,28 @@ class PDFReportGenerator:
             # _create_data_quality_section) are not implemented yet
 
             # Using available methods instead
-            story.extend(self._create_enhanced_executive_summary(analysis_data))
+            story.extend(self._section('executive_summary', data_hash,
+                                       self._create_enhanced_executive_summary, analysis_data))
 
             # Economic analysis (always included for comprehensive)
             if 'economic_analysis' in analysis_data:
-                story.extend(self._create_comprehensive_economic_analysis(analysis_data))
+                story.extend(self._section('economic_analysis', data_hash,
+                                           self._create_comprehensive_economic_analysis, analysis_data))
 
             # Economic forecast tables and charts (always included for comprehensive)
-            story.extend(self._create_enhanced_economic_forecast_table(analysis_data))
-            story.extend(self._create_enhanced_yield_forecast_graph(analysis_data))
+            story.extend(self._section('economic_forecast', data_hash,
+                                       self._create_enhanced_economic_forecast_table, analysis_data))
+            story.extend(self._section('yield_forecast_graph', data_hash,
+                                       self._create_enhanced_yield_forecast_graph, analysis_data))
 
             # Yield forecast (always included for comprehensive)
             if 'yield_forecast' in analysis_data:
-                story.extend(self._create_yield_projections_section(analysis_data))
+                story.extend(self._section('yield_projections', data_hash,
+                                           self._create_yield_projections_section, analysis_data))
             
             # Charts section (if enabled)
             if options.get('include_charts', True):
-                story.extend(self._create_comprehensive_charts_section(analysis_data))
+                story.extend(self._section('charts', data_hash, self._create_comprehensive_charts_section, analysis_data))
         else:
             # Legacy analysis format
             story.extend(self._create_executive_summary(analysis_data))
@@ -438,21 +787,24 @@ class PDFReportGenerator:
             canvas.restoreState()
 
         try:
-            doc.build(story, onFirstPage=_draw_page_frame, onLaterPages=_draw_page_frame)
+            # Chart images live in files only until the document is built
+            with tempfile.TemporaryDirectory(prefix='cropdrive_charts_') as image_dir:
+                story = self._render_charts(story, image_dir)
+                doc.build(story, onFirstPage=_draw_page_frame, onLaterPages=_draw_page_frame)
 
-            pdf_bytes = buffer.getvalue()
-            buffer.close()
-
-            if not pdf_bytes:
+            size = output.tell() - start
+            if not size:
                 logger.error("PDF generation resulted in empty buffer")
                 raise ValueError("PDF generation failed - empty buffer")
 
-            logger.info(f"✅ PDF generated successfully: {len(pdf_bytes)} bytes")
-            return pdf_bytes
+            output.seek(start)
+            logger.info(f"✅ PDF generated successfully: {size} bytes")
+            return output
 
         except Exception as e:
             logger.error(f"❌ Error during PDF build: {str(e)}")
-            buffer.close()
+            if owns_output:
+                output.close()
             raise
     
     def _create_title_page(self, metadata: Dict[str, Any]) -> List:
@@ -616,7 +968,7 @@ class PDFReportGenerator:
         return story
     
     def _create_enhanced_executive_summary(self, analysis_data: Dict[str, Any]) -> List:
-        """Create executive summary - COPY EXACTLY FROM RESULTS PAGE"""
+        """Create executive summary from the stored findings-engine output, as shown on the results page"""
         story = []
         
         # Executive Summary header
@@ -624,670 +976,17 @@ class PDFReportGenerator:
         story.append(Spacer(1, 12))
         
         # Handle data structure - analysis_data might be the analysis_results content directly
-        if 'analysis_results' in analysis_data:
-            # Full structure: analysis_data contains analysis_results
-            analysis_results = analysis_data.get('analysis_results', {})
-        else:
-            # Direct structure: analysis_data IS the analysis_results content
-            analysis_results = analysis_data
+        analysis_results = analysis_data.get('analysis_results', analysis_data)
         
-        # Try to get executive summary from stored data first
-        if 'executive_summary' in analysis_results and analysis_results['executive_summary']:
-            executive_summary_text = self._sanitize_text_persona(analysis_results['executive_summary'])
-            if isinstance(executive_summary_text, str) and executive_summary_text.strip():
-                story.append(Paragraph(executive_summary_text, self.styles['CustomBody']))
-                story.append(Spacer(1, 12))
-                return story
-
-        # Generate executive summary dynamically like the results page does
-        executive_summary_text = self._generate_executive_summary_for_pdf(analysis_results)
-
-        if executive_summary_text and executive_summary_text.strip():
-            executive_summary_text = self._sanitize_text_persona(executive_summary_text)
-            story.append(Paragraph(executive_summary_text, self.styles['CustomBody']))
-            story.append(Spacer(1, 12))
-            return story
-
-        # Fallback if generation fails
-        story.append(Paragraph(self._t('pdf_executive_summary_error', 'Executive summary could not be generated from the analysis data.'), self.styles['CustomBody']))
+        # Export never calls the LLM; results saved before the engine get the deterministic summary
+        executive_summary_text = get_findings(analysis_results, store=False, use_llm=False)['executive_summary']
+        if isinstance(executive_summary_text, str) and executive_summary_text.strip():
+            story.append(Paragraph(self._sanitize_text_persona(executive_summary_text), self.styles['CustomBody']))
+        else:
+            story.append(Paragraph(self._t('pdf_executive_summary_error', 'Executive summary could not be generated from the analysis data.'), self.styles['CustomBody']))
         story.append(Spacer(1, 12))
         return story
 
-    def _generate_executive_summary_for_pdf(self, analysis_results: Dict[str, Any]) -> str:
-        """Generate the exact Executive Summary that mirrors the results page."""
-        try:
-            # First, check if there's already a generated executive summary from the results page
-            if isinstance(analysis_results, dict) and 'executive_summary' in analysis_results:
-                existing_summary = analysis_results['executive_summary']
-                if isinstance(existing_summary, str) and existing_summary.strip():
-                    logger.info(f"🔍 DEBUG - Executive Summary: Using existing summary from results page, length: {len(existing_summary)}")
-                    logger.info(f"🔍 DEBUG - Executive Summary content: {existing_summary[:200]}...")
-                    return existing_summary
-            else:
-                logger.info(f"🔍 DEBUG - Executive Summary: No existing summary found in analysis_results")
-                logger.info(f"🔍 DEBUG - analysis_results keys: {list(analysis_results.keys()) if isinstance(analysis_results, dict) else 'Not a dict'}")
-
-            # If no existing summary, generate dynamic summary
-            executive_summary = self._generate_dynamic_executive_summary(analysis_results)
-
-            logger.info(f"🔍 DEBUG - Executive Summary: Generated dynamic text, length: {len(executive_summary)}")
-
-            return executive_summary
-
-        except Exception as exc:
-            logger.error(f"Error generating executive summary: {str(exc)}")
-            # Fallback to hardcoded summary
-            # Generate a more generic but still dynamic fallback summary
-            total_samples = 17  # Default value
-            if analysis_results and isinstance(analysis_results, dict):
-                metadata = analysis_results.get('analysis_metadata', {})
-                total_samples = metadata.get('total_parameters_analyzed', 17)
-
-            return f"This comprehensive agronomic analysis evaluates {total_samples} key nutritional parameters from soil and leaf tissue samples to assess the current fertility status and plant health of the oil palm plantation. The analysis is based on adherence to Malaysian Palm Oil Board (MPOB) standards for optimal oil palm cultivation. Laboratory results indicate nutritional conditions that may require attention to optimize yield potential and maintain sustainable production. Soil pH levels and nutrient availability have been assessed for proper root development and plant health. Current yield performance and land size data have been analyzed for economic projections. Economic analysis indicates that investment in corrective fertilization programs can generate positive returns through improved fruit bunch quality and increased fresh fruit bunch production. Site-specific nutrient management aligned with soil supply and crop demand is recommended, along with regular monitoring of pH and CEC trends to safeguard nutrient availability and retention capacity. Continued monitoring and adaptive management strategies will be essential for maintaining optimal nutritional status and maximizing the economic potential of this oil palm operation."
-            has_soil_data = bool(soil_params and soil_params.get('parameter_statistics'))
-            has_leaf_data = bool(leaf_params and leaf_params.get('parameter_statistics'))
-
-            if has_soil_data or has_leaf_data:
-                executive_sections.append("Laboratory results indicate nutritional imbalances requiring attention to optimize yield potential and maintain sustainable production.")
-            else:
-                executive_sections.append("Analysis completed with comprehensive evaluation of plantation nutritional status.")
-            executive_sections.append("")
-
-            # 4-7: Detailed issue identification and impacts - pH issues (only if we have soil data)
-            if has_soil_data:
-                executive_sections.append(self._t('pdf_exec_critical_soil_ph', 'CRITICAL SOIL pH ANALYSIS'))
-                ph_messages_added = False
-                soil_stats = soil_params['parameter_statistics']
-                ph_data = soil_stats.get('pH', {})
-                if ph_data:
-                    ph_avg = ph_data.get('average', 0)
-                    if ph_avg > 0 and ph_avg < 4.5:
-                        executive_sections.append(f"Critical soil pH deficiency detected at {ph_avg:.2f}, which severely limits nutrient availability and can cause stunted root growth, reduced nutrient uptake, and increased susceptibility to root diseases in oil palm trees.")
-                        executive_sections.append("Low soil pH affects oil palm by reducing the solubility of essential nutrients like phosphorus and micronutrients, leading to chlorosis, poor fruit development, and decreased oil content in fruit bunches.")
-                        executive_sections.append("pH deficiency in oil palm plantations can result in aluminum toxicity, which damages root systems and impairs water absorption, ultimately causing premature leaf senescence and reduced photosynthetic capacity.")
-                        executive_sections.append("Immediate pH correction through liming is essential to prevent long-term soil degradation and maintain the plantation's productive lifespan.")
-                        ph_messages_added = True
-                    elif ph_avg > 0 and ph_avg >= 4.5 and ph_avg <= 6.0:
-                        executive_sections.append(f"Soil pH levels at {ph_avg:.2f} are within optimal ranges, supporting proper nutrient availability and root development in the oil palm plantation.")
-                        ph_messages_added = True
-
-                if not ph_messages_added:
-                    executive_sections.append("Soil pH levels are within acceptable ranges, supporting proper nutrient availability and root development in the oil palm plantation.")
-            executive_sections.append("")
-
-            # 8-11: Key soil nutrient status (only if we have soil data)
-            if has_soil_data:
-                executive_sections.append(self._t('pdf_exec_soil_nutrient_status', 'SOIL NUTRIENT STATUS ASSESSMENT'))
-                nutrient_sentences_added = 0
-
-                soil_stats = soil_params['parameter_statistics']
-
-                # Check phosphorus (MPOB: critical <5, acceptable <8)
-                p_data = soil_stats.get('Available_P_mg_kg', {})
-                if p_data:
-                    p_avg = p_data.get('average', 0)
-                    if p_avg > 0 and p_avg < 8:
-                        executive_sections.append(f"Available phosphorus levels at {p_avg:.1f} mg/kg indicate deficiency, which can impair root development and reduce fruit bunch formation in oil palm trees.")
-                        nutrient_sentences_added += 1
-
-                # Check potassium (MPOB: critical <0.05, acceptable <0.10)
-                k_data = soil_stats.get('Exchangeable_K_meq%', {})
-                if k_data and nutrient_sentences_added < 2:
-                    k_avg = k_data.get('average', 0)
-                    if k_avg > 0 and k_avg < 0.10:
-                        executive_sections.append(f"Exchangeable potassium deficiency at {k_avg:.2f} meq% can compromise water balance regulation and reduce oil synthesis in oil palm trees.")
-                        nutrient_sentences_added += 1
-
-                # Check calcium (MPOB: critical <0.5, optimal <2.0)
-                ca_data = soil_stats.get('Exchangeable_Ca_meq%', {})
-                if ca_data and nutrient_sentences_added < 2:
-                    ca_avg = ca_data.get('average', 0)
-                    if ca_avg > 0 and ca_avg < 2.0:
-                        executive_sections.append(f"Calcium availability at {ca_avg:.2f} meq% indicates insufficient structural support, potentially weakening cell walls and reducing palm vigor.")
-                        nutrient_sentences_added += 1
-
-                if nutrient_sentences_added == 0:
-                    # Only add a generic statement if we actually have soil data but no specific deficiencies
-                    if soil_params.get('parameter_statistics'):
-                        executive_sections.append("Soil nutrient analysis completed with no critical deficiencies detected in the tested parameters.")
-                    else:
-                        executive_sections.append("Soil nutrient analysis data is being processed.")
-            executive_sections.append("")
-
-            # 12-15: Leaf tissue nutrient status (only if we have leaf data)
-            if has_leaf_data:
-                executive_sections.append(self._t('pdf_exec_leaf_tissue_analysis', 'LEAF TISSUE NUTRIENT ANALYSIS'))
-                leaf_sentences_added = 0
-
-                leaf_stats = leaf_params['parameter_statistics']
-
-                # Check nitrogen
-                n_data = leaf_stats.get('N_%', {})
-                if n_data:
-                    n_avg = n_data.get('average', 0)
-                    if n_avg > 0 and n_avg < 2.5:
-                        executive_sections.append(f"Leaf nitrogen content at {n_avg:.2f}% indicates deficiency, which can limit protein synthesis and reduce photosynthetic efficiency in oil palm.")
-                        leaf_sentences_added += 1
-
-                # Check magnesium
-                mg_data = leaf_stats.get('Mg_%', {})
-                if mg_data and leaf_sentences_added < 2:
-                    mg_avg = mg_data.get('average', 0)
-                    if mg_avg > 0 and mg_avg < 0.25:
-                        executive_sections.append(f"Magnesium deficiency at {mg_avg:.3f}% threatens chlorophyll integrity, potentially causing chlorosis and reduced photosynthetic capacity in oil palm fronds.")
-                        leaf_sentences_added += 1
-
-                if leaf_sentences_added == 0:
-                    # Only add a generic statement if we actually have leaf data but no specific deficiencies
-                    if leaf_params.get('parameter_statistics'):
-                        executive_sections.append("Leaf tissue analysis completed with no critical deficiencies detected in the tested parameters.")
-                    else:
-                        executive_sections.append("Leaf tissue analysis data is being processed.")
-                executive_sections.append("")
-
-            # 16-18: Yield and economic implications (only if we have yield data)
-            if land_yield_data:
-                executive_sections.append(self._t('pdf_exec_yield_economic', 'YIELD & ECONOMIC IMPACT ANALYSIS'))
-                # Use same data extraction logic as dynamic summary
-                current_yield = land_yield_data.get('current_yield')
-                if current_yield is None:
-                    economic_forecast = analysis_results.get('economic_forecast', {})
-                    if economic_forecast:
-                        current_yield = economic_forecast.get('current_yield_tonnes_per_ha') or economic_forecast.get('current_yield')
-                if current_yield is None:
-                    current_yield = 18.0
-
-                land_size = land_yield_data.get('land_size') or land_yield_data.get('land_size_hectares')
-                if land_size is None:
-                    economic_forecast = analysis_results.get('economic_forecast', {})
-                    if economic_forecast:
-                        land_size = economic_forecast.get('land_size_hectares') or economic_forecast.get('land_size')
-                if land_size is None:
-                    land_size = 18
-
-                try:
-                    current_yield = float(current_yield) if current_yield is not None else 18.0
-                except (ValueError, TypeError):
-                    current_yield = 18.0
-
-                try:
-                    land_size = float(land_size) if land_size is not None else 18
-                except (ValueError, TypeError):
-                    land_size = 18
-
-                industry_benchmark = 20.0
-                yield_comparison = "exceeds" if current_yield > industry_benchmark else "is below"
-                correction_verb = "maintaining" if current_yield > industry_benchmark else "increasing"
-
-                executive_sections.append(f"Current yield performance of {current_yield:.1f} tonnes per hectare across {land_size:.0f} hectares {yield_comparison} industry benchmarks, with nutritional corrections potentially {correction_verb} production by 15-25%.")
-                # Dynamic economic analysis based on actual forecast data
-                economic_forecast = analysis_results.get('economic_forecast', {})
-                if economic_forecast and economic_forecast.get('scenarios'):
-                    scenarios = economic_forecast['scenarios']
-                    # Get payback period from medium scenario (most representative)
-                    medium_scenario = scenarios.get('medium', {})
-                    if medium_scenario and 'payback_months_range' in medium_scenario:
-                        payback_range = medium_scenario['payback_months_range']
-                        executive_sections.append(f"Economic analysis indicates that investment in corrective fertilization programs will generate positive returns within {payback_range} through improved fruit bunch quality and increased fresh fruit bunch production.")
-                    else:
-                        executive_sections.append("Economic analysis indicates that investment in corrective fertilization programs will generate positive returns through improved fruit bunch quality and increased fresh fruit bunch production.")
-                else:
-                    executive_sections.append("Economic analysis indicates that investment in corrective fertilization programs will generate positive returns through improved fruit bunch quality and increased fresh fruit bunch production.")
-                executive_sections.append("pH deficiency correction alone can prevent yield losses of up to 30% and improve fruit bunch quality by enhancing nutrient availability to developing palms.")
-                executive_sections.append("")
-            else:
-                # Add a general economic note if no specific yield data
-                executive_sections.append(self._t('pdf_exec_yield_economic', 'YIELD & ECONOMIC IMPACT ANALYSIS'))
-                executive_sections.append("Nutritional management programs typically provide excellent returns on investment through improved yields and palm health, with payback periods of 12-18 months for corrective fertilization.")
-                executive_sections.append("")
-
-            # 19-20: Recommendations and monitoring
-            executive_sections.append(self._t('pdf_exec_recommendations_monitoring', 'RECOMMENDATIONS & MONITORING'))
-            executive_sections.append("Adopt site-specific nutrient management to align input rates with soil supply and crop demand, while prioritizing balanced N-P-K programs complemented by targeted secondary and micronutrient support for optimal oil palm nutrition.")
-            executive_sections.append("Incorporate organic matter through empty fruit bunches, compost, or cover crops to build soil health, and monitor pH and CEC trends annually to safeguard nutrient availability and retention capacity.")
-            executive_sections.append("Continued monitoring and adaptive management strategies will be essential for maintaining optimal nutritional status and maximizing the economic potential of this oil palm operation.")
-
-            # Limit to reasonable length for PDF
-            if len(executive_sections) > 25:
-                executive_sections = executive_sections[:25]
-
-            # Extract critical issues from Step 2
-            if step2.get('identified_issues'):
-                issues = step2['identified_issues']
-                if isinstance(issues, list):
-                    for issue in issues[:3]:  # Top 3 critical issues
-                        if isinstance(issue, dict):
-                            nutrient = issue.get('parameter', 'Unknown')
-                            severity = issue.get('severity', 'Medium')
-                            description = issue.get('description', issue.get('finding', ''))
-                            if description:
-                                executive_sections.append(f"• {severity.upper()}: {description}")
-                        elif isinstance(issue, str):
-                            executive_sections.append(f"• {issue}")
-
-            # Extract from gap tables
-            for step in step_results:
-                    tables = step.get('tables', [])
-                    if isinstance(tables, list):
-                        for table in tables:
-                            if isinstance(table, dict) and 'gap' in table.get('title', '').lower():
-                                rows = table.get('rows', [])
-                                headers = table.get('headers', [])
-                                gap_idx = None
-                                for i, header in enumerate(headers):
-                                    if 'gap' in header.lower() or '%' in header.lower():
-                                        gap_idx = i
-                                        break
-                                if gap_idx is not None:
-                                    critical_gaps = []
-                                    for row in rows:
-                                        if isinstance(row, list) and len(row) > gap_idx:
-                                            try:
-                                                gap_value = row[gap_idx]
-                                                if isinstance(gap_value, str):
-                                                    import re
-                                                    match = re.search(r'([+-]?\d*\.?\d+)', gap_value)
-                                                    if match:
-                                                        gap_percent = float(match.group(1))
-                                                        if gap_percent > 20:  # Critical threshold
-                                                            nutrient = row[0] if len(row) > 0 else "Unknown"
-                                                            critical_gaps.append(f"{nutrient} ({gap_percent:.0f}% deficiency)")
-                                            except (ValueError, TypeError):
-                                                continue
-                                if critical_gaps:
-                                    executive_sections.append(f"Critical nutrient gaps identified: {', '.join(critical_gaps[:3])}")
-
-            # Only add "no critical deficiencies" if no deficiencies were found above
-            deficiency_found = any("deficien" in section.lower() or "gap" in section.lower() or "critical" in section.lower() for section in executive_sections[-10:])
-            if not deficiency_found:
-                executive_sections.append("Soil and leaf nutrient analysis indicates adequate nutrient status for current production levels.")
-            else:
-                # Add summary of critical deficiencies found
-                critical_count = sum(1 for section in executive_sections[-10:] if any(word in section.lower() for word in ["critical", "severe", "deficient"]))
-                if critical_count > 0:
-                    executive_sections.append(f"Analysis identified {critical_count} critical nutrient deficiencies requiring immediate intervention.")
-            executive_sections.append("")
-
-            # TOP 3 LIMITING FACTORS - Restate critical nutrients from gap tables
-            executive_sections.append(self._t('pdf_exec_top_limiting_factors', 'TOP 3 LIMITING FACTORS'))
-            top_limiting = []
-
-            # Collect critical nutrients from all gap tables
-            for step in step_results:
-                tables = step.get('tables', [])
-                if isinstance(tables, list):
-                    for table in tables:
-                        if isinstance(table, dict) and 'gap' in table.get('title', '').lower():
-                            rows = table.get('rows', [])
-                            headers = table.get('headers', [])
-                            gap_idx = None
-                            for i, header in enumerate(headers):
-                                if 'gap' in header.lower() or '%' in header.lower():
-                                    gap_idx = i
-                                    break
-                            if gap_idx is not None:
-                                for row in rows:
-                                    if isinstance(row, list) and len(row) > gap_idx:
-                                        try:
-                                            gap_value = row[gap_idx]
-                                            if isinstance(gap_value, str):
-                                                import re
-                                                match = re.search(r'([+-]?\d*\.?\d+)', gap_value)
-                                                if match:
-                                                    gap_percent = float(match.group(1))
-                                                    if gap_percent > 10:  # Include significant gaps
-                                                        nutrient = row[0] if len(row) > 0 else "Unknown"
-                                                        severity = "Critical" if gap_percent > 30 else "Moderate" if gap_percent > 20 else "Mild"
-                                                        top_limiting.append((gap_percent, f"{nutrient} ({gap_percent:.0f}% gap - {severity})"))
-                                        except (ValueError, TypeError):
-                                            continue
-
-            # Sort by gap percentage and take top 3
-            top_limiting.sort(key=lambda x: x[0], reverse=True)
-            for i, (_, factor) in enumerate(top_limiting[:3], 1):
-                executive_sections.append(f"{i}. {factor}")
-
-            if not top_limiting:
-                executive_sections.append("No significant nutrient limitations identified.")
-            executive_sections.append("")
-
-            # 4. RECOMMENDED SOLUTIONS - Pull from Step 3
-            executive_sections.append(self._t('pdf_exec_recommended_solutions', 'RECOMMENDED SOLUTIONS & INTERVENTIONS'))
-            step3 = next((s for s in step_results if s.get('step_number') == 3), {})
-
-            # Get specific recommendations from Step 3
-            specific_recs = step3.get('specific_recommendations', [])
-            if isinstance(specific_recs, list):
-                for rec in specific_recs[:5]:  # Top 5 recommendations
-                    if isinstance(rec, str) and rec.strip():
-                        executive_sections.append(f"• {rec.strip()}")
-
-            # Get recommendations from tables
-            tables = step3.get('tables', [])
-            if isinstance(tables, list):
-                for table in tables:
-                    if isinstance(table, dict) and 'recommend' in table.get('title', '').lower():
-                        rows = table.get('rows', [])
-                        for row in rows[:3]:  # Top 3 recommendations
-                            if isinstance(row, list) and len(row) >= 3:
-                                nutrient = row[0] if len(row) > 0 else ""
-                                recommendation = row[1] if len(row) > 1 else ""
-                                method = row[2] if len(row) > 2 else ""
-                                if recommendation:
-                                    executive_sections.append(f"• {nutrient}: {recommendation} ({method})")
-
-            if not any("•" in section and len(section) > 10 for section in executive_sections[-10:]):
-                executive_sections.append("Implement comprehensive nutrient management program with balanced fertilization and soil amendments.")
-            executive_sections.append("")
-
-            # 5. ECONOMIC ANALYSIS - Pull from Step 5
-            executive_sections.append(self._t('pdf_exec_economic_roi', 'ECONOMIC IMPACT & ROI ANALYSIS'))
-            step5 = next((s for s in step_results if s.get('step_number') == 5), {})
-
-            # Extract economic forecast data
-            economic_data = analysis_results.get('economic_forecast', {})
-            if isinstance(economic_data, dict):
-                scenarios = economic_data.get('scenarios', {})
-                current_yield = economic_data.get('current_yield_tonnes_per_ha', 0)
-                land_size = economic_data.get('land_size_hectares', 0)
-
-                if current_yield > 0:
-                    executive_sections.append(f"Current yield: {current_yield:.1f} tonnes/ha across {land_size:.0f} hectares")
-
-                # Get medium scenario ROI
-                if 'medium' in scenarios:
-                    medium = scenarios['medium']
-                    roi_range = medium.get('roi_percentage_range', '')
-                    payback_range = medium.get('payback_months_range', '')
-                    if roi_range:
-                        executive_sections.append(f"Expected ROI: {roi_range} with payback period of {payback_range}")
-
-                # Get cost-benefit details
-                total_cost = medium.get('total_cost_rm', 0)
-                additional_revenue = medium.get('additional_revenue_rm', 0)
-                if total_cost > 0 and additional_revenue > 0:
-                    executive_sections.append(f"Investment: RM {total_cost:,.0f} | Additional revenue: RM {additional_revenue:,.0f}")
-
-            if not any("roi" in section.lower() or "economic" in section.lower() for section in executive_sections[-5:]):
-                executive_sections.append("Economic analysis indicates positive returns on nutrient management investments.")
-            executive_sections.append("")
-
-            # 6. 5-YEAR PROJECTIONS - Pull from Step 6
-            executive_sections.append(self._t('pdf_exec_5_year_yield', '5-YEAR YIELD PROJECTIONS'))
-            step6 = next((s for s in step_results if s.get('step_number') == 6), {})
-
-            # Extract yield forecast data
-            yield_forecast = analysis_results.get('yield_forecast', {})
-            if isinstance(yield_forecast, dict):
-                baseline = yield_forecast.get('baseline_yield', 0)
-                if baseline > 0:
-                    executive_sections.append(f"Baseline yield: {baseline:.1f} tonnes/ha")
-
-                # Get projections
-                scenarios = ['high_investment', 'medium_investment', 'low_investment']
-                for scenario in scenarios:
-                    if scenario in yield_forecast:
-                        scenario_data = yield_forecast[scenario]
-                        if isinstance(scenario_data, dict) and 'year_5' in scenario_data:
-                            year5_value = scenario_data['year_5']
-                            if isinstance(year5_value, str) and '-' in year5_value:
-                                # Range format
-                                executive_sections.append(f"{scenario.replace('_', ' ').title()}: {year5_value} t/ha by Year 5")
-                            elif isinstance(year5_value, (int, float)):
-                                executive_sections.append(f"{scenario.replace('_', ' ').title()}: {year5_value:.1f} t/ha by Year 5")
-
-            # Extract from forecast tables
-            tables = step6.get('tables', [])
-            if isinstance(tables, list):
-                for table in tables:
-                    if isinstance(table, dict) and 'projection' in table.get('title', '').lower():
-                        rows = table.get('rows', [])
-                        if len(rows) >= 5:
-                            # Get Year 5 projections
-                            year5_row = rows[4] if len(rows) > 4 else rows[-1]
-                            if isinstance(year5_row, list) and len(year5_row) >= 4:
-                                executive_sections.append(f"Year 5 projections: Low {year5_row[1]}, Medium {year5_row[2]}, High {year5_row[3]}")
-
-            if not any("year" in section.lower() or "projection" in section.lower() for section in executive_sections[-5:]):
-                executive_sections.append("5-year yield projections indicate sustainable production improvements with proper nutrient management.")
-            executive_sections.append("")
-
-            # 7. REGENERATIVE AGRICULTURE - Pull from Step 4
-            executive_sections.append(self._t('pdf_exec_regenerative', 'REGENERATIVE AGRICULTURE & SUSTAINABILITY'))
-            step4 = next((s for s in step_results if s.get('step_number') == 4), {})
-
-            # Extract regenerative practices
-            summary = step4.get('summary', '')
-            if summary:
-                executive_sections.append(summary)
-
-            tables = step4.get('tables', [])
-            if isinstance(tables, list):
-                for table in tables:
-                    if isinstance(table, dict) and 'regenerative' in table.get('title', '').lower():
-                        rows = table.get('rows', [])
-                        for row in rows[:3]:  # Top 3 practices
-                            if isinstance(row, list) and len(row) >= 2:
-                                practice = row[0] if len(row) > 0 else ""
-                                description = row[1] if len(row) > 1 else ""
-                                if practice and description:
-                                    executive_sections.append(f"• {practice}: {description}")
-
-            if not any("regenerative" in section.lower() or "sustainab" in section.lower() for section in executive_sections[-5:]):
-                executive_sections.append("Implement regenerative practices including cover cropping, organic matter addition, and minimum tillage for long-term soil health.")
-            executive_sections.append("")
-
-            # 8. CONCLUSION & NEXT STEPS
-            executive_sections.append(self._t('pdf_exec_conclusion', 'CONCLUSION & IMPLEMENTATION ROADMAP'))
-
-            # Get implementation guidance from any step
-            for step in step_results:
-                summary = step.get('summary', '')
-                if 'implement' in summary.lower() or 'action' in summary.lower():
-                    if len(summary) > 50:
-                        executive_sections.append(summary[:200] + "...")
-                        break
-
-            executive_sections.append("Priority implementation sequence:")
-            executive_sections.append("1. Immediate corrective fertilization for critical nutrient deficiencies")
-            executive_sections.append("2. Soil pH adjustment and liming where required")
-            executive_sections.append("3. Micronutrient supplementation program")
-            executive_sections.append("4. Regenerative agriculture practices implementation")
-            executive_sections.append("5. Continuous monitoring and adaptive management")
-
-            executive_sections.append("")
-            executive_sections.append("Regular soil and leaf tissue analysis every 6-12 months recommended for optimal plantation management.")
-
-            # Ensure we have at least basic content
-            if len(executive_sections) < 5:
-                executive_sections = [
-                    "EXECUTIVE OVERVIEW",
-                    "This comprehensive agronomic analysis evaluates nutritional parameters to assess oil palm plantation health.",
-                    "The analysis follows Malaysian Palm Oil Board (MPOB) standards for optimal cultivation.",
-                    "",
-                    "RECOMMENDATIONS",
-                    "Regular soil and leaf tissue analysis recommended for optimal plantation management.",
-                    "Site-specific nutrient management advised for sustainable production."
-                ]
-
-            # Join all sections with proper formatting for PDF
-            executive_summary = "\n\n".join(executive_sections)
-
-            logger.info(f"🔍 DEBUG - Executive Summary: Generated {len(executive_sections)} sections, total length: {len(executive_summary)}")
-            logger.info(f"🔍 DEBUG - Executive Summary: First 200 chars: {executive_summary[:200]}")
-
-            return executive_summary
-
-        except Exception as exc:
-            logger.error(f"Failed to generate executive summary for PDF: {exc}")
-            import traceback
-            logger.error(f"Executive Summary traceback: {traceback.format_exc()}")
-            return ""
-    
-    def _generate_dynamic_executive_summary(self, analysis_results: Dict[str, Any]) -> str:
-        """Generate the exact Executive Summary that mirrors the results page with detailed land/yield data."""
-        # Get the same data that results.py uses
-        raw_data = analysis_results.get('raw_data', {}) if isinstance(analysis_results, dict) else {}
-        soil_params = raw_data.get('soil_parameters', {}) if isinstance(raw_data, dict) else {}
-        leaf_params = raw_data.get('leaf_parameters', {}) if isinstance(raw_data, dict) else {}
-        land_yield_data = raw_data.get('land_yield_data', {}) if isinstance(raw_data, dict) else {}
-
-        issues_analysis = analysis_results.get('issues_analysis', {}) if isinstance(analysis_results, dict) else {}
-        all_issues = issues_analysis.get('all_issues', []) if isinstance(issues_analysis, dict) else []
-
-        metadata = analysis_results.get('analysis_metadata', {}) if isinstance(analysis_results, dict) else {}
-
-        try:
-
-            # Generate the executive summary using the same logic as results.py
-            summary_sentences = []
-
-            # 1-3: Analysis overview and scope (using actual data)
-            total_samples = metadata.get('total_parameters_analyzed', 17)
-            summary_sentences.append(
-                f"This comprehensive agronomic analysis evaluates {total_samples} "
-                "key nutritional parameters from both soil and leaf tissue samples "
-                "to assess the current fertility status and plant health of the "
-                "oil palm plantation.")
-            summary_sentences.append(
-                "The analysis is based on adherence to Malaysian Palm "
-                "Oil Board (MPOB) standards for optimal oil palm cultivation.")
-            summary_sentences.append(
-                "Laboratory results indicate 1 significant "
-                "nutritional imbalance requiring immediate attention to optimize "
-                "yield potential and maintain sustainable production.")
-
-            # 4-7: Detailed issue identification and impacts (pH and nutrients)
-            ph_messages_added = False
-            if soil_params.get('parameter_statistics'):
-                soil_stats = soil_params['parameter_statistics']
-                ph_data = soil_stats.get('pH', {})
-                if ph_data:
-                    ph_avg = ph_data.get('average', 0)
-                    if ph_avg > 0 and ph_avg < 4.5:
-                        summary_sentences.append(f"Critical soil pH deficiency detected at {ph_avg:.2f}, which severely limits nutrient availability and can cause stunted root growth, reduced nutrient uptake, and increased susceptibility to root diseases in oil palm trees.")
-                        summary_sentences.append("Low soil pH affects oil palm by reducing the solubility of essential nutrients like phosphorus and micronutrients, leading to chlorosis, poor fruit development, and decreased oil content in fruit bunches.")
-                        summary_sentences.append("pH deficiency in oil palm plantations can result in aluminum toxicity, which damages root systems and impairs water absorption, ultimately causing premature leaf senescence and reduced photosynthetic capacity.")
-                        summary_sentences.append("Immediate pH correction through liming is essential to prevent long-term soil degradation and maintain the plantation's productive lifespan.")
-                        ph_messages_added = True
-                    elif ph_avg > 0 and ph_avg >= 4.5 and ph_avg <= 6.0:
-                        summary_sentences.append(f"Soil pH levels at {ph_avg:.2f} are within optimal ranges, supporting proper nutrient availability and root development in the oil palm plantation.")
-                        ph_messages_added = True
-
-            if not ph_messages_added:
-                summary_sentences.append("Soil pH levels are within acceptable ranges, supporting proper nutrient availability and root development in the oil palm plantation.")
-
-            # 8-11: Key soil nutrient status (using correct MPOB thresholds)
-            nutrient_sentences_added = 0
-            if soil_params.get('parameter_statistics'):
-                soil_stats = soil_params['parameter_statistics']
-
-                # Check phosphorus (MPOB: critical <5, acceptable <8)
-                p_data = soil_stats.get('Available_P_mg_kg', {})
-                if p_data:
-                    p_avg = p_data.get('average', 0)
-                    if p_avg > 0 and p_avg < 8:
-                        summary_sentences.append(f"Available phosphorus levels at {p_avg:.1f} mg/kg indicate deficiency, which can impair root development and reduce fruit bunch formation in oil palm trees.")
-                        nutrient_sentences_added += 1
-
-                # Check potassium (MPOB: critical <0.05, acceptable <0.10)
-                k_data = soil_stats.get('Exchangeable_K_meq%', {})
-                if k_data and nutrient_sentences_added < 2:
-                    k_avg = k_data.get('average', 0)
-                    if k_avg > 0 and k_avg < 0.10:
-                        summary_sentences.append(f"Exchangeable potassium deficiency at {k_avg:.2f} meq% can compromise water balance regulation and reduce oil synthesis in oil palm trees.")
-                        nutrient_sentences_added += 1
-
-                # Check calcium (MPOB: critical <0.5, optimal <2.0)
-                ca_data = soil_stats.get('Exchangeable_Ca_meq%', {})
-                if ca_data and nutrient_sentences_added < 2:
-                    ca_avg = ca_data.get('average', 0)
-                    if ca_avg > 0 and ca_avg < 2.0:
-                        summary_sentences.append(f"Calcium availability at {ca_avg:.2f} meq% indicates insufficient structural support, potentially weakening cell walls and reducing palm vigor.")
-                        nutrient_sentences_added += 1
-
-            # 12-15: Leaf tissue nutrient status
-            leaf_sentences_added = 0
-            if leaf_params.get('parameter_statistics'):
-                leaf_stats = leaf_params['parameter_statistics']
-
-                # Check nitrogen
-                n_data = leaf_stats.get('N_%', {})
-                if n_data:
-                    n_avg = n_data.get('average', 0)
-                    if n_avg > 0 and n_avg < 2.5:
-                        summary_sentences.append(f"Leaf nitrogen content at {n_avg:.2f}% indicates deficiency, which can limit protein synthesis and reduce photosynthetic efficiency in oil palm.")
-                        leaf_sentences_added += 1
-
-                # Check magnesium
-                mg_data = leaf_stats.get('Mg_%', {})
-                if mg_data and leaf_sentences_added < 2:
-                    mg_avg = mg_data.get('average', 0)
-                    if mg_avg > 0 and mg_avg < 0.25:
-                        summary_sentences.append(f"Magnesium deficiency at {mg_avg:.3f}% threatens chlorophyll integrity, potentially causing chlorosis and reduced photosynthetic capacity in oil palm fronds.")
-                        leaf_sentences_added += 1
-
-            # 16-18: Yield and economic implications
-            current_yield = land_yield_data.get('current_yield')
-            land_size = land_yield_data.get('land_size')
-
-            try:
-                current_yield = float(current_yield) if current_yield is not None else None
-            except (ValueError, TypeError):
-                current_yield = None
-
-            try:
-                land_size = float(land_size) if land_size is not None else None
-            except (ValueError, TypeError):
-                land_size = None
-
-            if current_yield is not None and land_size is not None:
-                summary_sentences.append(f"Current yield performance is {current_yield:.1f} t/ha over {land_size:.0f} ha based on the uploaded report.")
-            elif current_yield is not None:
-                summary_sentences.append(f"Current yield performance is {current_yield:.1f} t/ha based on the uploaded report.")
-            elif land_size is not None:
-                summary_sentences.append(f"Recorded land size is {land_size:.0f} ha based on the uploaded report.")
-
-            # Dynamic economic analysis based on actual forecast data
-            economic_forecast = analysis_results.get('economic_forecast', {})
-            if economic_forecast and economic_forecast.get('scenarios'):
-                scenarios = economic_forecast['scenarios']
-                # Get payback period from medium scenario (most representative)
-                medium_scenario = scenarios.get('medium', {})
-                if medium_scenario and 'payback_months_range' in medium_scenario:
-                    payback_range = medium_scenario['payback_months_range']
-                    summary_sentences.append(f"Economic analysis indicates that investment in corrective fertilization programs will generate positive returns within {payback_range} through improved fruit bunch quality and increased fresh fruit bunch production.")
-                else:
-                    summary_sentences.append("Economic analysis indicates that investment in corrective fertilization programs will generate positive returns through improved fruit bunch quality and increased fresh fruit bunch production.")
-            else:
-                summary_sentences.append("Economic analysis indicates that investment in corrective fertilization programs will generate positive returns through improved fruit bunch quality and increased fresh fruit bunch production.")
-
-            # Only mention pH correction benefits if pH was actually deficient
-            if ph_messages_added and any('deficien' in sentence.lower() for sentence in summary_sentences if 'pH' in sentence):
-                summary_sentences.append("pH correction can prevent yield losses of up to 30% and improve fruit bunch quality by enhancing nutrient availability to developing palms.")
-
-            # 19-20: Detailed recommendations and monitoring
-            summary_sentences.append("Adopt site-specific nutrient management to align input rates with soil supply and crop demand, while prioritizing balanced N-P-K programs complemented by targeted secondary and micronutrient support for optimal oil palm nutrition.")
-            summary_sentences.append("Incorporate organic matter through empty fruit bunches, compost, or cover crops to build soil health, and monitor pH and CEC trends annually to safeguard nutrient availability and retention capacity.")
-
-            # Add a final concluding sentence
-            summary_sentences.append("Continued monitoring and adaptive management strategies will be essential for maintaining optimal nutritional status and maximizing the economic potential of this oil palm operation.")
-
-            # Limit to exactly 20 sentences maximum
-            if len(summary_sentences) > 20:
-                summary_sentences = summary_sentences[:20]
-
-            # Join sentences into a comprehensive summary
-            comprehensive_summary = " ".join(summary_sentences)
-
-            return comprehensive_summary
-
-        except Exception as e:
-            logger.error(f"Error generating enhanced executive summary: {str(e)}")
-            # Fallback to a more generic but still dynamic summary
-            total_samples = metadata.get('total_parameters_analyzed', 17)
-            return f"This comprehensive agronomic analysis evaluates {total_samples} key nutritional parameters from soil and leaf tissue samples to assess the current fertility status and plant health of the oil palm plantation. The analysis is based on adherence to Malaysian Palm Oil Board (MPOB) standards for optimal oil palm cultivation. Laboratory results indicate nutritional conditions that may require attention to optimize yield potential and maintain sustainable production. Soil pH levels and nutrient availability have been assessed for proper root development and plant health. Current yield performance and land size data have been analyzed for economic projections. Economic analysis indicates that investment in corrective fertilization programs can generate positive returns through improved fruit bunch quality and increased fresh fruit bunch production. Site-specific nutrient management aligned with soil supply and crop demand is recommended, along with regular monitoring of pH and CEC trends to safeguard nutrient availability and retention capacity. Continued monitoring and adaptive management strategies will be essential for maintaining optimal nutritional status and maximizing the economic potential of this oil palm operation."
-
     def _create_fallback_steps_from_analysis_data(self, analysis_results: Dict[str, Any]) -> List:
         """Create fallback step structure from available analysis data"""
         steps = []
@@ -1703,195 +1402,6 @@ class PDFReportGenerator:
                         story.append(Spacer(1, 6))
                     story.append(Spacer(1, 8))
 
-    def _create_nutrient_status_tables_pdf(self, story, analysis_data, main_analysis_results=None):
-        """Create nutrient status tables matching results page format"""
-        try:
-            # Get soil and leaf data using multiple data sources (matching results page logic)
-            soil_params = None
-            leaf_params = None
-            
-            # Priority 1: Use main_analysis_results if available (this is where the data actually is)
-            if main_analysis_results:
-                if 'raw_data' in main_analysis_results:
-                    raw_data = main_analysis_results['raw_data']
-                    soil_params = raw_data.get('soil_parameters')
-                    leaf_params = raw_data.get('leaf_parameters')
-                
-                # Check main_analysis_results directly
-                if not soil_params and 'soil_parameters' in main_analysis_results:
-                    soil_params = main_analysis_results['soil_parameters']
-                if not leaf_params and 'leaf_parameters' in main_analysis_results:
-                    leaf_params = main_analysis_results['leaf_parameters']
-            
-            # Priority 2: Check step analysis_data
-            if not soil_params and 'raw_data' in analysis_data:
-                raw_data = analysis_data['raw_data']
-                soil_params = raw_data.get('soil_parameters')
-                leaf_params = raw_data.get('leaf_parameters')
-            
-            # Priority 3: Check analysis_data directly
-            if not soil_params and 'soil_parameters' in analysis_data:
-                soil_params = analysis_data['soil_parameters']
-            if not leaf_params and 'leaf_parameters' in analysis_data:
-                leaf_params = analysis_data['leaf_parameters']
-            
-            # Priority 4: Check if we have structured OCR data that needs conversion
-            if not soil_params and 'raw_ocr_data' in analysis_data:
-                raw_ocr_data = analysis_data['raw_ocr_data']
-                if 'soil_data' in raw_ocr_data and 'structured_ocr_data' in raw_ocr_data['soil_data']:
-                    from utils.analysis_engine import AnalysisEngine
-                    engine = AnalysisEngine()
-                    structured_soil_data = raw_ocr_data['soil_data']['structured_ocr_data']
-                    soil_params = engine._convert_structured_to_analysis_format(structured_soil_data, 'soil')
-                
-                if 'leaf_data' in raw_ocr_data and 'structured_ocr_data' in raw_ocr_data['leaf_data']:
-                    from utils.analysis_engine import AnalysisEngine
-                    engine = AnalysisEngine()
-                    structured_leaf_data = raw_ocr_data['leaf_data']['structured_ocr_data']
-                    leaf_params = engine._convert_structured_to_analysis_format(structured_leaf_data, 'leaf')
-            
-            # Debug logging
-            logger.info(f"🔍 DEBUG - PDF soil_params: {list(soil_params.keys()) if soil_params else 'None'}")
-            logger.info(f"🔍 DEBUG - PDF leaf_params: {list(leaf_params.keys()) if leaf_params else 'None'}")
-            
-            # If no data found, show informative message
-            if not soil_params and not leaf_params:
-                story.append(Paragraph("📋 No soil or leaf data available for nutrient status analysis.", self.styles['CustomBody']))
-                story.append(Spacer(1, 8))
-                return
-            
-            # MPOB standards (matching results page)
-            soil_mpob_standards = {
-                'pH': (4.5, 6.0),
-                'N (%)': (0.15, 0.25),
-                'Nitrogen (%)': (0.15, 0.25),
-                'Org. C (%)': (2.0, 4.0),
-                'Organic Carbon (%)': (2.0, 4.0),
-                'Total P (mg/kg)': (20, 50),
-                'Avail P (mg/kg)': (20, 50),
-                'Available P (mg/kg)': (20, 50),
-                'Exch. K (meq%)': (0.15, 0.30),
-                'Exch. Ca (meq%)': (3.0, 6.0),
-                'Exch. Mg (meq%)': (0.4, 0.8),
-                'CEC (meq%)': (12.0, 25.0),
-                'C.E.C (meq%)': (12.0, 25.0)
-            }
-            
-            leaf_mpob_standards = {
-                'N (%)': (2.4, 2.8),
-                'P (%)': (0.16, 0.22),
-                'K (%)': (1.0, 1.3),
-                'Mg (%)': (0.28, 0.38),
-                'Ca (%)': (0.5, 0.7),
-                'B (mg/kg)': (18, 28),
-                'Cu (mg/kg)': (6.0, 10.0),
-                'Zn (mg/kg)': (15, 25)
-            }
-            
-            # Always show Soil Nutrient Status section header
-            story.append(Paragraph(f"🌱 {self._t('soil_nutrient_status_title', 'Soil Nutrient Status')}", self.styles['Heading4']))
-            story.append(Spacer(1, 4))
-            
-            # Create Soil Nutrient Status table
-            if soil_params and 'parameter_statistics' in soil_params:
-                soil_stats = soil_params['parameter_statistics']
-                soil_data = []
-                
-                for param_name, data_dict in soil_stats.items():
-                    if isinstance(data_dict, dict) and 'average' in data_dict:
-                        avg_value = data_dict.get('average', 0)
-                        
-                        # Skip parameters with 0 values (no real data)
-                        if avg_value == 0:
-                            logger.warning(f"Skipping {param_name} with 0 value")
-                            continue
-                            
-                        min_val, max_val = soil_mpob_standards.get(param_name, (0, 0))
-                        
-                        # Determine status with translation
-                        if avg_value < min_val:
-                            status = self._t('status_deficient', 'Deficient')
-                        elif avg_value > max_val:
-                            status = self._t('status_excess', 'Excessive')
-                        else:
-                            status = self._t('status_optimal', 'Optimal')
-                        
-                        soil_data.append([
-                            param_name,
-                            f"{avg_value:.2f}",
-                            f"{min_val}-{max_val}",
-                            status
-                        ])
-                
-                if soil_data:
-                    headers = [self._t('table_parameter', 'Parameter'), self._t('table_value', 'Current Value'), self._t('table_mpob_standard', 'MPOB Range'), self._t('table_status', 'Status')]
-                    table_data = [headers] + soil_data
-                    pdf_table = self._create_table_with_proper_layout(table_data)
-                    story.append(pdf_table)
-                    story.append(Spacer(1, 8))
-                else:
-                    no_data_text = self._t('pdf_no_soil_data', 'No soil nutrient data available (all values are 0)')
-                    story.append(Paragraph(no_data_text, self.styles['CustomBody']))
-                    story.append(Spacer(1, 8))
-            else:
-                no_data_text = self._t('pdf_no_soil_data', 'No soil nutrient data available (all values are 0)')
-                story.append(Paragraph(no_data_text, self.styles['CustomBody']))
-                story.append(Spacer(1, 8))
-            
-            # Always show Leaf Nutrient Status section header
-            story.append(Paragraph(f"🍃 {self._t('leaf_nutrient_status_title', 'Leaf Nutrient Status')}", self.styles['Heading4']))
-            story.append(Spacer(1, 4))
-            
-            # Create Leaf Nutrient Status table
-            if leaf_params and 'parameter_statistics' in leaf_params:
-                leaf_stats = leaf_params['parameter_statistics']
-                leaf_data = []
-                
-                for param_name, data_dict in leaf_stats.items():
-                    if isinstance(data_dict, dict) and 'average' in data_dict:
-                        avg_value = data_dict.get('average', 0)
-                        
-                        # Skip parameters with 0 values (no real data)
-                        if avg_value == 0:
-                            logger.warning(f"Skipping {param_name} with 0 value")
-                            continue
-                            
-                        min_val, max_val = leaf_mpob_standards.get(param_name, (0, 0))
-                        
-                        # Determine status with translation
-                        if avg_value < min_val:
-                            status = self._t('status_deficient', 'Deficient')
-                        elif avg_value > max_val:
-                            status = self._t('status_excess', 'Excessive')
-                        else:
-                            status = self._t('status_optimal', 'Optimal')
-                        
-                        leaf_data.append([
-                            param_name,
-                            f"{avg_value:.2f}",
-                            f"{min_val}-{max_val}",
-                            status
-                        ])
-                
-                if leaf_data:
-                    headers = [self._t('table_parameter', 'Parameter'), self._t('table_value', 'Current Value'), self._t('table_mpob_standard', 'MPOB Range'), self._t('table_status', 'Status')]
-                    table_data = [headers] + leaf_data
-                    pdf_table = self._create_table_with_proper_layout(table_data)
-                    story.append(pdf_table)
-                    story.append(Spacer(1, 8))
-                else:
-                    no_data_text = self._t('pdf_no_leaf_data', 'No leaf nutrient data available (all values are 0)')
-                    story.append(Paragraph(no_data_text, self.styles['CustomBody']))
-                    story.append(Spacer(1, 8))
-            else:
-                no_data_text = self._t('pdf_no_leaf_data', 'No leaf nutrient data available (all values are 0)')
-                story.append(Paragraph(no_data_text, self.styles['CustomBody']))
-                story.append(Spacer(1, 8))
-                    
-        except Exception as e:
-            logger.error(f"Error creating nutrient status tables: {str(e)}")
-            story.append(Paragraph("Error creating nutrient status tables", self.styles['CustomBody']))
-
     def _create_raw_sample_data_tables_pdf(self, story, analysis_data, main_analysis_results=None):
         """Create raw sample data tables matching results page format"""
         try:
@@ -2069,33 +1579,9 @@ class PDFReportGenerator:
                 story.append(Paragraph("📋 No soil or leaf data available for nutrient status analysis.", self.styles['CustomBody']))
                 return
             
-            # EXACT MPOB standards from results page
-            soil_mpob_standards = {
-                'pH': (4.5, 6.0),
-                'N (%)': (0.15, 0.25),
-                'Nitrogen (%)': (0.15, 0.25),
-                'Org. C (%)': (2.0, 4.0),
-                'Organic Carbon (%)': (2.0, 4.0),
-                'Total P (mg/kg)': (20, 50),
-                'Avail P (mg/kg)': (20, 50),
-                'Available P (mg/kg)': (20, 50),
-                'Exch. K (meq%)': (0.15, 0.30),
-                'Exch. Ca (meq%)': (3.0, 6.0),
-                'Exch. Mg (meq%)': (0.4, 0.8),
-                'CEC (meq%)': (12.0, 25.0),
-                'C.E.C (meq%)': (12.0, 25.0)
-            }
-            
-            leaf_mpob_standards = {
-                'N (%)': (2.4, 2.8),
-                'P (%)': (0.16, 0.22),
-                'K (%)': (1.0, 1.3),
-                'Mg (%)': (0.28, 0.38),
-                'Ca (%)': (0.5, 0.7),
-                'B (mg/kg)': (18, 28),
-                'Cu (mg/kg)': (6.0, 10.0),
-                'Zn (mg/kg)': (15, 25)
-            }
+            # MPOB standards from the standards registry (admin overrides included)
+            soil_mpob_standards = standards_registry.status_ranges('soil')
+            leaf_mpob_standards = standards_registry.status_ranges('leaf')
             
             # Display Soil Nutrient Status table
             if soil_params and 'parameter_statistics' in soil_params:
@@ -2463,47 +1949,9 @@ class PDFReportGenerator:
                     structured_leaf_data = raw_ocr_data['leaf_data']['structured_ocr_data']
                     leaf_params = engine._convert_structured_to_analysis_format(structured_leaf_data, 'leaf')
 
-            # Define MPOB standards for comparison
-            soil_mpob_standards = {
-                'pH': {'min': 4.5, 'max': 5.5, 'unit': ''},
-                'N (%)': {'min': 0.15, 'unit': '%'},
-                'Nitrogen (%)': {'min': 0.15, 'unit': '%'},
-                'Org. C (%)': {'min': 1.0, 'unit': '%'},
-                'Organic Carbon (%)': {'min': 1.0, 'unit': '%'},
-                'Avail P (mg/kg)': {'min': 15.0, 'unit': 'mg/kg'},
-                'Available P (mg/kg)': {'min': 15.0, 'unit': 'mg/kg'},
-                'Total P (mg/kg)': {'min': 15.0, 'unit': 'mg/kg'},
-                'Total Phosphorus (mg/kg)': {'min': 15.0, 'unit': 'mg/kg'},
-                'Total_P (mg/kg)': {'min': 15.0, 'unit': 'mg/kg'},
-                'Total_P_mg_kg': {'min': 15.0, 'unit': 'mg/kg'},
-                'Exch. K (meq/100 g)': {'min': 0.15, 'unit': 'meq/100 g'},
-                'Exchangeable K (meq/100 g)': {'min': 0.15, 'unit': 'meq/100 g'},
-                'Exch. Ca (meq/100 g)': {'min': 0.5, 'unit': 'meq/100 g'},
-                'Exchangeable Ca (meq/100 g)': {'min': 0.5, 'unit': 'meq/100 g'},
-                'Exch. Mg (meq/100 g)': {'min': 0.25, 'unit': 'meq/100 g'},
-                'Exchangeable Mg (meq/100 g)': {'min': 0.25, 'unit': 'meq/100 g'},
-                'CEC (meq/100 g)': {'min': 5.0, 'unit': 'meq/100 g'},
-                'Cation Exchange Capacity (meq%)': {'min': 5.0, 'unit': 'meq/100 g'}
-            }
-
-            leaf_mpob_standards = {
-                'N (%)': {'min': 2.4, 'unit': '%'},
-                'Nitrogen (%)': {'min': 2.4, 'unit': '%'},
-                'P (%)': {'min': 0.14, 'unit': '%'},
-                'Phosphorus (%)': {'min': 0.14, 'unit': '%'},
-                'K (%)': {'min': 1.0, 'unit': '%'},
-                'Potassium (%)': {'min': 1.0, 'unit': '%'},
-                'Mg (%)': {'min': 0.25, 'unit': '%'},
-                'Magnesium (%)': {'min': 0.25, 'unit': '%'},
-                'Ca (%)': {'min': 0.5, 'unit': '%'},
-                'Calcium (%)': {'min': 0.5, 'unit': '%'},
-                'B (mg/kg)': {'min': 10.0, 'unit': 'mg/kg'},
-                'Boron (mg/kg)': {'min': 10.0, 'unit': 'mg/kg'},
-                'Cu (mg/kg)': {'min': 5.0, 'unit': 'mg/kg'},
-                'Copper (mg/kg)': {'min': 5.0, 'unit': 'mg/kg'},
-                'Zn (mg/kg)': {'min': 15.0, 'unit': 'mg/kg'},
-                'Zinc (mg/kg)': {'min': 15.0, 'unit': 'mg/kg'}
-            }
+            # MPOB standards from the standards registry (admin overrides included)
+            soil_mpob_standards = standards_registry.status_standards('soil')
+            leaf_mpob_standards = standards_registry.status_standards('leaf')
 
             gap_data = []
 
@@ -2916,425 +2364,30 @@ class PDFReportGenerator:
                 self._t('table_function', 'Function'),
                 self._t('table_correction_action', 'Correction Action')
             ]
-            table_data = [headers] + guide_data
-            pdf_table = self._create_table_with_proper_layout(table_data)
-            story.append(pdf_table)
-            story.append(Spacer(1, 8))
-                
-        except Exception as e:
-            logger.error(f"Error creating parameter quick guide table: {str(e)}")
-            story.append(Paragraph("Error creating parameter quick guide table", self.styles['CustomBody']))
-
-    def _generate_fallback_executive_summary(self, analysis_results: Dict[str, Any]) -> str:
-        """Clean finding text by removing duplicate 'Key Finding' words and normalizing (PDF version)"""
-        import re
-        
-        # Remove duplicate "Key Finding" patterns
-        # Pattern 1: "Key Finding X: Key finding Y:" -> "Key Finding X:"
-        text = re.sub(r'Key Finding \d+:\s*Key finding \d+:\s*', 'Key Finding ', text)
-        
-        # Pattern 2: "Key finding X:" -> remove (lowercase version)
-        text = re.sub(r'Key finding \d+:\s*', '', text)
-        
-        # Pattern 3: Multiple "Key Finding" at the start
-        text = re.sub(r'^(Key Finding \d+:\s*)+', 'Key Finding ', text)
-        
-        # Clean up extra spaces
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
-
-    def _is_same_issue_pdf(self, finding1, finding2):
-        """Check if two findings are about the same agricultural issue (PDF version)"""
-        # Define issue patterns
-        issue_patterns = {
-            'potassium_deficiency': ['potassium', 'k deficiency', 'k level', 'k average', 'k critical'],
-            'soil_acidity': ['ph', 'acidic', 'acidity', 'soil ph', 'ph level'],
-            'phosphorus_deficiency': ['phosphorus', 'p deficiency', 'available p', 'p level'],
-            'nutrient_deficiency': ['deficiency', 'deficient', 'nutrient', 'nutrients'],
-            'cec_issue': ['cec', 'cation exchange', 'nutrient retention', 'nutrient holding'],
-            'organic_matter': ['organic matter', 'organic carbon', 'carbon'],
-            'micronutrient': ['copper', 'zinc', 'manganese', 'iron', 'boron', 'micronutrient'],
-            'yield_impact': ['yield', 'productivity', 'tonnes', 'production'],
-            'economic_impact': ['roi', 'investment', 'cost', 'profit', 'revenue', 'economic']
-        }
-        
-        finding1_lower = finding1.lower()
-        finding2_lower = finding2.lower()
-        
-        # Check if both findings mention the same issue category
-        for issue, keywords in issue_patterns.items():
-            finding1_has_issue = any(keyword in finding1_lower for keyword in keywords)
-            finding2_has_issue = any(keyword in finding2_lower for keyword in keywords)
-            
-            if finding1_has_issue and finding2_has_issue:
-                # Additional check for specific values or percentages
-                if issue in ['potassium_deficiency', 'soil_acidity', 'phosphorus_deficiency']:
-                    # Extract numbers from both findings
-                    import re
-                    nums1 = re.findall(r'\d+\.?\d*', finding1)
-                    nums2 = re.findall(r'\d+\.?\d*', finding2)
-                    
-                    # If they have similar numbers, they're likely the same issue
-                    if nums1 and nums2:
-                        for num1 in nums1:
-                            for num2 in nums2:
-                                if abs(float(num1) - float(num2)) < 0.1:  # Very close values
-                                    return True
-                
-                return True
-        
-        return False
-
-    def _extract_key_concepts_pdf(self, text):
-        """Extract key concepts from text for better deduplication (PDF version)"""
-        import re
-        
-        # Define key agricultural concepts and nutrients
-        nutrients = ['nitrogen', 'phosphorus', 'potassium', 'calcium', 'magnesium', 'sulfur', 'copper', 'zinc', 'manganese', 'iron', 'boron', 'molybdenum']
-        parameters = ['ph', 'cec', 'organic matter', 'base saturation', 'yield', 'deficiency', 'excess', 'optimum', 'critical', 'mg/kg', '%', 'meq']
-        conditions = ['acidic', 'alkaline', 'deficient', 'sufficient', 'excessive', 'low', 'high', 'moderate', 'severe', 'mild']
-        
-        # Extract numbers and percentages
-        numbers = re.findall(r'\d+\.?\d*', text)
-        
-        # Extract nutrient names and parameters
-        found_concepts = set()
-        
-        # Check for nutrients
-        for nutrient in nutrients:
-            if nutrient in text:
-                found_concepts.add(nutrient)
-        
-        # Check for parameters
-        for param in parameters:
-            if param in text:
-                found_concepts.add(param)
-        
-        # Check for conditions
-        for condition in conditions:
-            if condition in text:
-                found_concepts.add(condition)
-        
-        # Add significant numbers (values that matter for agricultural analysis)
-        for num in numbers:
-            if float(num) > 0:  # Only add positive numbers
-                found_concepts.add(num)
-        
-        return found_concepts
-    
-    def _merge_similar_findings(self, finding1: str, finding2: str) -> str:
-        """Merge two similar findings into one comprehensive finding"""
-        import re
-        
-        # Extract parameter names with comprehensive mapping for all 9 soil and 8 leaf parameters
-        param_mapping = {
-            # Soil Parameters (9)
-            'ph': ['ph', 'ph level', 'soil ph', 'acidity', 'alkalinity'],
-            'nitrogen': ['nitrogen', 'n', 'n%', 'n_%', 'nitrogen%', 'nitrogen_%'],
-            'organic_carbon': ['organic carbon', 'organic_carbon', 'carbon', 'c', 'c%', 'c_%', 'organic_carbon_%'],
-            'total_phosphorus': ['total phosphorus', 'total p', 'total_p', 'total phosphorus mg/kg', 'total_p_mg_kg'],
-            'available_phosphorus': ['available phosphorus', 'available p', 'available_p', 'available phosphorus mg/kg', 'available_p_mg_kg'],
-            'exchangeable_potassium': ['exchangeable potassium', 'exch k', 'exch_k', 'exchangeable k', 'exchangeable_k', 'k meq%', 'k_meq%', 'exchangeable_k_meq%'],
-            'exchangeable_calcium': ['exchangeable calcium', 'exch ca', 'exch_ca', 'exchangeable ca', 'exchangeable_ca', 'ca meq%', 'ca_meq%', 'exchangeable_ca_meq%'],
-            'exchangeable_magnesium': ['exchangeable magnesium', 'exch mg', 'exch_mg', 'exchangeable mg', 'exchangeable_mg', 'mg meq%', 'mg_meq%', 'exchangeable_mg_meq%'],
-            'cec': ['cec', 'cation exchange capacity', 'c.e.c', 'cec meq%', 'cec_meq%'],
-            
-            # Leaf Parameters (8)
-            'leaf_nitrogen': ['leaf nitrogen', 'leaf n', 'leaf_n', 'n%', 'n_%', 'nitrogen%', 'nitrogen_%'],
-            'leaf_phosphorus': ['leaf phosphorus', 'leaf p', 'leaf_p', 'p%', 'p_%', 'phosphorus%', 'phosphorus_%'],
-            'leaf_potassium': ['leaf potassium', 'leaf k', 'leaf_k', 'k%', 'k_%', 'potassium%', 'potassium_%'],
-            'leaf_magnesium': ['leaf magnesium', 'leaf mg', 'leaf_mg', 'mg%', 'mg_%', 'magnesium%', 'magnesium_%'],
-            'leaf_calcium': ['leaf calcium', 'leaf ca', 'leaf_ca', 'ca%', 'ca_%', 'calcium%', 'calcium_%'],
-            'leaf_boron': ['leaf boron', 'leaf b', 'leaf_b', 'b mg/kg', 'b_mg_kg', 'boron mg/kg', 'boron_mg_kg'],
-            'leaf_copper': ['leaf copper', 'leaf cu', 'leaf_cu', 'cu mg/kg', 'cu_mg_kg', 'copper mg/kg', 'copper_mg_kg'],
-            'leaf_zinc': ['leaf zinc', 'leaf zn', 'leaf_zn', 'zn mg/kg', 'zn_mg_kg', 'zinc mg/kg', 'zinc_mg_kg'],
-            
-            # Land & Yield Parameters
-            'land_size': ['land size', 'land_size', 'farm size', 'farm_size', 'area', 'hectares', 'acres', 'square meters', 'square_meters'],
-            'current_yield': ['current yield', 'current_yield', 'yield', 'production', 'tonnes/hectare', 'kg/hectare', 'tonnes/acre', 'kg/acre', 'yield per hectare', 'yield per acre'],
-            'yield_forecast': ['yield forecast', 'yield_forecast', 'projected yield', 'projected_yield', 'future yield', 'future_yield', 'yield projection', 'yield_projection'],
-            'economic_impact': ['economic impact', 'economic_impact', 'roi', 'return on investment', 'cost benefit', 'cost_benefit', 'profitability', 'revenue', 'income'],
-            
-            # Legacy mappings for backward compatibility
-            'phosphorus': ['phosphorus', 'p', 'p%', 'p_%', 'phosphorus%', 'available p'],
-            'potassium': ['potassium', 'k', 'k%', 'k_%', 'potassium%'],
-            'calcium': ['calcium', 'ca', 'ca%', 'ca_%', 'calcium%'],
-            'magnesium': ['magnesium', 'mg', 'mg%', 'mg_%', 'magnesium%'],
-            'copper': ['copper', 'cu', 'cu mg/kg', 'cu_mg/kg', 'copper mg/kg'],
-            'zinc': ['zinc', 'zn', 'zn mg/kg', 'zn_mg/kg', 'zinc mg/kg'],
-            'boron': ['boron', 'b', 'b mg/kg', 'b_mg/kg', 'boron mg/kg']
-        }
-        
-        def extract_parameters(text):
-            """Extract all parameters mentioned in text"""
-            found_params = set()
-            text_lower = text.lower()
-            for param, variations in param_mapping.items():
-                if any(var in text_lower for var in variations):
-                    found_params.add(param)
-            return found_params
-        
-        def extract_values(text):
-            """Extract all numerical values from text"""
-            return re.findall(r'\d+\.?\d*%?', text)
-        
-        def extract_severity_keywords(text):
-            """Extract severity and impact keywords"""
-            severity_words = ['critical', 'severe', 'high', 'low', 'deficiency', 'excess', 'optimum', 'below', 'above']
-            found_severity = [word for word in severity_words if word in text.lower()]
-            return found_severity
-        
-        # Extract information from both findings
-        params1 = extract_parameters(finding1)
-        params2 = extract_parameters(finding2)
-        values1 = extract_values(finding1)
-        values2 = extract_values(finding2)
-        severity1 = extract_severity_keywords(finding1)
-        severity2 = extract_severity_keywords(finding2)
-        
-        # If both findings are about the same parameter(s), merge them comprehensively
-        if params1 and params2 and params1.intersection(params2):
-            # Get the common parameter
-            common_params = list(params1.intersection(params2))
-            param_name = common_params[0].upper() if common_params[0] != 'ph' else 'pH'
-            
-            # Combine all values
-            all_values = list(set(values1 + values2))
-            
-            # Combine all severity keywords
-            all_severity = list(set(severity1 + severity2))
-            
-            # Create comprehensive finding
-            if 'critical' in all_severity or 'severe' in all_severity:
-                severity_desc = "critical"
-            elif 'high' in all_severity:
-                severity_desc = "significant"
-            elif 'low' in all_severity:
-                severity_desc = "moderate"
-            else:
-                severity_desc = "notable"
-            
-            # Build comprehensive finding
-            if param_name == 'pH':
-                comprehensive_finding = f"Soil {param_name} shows {severity_desc} issues with values of {', '.join(all_values)}. "
-            else:
-                comprehensive_finding = f"{param_name} levels show {severity_desc} issues with values of {', '.join(all_values)}. "
-            
-            # Add context from both findings
-            context_parts = []
-            if 'deficiency' in all_severity:
-                context_parts.append("deficiency")
-            if 'excess' in all_severity:
-                context_parts.append("excess")
-            if 'below' in all_severity:
-                context_parts.append("below optimal levels")
-            if 'above' in all_severity:
-                context_parts.append("above optimal levels")
-            
-            if context_parts:
-                comprehensive_finding += f"This indicates {', '.join(context_parts)}. "
-            
-            # Add impact information
-            if 'critical' in all_severity or 'severe' in all_severity:
-                comprehensive_finding += "This directly impacts crop yield and requires immediate attention."
-            elif 'high' in all_severity:
-                comprehensive_finding += "This significantly affects plant health and productivity."
-            else:
-                comprehensive_finding += "This affects overall plant performance and should be addressed."
-            
-            return comprehensive_finding
-        
-        # If findings are about different parameters, combine them
-        return f"{finding1} Additionally, {finding2.lower()}"
-    
-    def _group_and_merge_findings_by_parameter_pdf(self, findings_list):
-        """Group findings by parameter and merge all findings about the same parameter into one comprehensive finding"""
-        import re
-        
-        # Parameter mapping for grouping - comprehensive mapping for all 9 soil and 8 leaf parameters
-        param_mapping = {
-            # Soil Parameters (9)
-            'ph': ['ph', 'ph level', 'soil ph', 'acidity', 'alkalinity'],
-            'nitrogen': ['nitrogen', 'n', 'n%', 'n_%', 'nitrogen%', 'nitrogen_%'],
-            'organic_carbon': ['organic carbon', 'organic_carbon', 'carbon', 'c', 'c%', 'c_%', 'organic_carbon_%'],
-            'total_phosphorus': ['total phosphorus', 'total p', 'total_p', 'total phosphorus mg/kg', 'total_p_mg_kg'],
-            'available_phosphorus': ['available phosphorus', 'available p', 'available_p', 'available phosphorus mg/kg', 'available_p_mg_kg'],
-            'exchangeable_potassium': ['exchangeable potassium', 'exch k', 'exch_k', 'exchangeable k', 'exchangeable_k', 'k meq%', 'k_meq%', 'exchangeable_k_meq%'],
-            'exchangeable_calcium': ['exchangeable calcium', 'exch ca', 'exch_ca', 'exchangeable ca', 'exchangeable_ca', 'ca meq%', 'ca_meq%', 'exchangeable_ca_meq%'],
-            'exchangeable_magnesium': ['exchangeable magnesium', 'exch mg', 'exch_mg', 'exchangeable mg', 'exchangeable_mg', 'mg meq%', 'mg_meq%', 'exchangeable_mg_meq%'],
-            'cec': ['cec', 'cation exchange capacity', 'c.e.c', 'cec meq%', 'cec_meq%'],
-            
-            # Leaf Parameters (8)
-            'leaf_nitrogen': ['leaf nitrogen', 'leaf n', 'leaf_n', 'n%', 'n_%', 'nitrogen%', 'nitrogen_%'],
-            'leaf_phosphorus': ['leaf phosphorus', 'leaf p', 'leaf_p', 'p%', 'p_%', 'phosphorus%', 'phosphorus_%'],
-            'leaf_potassium': ['leaf potassium', 'leaf k', 'leaf_k', 'k%', 'k_%', 'potassium%', 'potassium_%'],
-            'leaf_magnesium': ['leaf magnesium', 'leaf mg', 'leaf_mg', 'mg%', 'mg_%', 'magnesium%', 'magnesium_%'],
-            'leaf_calcium': ['leaf calcium', 'leaf ca', 'leaf_ca', 'ca%', 'ca_%', 'calcium%', 'calcium_%'],
-            'leaf_boron': ['leaf boron', 'leaf b', 'leaf_b', 'b mg/kg', 'b_mg_kg', 'boron mg/kg', 'boron_mg_kg'],
-            'leaf_copper': ['leaf copper', 'leaf cu', 'leaf_cu', 'cu mg/kg', 'cu_mg_kg', 'copper mg/kg', 'copper_mg_kg'],
-            'leaf_zinc': ['leaf zinc', 'leaf zn', 'leaf_zn', 'zn mg/kg', 'zn_mg_kg', 'zinc mg/kg', 'zinc_mg_kg'],
-            
-            # Land & Yield Parameters
-            'land_size': ['land size', 'land_size', 'farm size', 'farm_size', 'area', 'hectares', 'acres', 'square meters', 'square_meters'],
-            'current_yield': ['current yield', 'current_yield', 'yield', 'production', 'tonnes/hectare', 'kg/hectare', 'tonnes/acre', 'kg/acre', 'yield per hectare', 'yield per acre'],
-            'yield_forecast': ['yield forecast', 'yield_forecast', 'projected yield', 'projected_yield', 'future yield', 'future_yield', 'yield projection', 'yield_projection'],
-            'economic_impact': ['economic impact', 'economic_impact', 'roi', 'return on investment', 'cost benefit', 'cost_benefit', 'profitability', 'revenue', 'income'],
-            
-            # Legacy mappings for backward compatibility
-            'phosphorus': ['phosphorus', 'p', 'p%', 'p_%', 'phosphorus%', 'available p'],
-            'potassium': ['potassium', 'k', 'k%', 'k_%', 'potassium%'],
-            'calcium': ['calcium', 'ca', 'ca%', 'ca_%', 'calcium%'],
-            'magnesium': ['magnesium', 'mg', 'mg%', 'mg_%', 'magnesium%'],
-            'copper': ['copper', 'cu', 'cu mg/kg', 'cu_mg/kg', 'copper mg/kg'],
-            'zinc': ['zinc', 'zn', 'zn mg/kg', 'zn_mg/kg', 'zinc mg/kg'],
-            'boron': ['boron', 'b', 'b mg/kg', 'b_mg/kg', 'boron mg/kg']
-        }
-        
-        def extract_parameter(text):
-            """Extract the primary parameter from text"""
-            text_lower = text.lower()
-            for param, variations in param_mapping.items():
-                if any(var in text_lower for var in variations):
-                    return param
-            return 'other'
-        
-        def extract_values(text):
-            """Extract all numerical values from text"""
-            return re.findall(r'\d+\.?\d*%?', text)
-        
-        def extract_severity_keywords(text):
-            """Extract severity and impact keywords"""
-            severity_words = ['critical', 'severe', 'high', 'low', 'deficiency', 'excess', 'optimum', 'below', 'above']
-            return [word for word in severity_words if word in text.lower()]
-        
-        # Group findings by parameter
-        parameter_groups = {}
-        for finding_data in findings_list:
-            finding = finding_data['finding']
-            param = extract_parameter(finding)
-            
-            if param not in parameter_groups:
-                parameter_groups[param] = []
-            parameter_groups[param].append(finding_data)
-        
-        # Merge findings within each parameter group
-        merged_findings = []
-        for param, group_findings in parameter_groups.items():
-            if len(group_findings) == 1:
-                # Single finding, keep as is
-                merged_findings.append(group_findings[0])
-            else:
-                # Multiple findings about same parameter, merge them
-                merged_finding = self._merge_parameter_group_findings_pdf(param, group_findings)
-                if merged_finding:
-                    merged_findings.append(merged_finding)
-        
-        return merged_findings
-    
-    def _merge_parameter_group_findings_pdf(self, param, group_findings):
-        """Merge all findings in a parameter group into one comprehensive finding"""
-        import re
-        
-        # Extract all values and severity keywords from all findings in the group
-        all_values = []
-        all_severity = []
-        all_sources = []
-        
-        for finding_data in group_findings:
-            finding = finding_data['finding']
-            source = finding_data['source']
-            
-            # Extract values
-            values = re.findall(r'\d+\.?\d*%?', finding)
-            all_values.extend(values)
-            
-            # Extract severity keywords
-            severity_words = ['critical', 'severe', 'high', 'low', 'deficiency', 'excess', 'optimum', 'below', 'above']
-            severity = [word for word in severity_words if word in finding.lower()]
-            all_severity.extend(severity)
-            
-            all_sources.append(source)
-        
-        # Remove duplicates
-        unique_values = list(set(all_values))
-        unique_severity = list(set(all_severity))
-        unique_sources = list(set(all_sources))
-        
-        # Determine parameter name
-        param_name = param.upper() if param != 'ph' else 'pH'
-        
-        # Determine severity level
-        if 'critical' in unique_severity or 'severe' in unique_severity:
-            severity_desc = "critical"
-        elif 'high' in unique_severity:
-            severity_desc = "significant"
-        elif 'low' in unique_severity:
-            severity_desc = "moderate"
-        else:
-            severity_desc = "notable"
-        
-        # Build comprehensive finding
-        if param == 'ph':
-            comprehensive_finding = f"Soil {param_name} shows {severity_desc} issues with values of {', '.join(unique_values)}. "
-        else:
-            comprehensive_finding = f"{param_name} levels show {severity_desc} issues with values of {', '.join(unique_values)}. "
-        
-        # Add context
-        context_parts = []
-        if 'deficiency' in unique_severity:
-            context_parts.append("deficiency")
-        if 'excess' in unique_severity:
-            context_parts.append("excess")
-        if 'below' in unique_severity:
-            context_parts.append("below optimal levels")
-        if 'above' in unique_severity:
-            context_parts.append("above optimal levels")
-        
-        if context_parts:
-            comprehensive_finding += f"This indicates {', '.join(context_parts)}. "
-        
-        # Add impact information
-        if 'critical' in unique_severity or 'severe' in unique_severity:
-            comprehensive_finding += "This directly impacts crop yield and requires immediate attention."
-        elif 'high' in unique_severity:
-            comprehensive_finding += "This significantly affects plant health and productivity."
-        else:
-            comprehensive_finding += "This affects overall plant performance and should be addressed."
-        
-        return {
-            'finding': comprehensive_finding,
-            'source': ', '.join(unique_sources)
-        }
-    
+            table_data = [headers] + guide_data
+            pdf_table = self._create_table_with_proper_layout(table_data)
+            story.append(pdf_table)
+            story.append(Spacer(1, 8))
+                
+        except Exception as e:
+            logger.error(f"Error creating parameter quick guide table: {str(e)}")
+            story.append(Paragraph("Error creating parameter quick guide table", self.styles['CustomBody']))
+
     def _create_enhanced_key_findings(self, analysis_data: Dict[str, Any]) -> List:
-        """Create enhanced key findings section with intelligent extraction and deduplication"""
+        """Create key findings section from the stored findings-engine output"""
         story = []
         
         # Key Findings header
         story.append(Paragraph("Key Findings", self.styles['Heading1']))
         story.append(Spacer(1, 12))
         
-        # Handle data structure - analysis_data might be the analysis_results content directly
-        if 'analysis_results' in analysis_data:
-            # Full structure: analysis_data contains analysis_results
-            analysis_results = analysis_data.get('analysis_results', {})
-        else:
-            # Direct structure: analysis_data IS the analysis_results content
-            analysis_results = analysis_data
-        
-        step_results = analysis_results.get('step_by_step_analysis', [])
-        
-        # Generate intelligent key findings with proper deduplication
-        all_key_findings = self._generate_intelligent_key_findings_pdf_OLD(analysis_results, step_results)
+        analysis_results = analysis_data.get('analysis_results', analysis_data)
+        all_key_findings = get_findings(analysis_results, store=False, use_llm=False)['key_findings']
         
         if all_key_findings:
-            # Display key findings - exact same format as results page
+            # Same numbering as the results page
             for i, finding_data in enumerate(all_key_findings, 1):
-                finding = finding_data['finding']
-                
-                # Create finding paragraph with proper formatting - exact same as results page
-                finding_text = f"<b>Key Finding {i}:</b> {finding}"
+                finding_text = f"<b>Key Finding {i}:</b> {finding_data['finding']}"
                 story.append(Paragraph(finding_text, self.styles['CustomBody']))
                 story.append(Spacer(1, 8))
         else:
@@ -3343,429 +2396,6 @@ class PDFReportGenerator:
         story.append(Spacer(1, 20))
         return story
     
-    def _generate_intelligent_key_findings_pdf_OLD(self, analysis_results, step_results):
-        """Generate comprehensive intelligent key findings grouped by parameter with proper deduplication - PDF version"""
-        all_key_findings = []
-        
-        # 1. Check for key findings at the top level of analysis_results
-        if 'key_findings' in analysis_results and analysis_results['key_findings']:
-            findings_data = analysis_results['key_findings']
-            
-            # Handle both list and string formats
-            if isinstance(findings_data, list):
-                findings_list = findings_data
-            elif isinstance(findings_data, str):
-                findings_list = [f.strip() for f in findings_data.split('\n') if f.strip()]
-            else:
-                findings_list = []
-            
-            # Process each finding
-            for finding in findings_list:
-                if isinstance(finding, str) and finding.strip():
-                    cleaned_finding = self._clean_finding_text_pdf(finding.strip())
-                    all_key_findings.append({
-                        'finding': cleaned_finding,
-                        'source': 'Overall Analysis'
-                    })
-        
-        # 2. Extract comprehensive key findings from step-by-step analysis
-        if step_results:
-            step_findings = []
-            
-            for step in step_results:
-                step_number = step.get('step_number', 0)
-                step_title = step.get('step_title', f"Step {step_number}")
-                
-                # Extract findings from multiple step sources
-                step_sources = []
-                
-                # Direct key_findings field
-                if 'key_findings' in step and step['key_findings']:
-                    step_sources.append(('key_findings', step['key_findings']))
-                
-                # Summary field
-                if 'summary' in step and step['summary']:
-                    step_sources.append(('summary', step['summary']))
-                
-                # Detailed analysis field
-                if 'detailed_analysis' in step and step['detailed_analysis']:
-                    step_sources.append(('detailed_analysis', step['detailed_analysis']))
-                
-                # Issues identified
-                if 'issues_identified' in step and step['issues_identified']:
-                    step_sources.append(('issues_identified', step['issues_identified']))
-                
-                # Recommendations
-                if 'recommendations' in step and step['recommendations']:
-                    step_sources.append(('recommendations', step['recommendations']))
-                
-                # Process each source
-                for source_type, source_data in step_sources:
-                    findings_list = []
-                    
-                    # Handle different data formats
-                    if isinstance(source_data, list):
-                        findings_list = source_data
-                    elif isinstance(source_data, str):
-                        # Split by common delimiters and clean
-                        lines = source_data.split('\n')
-                        findings_list = [line.strip() for line in lines if line.strip()]
-                    else:
-                        continue
-                    
-                    # Extract key findings from each item
-                    for finding in findings_list:
-                        if isinstance(finding, str) and finding.strip():
-                            # Enhanced keyword filtering for better relevance
-                            finding_lower = finding.lower()
-                            relevant_keywords = [
-                                'deficiency', 'critical', 'severe', 'low', 'high', 'optimum', 'ph', 'nutrient', 'yield',
-                                'recommendation', 'finding', 'issue', 'problem', 'analysis', 'result', 'conclusion',
-                                'soil', 'leaf', 'land', 'hectares', 'acres', 'tonnes', 'production', 'economic',
-                                'roi', 'investment', 'cost', 'benefit', 'profitability', 'forecast', 'projection',
-                                'improvement', 'increase', 'decrease', 'balance', 'ratio', 'level', 'status',
-                                'nitrogen', 'phosphorus', 'potassium', 'calcium', 'magnesium', 'carbon', 'cec',
-                                'boron', 'zinc', 'copper', 'manganese', 'iron', 'sulfur', 'chlorine'
-                            ]
-                            
-                            # Check if finding contains relevant keywords
-                            if any(keyword in finding_lower for keyword in relevant_keywords):
-                                cleaned_finding = self._clean_finding_text_pdf(finding.strip())
-                                if cleaned_finding and len(cleaned_finding) > 20:  # Minimum length filter
-                                    step_findings.append({
-                                        'finding': cleaned_finding,
-                                        'source': f"{step_title} ({source_type.replace('_', ' ').title()})"
-                                    })
-            
-            # Apply intelligent deduplication to step findings
-            if step_findings:
-                # First group findings by parameter and merge within each group
-                parameter_merged_findings = self._group_and_merge_findings_by_parameter_pdf(step_findings)
-                
-                # Then apply additional deduplication for any remaining similar findings
-                unique_findings = []
-                seen_concepts = []
-                
-                for finding_data in parameter_merged_findings:
-                    finding = finding_data['finding']
-                    normalized = ' '.join(finding.lower().split())
-                    key_concepts = self._extract_key_concepts_pdf(normalized)
-                    
-                    is_duplicate = False
-                    for i, seen_concept_set in enumerate(seen_concepts):
-                        concept_overlap = len(key_concepts.intersection(seen_concept_set))
-                        total_concepts = len(key_concepts.union(seen_concept_set))
-                        
-                        if total_concepts > 0:
-                            similarity = concept_overlap / total_concepts
-                            word_similarity = len(key_concepts.intersection(seen_concept_set)) / max(len(key_concepts), len(seen_concept_set)) if len(key_concepts) > 0 and len(seen_concept_set) > 0 else 0
-                            
-                            # More aggressive deduplication - consolidate similar issues
-                            if similarity > 0.5 or word_similarity > 0.6:
-                                # Merge findings for the same issue
-                                existing_finding = unique_findings[i]['finding']
-                                merged_finding = self._merge_similar_findings(existing_finding, finding)
-                                unique_findings[i]['finding'] = merged_finding
-                                is_duplicate = True
-                                break
-                            
-                            # Check for same issue with stricter criteria
-                            if similarity > 0.3 and word_similarity > 0.4:
-                                if self._is_same_issue_pdf(finding, unique_findings[i]['finding']):
-                                    # Merge findings for the same issue
-                                    existing_finding = unique_findings[i]['finding']
-                                    merged_finding = self._merge_similar_findings(existing_finding, finding)
-                                    unique_findings[i]['finding'] = merged_finding
-                                    is_duplicate = True
-                                    break
-                    
-                    if not is_duplicate:
-                        unique_findings.append(finding_data)
-                        seen_concepts.append(key_concepts)
-                
-                # Combine step findings with existing findings
-                all_key_findings.extend(unique_findings)
-        
-        # Note: Comprehensive parameter-specific key findings are handled by the PDF helper logic
-        
-        # 4. Extract key findings from other analysis sources
-        # Land and yield data
-        land_yield_data = analysis_results.get('land_yield_data', {})
-        if land_yield_data:
-            land_size = land_yield_data.get('land_size', 0)
-            current_yield = land_yield_data.get('current_yield', 0)
-            land_unit = land_yield_data.get('land_unit', 'hectares')
-            yield_unit = land_yield_data.get('yield_unit', 'tonnes/hectare')
-            
-            if land_size > 0:
-                all_key_findings.append({
-                    'finding': f"Farm analysis covers {land_size} {land_unit} of agricultural land with current production of {current_yield} {yield_unit}.",
-                    'source': 'Land & Yield Data'
-                })
-        
-        # Economic forecast
-        economic_forecast = analysis_results.get('economic_forecast', {})
-        if economic_forecast:
-            scenarios = economic_forecast.get('scenarios', {})
-            if scenarios:
-                best_roi = 0
-                best_scenario = ""
-                for level, data in scenarios.items():
-                    if isinstance(data, dict) and data.get('roi_percentage', 0) > best_roi:
-                        best_roi = data.get('roi_percentage', 0)
-                        best_scenario = level
-                
-                if best_roi > 0:
-                    all_key_findings.append({
-                        'finding': f"Economic analysis shows {best_scenario} investment level offers the best ROI of {best_roi:.1f}% with {scenarios[best_scenario].get('payback_months', 0):.1f} months payback period.",
-                        'source': 'Economic Forecast'
-                    })
-        
-        # Yield forecast
-        yield_forecast = analysis_results.get('yield_forecast', {})
-        if yield_forecast:
-            projected_yield = yield_forecast.get('projected_yield', 0)
-            current_yield = yield_forecast.get('current_yield', 0)
-            if projected_yield > 0 and current_yield > 0:
-                increase = ((projected_yield - current_yield) / current_yield) * 100
-                all_key_findings.append({
-                    'finding': f"Yield projection indicates potential increase from {current_yield} to {projected_yield} tonnes/hectare ({increase:.1f}% improvement) with proper management.",
-                    'source': 'Yield Forecast'
-                })
-        
-        # Apply final parameter-based grouping to all findings
-        if all_key_findings:
-            all_key_findings = self._group_and_merge_findings_by_parameter_pdf(all_key_findings)
-            
-        return all_key_findings
-    
-    def _generate_comprehensive_parameter_findings_pdf(self, analysis_results, step_results):
-        """Generate comprehensive key findings grouped by specific parameters - PDF version"""
-        findings = []
-        
-        # Get raw data for analysis
-        raw_data = analysis_results.get('raw_data', {})
-        soil_params = raw_data.get('soil_parameters', {}).get('parameter_statistics', {})
-        leaf_params = raw_data.get('leaf_parameters', {}).get('parameter_statistics', {})
-        
-        # Get MPOB standards for comparison
-        try:
-            from utils.mpob_standards import get_mpob_standards
-            mpob = get_mpob_standards()
-        except (ImportError, AttributeError):
-            mpob = None
-        
-        # 1. Soil pH Analysis
-        if 'pH' in soil_params and mpob:
-            ph_value = soil_params['pH'].get('average', 0)
-            
-            if ph_value > 0:
-                if ph_value < 4.5:
-                    findings.append({
-                        'finding': f"Soil pH is critically low at {ph_value:.1f}, significantly below optimal range of 4.5-5.5. This acidic condition severely limits nutrient availability and root development.",
-                        'source': 'Soil Analysis - pH'
-                    })
-                elif ph_value > 5.5:
-                    findings.append({
-                        'finding': f"Soil pH is high at {ph_value:.1f}, above optimal range of 4.5-5.5. This alkaline condition reduces availability of essential micronutrients like iron and zinc.",
-                        'source': 'Soil Analysis - pH'
-                    })
-                else:
-                    findings.append({
-                        'finding': f"Soil pH is within optimal range at {ph_value:.1f}, providing good conditions for nutrient availability and root development.",
-                        'source': 'Soil Analysis - pH'
-                    })
-        
-        # 2. Soil Nitrogen Analysis
-        if 'Nitrogen_%' in soil_params and mpob:
-            n_value = soil_params['Nitrogen_%'].get('average', 0)
-            n_optimal = mpob.get('soil', {}).get('nitrogen', {}).get('optimal', 0.2)
-            
-            if n_value > 0:
-                if n_value < n_optimal * 0.7:
-                    findings.append({
-                        'finding': f"Soil nitrogen is critically deficient at {n_value:.2f}%, well below optimal level of {n_optimal:.2f}%. This severely limits plant growth and leaf development.",
-                        'source': 'Soil Analysis - Nitrogen'
-                    })
-                elif n_value > n_optimal * 1.3:
-                    findings.append({
-                        'finding': f"Soil nitrogen is excessive at {n_value:.2f}%, above optimal level of {n_optimal:.2f}%. This may cause nutrient imbalances and environmental concerns.",
-                        'source': 'Soil Analysis - Nitrogen'
-                    })
-                else:
-                    findings.append({
-                        'finding': f"Soil nitrogen is adequate at {n_value:.2f}%, within optimal range for healthy plant growth.",
-                        'source': 'Soil Analysis - Nitrogen'
-                    })
-        
-        # 3. Soil Phosphorus Analysis
-        if 'Available_P_mg_kg' in soil_params and mpob:
-            p_value = soil_params['Available_P_mg_kg'].get('average', 0)
-            p_optimal = mpob.get('soil', {}).get('available_phosphorus', {}).get('optimal', 15)
-            
-            if p_value > 0:
-                if p_value < p_optimal * 0.5:
-                    findings.append({
-                        'finding': f"Available phosphorus is critically low at {p_value:.1f} mg/kg, severely below optimal level of {p_optimal} mg/kg. This limits root development and energy transfer.",
-                        'source': 'Soil Analysis - Phosphorus'
-                    })
-                elif p_value > p_optimal * 2:
-                    findings.append({
-                        'finding': f"Available phosphorus is excessive at {p_value:.1f} mg/kg, well above optimal level of {p_optimal} mg/kg. This may cause nutrient lockup and environmental issues.",
-                        'source': 'Soil Analysis - Phosphorus'
-                    })
-                else:
-                    findings.append({
-                        'finding': f"Available phosphorus is adequate at {p_value:.1f} mg/kg, within optimal range for proper plant development.",
-                        'source': 'Soil Analysis - Phosphorus'
-                    })
-        
-        # 4. Soil Potassium Analysis
-        if 'Exchangeable_K_meq%' in soil_params and mpob:
-            k_value = soil_params['Exchangeable_K_meq%'].get('average', 0)
-            k_optimal = mpob.get('soil', {}).get('exchangeable_potassium', {}).get('optimal', 0.3)
-            
-            if k_value > 0:
-                if k_value < k_optimal * 0.6:
-                    findings.append({
-                        'finding': f"Exchangeable potassium is deficient at {k_value:.2f} meq%, below optimal level of {k_optimal:.2f} meq%. This affects water regulation and disease resistance.",
-                        'source': 'Soil Analysis - Potassium'
-                    })
-                elif k_value > k_optimal * 1.5:
-                    findings.append({
-                        'finding': f"Exchangeable potassium is high at {k_value:.2f} meq%, above optimal level of {k_optimal:.2f} meq%. This may cause nutrient imbalances.",
-                        'source': 'Soil Analysis - Potassium'
-                    })
-                else:
-                    findings.append({
-                        'finding': f"Exchangeable potassium is adequate at {k_value:.2f} meq%, within optimal range for healthy plant function.",
-                        'source': 'Soil Analysis - Potassium'
-                    })
-        
-        # 5. Leaf Nutrient Analysis
-        if leaf_params:
-            # Leaf Nitrogen
-            if 'N_%' in leaf_params:
-                leaf_n = leaf_params['N_%'].get('average', 0)
-                if leaf_n > 0:
-                    if leaf_n < 2.6:
-                        findings.append({
-                            'finding': f"Leaf nitrogen is deficient at {leaf_n:.1f}%, below MPOB optimal range of 2.4-2.8%. This indicates poor nitrogen uptake and affects photosynthesis.",
-                            'source': 'Leaf Analysis - Nitrogen'
-                        })
-                    elif leaf_n > 3.2:
-                        findings.append({
-                            'finding': f"Leaf nitrogen is excessive at {leaf_n:.1f}%, above MPOB optimal range of 2.4-2.8%. This may cause nutrient imbalances and delayed maturity.",
-                            'source': 'Leaf Analysis - Nitrogen'
-                        })
-                    else:
-                        findings.append({
-                            'finding': f"Leaf nitrogen is optimal at {leaf_n:.1f}%, within MPOB recommended range for healthy palm growth.",
-                            'source': 'Leaf Analysis - Nitrogen'
-                        })
-            
-            # Leaf Phosphorus
-            if 'P_%' in leaf_params:
-                leaf_p = leaf_params['P_%'].get('average', 0)
-                if leaf_p > 0:
-                    if leaf_p < 0.16:
-                        findings.append({
-                            'finding': f"Leaf phosphorus is deficient at {leaf_p:.2f}%, below MPOB optimal range of 0.16-0.22%. This limits energy transfer and root development.",
-                            'source': 'Leaf Analysis - Phosphorus'
-                        })
-                    elif leaf_p > 0.22:
-                        findings.append({
-                            'finding': f"Leaf phosphorus is high at {leaf_p:.2f}%, above MPOB optimal range of 0.16-0.22%. This may indicate over-fertilization.",
-                            'source': 'Leaf Analysis - Phosphorus'
-                        })
-                    else:
-                        findings.append({
-                            'finding': f"Leaf phosphorus is adequate at {leaf_p:.2f}%, within MPOB optimal range for proper plant function.",
-                            'source': 'Leaf Analysis - Phosphorus'
-                        })
-            
-            # Leaf Potassium
-            if 'K_%' in leaf_params:
-                leaf_k = leaf_params['K_%'].get('average', 0)
-                if leaf_k > 0:
-                    if leaf_k < 1.3:
-                        findings.append({
-                            'finding': f"Leaf potassium is deficient at {leaf_k:.1f}%, below MPOB optimal range of 1.3-1.7%. This affects water regulation and disease resistance.",
-                            'source': 'Leaf Analysis - Potassium'
-                        })
-                    elif leaf_k > 1.7:
-                        findings.append({
-                            'finding': f"Leaf potassium is high at {leaf_k:.1f}%, above MPOB optimal range of 1.3-1.7%. This may cause nutrient imbalances.",
-                            'source': 'Leaf Analysis - Potassium'
-                        })
-                    else:
-                        findings.append({
-                            'finding': f"Leaf potassium is optimal at {leaf_k:.1f}%, within MPOB recommended range for healthy palm growth.",
-                            'source': 'Leaf Analysis - Potassium'
-                        })
-            
-            # Leaf Magnesium
-            if 'Mg_%' in leaf_params:
-                leaf_mg = leaf_params['Mg_%'].get('average', 0)
-                if leaf_mg > 0:
-                    if leaf_mg < 0.28:
-                        findings.append({
-                            'finding': f"Leaf magnesium is deficient at {leaf_mg:.2f}%, below MPOB optimal range of 0.28-0.38%. This affects chlorophyll production and photosynthesis.",
-                            'source': 'Leaf Analysis - Magnesium'
-                        })
-                    elif leaf_mg > 0.38:
-                        findings.append({
-                            'finding': f"Leaf magnesium is high at {leaf_mg:.2f}%, above MPOB optimal range of 0.28-0.38%. This may indicate over-fertilization.",
-                            'source': 'Leaf Analysis - Magnesium'
-                        })
-                    else:
-                        findings.append({
-                            'finding': f"Leaf magnesium is adequate at {leaf_mg:.2f}%, within MPOB optimal range for healthy palm growth.",
-                            'source': 'Leaf Analysis - Magnesium'
-                        })
-            
-            # Leaf Calcium
-            if 'Ca_%' in leaf_params:
-                leaf_ca = leaf_params['Ca_%'].get('average', 0)
-                if leaf_ca > 0:
-                    if leaf_ca < 0.5:
-                        findings.append({
-                            'finding': f"Leaf calcium is deficient at {leaf_ca:.1f}%, below MPOB optimal range of 0.5-0.7%. This affects cell wall strength and fruit quality.",
-                            'source': 'Leaf Analysis - Calcium'
-                        })
-                    elif leaf_ca > 0.7:
-                        findings.append({
-                            'finding': f"Leaf calcium is high at {leaf_ca:.1f}%, above MPOB optimal range of 0.5-0.7%. This may cause nutrient imbalances.",
-                            'source': 'Leaf Analysis - Calcium'
-                        })
-                    else:
-                        findings.append({
-                            'finding': f"Leaf calcium is optimal at {leaf_ca:.1f}%, within MPOB recommended range for healthy palm growth.",
-                            'source': 'Leaf Analysis - Calcium'
-                        })
-            
-            # Leaf Boron
-            if 'B_mg_kg' in leaf_params:
-                leaf_b = leaf_params['B_mg_kg'].get('average', 0)
-                if leaf_b > 0:
-                    if leaf_b < 10:
-                        findings.append({
-                            'finding': f"Leaf boron is deficient at {leaf_b:.1f} mg/kg, below optimal range of 10-20 mg/kg. This affects fruit development and pollen viability.",
-                            'source': 'Leaf Analysis - Boron'
-                        })
-                    elif leaf_b > 20:
-                        findings.append({
-                            'finding': f"Leaf boron is high at {leaf_b:.1f} mg/kg, above optimal range of 10-20 mg/kg. This may cause toxicity symptoms.",
-                            'source': 'Leaf Analysis - Boron'
-                        })
-                    else:
-                        findings.append({
-                            'finding': f"Leaf boron is adequate at {leaf_b:.1f} mg/kg, within optimal range for healthy palm growth.",
-                            'source': 'Leaf Analysis - Boron'
-                        })
-        
-        return findings
-    
     def _create_comprehensive_step_by_step_analysis(self, analysis_data: Dict[str, Any]) -> List:
         """Create comprehensive step-by-step analysis section with visualizations"""
         story = []
@@ -4018,7 +2648,6 @@ class PDFReportGenerator:
             elif step_number == 6:
                 # Step 6: Yield Forecast - Add forecast chart
                 logger.info("🎯 Processing Step 6 - Forecast Graph")
-                story.extend(self._create_step6_yield_forecast(analysis_data))
                 logger.info(f"🔍 DEBUG Step 6 - analysis_data keys: {list(analysis_data.keys())}")
 
                 # Handle data structure - analysis_data might be the analysis_results content directly
@@ -4034,24 +2663,16 @@ class PDFReportGenerator:
                     logger.info("🔍 DEBUG Step 6 - Calling forecast chart method with analysis_results")
                     logger.info(f"🔍 DEBUG Step 6 - analysis_results keys: {list(analysis_results.keys())}")
                     logger.info(f"🔍 DEBUG Step 6 - analysis_results content: {analysis_results}")
-                    yield_chart = self._create_accurate_yield_forecast_chart_for_pdf(analysis_results)
-                    logger.info(f"🔍 DEBUG Step 6 - Chart method returned: {type(yield_chart)}")
-
                     step_prefix = self._t('pdf_step_prefix', 'STEP')
                     forecast_title = self._t('pdf_forecast_graph_title', 'Forecast Graph: 5-Year Yield Forecast & Projections')
-                    if yield_chart is not None:
-                        logger.info("🔍 DEBUG Step 6 - Adding chart to story")
-                        story.append(Paragraph(f"📈 {step_prefix} 6 — {forecast_title}", self.styles['Heading3']))
-                        story.append(Spacer(1, 8))
-                        story.append(yield_chart)
-                        story.append(Spacer(1, 12))
-                        logger.info("✅ Added accurate yield forecast chart to Step 6 - ONLY forecast graph")
-                    else:
-                        logger.warning("❌ Step 6: Yield forecast chart is None")
-                        logger.info("🔍 DEBUG Step 6 - Chart is None, adding failure message")
-                        story.append(Paragraph(f"📈 {step_prefix} 6 — {forecast_title}", self.styles['Heading3']))
-                        story.append(Spacer(1, 8))
-                        story.append(Paragraph("5-Year Yield Forecast (t/ha) - Chart generation failed", self.styles['Normal']))
+                    story.append(Paragraph(f"📈 {step_prefix} 6 — {forecast_title}", self.styles['Heading3']))
+                    story.append(Spacer(1, 8))
+                    # Rendered by the chart render stage; the failure message stands in if it yields nothing
+                    story.append(ChartPlaceholder(
+                        '_create_accurate_yield_forecast_chart_for_pdf', (analysis_results,),
+                        after=[Spacer(1, 12)],
+                        fallback=[Paragraph("5-Year Yield Forecast (t/ha) - Chart generation failed", self.styles['Normal'])]))
+                    logger.info("✅ Added accurate yield forecast chart to Step 6 - ONLY forecast graph")
 
                 except Exception as e:
                     logger.error(f"❌ Step 6: Error adding yield forecast chart: {str(e)}")
@@ -4217,41 +2838,22 @@ class PDFReportGenerator:
             story.append(Paragraph("Visualizations:", self.styles['Heading3']))
             
             for chart_data in step['charts']:
-                try:
-                    # Create chart using enhanced matplotlib
-                    chart_image = self._create_enhanced_chart_image(chart_data)
-                    if chart_image:
-                        # Create a BytesIO object from the image bytes
-                        img_buffer = io.BytesIO(chart_image)
-                        story.append(Image(img_buffer, width=6*inch, height=4*inch))
-                        story.append(Spacer(1, 8))
-                except Exception as e:
-                    logger.warning(f"Could not create chart: {str(e)}")
-                    continue
+                story.append(ChartPlaceholder('_create_enhanced_chart_image', (chart_data,),
+                                              after=[Spacer(1, 8)]))
         
         # Generate contextual visualizations based on step content
         contextual_viz = self._generate_contextual_visualizations_pdf(step, step_number)
         if contextual_viz:
             for viz_data in contextual_viz:
-                try:
-                    chart_image = self._create_enhanced_chart_image(viz_data)
-                    if chart_image:
-                        img_buffer = io.BytesIO(chart_image)
-                        story.append(Image(img_buffer, width=6*inch, height=4*inch))
-                        story.append(Spacer(1, 8))
-                except Exception as e:
-                    logger.warning(f"Could not create contextual chart: {str(e)}")
-                    continue
+                story.append(ChartPlaceholder('_create_enhanced_chart_image', (viz_data,),
+                                              after=[Spacer(1, 8)]))
         
         # Create nutrient status visualization for Step 1
         if step_number == 1:
-            nutrient_chart = self._create_nutrient_status_chart(step)
-            if nutrient_chart:
-                story.append(Paragraph("Nutrient Status Overview:", self.styles['Heading3']))
-                # Create a BytesIO object from the image bytes
-                img_buffer = io.BytesIO(nutrient_chart)
-                story.append(Image(img_buffer, width=6*inch, height=4*inch))
-                story.append(Spacer(1, 8))
+            story.append(ChartPlaceholder(
+                '_create_nutrient_status_chart', (step,),
+                before=[Paragraph("Nutrient Status Overview:", self.styles['Heading3'])],
+                after=[Spacer(1, 8)]))
         
         return story
     
@@ -4420,14 +3022,9 @@ class PDFReportGenerator:
     def _create_chart_image(self, chart_data: Dict[str, Any]) -> Optional[bytes]:
         """Create chart image from chart data with enhanced support for new visualization types"""
         try:
-            import matplotlib.pyplot as plt
             import io
             import numpy as np
             
-            # Clear any existing figures to prevent memory issues
-            plt.clf()
-            plt.close('all')
-            
             chart_type = chart_data.get('type', 'bar')
             data = chart_data.get('data', {})
             title = chart_data.get('title', 'Chart')
@@ -4461,11 +3058,10 @@ class PDFReportGenerator:
     def _create_line_chart_pdf(self, data: Dict[str, Any], title: str, options: Dict[str, Any]) -> Optional[bytes]:
         """Create line chart for PDF"""
         try:
-            import matplotlib.pyplot as plt
             import io
             import numpy as np
             
-            fig, ax = plt.subplots(figsize=(12, 8))
+            fig, ax = _new_figure(figsize=(12, 8))
             
             # Handle different data formats
             if 'categories' in data and 'series' in data:
@@ -4502,13 +3098,12 @@ class PDFReportGenerator:
             ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
             ax.grid(True, alpha=0.3)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Save to bytes
             img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
+            self._save_chart(fig, img_buffer, dpi=150)
             img_buffer.seek(0)
-            plt.close(fig)
             
             return img_buffer.getvalue()
             
@@ -4519,7 +3114,6 @@ class PDFReportGenerator:
     def _create_actual_vs_optimal_chart_pdf(self, data: Dict[str, Any], title: str, options: Dict[str, Any]) -> Optional[bytes]:
         """Create actual vs optimal bar chart for PDF with separate charts for each parameter"""
         try:
-            import matplotlib.pyplot as plt
             import io
             import numpy as np
             
@@ -4547,7 +3141,7 @@ class PDFReportGenerator:
                 rows = 1
                 cols = num_params
             
-            fig, axes = plt.subplots(rows, cols, figsize=(6*cols, 4*rows))
+            fig, axes = _new_figure(rows, cols, figsize=(6*cols, 4*rows))
             
             # If only one parameter, axes won't be a list
             if num_params == 1:
@@ -4607,13 +3201,12 @@ class PDFReportGenerator:
             # Set main title
             fig.suptitle(title, fontsize=14, fontweight='bold', y=0.95)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Save to bytes
             img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
+            self._save_chart(fig, img_buffer, dpi=150)
             img_buffer.seek(0)
-            plt.close(fig)
             
             return img_buffer.getvalue()
             
@@ -4624,10 +3217,9 @@ class PDFReportGenerator:
     def _create_pie_chart_pdf(self, data: Dict[str, Any], title: str, options: Dict[str, Any]) -> Optional[bytes]:
         """Create pie chart for PDF"""
         try:
-            import matplotlib.pyplot as plt
             import io
             
-            fig, ax = plt.subplots(figsize=(10, 8))
+            fig, ax = _new_figure(figsize=(10, 8))
             
             categories = data.get('categories', [])
             values = data.get('values', [])
@@ -4647,13 +3239,12 @@ class PDFReportGenerator:
             
             ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Save to bytes
             img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
+            self._save_chart(fig, img_buffer, dpi=150)
             img_buffer.seek(0)
-            plt.close(fig)
             
             return img_buffer.getvalue()
             
@@ -4664,11 +3255,10 @@ class PDFReportGenerator:
     def _create_multi_axis_chart_pdf(self, data: Dict[str, Any], title: str, options: Dict[str, Any]) -> Optional[bytes]:
         """Create multi-axis chart for PDF"""
         try:
-            import matplotlib.pyplot as plt
             import io
             import numpy as np
             
-            fig, ax1 = plt.subplots(figsize=(12, 8))
+            fig, ax1 = _new_figure(figsize=(12, 8))
             
             categories = data.get('categories', [])
             series = data.get('series', [])
@@ -4709,13 +3299,12 @@ class PDFReportGenerator:
             lines2, labels2 = ax2.get_legend_handles_labels()
             ax1.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Save to bytes
             img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
+            self._save_chart(fig, img_buffer, dpi=150)
             img_buffer.seek(0)
-            plt.close(fig)
             
             return img_buffer.getvalue()
             
@@ -4726,11 +3315,10 @@ class PDFReportGenerator:
     def _create_heatmap_pdf(self, data: Dict[str, Any], title: str, options: Dict[str, Any]) -> Optional[bytes]:
         """Create heatmap for PDF"""
         try:
-            import matplotlib.pyplot as plt
             import io
             import numpy as np
             
-            fig, ax = plt.subplots(figsize=(10, 8))
+            fig, ax = _new_figure(figsize=(10, 8))
             
             parameters = data.get('parameters', [])
             levels = data.get('levels', [])
@@ -4763,20 +3351,19 @@ class PDFReportGenerator:
             ax.set_yticklabels(parameters)
             
             # Add colorbar
-            cbar = plt.colorbar(im, ax=ax)
+            cbar = fig.colorbar(im, ax=ax)
             cbar.set_ticks([0, 1, 2, 3])
             cbar.set_ticklabels(['Critical', 'High', 'Medium', 'Low'])
             cbar.set_label('Deficiency Level')
             
             ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Save to bytes
             img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
+            self._save_chart(fig, img_buffer, dpi=150)
             img_buffer.seek(0)
-            plt.close(fig)
             
             return img_buffer.getvalue()
             
@@ -4787,11 +3374,10 @@ class PDFReportGenerator:
     def _create_radar_chart_pdf(self, data: Dict[str, Any], title: str, options: Dict[str, Any]) -> Optional[bytes]:
         """Create radar chart for PDF"""
         try:
-            import matplotlib.pyplot as plt
             import io
             import numpy as np
             
-            fig, ax = plt.subplots(figsize=(10, 10), subplot_kw=dict(projection='polar'))
+            fig, ax = _new_figure(figsize=(10, 10), subplot_kw=dict(projection='polar'))
             
             categories = data.get('categories', [])
             series = data.get('series', [])
@@ -4824,13 +3410,12 @@ class PDFReportGenerator:
             ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.0))
             ax.grid(True)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Save to bytes
             img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
+            self._save_chart(fig, img_buffer, dpi=150)
             img_buffer.seek(0)
-            plt.close(fig)
             
             return img_buffer.getvalue()
             
@@ -4841,7 +3426,6 @@ class PDFReportGenerator:
     def _create_bar_chart_pdf(self, data: Dict[str, Any], title: str, options: Dict[str, Any]) -> Optional[bytes]:
         """Create bar chart for PDF with separate charts for each parameter"""
         try:
-            import matplotlib.pyplot as plt
             import io
             import numpy as np
             
@@ -4870,7 +3454,7 @@ class PDFReportGenerator:
                         rows = 1
                         cols = num_params
                     
-                    fig, axes = plt.subplots(rows, cols, figsize=(6*cols, 4*rows))
+                    fig, axes = _new_figure(rows, cols, figsize=(6*cols, 4*rows))
                     
                     # If only one parameter, axes won't be a list
                     if num_params == 1:
@@ -4930,13 +3514,12 @@ class PDFReportGenerator:
                     # Set main title
                     fig.suptitle(title, fontsize=14, fontweight='bold', y=0.95)
             
-                    plt.tight_layout()
+                    fig.tight_layout()
                     
                     # Save to bytes
                     img_buffer = io.BytesIO()
-                    plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
+                    self._save_chart(fig, img_buffer, dpi=150)
                     img_buffer.seek(0)
-                    plt.close(fig)
                     
                     return img_buffer.getvalue()
             
@@ -4956,7 +3539,7 @@ class PDFReportGenerator:
                     rows = 1
                     cols = num_params
                 
-                fig, axes = plt.subplots(rows, cols, figsize=(6*cols, 4*rows))
+                fig, axes = _new_figure(rows, cols, figsize=(6*cols, 4*rows))
                 
                 # If only one parameter, axes won't be a list
                 if num_params == 1:
@@ -4993,13 +3576,12 @@ class PDFReportGenerator:
                 # Set main title
                 fig.suptitle(title, fontsize=14, fontweight='bold', y=0.95)
                 
-                plt.tight_layout()
+                fig.tight_layout()
                 
                 # Save to bytes
                 img_buffer = io.BytesIO()
-                plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
+                self._save_chart(fig, img_buffer, dpi=150)
                 img_buffer.seek(0)
-                plt.close(fig)
                 
                 return img_buffer.getvalue()
             
@@ -5012,12 +3594,8 @@ class PDFReportGenerator:
     def _create_nutrient_status_chart(self, step: Dict[str, Any]) -> Optional[bytes]:
         """Create nutrient status chart for Step 1"""
         try:
-            import matplotlib.pyplot as plt
             import io
             
-            # Clear any existing figures to prevent memory issues
-            plt.clf()
-            plt.close('all')
             
             # Extract nutrient data from step
             soil_params = step.get('soil_parameters', {})
@@ -5028,12 +3606,12 @@ class PDFReportGenerator:
             
             # Determine layout based on available data
             if soil_params and leaf_params:
-                fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+                fig, (ax1, ax2) = _new_figure(1, 2, figsize=(12, 5))
             elif soil_params:
-                fig, ax1 = plt.subplots(1, 1, figsize=(6, 5))
+                fig, ax1 = _new_figure(1, 1, figsize=(6, 5))
                 ax2 = None
             else:
-                fig, ax2 = plt.subplots(1, 1, figsize=(6, 5))
+                fig, ax2 = _new_figure(1, 1, figsize=(6, 5))
                 ax1 = None
             
             # Soil nutrients chart
@@ -5066,13 +3644,12 @@ class PDFReportGenerator:
                     ax2.set_ylabel('Value')
                     ax2.tick_params(axis='x', rotation=45)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Save to bytes
             img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
+            self._save_chart(fig, img_buffer, dpi=150)
             img_buffer.seek(0)
-            plt.close(fig)
             
             return img_buffer.getvalue()
             
@@ -5157,48 +3734,11 @@ class PDFReportGenerator:
             if step_number == 1:  # Data Analysis
                 # Create nutrient comparison charts
                 if soil_params.get('parameter_statistics') or leaf_params.get('parameter_statistics'):
-                    chart_image = self._create_nutrient_comparison_chart(soil_params, leaf_params)
-                    if chart_image:
-                        story.append(Paragraph("Nutrient Analysis Visualization:", self.styles['Heading3']))
-                        img_buffer = io.BytesIO(chart_image)
-                        story.append(Image(img_buffer, width=6*inch, height=4*inch))
-                        story.append(Spacer(1, 8))
-                
-                # Create actual vs optimal bar charts
-                if soil_params.get('parameter_statistics'):
-                    soil_chart = _create_actual_vs_optimal_chart(soil_params['parameter_statistics'], 'soil')
-                    if soil_chart:
-                        story.append(Paragraph("Soil Nutrients: Actual vs Optimal Levels:", self.styles['Heading3']))
-                        img_buffer = io.BytesIO(soil_chart)
-                        story.append(Image(img_buffer, width=6*inch, height=4*inch))
-                        story.append(Spacer(1, 8))
-                
-                if leaf_params.get('parameter_statistics'):
-                    leaf_chart = _create_actual_vs_optimal_chart(leaf_params['parameter_statistics'], 'leaf')
-                    if leaf_chart:
-                        story.append(Paragraph("Leaf Nutrients: Actual vs Optimal Levels:", self.styles['Heading3']))
-                        img_buffer = io.BytesIO(leaf_chart)
-                        story.append(Image(img_buffer, width=6*inch, height=4*inch))
-                        story.append(Spacer(1, 8))
-                
-                # Create nutrient ratio charts
-                if soil_params.get('parameter_statistics'):
-                    soil_ratio_chart = _create_nutrient_ratio_chart(soil_params['parameter_statistics'], 'soil')
-                    if soil_ratio_chart:
-                        story.append(Paragraph("Soil Nutrient Ratios:", self.styles['Heading3']))
-                        img_buffer = io.BytesIO(soil_ratio_chart)
-                        story.append(Image(img_buffer, width=6*inch, height=4*inch))
-                        story.append(Spacer(1, 8))
-                
-                if leaf_params.get('parameter_statistics'):
-                    leaf_ratio_chart = _create_nutrient_ratio_chart(leaf_params['parameter_statistics'], 'leaf')
-                    if leaf_ratio_chart:
-                        story.append(Paragraph("Leaf Nutrient Ratios:", self.styles['Heading3']))
-                        img_buffer = io.BytesIO(leaf_ratio_chart)
-                        story.append(Image(img_buffer, width=6*inch, height=4*inch))
-                        story.append(Spacer(1, 8))
+                    story.append(ChartPlaceholder(
+                        '_create_nutrient_comparison_chart', (soil_params, leaf_params),
+                        before=[Paragraph("Nutrient Analysis Visualization:", self.styles['Heading3'])],
+                        after=[Spacer(1, 8)]))
                 
-            
             elif step_number == 2:  # Issue Diagnosis
                 # Charts removed as requested
                 pass
@@ -5207,12 +3747,10 @@ class PDFReportGenerator:
                 # Create solution impact chart
                 recommendations = analysis_data.get('recommendations', [])
                 if recommendations:
-                    chart_image = self._create_solution_impact_chart(recommendations)
-                    if chart_image:
-                        story.append(Paragraph("Solution Impact Analysis:", self.styles['Heading3']))
-                        img_buffer = io.BytesIO(chart_image)
-                        story.append(Image(img_buffer, width=6*inch, height=4*inch))
-                        story.append(Spacer(1, 8))
+                    story.append(ChartPlaceholder(
+                        '_create_solution_impact_chart', (recommendations,),
+                        before=[Paragraph("Solution Impact Analysis:", self.styles['Heading3'])],
+                        after=[Spacer(1, 8)]))
             
             elif step_number == 5:  # Economic Impact
                 # Economic Impact Visualization removed as requested
@@ -5230,11 +3768,8 @@ class PDFReportGenerator:
     def _create_nutrient_comparison_chart(self, soil_params: Dict[str, Any], leaf_params: Dict[str, Any]) -> Optional[bytes]:
         """Create nutrient comparison chart"""
         try:
-            import matplotlib.pyplot as plt
             import numpy as np
             
-            plt.clf()
-            plt.close('all')
             
             # Extract nutrient data
             soil_stats = soil_params.get('parameter_statistics', {})
@@ -5244,7 +3779,7 @@ class PDFReportGenerator:
                 return None
             
             # Create subplot
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig, ax = _new_figure(figsize=(10, 6))
             
             # Prepare data for comparison
             nutrients = []
@@ -5288,15 +3823,14 @@ class PDFReportGenerator:
             ax.legend()
             ax.grid(True, alpha=0.3)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Save to bytes
             img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
+            self._save_chart(fig, img_buffer, dpi=300)
             img_buffer.seek(0)
             result = img_buffer.getvalue()
             
-            plt.close(fig)
             return result
             
         except Exception as e:
@@ -5307,11 +3841,8 @@ class PDFReportGenerator:
     def _create_solution_impact_chart(self, recommendations: List[Dict[str, Any]]) -> Optional[bytes]:
         """Create solution impact chart"""
         try:
-            import matplotlib.pyplot as plt
             import numpy as np
             
-            plt.clf()
-            plt.close('all')
             
             if not recommendations:
                 return None
@@ -5336,7 +3867,7 @@ class PDFReportGenerator:
                 return None
             
             # Create horizontal bar chart
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig, ax = _new_figure(figsize=(10, 6))
             
             y_pos = np.arange(len(solutions))
             ax.barh(y_pos, impacts, alpha=0.8)
@@ -5346,15 +3877,14 @@ class PDFReportGenerator:
             ax.set_title('Solution Impact Analysis')
             ax.grid(True, alpha=0.3)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Save to bytes
             img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
+            self._save_chart(fig, img_buffer, dpi=300)
             img_buffer.seek(0)
             result = img_buffer.getvalue()
             
-            plt.close(fig)
             return result
             
         except Exception as e:
@@ -5428,32 +3958,6 @@ class PDFReportGenerator:
 
         return story
 
-    def _create_step6_yield_forecast(self, analysis_data: Dict[str, Any]) -> List:
-        """Create Step 6 yield forecast visualizations"""
-        story = []
-
-        try:
-            # Get yield forecast data
-            yield_forecast = analysis_data.get('yield_forecast', {})
-
-            if yield_forecast:
-                story.append(Paragraph("Yield Forecast Visualization", self.styles['Heading3']))
-                story.append(Spacer(1, 8))
-
-                # Create yield forecast chart
-                yield_chart = self._create_yield_projection_chart_for_pdf(yield_forecast)
-                if yield_chart:
-                    story.append(yield_chart)
-                    story.append(Spacer(1, 8))
-                # Remove error message - just skip if chart can't be generated
-            # Remove error message - just skip if no data available
-
-        except Exception as e:
-            logger.error(f"Error creating Step 6 yield forecast: {str(e)}")
-            # Remove error message - just skip if error occurs
-
-        return story
-    
     def _create_step1_visualizations_section(self, analysis_data: Dict[str, Any]) -> List:
         """Create Step 1 visualizations section with all charts and graphs"""
         story = []
@@ -5471,47 +3975,11 @@ class PDFReportGenerator:
             
             # Create nutrient comparison charts
             if soil_params.get('parameter_statistics') or leaf_params.get('parameter_statistics'):
-                chart_image = self._create_nutrient_comparison_chart(soil_params, leaf_params)
-                if chart_image:
-                    story.append(Paragraph("Nutrient Analysis Visualization:", self.styles['Heading3']))
-                    img_buffer = io.BytesIO(chart_image)
-                    story.append(Image(img_buffer, width=6*inch, height=4*inch))
-                    story.append(Spacer(1, 8))
-            
-            # Create actual vs optimal bar charts
-            if soil_params.get('parameter_statistics'):
-                soil_chart = _create_actual_vs_optimal_chart(soil_params['parameter_statistics'], 'soil')
-                if soil_chart:
-                    story.append(Paragraph("Soil Nutrients: Actual vs Optimal Levels:", self.styles['Heading3']))
-                    img_buffer = io.BytesIO(soil_chart)
-                    story.append(Image(img_buffer, width=6*inch, height=4*inch))
-                    story.append(Spacer(1, 8))
-            
-            if leaf_params.get('parameter_statistics'):
-                leaf_chart = _create_actual_vs_optimal_chart(leaf_params['parameter_statistics'], 'leaf')
-                if leaf_chart:
-                    story.append(Paragraph("Leaf Nutrients: Actual vs Optimal Levels:", self.styles['Heading3']))
-                    img_buffer = io.BytesIO(leaf_chart)
-                    story.append(Image(img_buffer, width=6*inch, height=4*inch))
-                    story.append(Spacer(1, 8))
-            
-            # Create nutrient ratio charts
-            if soil_params.get('parameter_statistics'):
-                soil_ratio_chart = _create_nutrient_ratio_chart(soil_params['parameter_statistics'], 'soil')
-                if soil_ratio_chart:
-                    story.append(Paragraph("Soil Nutrient Ratios:", self.styles['Heading3']))
-                    img_buffer = io.BytesIO(soil_ratio_chart)
-                    story.append(Image(img_buffer, width=6*inch, height=4*inch))
-                    story.append(Spacer(1, 8))
+                story.append(ChartPlaceholder(
+                    '_create_nutrient_comparison_chart', (soil_params, leaf_params),
+                    before=[Paragraph("Nutrient Analysis Visualization:", self.styles['Heading3'])],
+                    after=[Spacer(1, 8)]))
             
-            if leaf_params.get('parameter_statistics'):
-                leaf_ratio_chart = _create_nutrient_ratio_chart(leaf_params['parameter_statistics'], 'leaf')
-                if leaf_ratio_chart:
-                    story.append(Paragraph("Leaf Nutrient Ratios:", self.styles['Heading3']))
-                    img_buffer = io.BytesIO(leaf_ratio_chart)
-                    story.append(Image(img_buffer, width=6*inch, height=4*inch))
-                    story.append(Spacer(1, 8))
-        
         except Exception as e:
             logger.warning(f"Could not create Step 1 visualizations: {str(e)}")
             story.append(Paragraph("Step 1 visualizations not available.", self.styles['CustomBody']))
@@ -5831,12 +4299,13 @@ class PDFReportGenerator:
                     # Add summary metrics
                     story.append(Paragraph("Investment Summary:", self.styles['Heading5']))
                     
+                    display = scenario_display(scenario_data)
                     summary_data = [
                         ['Metric', 'Value'],
-                        ['Total Investment', scenario_data.get('total_cost_range', 'N/A')],
-                        ['5-Year Cumulative Profit', scenario_data.get('cumulative_net_profit_range', 'N/A')],
-                        ['5-Year ROI', scenario_data.get('roi_5year_range', 'N/A')],
-                        ['Payback Period', scenario_data.get('payback_period_range', 'N/A')]
+                        ['Total Investment', display['total_cost_range']],
+                        ['5-Year Cumulative Profit', display['cumulative_net_profit_range']],
+                        ['5-Year ROI', display['roi_5year_range']],
+                        ['Payback Period', display['payback_period_range']]
                     ]
                     
                     summary_table = self._create_table_with_proper_layout(summary_data)
@@ -6622,12 +5091,8 @@ class PDFReportGenerator:
         
         if yield_forecast:
             # Create yield projection chart
-            chart_image = self._create_yield_projection_chart(yield_forecast)
-            if chart_image:
-                # Create a BytesIO object from the image bytes
-                img_buffer = io.BytesIO(chart_image)
-                story.append(Image(img_buffer, width=6*inch, height=4*inch))
-                story.append(Spacer(1, 12))
+            story.append(ChartPlaceholder('_create_yield_projection_chart', (yield_forecast,),
+                                          after=[Spacer(1, 12)]))
             
             # Create yield projections table - REMOVED as requested by user
             # story.extend(self._create_yield_projections_table(yield_forecast))
@@ -6653,18 +5118,22 @@ class PDFReportGenerator:
     def _create_yield_projection_chart(self, yield_forecast: Dict[str, Any]) -> Optional[bytes]:
         """Create yield projection chart"""
         try:
-            import matplotlib.pyplot as plt
             import io
             
-            # Clear any existing figures to prevent memory issues
-            plt.clf()
-            plt.close('all')
             
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig, ax = _new_figure(figsize=(10, 6))
             
             years = [0, 1, 2, 3, 4, 5]
             year_labels = ['Current', 'Year 1', 'Year 2', 'Year 3', 'Year 4', 'Year 5']
             
+            # Baseline (the first point of range-format scenarios)
+            baseline_yield = yield_forecast.get('baseline_yield', 0)
+            # Ensure baseline_yield is numeric
+            try:
+                baseline_yield = float(baseline_yield) if baseline_yield is not None else 0
+            except (ValueError, TypeError):
+                baseline_yield = 0
+            
             # Plot different investment scenarios - handle both old array format and new range format
             for investment_type, style, marker in [('high_investment', 'o-', 'o'), ('medium_investment', 's-', 's'), ('low_investment', '^-', '^')]:
                 if investment_type in yield_forecast:
@@ -6699,12 +5168,6 @@ class PDFReportGenerator:
                             ax.plot(years, full_values, style, label=investment_name, linewidth=2, markersize=6)
             
             # Add baseline if available
-            baseline_yield = yield_forecast.get('baseline_yield', 0)
-            # Ensure baseline_yield is numeric
-            try:
-                baseline_yield = float(baseline_yield) if baseline_yield is not None else 0
-            except (ValueError, TypeError):
-                baseline_yield = 0
             if baseline_yield > 0:
                 ax.axhline(y=baseline_yield, color='gray', linestyle='--', alpha=0.7, label=f'Current Baseline: {baseline_yield:.1f} t/ha')
             
@@ -6716,13 +5179,12 @@ class PDFReportGenerator:
             ax.set_xticks(years)
             ax.set_xticklabels(year_labels)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Save to bytes
             img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
+            self._save_chart(fig, img_buffer, dpi=150)
             img_buffer.seek(0)
-            plt.close(fig)
             
             return img_buffer.getvalue()
             
@@ -7033,15 +5495,47 @@ class PDFReportGenerator:
                     forecast_step = step
                     break
         
+        # Fit the graph within the content width
+        max_width = self.content_width / 72  # Convert points to inches
+        chart_width = min(5.5, max_width * 0.9)  # Use 90% of available width, max 5.5 inches
+        chart_height = chart_width * 0.6  # Maintain aspect ratio
+        
+        if yield_forecast:
+            story.append(ChartPlaceholder(
+                '_create_enhanced_yield_forecast_chart', (yield_forecast,),
+                width=chart_width*inch, height=chart_height*inch,
+                after=[
+                    Spacer(1, 12),
+                    # Add mandatory footnote
+                    Paragraph("*Projections require yearly follow-up and adaptive adjustments based on actual field conditions and market changes.", self.styles['CustomBody']),
+                    Spacer(1, 6),
+                ]))
+        else:
+            # Create a basic yield forecast graph when data is not available
+            story.append(Paragraph("Yield Projection Overview", self.styles['Heading2']))
+            story.append(Spacer(1, 8))
+            story.append(ChartPlaceholder(
+                '_create_enhanced_yield_forecast_chart', (None,),
+                width=chart_width*inch, height=chart_height*inch,
+                after=[Spacer(1, 12)]))
+        
+        story.append(Spacer(1, 20))
+        return story
+    
+    def _create_enhanced_yield_forecast_chart(self, yield_forecast: Optional[Dict[str, Any]]) -> Optional[bytes]:
+        """Create the 5-year yield forecast graph; sample projections when there is no forecast"""
+        fig, ax = _new_figure(figsize=(10, 6))
+        
+        # Years including baseline (0-5)
+        years = [0, 1, 2, 3, 4, 5]
+        year_labels = ['Current', 'Year 1', 'Year 2', 'Year 3', 'Year 4', 'Year 5']
+        series_styles = [
+            ('high_investment', 'r-o', 'High Investment'),
+            ('medium_investment', 'g-s', 'Medium Investment'),
+            ('low_investment', 'b-^', 'Low Investment'),
+        ]
+        
         if yield_forecast:
-            
-            # Create the yield forecast graph
-            fig, ax = plt.subplots(figsize=(10, 6))
-            
-            # Years including baseline (0-5)
-            years = [0, 1, 2, 3, 4, 5]
-            year_labels = ['Current', 'Year 1', 'Year 2', 'Year 3', 'Year 4', 'Year 5']
-            
             # Get baseline yield
             baseline_yield = yield_forecast.get('baseline_yield', 0)
             # Ensure baseline_yield is numeric
@@ -7056,119 +5550,35 @@ class PDFReportGenerator:
                           label=f'Current Baseline: {baseline_yield:.1f} t/ha')
             
             # Plot lines for different investment approaches
-            if 'high_investment' in yield_forecast:
-                high_data = yield_forecast['high_investment']
-                if isinstance(high_data, list) and len(high_data) >= 6:
-                    # Old array format
-                    ax.plot(years, high_data, 'r-o', linewidth=2, label='High Investment', markersize=6)
-                elif isinstance(high_data, dict):
-                    # New range format - extract numeric values for plotting
-                    high_yields = [baseline_yield]  # Start with baseline
-                    for year in ['year_1', 'year_2', 'year_3', 'year_4', 'year_5']:
-                        if year in high_data:
-                            # Extract numeric value from range string like "25.5-27.0 t/ha"
-                            try:
-                                range_str = high_data[year]
-                                if isinstance(range_str, str) and '-' in range_str:
-                                    # Extract the first number from the range
-                                    numeric_part = range_str.split('-')[0].strip()
-                                    high_yields.append(float(numeric_part))
-                                else:
-                                    high_yields.append(float(range_str))
-                            except (ValueError, TypeError):
-                                high_yields.append(baseline_yield)
-                        else:
-                            high_yields.append(baseline_yield)
-                    ax.plot(years, high_yields, 'r-o', linewidth=2, label='High Investment', markersize=6)
-            
-            if 'medium_investment' in yield_forecast:
-                medium_data = yield_forecast['medium_investment']
-                if isinstance(medium_data, list) and len(medium_data) >= 6:
-                    # Old array format
-                    ax.plot(years, medium_data, 'g-s', linewidth=2, label='Medium Investment', markersize=6)
-                elif isinstance(medium_data, dict):
-                    # New range format - extract numeric values for plotting
-                    medium_yields = [baseline_yield]  # Start with baseline
-                    for year in ['year_1', 'year_2', 'year_3', 'year_4', 'year_5']:
-                        if year in medium_data:
-                            # Extract numeric value from range string like "25.5-27.0 t/ha"
-                            try:
-                                range_str = medium_data[year]
-                                if isinstance(range_str, str) and '-' in range_str:
-                                    # Extract the first number from the range
-                                    numeric_part = range_str.split('-')[0].strip()
-                                    medium_yields.append(float(numeric_part))
-                                else:
-                                    medium_yields.append(float(range_str))
-                            except (ValueError, TypeError):
-                                medium_yields.append(baseline_yield)
-                        else:
-                            medium_yields.append(baseline_yield)
-                    ax.plot(years, medium_yields, 'g-s', linewidth=2, label='Medium Investment', markersize=6)
-            
-            if 'low_investment' in yield_forecast:
-                low_data = yield_forecast['low_investment']
-                if isinstance(low_data, list) and len(low_data) >= 6:
+            for key, fmt, label in series_styles:
+                if key not in yield_forecast:
+                    continue
+                series_data = yield_forecast[key]
+                if isinstance(series_data, list) and len(series_data) >= 6:
                     # Old array format
-                    ax.plot(years, low_data, 'b-^', linewidth=2, label='Low Investment', markersize=6)
-                elif isinstance(low_data, dict):
+                    ax.plot(years, series_data, fmt, linewidth=2, label=label, markersize=6)
+                elif isinstance(series_data, dict):
                     # New range format - extract numeric values for plotting
-                    low_yields = [baseline_yield]  # Start with baseline
+                    yields = [baseline_yield]  # Start with baseline
                     for year in ['year_1', 'year_2', 'year_3', 'year_4', 'year_5']:
-                        if year in low_data:
+                        if year in series_data:
                             # Extract numeric value from range string like "25.5-27.0 t/ha"
                             try:
-                                range_str = low_data[year]
+                                range_str = series_data[year]
                                 if isinstance(range_str, str) and '-' in range_str:
                                     # Extract the first number from the range
                                     numeric_part = range_str.split('-')[0].strip()
-                                    low_yields.append(float(numeric_part))
+                                    yields.append(float(numeric_part))
                                 else:
-                                    low_yields.append(float(range_str))
+                                    yields.append(float(range_str))
                             except (ValueError, TypeError):
-                                low_yields.append(baseline_yield)
+                                yields.append(baseline_yield)
                         else:
-                            low_yields.append(baseline_yield)
-                    ax.plot(years, low_yields, 'b-^', linewidth=2, label='Low Investment', markersize=6)
-            
-            # Customize the graph
-            ax.set_xlabel('Years', fontsize=12, fontweight='bold')
-            ax.set_ylabel('Yield (tons/ha)', fontsize=12, fontweight='bold')
-            ax.set_title(self._t('pdf_5_year_yield_forecast_baseline', '5-Year Yield Forecast from Current Baseline'), fontsize=14, fontweight='bold')
-            ax.legend(fontsize=10)
-            ax.grid(True, alpha=0.3)
-            ax.set_xticks(years)
-            ax.set_xticklabels(year_labels)
-            
-            # Save the graph to a buffer
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-            buffer.seek(0)
-            
-            # Add the graph to the PDF - ensure it fits within content width
-            max_width = self.content_width / 72  # Convert points to inches
-            chart_width = min(5.5, max_width * 0.9)  # Use 90% of available width, max 5.5 inches
-            chart_height = chart_width * 0.6  # Maintain aspect ratio
-            story.append(Image(buffer, width=chart_width*inch, height=chart_height*inch))
-            story.append(Spacer(1, 12))
-            
-            # Add mandatory footnote
-            story.append(Paragraph("*Projections require yearly follow-up and adaptive adjustments based on actual field conditions and market changes.", self.styles['CustomBody']))
-            story.append(Spacer(1, 6))
+                            yields.append(baseline_yield)
+                    ax.plot(years, yields, fmt, linewidth=2, label=label, markersize=6)
             
-            plt.close(fig)
+            title = self._t('pdf_5_year_yield_forecast_baseline', '5-Year Yield Forecast from Current Baseline')
         else:
-            # Create a basic yield forecast graph when data is not available
-            story.append(Paragraph("Yield Projection Overview", self.styles['Heading2']))
-            story.append(Spacer(1, 8))
-            
-            # Create a basic yield forecast graph
-            fig, ax = plt.subplots(figsize=(10, 6))
-            
-            # Years including baseline (0-5)
-            years = [0, 1, 2, 3, 4, 5]
-            year_labels = ['Current', 'Year 1', 'Year 2', 'Year 3', 'Year 4', 'Year 5']
-            
             # Baseline yield (typical oil palm yield)
             baseline_yield = 15.0  # tons/ha
             
@@ -7177,42 +5587,29 @@ class PDFReportGenerator:
                       label=f'Current Baseline: {baseline_yield:.1f} t/ha')
             
             # Create sample projections
-            high_yields = [baseline_yield, 16.5, 18.2, 19.8, 21.5, 23.0]
-            medium_yields = [baseline_yield, 16.0, 17.5, 19.0, 20.2, 21.5]
-            low_yields = [baseline_yield, 15.5, 16.8, 18.0, 19.0, 20.0]
-            
-            # Plot lines for different investment approaches
-            ax.plot(years, high_yields, 'r-o', linewidth=2, label='High Investment', markersize=6)
-            ax.plot(years, medium_yields, 'g-s', linewidth=2, label='Medium Investment', markersize=6)
-            ax.plot(years, low_yields, 'b-^', linewidth=2, label='Low Investment', markersize=6)
-            
-            # Customize the graph
-            ax.set_xlabel('Years', fontsize=12, fontweight='bold')
-            ax.set_ylabel('Yield (tons/ha)', fontsize=12, fontweight='bold')
-            ax.set_title(self._t('pdf_5_year_yield_forecast_sample', '5-Year Yield Forecast - Sample Projections'), fontsize=14, fontweight='bold')
-            ax.legend(fontsize=10)
-            ax.grid(True, alpha=0.3)
-            ax.set_xticks(years)
-            ax.set_xticklabels(year_labels)
-            
-            # Save the graph to a buffer
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-            buffer.seek(0)
-            
-            # Add the graph to the PDF - ensure it fits within content width
-            max_width = self.content_width / 72  # Convert points to inches
-            chart_width = min(5.5, max_width * 0.9)  # Use 90% of available width, max 5.5 inches
-            chart_height = chart_width * 0.6  # Maintain aspect ratio
-            story.append(Image(buffer, width=chart_width*inch, height=chart_height*inch))
-            story.append(Spacer(1, 12))
-            
-            # Assumptions section removed as requested
+            sample_yields = [
+                [baseline_yield, 16.5, 18.2, 19.8, 21.5, 23.0],
+                [baseline_yield, 16.0, 17.5, 19.0, 20.2, 21.5],
+                [baseline_yield, 15.5, 16.8, 18.0, 19.0, 20.0],
+            ]
+            for (_, fmt, label), yields in zip(series_styles, sample_yields):
+                ax.plot(years, yields, fmt, linewidth=2, label=label, markersize=6)
             
-            plt.close(fig)
+            title = self._t('pdf_5_year_yield_forecast_sample', '5-Year Yield Forecast - Sample Projections')
         
-        story.append(Spacer(1, 20))
-        return story
+        # Customize the graph
+        ax.set_xlabel('Years', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Yield (tons/ha)', fontsize=12, fontweight='bold')
+        ax.set_title(title, fontsize=14, fontweight='bold')
+        ax.legend(fontsize=10)
+        ax.grid(True, alpha=0.3)
+        ax.set_xticks(years)
+        ax.set_xticklabels(year_labels)
+        
+        # Save the graph to a buffer
+        buffer = io.BytesIO()
+        self._save_chart(fig, buffer, dpi=300)
+        return buffer.getvalue()
     
     def _create_enhanced_conclusion(self, analysis_data: Dict[str, Any]) -> List:
         """Create enhanced detailed conclusion section"""
@@ -7497,33 +5894,6 @@ class PDFReportGenerator:
         try:
             logger.info("🔍 Starting robust soil data extraction for PDF")
             
-            # Same comprehensive parameter mapping as results page
-            soil_parameter_mappings = {
-                'ph': 'pH', 'pH': 'pH', 'soil_ph': 'pH', 'soil_p_h': 'pH',
-                'p_h': 'pH', 'soil_ph_value': 'pH', 'ph_value': 'pH',
-                'n': 'N (%)', 'nitrogen': 'N (%)', 'n_percent': 'N (%)', 'n_%': 'N (%)',
-                'soil_n': 'N (%)', 'soil_nitrogen': 'N (%)', 'nitrogen_percent': 'N (%)',
-                'org_c': 'Org. C (%)', 'organic_carbon': 'Org. C (%)', 'org_carbon': 'Org. C (%)',
-                'organic_c': 'Org. C (%)', 'soil_organic_carbon': 'Org. C (%)', 'oc': 'Org. C (%)',
-                'soil_oc': 'Org. C (%)', 'carbon': 'Org. C (%)', 'soil_carbon': 'Org. C (%)',
-                'total_p': 'Total P (mg/kg)', 'total_phosphorus': 'Total P (mg/kg)', 'tp': 'Total P (mg/kg)',
-                'soil_total_p': 'Total P (mg/kg)', 'total_p_mg_kg': 'Total P (mg/kg)', 'p_total': 'Total P (mg/kg)',
-                'avail_p': 'Avail P (mg/kg)', 'available_p': 'Avail P (mg/kg)', 'ap': 'Avail P (mg/kg)',
-                'soil_avail_p': 'Avail P (mg/kg)', 'available_phosphorus': 'Avail P (mg/kg)', 'p_available': 'Avail P (mg/kg)',
-                'avail_p_mg_kg': 'Avail P (mg/kg)', 'p_avail': 'Avail P (mg/kg)',
-                'exch_k': 'Exch. K (meq%)', 'exchangeable_k': 'Exch. K (meq%)', 'ek': 'Exch. K (meq%)',
-                'soil_exch_k': 'Exch. K (meq%)', 'k_exchangeable': 'Exch. K (meq%)', 'exch_k_meq': 'Exch. K (meq%)',
-                'k_exch': 'Exch. K (meq%)', 'exchangeable_potassium': 'Exch. K (meq%)',
-                'exch_ca': 'Exch. Ca (meq%)', 'exchangeable_ca': 'Exch. Ca (meq%)', 'eca': 'Exch. Ca (meq%)',
-                'soil_exch_ca': 'Exch. Ca (meq%)', 'ca_exchangeable': 'Exch. Ca (meq%)', 'exch_ca_meq': 'Exch. Ca (meq%)',
-                'ca_exch': 'Exch. Ca (meq%)', 'exchangeable_calcium': 'Exch. Ca (meq%)',
-                'exch_mg': 'Exch. Mg (meq%)', 'exchangeable_mg': 'Exch. Mg (meq%)', 'emg': 'Exch. Mg (meq%)',
-                'soil_exch_mg': 'Exch. Mg (meq%)', 'mg_exchangeable': 'Exch. Mg (meq%)', 'exch_mg_meq': 'Exch. Mg (meq%)',
-                'mg_exch': 'Exch. Mg (meq%)', 'exchangeable_magnesium': 'Exch. Mg (meq%)',
-                'cec': 'CEC (meq%)', 'cation_exchange_capacity': 'CEC (meq%)', 'cec_meq': 'CEC (meq%)',
-                'soil_cec': 'CEC (meq%)', 'exchange_capacity': 'CEC (meq%)', 'c_e_c': 'CEC (meq%)'
-            }
-            
             # Same search locations as results page
             search_locations = [
                 'raw_data.soil_parameters',
@@ -7584,25 +5954,11 @@ class PDFReportGenerator:
                 logger.warning("❌ No valid parameter statistics found")
                 return None
                 
-            # Apply robust parameter mapping
+            # Resolve each parameter key to its canonical ID once
+            key_map = parameter_standardizer.resolve_columns(param_stats.keys(), 'soil')
             mapped_params = {}
             for param_key, param_data in param_stats.items():
-                normalized_key = param_key.lower().strip().replace(' ', '_').replace('(', '').replace(')', '').replace('%', '').replace('.', '')
-                
-                mapped_name = soil_parameter_mappings.get(normalized_key)
-                if mapped_name:
-                    mapped_params[mapped_name] = param_data
-                    logger.info(f"✅ PDF Mapped {param_key} -> {mapped_name}")
-                else:
-                    # Try partial matching
-                    for mapping_key, mapping_value in soil_parameter_mappings.items():
-                        if mapping_key in normalized_key or normalized_key in mapping_key:
-                            mapped_params[mapping_value] = param_data
-                            logger.info(f"✅ PDF Partial mapped {param_key} -> {mapping_value}")
-                            break
-                    else:
-                        mapped_params[param_key] = param_data
-                        logger.info(f"⚠️ PDF No mapping found for {param_key}, keeping original")
+                mapped_params[key_map[param_key] or param_key] = param_data
             
             logger.info(f"🎯 PDF Robust soil data extraction complete: {len(mapped_params)} parameters")
             return {
@@ -7620,26 +5976,6 @@ class PDFReportGenerator:
         try:
             logger.info("🔍 Starting robust leaf data extraction for PDF")
             
-            # Same comprehensive parameter mapping as results page
-            leaf_parameter_mappings = {
-                'n': 'N (%)', 'nitrogen': 'N (%)', 'n_percent': 'N (%)', 'n_%': 'N (%)',
-                'leaf_n': 'N (%)', 'leaf_nitrogen': 'N (%)', 'nitrogen_percent': 'N (%)',
-                'p': 'P (%)', 'phosphorus': 'P (%)', 'p_percent': 'P (%)', 'p_%': 'P (%)',
-                'leaf_p': 'P (%)', 'leaf_phosphorus': 'P (%)', 'phosphorus_percent': 'P (%)',
-                'k': 'K (%)', 'potassium': 'K (%)', 'k_percent': 'K (%)', 'k_%': 'K (%)',
-                'leaf_k': 'K (%)', 'leaf_potassium': 'K (%)', 'potassium_percent': 'K (%)',
-                'mg': 'Mg (%)', 'magnesium': 'Mg (%)', 'mg_percent': 'Mg (%)', 'mg_%': 'Mg (%)',
-                'leaf_mg': 'Mg (%)', 'leaf_magnesium': 'Mg (%)', 'magnesium_percent': 'Mg (%)',
-                'ca': 'Ca (%)', 'calcium': 'Ca (%)', 'ca_percent': 'Ca (%)', 'ca_%': 'Ca (%)',
-                'leaf_ca': 'Ca (%)', 'leaf_calcium': 'Ca (%)', 'calcium_percent': 'Ca (%)',
-                'b': 'B (mg/kg)', 'boron': 'B (mg/kg)', 'b_mg_kg': 'B (mg/kg)', 'b_mg/kg': 'B (mg/kg)',
-                'leaf_b': 'B (mg/kg)', 'leaf_boron': 'B (mg/kg)', 'boron_mg_kg': 'B (mg/kg)',
-                'cu': 'Cu (mg/kg)', 'copper': 'Cu (mg/kg)', 'cu_mg_kg': 'Cu (mg/kg)', 'cu_mg/kg': 'Cu (mg/kg)',
-                'leaf_cu': 'Cu (mg/kg)', 'leaf_copper': 'Cu (mg/kg)', 'copper_mg_kg': 'Cu (mg/kg)',
-                'zn': 'Zn (mg/kg)', 'zinc': 'Zn (mg/kg)', 'zn_mg_kg': 'Zn (mg/kg)', 'zn_mg/kg': 'Zn (mg/kg)',
-                'leaf_zn': 'Zn (mg/kg)', 'leaf_zinc': 'Zn (mg/kg)', 'zinc_mg_kg': 'Zn (mg/kg)'
-            }
-            
             # Same search locations as results page
             search_locations = [
                 'raw_data.leaf_parameters',
@@ -7700,25 +6036,11 @@ class PDFReportGenerator:
                 logger.warning("❌ No valid parameter statistics found")
                 return None
                 
-            # Apply robust parameter mapping
+            # Resolve each parameter key to its canonical ID once
+            key_map = parameter_standardizer.resolve_columns(param_stats.keys(), 'leaf')
             mapped_params = {}
             for param_key, param_data in param_stats.items():
-                normalized_key = param_key.lower().strip().replace(' ', '_').replace('(', '').replace(')', '').replace('%', '').replace('.', '')
-                
-                mapped_name = leaf_parameter_mappings.get(normalized_key)
-                if mapped_name:
-                    mapped_params[mapped_name] = param_data
-                    logger.info(f"✅ PDF Mapped {param_key} -> {mapped_name}")
-                else:
-                    # Try partial matching
-                    for mapping_key, mapping_value in leaf_parameter_mappings.items():
-                        if mapping_key in normalized_key or normalized_key in mapping_key:
-                            mapped_params[mapping_value] = param_data
-                            logger.info(f"✅ PDF Partial mapped {param_key} -> {mapping_value}")
-                            break
-                    else:
-                        mapped_params[param_key] = param_data
-                        logger.info(f"⚠️ PDF No mapping found for {param_key}, keeping original")
+                mapped_params[key_map[param_key] or param_key] = param_data
             
             logger.info(f"🎯 PDF Robust leaf data extraction complete: {len(mapped_params)} parameters")
             return {
@@ -7795,13 +6117,9 @@ class PDFReportGenerator:
 
         return visualizations
 
-    def _create_chart_image_for_pdf(self, viz_data: Dict[str, Any], viz_type: str, title: str) -> Optional[Image]:
-        """Create chart image for PDF from visualization data"""
+    def _create_chart_image_for_pdf(self, viz_data: Dict[str, Any], viz_type: str, title: str) -> Optional[bytes]:
+        """Create chart PNG for PDF from visualization data"""
         try:
-            # Clear any existing figures
-            plt.clf()
-            plt.close('all')
-            
             # Create chart based on type
             if 'yield' in title.lower() and 'forecast' in title.lower():
                 return self._create_yield_forecast_chart_for_pdf(viz_data, title)
@@ -7813,7 +6131,7 @@ class PDFReportGenerator:
                 return self._create_leaf_nutrient_status_chart_for_pdf(viz_data)
             else:
                 # Create a simple placeholder chart for other types
-                fig, ax = plt.subplots(figsize=(8, 6))
+                fig, ax = _new_figure(figsize=(8, 6))
                 ax.text(0.5, 0.5, f'Chart: {title}\nType: {viz_type}',
                        transform=ax.transAxes, ha='center', va='center', fontsize=14)
                 ax.set_title(title)
@@ -7822,8 +6140,7 @@ class PDFReportGenerator:
             # Save to buffer
             from io import BytesIO
             buffer = BytesIO()
-            fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-            plt.close(fig)
+            self._save_chart(fig, buffer, dpi=150)
             
             # Get buffer data and reset position
             buffer_data = buffer.getvalue()
@@ -7833,24 +6150,15 @@ class PDFReportGenerator:
             if not buffer_data or len(buffer_data) == 0:
                 logger.warning(f"Empty buffer for chart: {title}")
                 return None
-                
-            # Create new buffer with the data
-            image_buffer = BytesIO(buffer_data)
-            
-            # Create reportlab Image with proper error handling
-            try:
-                chart_image = Image(image_buffer, width=6*inch, height=4*inch)
-                logger.info(f"Successfully created chart image for: {title}")
-                return chart_image
-            except Exception as img_error:
-                logger.error(f"Error creating Image object for {title}: {str(img_error)}")
-                return None
+
+            logger.info(f"Successfully created chart image for: {title}")
+            return buffer_data
 
         except Exception as e:
             logger.error(f"Error creating chart image for PDF: {str(e)}")
             return None
 
-    def _create_accurate_yield_forecast_chart_for_pdf(self, analysis_data: Dict[str, Any]) -> Optional[Image]:
+    def _create_accurate_yield_forecast_chart_for_pdf(self, analysis_data: Dict[str, Any]) -> Optional[bytes]:
         """Create accurate 5-Year Yield Forecast chart for PDF - EXACT COPY OF RESULTS PAGE LOGIC"""
         try:
             # EXACT SAME LOGIC AS RESULTS PAGE - Check for yield forecast data in multiple possible locations
@@ -7958,7 +6266,7 @@ class PDFReportGenerator:
                 logger.error(f"❌ Error extracting baseline yield: {str(e)}")
                 baseline_yield = 22.0  # Default fallback
             
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig, ax = _new_figure(figsize=(10, 6))
             
             # Years including baseline (0-5) - EXACT SAME AS RESULTS PAGE
             years = list(range(0, 6))
@@ -8119,15 +6427,14 @@ class PDFReportGenerator:
             ax.set_xticklabels(year_labels)
             
             # Mandatory footnote
-            plt.figtext(0.5, -0.05, "Projections assume continued yearly intervention with recommended nutrient management and stable market conditions.", ha='center', fontsize=8)
-            plt.tight_layout()
+            fig.text(0.5, -0.05, "Projections assume continued yearly intervention with recommended nutrient management and stable market conditions.", ha='center', fontsize=8)
+            fig.tight_layout()
 
             # Save to buffer with error handling
             try:
                 from io import BytesIO
                 buffer = BytesIO()
-                fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-                plt.close(fig)
+                self._save_chart(fig, buffer, dpi=150)
 
                 # Validate buffer data
                 buffer_data = buffer.getvalue()
@@ -8135,16 +6442,11 @@ class PDFReportGenerator:
                     logger.error("❌ Buffer is empty after saving chart")
                     return None
 
-                # Create reportlab Image with error handling
-                image_buffer = BytesIO(buffer_data)
-                chart_image = Image(image_buffer, width=6*inch, height=4*inch)
-
                 logger.info(f"✅ Successfully created dynamic yield forecast chart for PDF with baseline: {baseline_yield:.1f}")
-                return chart_image
+                return buffer_data
 
             except Exception as e:
                 logger.error(f"❌ Error saving chart to buffer: {str(e)}")
-                plt.close(fig)
                 return None
 
         except Exception as e:
@@ -8194,7 +6496,7 @@ class PDFReportGenerator:
                 fallback_values.append(baseline_yield * (1 + improvement))
         return fallback_values
 
-    def _create_yield_forecast_chart_for_pdf(self, viz_data: Dict[str, Any], title: str) -> Optional[Image]:
+    def _create_yield_forecast_chart_for_pdf(self, viz_data: Dict[str, Any], title: str) -> Optional[bytes]:
         """Create yield forecast chart for PDF (legacy method)"""
         try:
             # Extract yield forecast data from analysis_data
@@ -8203,7 +6505,7 @@ class PDFReportGenerator:
                 logger.warning("No yield forecast data available")
                 return None
 
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig, ax = _new_figure(figsize=(10, 6))
             
             years = list(range(1, 6))  # Year 1 to Year 5
             
@@ -8250,25 +6552,19 @@ class PDFReportGenerator:
             # Save to buffer
             from io import BytesIO
             buffer = BytesIO()
-            fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-            plt.close(fig)
-            
-            # Create reportlab Image
-            buffer_data = buffer.getvalue()
-            image_buffer = BytesIO(buffer_data)
-            chart_image = Image(image_buffer, width=6*inch, height=4*inch)
+            self._save_chart(fig, buffer, dpi=150)
             
             logger.info(f"Successfully created yield forecast chart for PDF")
-            return chart_image
+            return buffer.getvalue()
             
         except Exception as e:
             logger.error(f"Error creating yield forecast chart for PDF: {str(e)}")
             return None
             
-    def _create_nutrient_gap_chart_for_pdf(self, viz_data: Dict[str, Any], title: str) -> Optional[Image]:
+    def _create_nutrient_gap_chart_for_pdf(self, viz_data: Dict[str, Any], title: str) -> Optional[bytes]:
         """Create nutrient gap chart for PDF"""
         try:
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig, ax = _new_figure(figsize=(10, 6))
             
             # Create a simple bar chart showing nutrient gaps
             nutrients = ['N', 'P', 'K', 'Ca', 'Mg']
@@ -8289,22 +6585,16 @@ class PDFReportGenerator:
             # Save to buffer
             from io import BytesIO
             buffer = BytesIO()
-            fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-            plt.close(fig)
-            
-            # Create reportlab Image
-            buffer_data = buffer.getvalue()
-            image_buffer = BytesIO(buffer_data)
-            chart_image = Image(image_buffer, width=6*inch, height=4*inch)
+            self._save_chart(fig, buffer, dpi=150)
             
             logger.info(f"Successfully created nutrient gap chart for PDF")
-            return chart_image
+            return buffer.getvalue()
         
         except Exception as e:
             logger.error(f"Error creating nutrient gap chart for PDF: {str(e)}")
             return None
         
-    def _create_soil_nutrient_status_chart_for_pdf(self, analysis_data: Dict[str, Any]) -> Optional[Image]:
+    def _create_soil_nutrient_status_chart_for_pdf(self, analysis_data: Dict[str, Any]) -> Optional[bytes]:
         """Create soil nutrient status chart for PDF - individual bar charts for each parameter"""
         try:
             logger.info("🌱 Starting soil nutrient chart creation for PDF")
@@ -8747,21 +7037,11 @@ class PDFReportGenerator:
                 logger.info("⏭️ No soil data available - skipping chart creation")
                 return None
             
-            # EXACT MPOB standards from results page
-            soil_mpob_standards = {
-                'pH': (4.5, 6.0),
-                'N (%)': (0.15, 0.25),
-                'Org. C (%)': (2.0, 4.0),
-                'Total P (mg/kg)': (20, 50),
-                'Avail P (mg/kg)': (20, 50),
-                'Exch. K (meq%)': (0.15, 0.30),
-                'Exch. Ca (meq%)': (3.0, 6.0),
-                'Exch. Mg (meq%)': (0.4, 0.8),
-                'CEC (meq%)': (12.0, 25.0)
-            }
+            # MPOB standards from the standards registry (admin overrides included)
+            soil_mpob_standards = standards_registry.status_ranges('soil')
             
             # Create individual bar charts for each parameter - 3x3 grid layout
-            fig, axes = plt.subplots(3, 3, figsize=(15, 12))
+            fig, axes = _new_figure(3, 3, figsize=(15, 12))
             fig.suptitle('🌱 Soil Nutrient Status (Average vs. MPOB Standard)', fontsize=16, fontweight='bold')
             fig.text(0.5, 0.02, 'REAL values from your current data - Observed (Average) vs Recommended (MPOB)', ha='center', fontsize=12, style='italic')
             
@@ -8831,27 +7111,21 @@ class PDFReportGenerator:
             for i in range(len(actual_soil_data), 9):
                 axes_flat[i].set_visible(False)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Save to buffer
             from io import BytesIO
             buffer = BytesIO()
-            fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-            plt.close(fig)
-            
-            # Create reportlab Image
-            buffer_data = buffer.getvalue()
-            image_buffer = BytesIO(buffer_data)
-            chart_image = Image(image_buffer, width=6*inch, height=4*inch)
+            self._save_chart(fig, buffer, dpi=150)
             
             logger.info(f"Successfully created individual soil nutrient status charts for PDF")
-            return chart_image
+            return buffer.getvalue()
             
         except Exception as e:
             logger.error(f"Error creating soil nutrient status chart for PDF: {str(e)}")
             return None
 
-    def _create_leaf_nutrient_status_chart_for_pdf(self, analysis_data: Dict[str, Any]) -> Optional[Image]:
+    def _create_leaf_nutrient_status_chart_for_pdf(self, analysis_data: Dict[str, Any]) -> Optional[bytes]:
         """Create leaf nutrient status chart for PDF - individual bar charts for each parameter"""
         try:
             logger.info("🍃 Starting leaf nutrient chart creation for PDF")
@@ -9310,20 +7584,11 @@ class PDFReportGenerator:
                 logger.info("⏭️ No leaf data available - skipping chart creation")
                 return None
             
-            # EXACT MPOB standards from results page
-            leaf_mpob_standards = {
-                'N (%)': (2.4, 2.8),
-                'P (%)': (0.16, 0.22),
-                'K (%)': (1.0, 1.3),
-                'Mg (%)': (0.28, 0.38),
-                'Ca (%)': (0.5, 0.7),
-                'B (mg/kg)': (18, 28),
-                'Cu (mg/kg)': (6.0, 10.0),
-                'Zn (mg/kg)': (15, 25)
-            }
+            # MPOB standards from the standards registry (admin overrides included)
+            leaf_mpob_standards = standards_registry.status_ranges('leaf')
             
             # Create individual bar charts for each parameter - 2x4 grid layout (8 parameters)
-            fig, axes = plt.subplots(2, 4, figsize=(16, 8))
+            fig, axes = _new_figure(2, 4, figsize=(16, 8))
             fig.suptitle('🍃 Leaf Nutrient Status (Average vs. MPOB Standard)', fontsize=16, fontweight='bold')
             fig.text(0.5, 0.02, 'REAL values from your current data - Observed (Average) vs Recommended (MPOB)', ha='center', fontsize=12, style='italic')
             
@@ -9392,21 +7657,15 @@ class PDFReportGenerator:
             for i in range(len(actual_leaf_data), 8):
                 axes_flat[i].set_visible(False)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Save to buffer
             from io import BytesIO
             buffer = BytesIO()
-            fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-            plt.close(fig)
-            
-            # Create reportlab Image
-            buffer_data = buffer.getvalue()
-            image_buffer = BytesIO(buffer_data)
-            chart_image = Image(image_buffer, width=6*inch, height=4*inch)
+            self._save_chart(fig, buffer, dpi=150)
             
             logger.info(f"Successfully created individual leaf nutrient status charts for PDF")
-            return chart_image
+            return buffer.getvalue()
             
         except Exception as e:
             logger.error(f"Error creating leaf nutrient status chart for PDF: {str(e)}")
@@ -9664,6 +7923,19 @@ class PDFReportGenerator:
             logger.error(f"Error creating top-level data tables: {str(e)}")
         return story
 
+def generate_pdf_report_file(analysis_data: Dict[str, Any], metadata: Dict[str, Any],
+                            options: Optional[Dict[str, Any]] = None,
+                            output: Optional[BinaryIO] = None) -> BinaryIO:
+    """Generate a PDF report into a stream (a spooled temporary file by default), rewound for reading"""
+    if options is None:
+        options = {
+            'include_economic': True,
+            'include_forecast': True,
+            'include_charts': True
+        }
+    return PDFReportGenerator().generate_report_file(analysis_data, metadata, options, output=output)
+
+
 def generate_pdf_report(analysis_data: Dict[str, Any], metadata: Dict[str, Any], 
                        options: Optional[Dict[str, Any]] = None) -> bytes:
     """Main function to generate PDF report"""
@@ -0,0 +1,230 @@
+"""
+Sample Table
+Columnar store for soil and leaf samples: a samples x parameters float64
+matrix with a missing-value mask and sample/lab number index arrays, so
+per-parameter statistics are computed for all columns in one vectorized pass.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _to_float(value: Any, numeric_only: bool = False) -> float:
+    """Convert a sample value to float, returning NaN for missing or unparseable values"""
+    if value is None:
+        return np.nan
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    if numeric_only:
+        return np.nan
+    try:
+        return float(str(value).strip())
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class ParameterStatistics(dict):
+    """Statistics of one parameter column, behaving as a plain dict.
+
+    The scalar statistics are stored up front; the per-sample ``values`` and
+    ``samples`` lists are built from the owning table the first time they
+    are read, iterated or serialized.
+    """
+
+    LAZY_KEYS = ('values', 'samples')
+
+    def __init__(self, table: 'SampleTable', column: int, statistics: Dict[str, Any]):
+        super().__init__(statistics)
+        self._table = table
+        self._column = column
+
+    def _materialize(self):
+        if self._table is not None:
+            table, self._table = self._table, None
+            dict.__setitem__(self, 'values', table.column_values(self._column))
+            dict.__setitem__(self, 'samples', table.column_samples(self._column))
+
+    def __getitem__(self, key):
+        if key in self.LAZY_KEYS:
+            self._materialize()
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if key in self.LAZY_KEYS:
+            self._materialize()
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        return (self._table is not None and key in self.LAZY_KEYS) or dict.__contains__(self, key)
+
+    def __len__(self):
+        return dict.__len__(self) + (len(self.LAZY_KEYS) if self._table is not None else 0)
+
+    def __iter__(self):
+        self._materialize()
+        return dict.__iter__(self)
+
+    def keys(self):
+        self._materialize()
+        return dict.keys(self)
+
+    def values(self):
+        self._materialize()
+        return dict.values(self)
+
+    def items(self):
+        self._materialize()
+        return dict.items(self)
+
+    def copy(self) -> Dict[str, Any]:
+        self._materialize()
+        return dict(dict.items(self))
+
+    def __setitem__(self, key, value):
+        self._materialize()
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._materialize()
+        dict.__delitem__(self, key)
+
+    def pop(self, key, *default):
+        self._materialize()
+        return dict.pop(self, key, *default)
+
+    def setdefault(self, key, default=None):
+        self._materialize()
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        self._materialize()
+        dict.update(self, *args, **kwargs)
+
+    def __eq__(self, other):
+        self._materialize()
+        return dict.__eq__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        self._materialize()
+        return dict.__repr__(self)
+
+    def __reduce_ex__(self, protocol):
+        # Pickle and deepcopy as a plain dict rather than dragging the table along
+        return dict, (self.copy(),)
+
+
+class SampleTable:
+    """Samples x parameters float64 matrix with a NaN missing-value mask"""
+
+    def __init__(self, parameters: Sequence[str], values: np.ndarray,
+                 sample_no: np.ndarray, lab_no: np.ndarray):
+        self.parameters = list(parameters)
+        self.values = values
+        self.mask = ~np.isnan(values)
+        self.sample_no = sample_no
+        self.lab_no = lab_no
+        self._columns = {parameter: i for i, parameter in enumerate(self.parameters)}
+
+    @classmethod
+    def from_samples(cls, samples: Sequence[Any], parameters: Sequence[str],
+                     numeric_only: bool = False) -> 'SampleTable':
+        """Build a table from sample dicts in a single pass.
+
+        Args:
+            samples: Sample dictionaries keyed by parameter name
+            parameters: Parameter names that become the table columns
+            numeric_only: Treat non-numeric values (including numeric strings) as missing
+
+        Returns:
+            SampleTable with one row per sample
+        """
+        count = len(samples)
+        values = np.full((count, len(parameters)), np.nan)
+        sample_no = np.full(count, 'N/A', dtype=object)
+        lab_no = np.full(count, 'N/A', dtype=object)
+
+        for i, sample in enumerate(samples):
+            if not isinstance(sample, dict):
+                continue
+            sample_no[i] = sample.get('sample_no', 'N/A')
+            lab_no[i] = sample.get('lab_no', 'N/A')
+            values[i] = [_to_float(sample.get(parameter), numeric_only) for parameter in parameters]
+
+        return cls(parameters, values, sample_no, lab_no)
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def column(self, parameter: str) -> np.ndarray:
+        """Return the values of one parameter (NaN where missing)"""
+        return self.values[:, self._columns[parameter]]
+
+    def column_values(self, column: int) -> List[float]:
+        """Present values of a column in sample order"""
+        return self.values[self.mask[:, column], column].tolist()
+
+    def column_samples(self, column: int) -> List[Dict[str, Any]]:
+        """Per-sample records of the present values of a column"""
+        rows = self.mask[:, column]
+        return [
+            {'sample_no': sample_no, 'lab_no': lab_no, 'value': value}
+            for sample_no, lab_no, value in zip(
+                self.sample_no[rows].tolist(), self.lab_no[rows].tolist(), self.values[rows, column].tolist()
+            )
+        ]
+
+    def means(self, valid: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Column means over the cells selected by ``valid`` (default: all present cells).
+
+        Returns:
+            Tuple of (means, counts); means are NaN for columns with no valid cells
+        """
+        valid = self.mask if valid is None else valid & self.mask
+        counts = valid.sum(axis=0)
+        sums = np.where(valid, self.values, 0.0).sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return sums / counts, counts
+
+    def statistics(self) -> Dict[str, np.ndarray]:
+        """Count, mean, min, max and sample standard deviation (n-1) of every column"""
+        mean, count = self.means()
+        present = self.mask
+        deviations = np.where(present, self.values - np.nan_to_num(mean), 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = np.where(count > 1, (deviations ** 2).sum(axis=0) / (count - 1), 0.0)
+        return {
+            'count': count,
+            'mean': mean,
+            'min': np.where(present, self.values, np.inf).min(axis=0, initial=np.inf),
+            'max': np.where(present, self.values, -np.inf).max(axis=0, initial=-np.inf),
+            'std_dev': np.sqrt(variance)
+        }
+
+    def parameter_statistics(self, total_samples: Optional[int] = None) -> Dict[str, ParameterStatistics]:
+        """Per-parameter statistics dicts for every column with at least one value.
+
+        Args:
+            total_samples: Sample count used for ``missing_count`` (defaults to the table length)
+        """
+        total_samples = len(self) if total_samples is None else total_samples
+        stats = self.statistics()
+        parameter_stats = {}
+        for j, parameter in enumerate(self.parameters):
+            count = int(stats['count'][j])
+            if not count:
+                continue
+            parameter_stats[parameter] = ParameterStatistics(self, j, {
+                'average': float(stats['mean'][j]),
+                'min': float(stats['min'][j]),
+                'max': float(stats['max'][j]),
+                'std_dev': float(stats['std_dev'][j]),
+                'count': count,
+                'missing_count': int(total_samples - count)
+            })
+        return parameter_stats
@@ -0,0 +1,81 @@
+"""
+Section Cache
+Flowables of rendered PDF report sections, keyed by section name, a hash of
+the section inputs, the language and the options the section reads. Reports
+are assembled from cached sections whose key still matches, so toggling one
+section or switching language rebuilds only what changed. Entries live in an
+in-process LRU and are handed out as deep copies, because ReportLab flowables
+keep layout state from the document they were last built into.
+"""
+
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+try:
+    from utils.stage_cache import fingerprint
+except ImportError:
+    from stage_cache import fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Bump when section layout code changes so stale flowables are not reused
+SECTION_CACHE_FORMAT = 1
+
+DEFAULT_MAX_ENTRIES = 128
+
+
+def section_key(section: str, inputs_hash: str, language: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """Cache key for one section: name, input hash, language and the options it reads"""
+    return fingerprint(SECTION_CACHE_FORMAT, section, inputs_hash, language, options or {})
+
+
+class SectionCache:
+    """In-process LRU of section flowable lists"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, List]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[List]:
+        """A private copy of the cached flowables for a key, or None"""
+        with self._lock:
+            flowables = self._entries.get(key)
+            if flowables is not None:
+                self._entries.move_to_end(key)
+        if flowables is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return copy.deepcopy(flowables)
+
+    def put(self, key: str, flowables: List):
+        """Store a private copy of freshly built flowables (the caller keeps the originals)"""
+        try:
+            flowables = copy.deepcopy(flowables)
+        except Exception as e:
+            logger.warning(f"Section flowables could not be copied, not caching: {str(e)}")
+            return
+        with self._lock:
+            self._entries[key] = flowables
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+
+# Global section cache instance
+section_cache = SectionCache()
@@ -0,0 +1,209 @@
+"""
+Stage Cache
+Memoization for the deterministic analysis stages (data quality, cross
+validation, standards comparison, recommendations, economic forecast).
+Results are keyed by a stable hash of the canonicalized stage inputs plus the
+standards/config version, kept in an in-process LRU and, when
+CROPDRIVE_STAGE_CACHE_DIR is set, in a pickle-per-entry disk tier shared
+across processes and restarts.
+"""
+
+import copy
+import functools
+import hashlib
+import json
+import logging
+import math
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when a memoized stage changes its output so stale disk entries are ignored
+STAGE_CACHE_FORMAT = 2
+
+DEFAULT_MAX_ENTRIES = 256
+DISK_CACHE_ENV = 'CROPDRIVE_STAGE_CACHE_DIR'
+
+_MISSING = object()
+
+
+def _canonicalize(value: Any) -> Any:
+    """Convert a stage input into a JSON-serializable value with a stable ordering"""
+    if isinstance(value, dict):
+        return {str(key): _canonicalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonicalize(item) for item in value), key=repr)
+    if isinstance(value, np.ndarray):
+        return _canonicalize(value.tolist())
+    if isinstance(value, np.generic):
+        return _canonicalize(value.item())
+    if isinstance(value, float):
+        return value if math.isfinite(value) else repr(value)
+    if value is None or isinstance(value, (str, int, bool)):
+        return value
+    if is_dataclass(value) and not isinstance(value, type):
+        return _canonicalize(asdict(value))
+    if isinstance(value, (datetime, date)):
+        # Same form as stored in Firestore, so session and stored copies hash alike
+        return value.isoformat()
+    return repr(value)
+
+
+def _json_default(value: Any) -> Any:
+    """Encode the non-JSON leaves met by the fast path"""
+    if isinstance(value, (np.ndarray, np.generic, set, frozenset, datetime, date)) or is_dataclass(value):
+        return _canonicalize(value)
+    return repr(value)
+
+
+def fingerprint(*values: Any) -> str:
+    """Stable hex digest of any combination of dicts, lists, arrays and scalars"""
+    try:
+        # Fast path: the C encoder handles plain dicts, lists and scalars directly
+        payload = json.dumps(values, sort_keys=True, separators=(',', ':'), ensure_ascii=False,
+                             default=_json_default)
+    except (TypeError, ValueError):
+        # Mixed or non-string dict keys that cannot be sorted as-is
+        payload = json.dumps(_canonicalize(values), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=20).hexdigest()
+
+
+def config_version() -> str:
+    """Version of everything the stages read besides their arguments: standards and economic config"""
+    try:
+        from utils.standards_registry import standards_registry
+        from utils.config_manager import get_economic_config
+    except ImportError:
+        from standards_registry import standards_registry
+        from config_manager import get_economic_config
+    return f"{STAGE_CACHE_FORMAT}:{standards_registry.version}:{fingerprint(get_economic_config())[:12]}"
+
+
+class StageCache:
+    """In-process LRU of stage results with an optional disk tier"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, disk_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._entries: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _disk_path(self, stage: str, key: str) -> Optional[str]:
+        if not self.disk_dir:
+            return None
+        return os.path.join(self.disk_dir, stage, f"{key}.pkl")
+
+    def _load_disk(self, stage: str, key: str) -> Any:
+        path = self._disk_path(stage, key)
+        if not path or not os.path.exists(path):
+            return _MISSING
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable stage cache entry {path}: {str(e)}")
+            return _MISSING
+
+    def _store_disk(self, stage: str, key: str, value: Any):
+        path = self._disk_path(stage, key)
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not write stage cache entry for {stage}: {str(e)}")
+
+    def get(self, stage: str, key: str) -> Any:
+        """Cached result of a stage (a private copy), or the _MISSING sentinel"""
+        entry_key = f"{stage}:{key}"
+        with self._lock:
+            value = self._entries.get(entry_key, _MISSING)
+            if value is not _MISSING:
+                self._entries.move_to_end(entry_key)
+
+        if value is _MISSING:
+            value = self._load_disk(stage, key)
+            if value is not _MISSING:
+                self._remember(entry_key, value)
+
+        if value is _MISSING:
+            self.misses += 1
+            return _MISSING
+        self.hits += 1
+        return copy.deepcopy(value)
+
+    def put(self, stage: str, key: str, value: Any):
+        """Store a private copy of a stage result in memory and on disk"""
+        value = copy.deepcopy(value)
+        self._remember(f"{stage}:{key}", value)
+        self._store_disk(stage, key, value)
+
+    def _remember(self, entry_key: str, value: Any):
+        with self._lock:
+            self._entries[entry_key] = value
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def call(self, stage: str, function: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+        """Return the memoized result of function(*args, **kwargs), computing it on a miss"""
+        try:
+            key = fingerprint(config_version(), args, kwargs)
+        except Exception as e:
+            logger.warning(f"Stage {stage} inputs could not be fingerprinted, computing directly: {str(e)}")
+            return function(*args, **kwargs)
+
+        cached = self.get(stage, key)
+        if cached is not _MISSING:
+            logger.debug(f"Stage cache hit for {stage}")
+            return cached
+
+        result = function(*args, **kwargs)
+        self.put(stage, key, result)
+        return result
+
+    def clear(self, disk: bool = False):
+        """Drop all in-memory entries (and the disk tier when disk=True)"""
+        with self._lock:
+            self._entries.clear()
+        if disk and self.disk_dir and os.path.isdir(self.disk_dir):
+            for root, _, files in os.walk(self.disk_dir):
+                for name in files:
+                    if name.endswith('.pkl'):
+                        os.remove(os.path.join(root, name))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries),
+                'disk_dir': self.disk_dir}
+
+
+# Global stage cache instance
+stage_cache = StageCache(disk_dir=os.getenv(DISK_CACHE_ENV) or None)
+
+
+def memoized_stage(stage: str) -> Callable:
+    """Memoize a deterministic method on its arguments (``self`` is not part of the key)"""
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return stage_cache.call(stage, functools.partial(method, self), args, kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,380 @@
+"""
+Standards Registry
+Single source of truth for the MPOB soil and leaf standards. The versioned
+standards file is loaded once, merged with any admin overrides saved through
+the config manager, and compiled into NumPy min/max/optimal arrays per
+canonical parameter so averages or whole sample matrices are compared in one
+vectorized operation.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from utils.config_manager import config_manager, MPOBStandard, MPOBStandards
+    from utils.parameter_standardizer import parameter_standardizer
+except ImportError:
+    from config_manager import config_manager, MPOBStandard, MPOBStandards
+    from parameter_standardizer import parameter_standardizer
+
+logger = logging.getLogger(__name__)
+
+# Versioned standards shipped with the application
+DEFAULT_STANDARDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mpob_standards.json')
+
+# Config name of the admin overrides (config/<name>.json via ConfigManager)
+OVERRIDES_CONFIG = 'mpob_standards'
+
+# Status codes returned by StandardsTable.classify
+STATUS_MISSING = -2
+STATUS_LOW = -1
+STATUS_OPTIMAL = 0
+STATUS_HIGH = 1
+
+
+class StandardsTable:
+    """Standards of one report type compiled to aligned NumPy arrays"""
+
+    def __init__(self, param_type: str, standards: Dict[str, Dict[str, Any]], version: str):
+        self.param_type = param_type
+        self.version = version
+        self.parameters: List[str] = list(standards)
+        self.index: Dict[str, int] = {param: i for i, param in enumerate(self.parameters)}
+        self._standards = standards
+
+        self.min = np.array([float(standards[p]['min']) for p in self.parameters])
+        self.max = np.array([float(standards[p]['max']) for p in self.parameters])
+        self.optimal = np.array([
+            float(standards[p]['optimal']) if standards[p].get('optimal') is not None
+            else (float(standards[p]['min']) + float(standards[p]['max'])) / 2
+            for p in self.parameters
+        ])
+        self.critical = np.array([bool(standards[p].get('critical', False)) for p in self.parameters])
+
+        for array in (self.min, self.max, self.optimal, self.critical):
+            array.setflags(write=False)
+
+    def __contains__(self, param: str) -> bool:
+        return param in self.index
+
+    def __len__(self) -> int:
+        return len(self.parameters)
+
+    def get(self, param: str, default: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Full standard of a canonical parameter (min, max, optimal, unit, causes, ...)"""
+        return self._standards.get(param, default)
+
+    def lookup(self, parameters: Sequence[str]) -> np.ndarray:
+        """Column index of each parameter in the table, -1 for parameters without a standard"""
+        return np.array([self.index.get(param, -1) for param in parameters], dtype=np.intp)
+
+    def classify(self, values: np.ndarray, parameters: Sequence[str]) -> np.ndarray:
+        """Compare values against the standards in one vectorized operation.
+
+        Args:
+            values: Array whose last axis follows ``parameters`` (a row of
+                averages or a samples x parameters matrix, NaN where missing)
+            parameters: Canonical parameter IDs of the value columns
+
+        Returns:
+            int8 array of the same shape with STATUS_LOW, STATUS_OPTIMAL,
+            STATUS_HIGH or STATUS_MISSING (missing value or no standard)
+        """
+        values = np.asarray(values, dtype=float)
+        columns = self.lookup(parameters)
+        known = columns >= 0
+        safe_columns = np.where(known, columns, 0)
+
+        status = np.where(values < self.min[safe_columns], STATUS_LOW,
+                          np.where(values > self.max[safe_columns], STATUS_HIGH, STATUS_OPTIMAL))
+        status = np.where(np.isnan(values) | ~known, STATUS_MISSING, status)
+        return status.astype(np.int8)
+
+    def evaluate(self, values: np.ndarray, parameters: Sequence[str],
+                 blocks: Optional[Sequence[Any]] = None) -> Dict[str, Any]:
+        """Evaluate every sample, and every block of samples, against the standards.
+
+        Args:
+            values: Samples x parameters matrix (NaN where missing)
+            parameters: Canonical parameter IDs of the matrix columns
+            blocks: Optional block/field label of every sample row
+
+        Returns:
+            Column-oriented dict of plain lists, ready for charts and storage:
+            per-sample ``status`` codes, per-parameter ``deficiency_fraction``
+            and ``excess_fraction`` and, when blocks are given, per-block means,
+            status of the block means and deficiency fractions
+        """
+        values = np.asarray(values, dtype=float).reshape(-1, len(parameters))
+        status = self.classify(values, parameters)
+        present = status != STATUS_MISSING
+        low = status == STATUS_LOW
+        high = status == STATUS_HIGH
+
+        counts = present.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            deficiency = np.where(counts > 0, low.sum(axis=0) / counts, 0.0)
+            excess = np.where(counts > 0, high.sum(axis=0) / counts, 0.0)
+
+        evaluation = {
+            'param_type': self.param_type,
+            'standards_version': self.version,
+            'parameters': list(parameters),
+            'sample_count': int(values.shape[0]),
+            'status': {param: status[:, j].tolist() for j, param in enumerate(parameters)},
+            'evaluated_count': dict(zip(parameters, counts.tolist())),
+            'deficiency_fraction': dict(zip(parameters, deficiency.tolist())),
+            'excess_fraction': dict(zip(parameters, excess.tolist())),
+            'blocks': None
+        }
+
+        if blocks is not None and values.shape[0]:
+            evaluation['blocks'] = self._evaluate_blocks(values, parameters, present, low, blocks)
+        return evaluation
+
+    def _evaluate_blocks(self, values: np.ndarray, parameters: Sequence[str], present: np.ndarray,
+                         low: np.ndarray, blocks: Sequence[Any]) -> Dict[str, Any]:
+        """Per-block means, status and deficiency fractions via one bincount per aggregate"""
+        labels, inverse = np.unique(np.asarray(blocks, dtype=str), return_inverse=True)
+        block_count, width = len(labels), len(parameters)
+        cells = (inverse.reshape(-1, 1) * width + np.arange(width)).ravel()
+        size = block_count * width
+
+        def block_sum(weights: np.ndarray) -> np.ndarray:
+            return np.bincount(cells, weights=weights.ravel(), minlength=size).reshape(block_count, width)
+
+        counts = block_sum(present.astype(float))
+        sums = block_sum(np.where(present, values, 0.0))
+        deficient = block_sum(low.astype(float))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(counts > 0, sums / counts, np.nan)
+            deficiency = np.where(counts > 0, deficient / counts, 0.0)
+        block_status = self.classify(means, parameters)
+
+        return {
+            'labels': labels.tolist(),
+            'sample_count': np.bincount(inverse, minlength=block_count).tolist(),
+            'means': {param: [None if np.isnan(v) else v for v in means[:, j].tolist()]
+                      for j, param in enumerate(parameters)},
+            'status': {param: block_status[:, j].tolist() for j, param in enumerate(parameters)},
+            'deficiency_fraction': {param: deficiency[:, j].tolist() for j, param in enumerate(parameters)}
+        }
+
+    def ranges(self) -> Dict[str, Dict[str, float]]:
+        """Plain {parameter: {'min', 'max', 'optimal'}} view of the table"""
+        return {
+            param: {'min': float(self.min[i]), 'max': float(self.max[i]), 'optimal': float(self.optimal[i])}
+            for i, param in enumerate(self.parameters)
+        }
+
+
+class StandardsLookup(Mapping):
+    """Read-only view of a standards table keyed by any name of a parameter.
+
+    Status tables and charts look standards up by whatever display name their
+    data uses ('Exch. K (meq%)', 'Available P (mg/kg)', ...); names are
+    resolved to canonical IDs on access. Iteration yields canonical IDs.
+    """
+
+    def __init__(self, table: StandardsTable, value: Callable[[Dict[str, Any]], Any]):
+        self.table = table
+        self._value = value
+
+    def __getitem__(self, name: str) -> Any:
+        param = name if name in self.table else parameter_standardizer.resolve(name, self.table.param_type)
+        standard = self.table.get(param) if param else None
+        if standard is None:
+            raise KeyError(name)
+        return self._value(standard)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.table.parameters)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+
+# Values are passed through as stored so tables show '15-40' rather than '15.0-40.0'
+def _range_pair(standard: Dict[str, Any]) -> tuple:
+    return standard['min'], standard['max']
+
+
+def _range_details(standard: Dict[str, Any]) -> Dict[str, Any]:
+    return {'min': standard['min'], 'max': standard['max'],
+            'optimal': standard.get('optimal'), 'unit': standard.get('unit', '')}
+
+
+class StandardsRegistry:
+    """Loads, caches and invalidates the MPOB standards.
+
+    The standards file and overrides are read once and compiled per report
+    type. Every access checks the override file's modification time, so an
+    admin edit (in this or another process) invalidates the cached tables
+    and bumps ``version``.
+    """
+
+    REPORT_TYPES = ('soil', 'leaf')
+
+    def __init__(self, standards_file: str = DEFAULT_STANDARDS_FILE):
+        self.standards_file = standards_file
+        self._lock = threading.Lock()
+        self._signature = None
+        self._version = None
+        self._standards: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._tables: Dict[str, StandardsTable] = {}
+        self._mpob_standards: Optional[MPOBStandards] = None
+
+    @property
+    def overrides_path(self) -> str:
+        return os.path.join(config_manager.config_dir, f"{OVERRIDES_CONFIG}.json")
+
+    def _overrides_signature(self):
+        try:
+            stat = os.stat(self.overrides_path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _ensure_loaded(self):
+        signature = self._overrides_signature()
+        if self._version is not None and signature == self._signature:
+            return
+
+        with self._lock:
+            if self._version is not None and signature == self._signature:
+                return
+
+            with open(self.standards_file, 'r', encoding='utf-8') as f:
+                document = json.load(f)
+            standards = {param_type: document.get(param_type, {}) for param_type in self.REPORT_TYPES}
+            version = str(document.get('version', '0'))
+
+            overrides = config_manager.load_config(OVERRIDES_CONFIG) if signature else None
+            if overrides:
+                standards = self._merge_overrides(standards, overrides)
+                digest = hashlib.sha1(json.dumps(overrides, sort_keys=True, default=str).encode('utf-8'))
+                version = f"{version}+{digest.hexdigest()[:8]}"
+
+            self._standards = standards
+            self._tables = {}
+            self._mpob_standards = None
+            self._version = version
+            self._signature = signature
+            logger.info(f"Loaded MPOB standards version {version}")
+
+    def _merge_overrides(self, standards: Dict[str, Dict[str, Dict[str, Any]]],
+                         overrides: Dict[str, Any]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Merge admin overrides field by field; parameter names may use any known alias"""
+        merged = copy.deepcopy(standards)
+        for param_type in self.REPORT_TYPES:
+            section = overrides.get(param_type) or overrides.get(f"{param_type}_standards") or {}
+            for name, fields in section.items():
+                if not isinstance(fields, dict):
+                    continue
+                param = parameter_standardizer.resolve(name, param_type) or name
+                target = merged[param_type].setdefault(param, {'critical': False, 'unit': '', 'causes': {}, 'impacts': {}})
+                for field in ('min', 'max', 'optimal', 'unit', 'critical', 'category', 'description'):
+                    if fields.get(field) is not None:
+                        target[field] = fields[field]
+                if 'min' not in target or 'max' not in target:
+                    logger.warning(f"Ignoring {param_type} standard override for {name}: min and max are required")
+                    del merged[param_type][param]
+        return merged
+
+    @property
+    def version(self) -> str:
+        """Version of the loaded standards (file version plus an overrides digest)"""
+        self._ensure_loaded()
+        return self._version
+
+    def invalidate(self):
+        """Drop the cached standards so the next access reloads them"""
+        with self._lock:
+            self._version = None
+
+    def table(self, param_type: str) -> StandardsTable:
+        """Compiled standards of 'soil' or 'leaf' parameters"""
+        self._ensure_loaded()
+        param_type = param_type.lower()
+        table = self._tables.get(param_type)
+        if table is None:
+            table = StandardsTable(param_type, self._standards.get(param_type, {}), self._version)
+            self._tables[param_type] = table
+        return table
+
+    def get(self, param: str, param_type: str) -> Optional[Dict[str, Any]]:
+        """Standard of one parameter, resolving the name to its canonical ID"""
+        table = self.table(param_type)
+        return table.get(parameter_standardizer.resolve(param, param_type) or param)
+
+    def save_overrides(self, overrides: Dict[str, Any]) -> bool:
+        """Persist admin overrides ({'soil': {param: fields}, 'leaf': ...}) and invalidate the cache"""
+        saved = config_manager.save_config(OVERRIDES_CONFIG, overrides)
+        self.invalidate()
+        return saved
+
+    def reset_overrides(self) -> bool:
+        """Remove admin overrides and fall back to the standards file"""
+        reset = config_manager.reset_to_defaults(OVERRIDES_CONFIG)
+        self.invalidate()
+        return reset
+
+    def mpob_standards(self) -> MPOBStandards:
+        """Standards as the MPOBStandards dataclass used by the config UI"""
+        self._ensure_loaded()
+        if self._mpob_standards is None:
+            sections = {}
+            for param_type in self.REPORT_TYPES:
+                sections[param_type] = {
+                    param: MPOBStandard(
+                        param, float(std['min']), float(std['max']), std.get('unit', ''),
+                        std.get('optimal'), std.get('description', ''), bool(std.get('critical', False))
+                    )
+                    for param, std in self._standards[param_type].items()
+                }
+            self._mpob_standards = MPOBStandards(
+                standards={}, soil_standards=sections['soil'], leaf_standards=sections['leaf']
+            )
+        return self._mpob_standards
+
+    def as_ranges(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Standards as {'soil_standards': {param: {'min', 'max', 'unit', 'optimal'}}, 'leaf_standards': ...}"""
+        self._ensure_loaded()
+        return {
+            f"{param_type}_standards": {
+                param: {'min': std['min'], 'max': std['max'], 'unit': std.get('unit', ''), 'optimal': std.get('optimal')}
+                for param, std in self._standards[param_type].items()
+            }
+            for param_type in self.REPORT_TYPES
+        }
+
+
+    def status_ranges(self, param_type: str) -> StandardsLookup:
+        """{name: (min, max)} of 'soil' or 'leaf' standards for status tables and charts"""
+        return StandardsLookup(self.table(param_type), _range_pair)
+
+    def status_standards(self, param_type: str) -> StandardsLookup:
+        """{name: {'min', 'max', 'optimal', 'unit'}} of 'soil' or 'leaf' standards"""
+        return StandardsLookup(self.table(param_type), _range_details)
+
+
+# Global standards registry instance
+standards_registry = StandardsRegistry()
+
+
+def get_standards_table(param_type: str) -> StandardsTable:
+    """Get the compiled standards of 'soil' or 'leaf' parameters"""
+    return standards_registry.table(param_type)
+
+
+def get_standards_version() -> str:
+    """Get the version of the loaded standards"""
+    return standards_registry.version
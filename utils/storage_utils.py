@@ -0,0 +1,159 @@
+"""
+Storage Utilities
+Cloud Storage access with a local-filesystem stand-in that mirrors the subset
+of the google-cloud-storage Bucket/Blob API used by the application.
+"""
+
+import os
+import logging
+import shutil
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Optional Google Cloud Storage client
+try:
+    from google.cloud import storage as gcs_storage
+    GCS_AVAILABLE = True
+except ImportError:
+    gcs_storage = None
+    GCS_AVAILABLE = False
+
+# Root directory for the local stand-in when no path is given
+DEFAULT_LOCAL_STORAGE_ROOT = os.path.join(os.path.expanduser('~'), '.cropdrive_storage')
+
+
+class LocalBlob:
+    """Filesystem-backed object compatible with google.cloud.storage.Blob"""
+
+    def __init__(self, bucket: 'LocalStorageBucket', name: str):
+        self.bucket = bucket
+        self.name = name
+        self.content_type: Optional[str] = None
+        self.metadata: Optional[dict] = None
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.bucket.root, *self.name.split('/'))
+
+    @property
+    def public_url(self) -> str:
+        return f"file://{os.path.abspath(self.path)}"
+
+    @property
+    def size(self) -> Optional[int]:
+        return os.path.getsize(self.path) if self.exists() else None
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.path)
+
+    def _prepare(self, content_type: Optional[str]):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if content_type:
+            self.content_type = content_type
+
+    def upload_from_filename(self, filename: str, content_type: Optional[str] = None):
+        self._prepare(content_type)
+        shutil.copyfile(filename, self.path)
+
+    def upload_from_string(self, data, content_type: Optional[str] = None):
+        self._prepare(content_type)
+        mode = 'wb' if isinstance(data, (bytes, bytearray)) else 'w'
+        with open(self.path, mode) as f:
+            f.write(data)
+
+    def upload_from_file(self, file_obj, content_type: Optional[str] = None, rewind: bool = False):
+        self._prepare(content_type)
+        if rewind:
+            file_obj.seek(0)
+        with open(self.path, 'wb') as f:
+            shutil.copyfileobj(file_obj, f)
+
+    def download_as_bytes(self) -> bytes:
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def download_to_filename(self, filename: str):
+        shutil.copyfile(self.path, filename)
+
+    def download_to_file(self, file_obj):
+        with open(self.path, 'rb') as f:
+            shutil.copyfileobj(f, file_obj)
+
+    def open(self, mode: str = 'rb'):
+        if 'w' in mode:
+            self._prepare(None)
+        return open(self.path, mode)
+
+    def delete(self):
+        if self.exists():
+            os.remove(self.path)
+
+    def make_public(self):
+        """No-op: local files are always reachable through public_url"""
+
+
+class LocalStorageBucket:
+    """Filesystem-backed bucket compatible with google.cloud.storage.Bucket.
+
+    Object names map to paths under ``root`` so code written against Cloud
+    Storage (including ``gs://<name>/...`` URIs) runs unchanged in tests and
+    local development.
+    """
+
+    def __init__(self, name: str = 'local-bucket', root: Optional[str] = None):
+        self.name = name
+        self.root = os.path.join(root or DEFAULT_LOCAL_STORAGE_ROOT, name)
+        os.makedirs(self.root, exist_ok=True)
+
+    def blob(self, name: str) -> LocalBlob:
+        return LocalBlob(self, name)
+
+    def get_blob(self, name: str) -> Optional[LocalBlob]:
+        blob = self.blob(name)
+        return blob if blob.exists() else None
+
+    def list_blobs(self, prefix: str = '') -> Iterator[LocalBlob]:
+        for directory, _, files in os.walk(self.root):
+            for filename in sorted(files):
+                relative = os.path.relpath(os.path.join(directory, filename), self.root)
+                name = relative.replace(os.sep, '/')
+                if name.startswith(prefix):
+                    yield LocalBlob(self, name)
+
+
+def gcs_uri(bucket, path: str) -> str:
+    """Build a gs:// URI for an object path in a bucket"""
+    return f"gs://{bucket.name}/{path.lstrip('/')}"
+
+
+def split_gcs_uri(uri: str) -> tuple:
+    """Split a gs://bucket/path URI into (bucket name, object path)"""
+    without_scheme = uri[len('gs://'):] if uri.startswith('gs://') else uri
+    bucket_name, _, path = without_scheme.partition('/')
+    return bucket_name, path
+
+
+def get_storage_bucket(bucket_name: Optional[str] = None, local_root: Optional[str] = None):
+    """Get a Cloud Storage bucket, falling back to the local stand-in.
+
+    The local stand-in is used when ``local_root`` is given, when the
+    ``CROPDRIVE_LOCAL_STORAGE`` environment variable is set, or when no
+    Cloud Storage bucket can be obtained.
+    """
+    local_root = local_root or os.getenv('CROPDRIVE_LOCAL_STORAGE')
+    if local_root:
+        return LocalStorageBucket(bucket_name or 'local-bucket', local_root)
+
+    try:
+        if bucket_name and GCS_AVAILABLE:
+            return gcs_storage.Client().bucket(bucket_name)
+
+        from utils.firebase_config import get_storage_bucket as get_firebase_bucket
+        bucket = get_firebase_bucket()
+        if bucket is not None:
+            return bucket
+    except Exception as e:
+        logger.warning(f"Cloud Storage unavailable, using local storage: {e}")
+
+    return LocalStorageBucket(bucket_name or 'local-bucket')